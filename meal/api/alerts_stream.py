@@ -0,0 +1,96 @@
+"""Server-Sent Events stream for pantry alerts.
+
+Pushes the events captured by meal.events.web_observers (pantry.low_stock / pantry.near_expiry)
+to connected browsers instead of having every tab poll /api/pantry/alerts.
+
+Fan-out design (one worker, many subscribers):
+  * A single listener is registered on web_observers. When an event is recorded it
+    resolves one shared asyncio future (thread-safe via call_soon_threadsafe) and swaps in
+    a fresh one, so waking N subscribers costs one callback, not N queues.
+  * Subscribers keep only their last delivered id and read the ring buffer from there
+    (index arithmetic on consecutive ids), so there is no per-subscriber buffering.
+  * Idle connections get a comment line every HEARTBEAT_SECONDS to keep proxies from
+    closing them.
+
+Resume: the browser's EventSource resends the last seen `id:` as the Last-Event-ID header
+on reconnect; events still in the ring buffer after that id are replayed first. Ids are per
+process and restart at 1, so an id above the newest one comes from before a restart or from
+another worker: the stream then starts at the newest event instead of waiting for the ids to
+catch up.
+"""
+from __future__ import annotations
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, Optional
+
+from meal.events import web_observers
+
+__all__ = ['alert_stream', 'format_sse', 'HEARTBEAT_SECONDS']
+
+HEARTBEAT_SECONDS = 15.0
+RETRY_MS = 3000
+
+
+class _Broadcaster:
+    """Shared wake-up signal for every subscriber on one event loop."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self._waiter: asyncio.Future = loop.create_future()
+        web_observers.add_listener(self._on_event)
+
+    def _on_event(self, _evt: Dict[str, Any]):
+        try:
+            self.loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:  # loop closed (e.g. test client shut down)
+            web_observers.remove_listener(self._on_event)
+
+    def _wake(self):
+        waiter, self._waiter = self._waiter, self.loop.create_future()
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def waiter(self) -> asyncio.Future:
+        return self._waiter
+
+
+_broadcasters: Dict[int, _Broadcaster] = {}
+
+
+def _broadcaster() -> _Broadcaster:
+    loop = asyncio.get_running_loop()
+    b = _broadcasters.get(id(loop))
+    if b is None or b.loop is not loop:
+        if b is not None:
+            web_observers.remove_listener(b._on_event)
+        b = _broadcasters[id(loop)] = _Broadcaster(loop)
+    return b
+
+
+def format_sse(data: Any, *, event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False))
+    return "\n".join(lines) + "\n\n"
+
+
+async def alert_stream(last_id: Optional[int] = None, *,
+                       heartbeat: float = HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+    """Yield SSE frames: backlog after last_id (None = only new events), then live events."""
+    broadcaster = _broadcaster()
+    latest = web_observers.latest_id()
+    cursor = latest if last_id is None or last_id > latest else last_id
+    yield f"retry: {RETRY_MS}\n\n"
+    while True:
+        # Grab the waiter before reading so an event recorded in between is not missed
+        waiter = broadcaster.waiter()
+        for evt in web_observers.get_events(cursor)['events']:
+            cursor = evt['id']
+            yield format_sse(evt, event=evt.get('type'), event_id=evt['id'])
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout=heartbeat)
+        except asyncio.TimeoutError:
+            yield ": keep-alive\n\n"
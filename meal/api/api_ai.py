@@ -1,25 +1,39 @@
+from __future__ import annotations
 import os
 import re
 import json
 import logging
 from json import JSONDecodeError
-from typing import Optional
-from openai import OpenAI
+from typing import TYPE_CHECKING, Optional
 from fastapi import APIRouter, HTTPException, Body
 
 from meal.domain.Recipe import Recipe
 from meal.infra.Recipe_Repository import reading_from_recipes
 from meal.utilities.constants import PRROMPT_TEMPLATE, RECIPE_JSON_FORMAT
+from meal.infra.storage_io import run_io
+from meal.infra.tracing import span
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
 
+# === Helper: traced OpenAI call ===
+def _create_response(client: OpenAI, **kwargs):
+    """client.responses.create inside an `openai.responses.create` tracing span."""
+    with span('openai.responses.create', model=kwargs.get('model')):
+        return client.responses.create(**kwargs)
+
+
 # === Helper: Get OpenAI Client ===
 def _get_openai_client():
     """Return an OpenAI client if OPENAI_API_KEY is set, otherwise None."""
     api_key = os.environ.get("OPENAI_API_KEY")
     if not api_key:
         return None
+    # The SDK takes ~0.4 s to import; only pay for it when AI generation is actually used
+    from openai import OpenAI
     return OpenAI(api_key=api_key)
 
 
@@ -31,7 +45,8 @@ def de_test():
         logger.warning("OPENAI_API_KEY not set — skipping AI call in de_test().")
         return None
 
-    response = client.responses.create(
+    response = _create_response(
+        client,
         model="gpt-4o-mini",
         input="scrie o rețetă pentru o cină sănătoasă folosind pui și legume",
     )
@@ -75,7 +90,8 @@ def create_recipe_from_ai(prompt: str = "") -> Recipe | None:
             prompt = ""
 
     # === OpenAI Call ===
-    response = client.responses.create(
+    response = _create_response(
+        client,
         model="gpt-4o-mini",
         input=prompt + PRROMPT_TEMPLATE + RECIPE_JSON_FORMAT,
     )
@@ -182,7 +198,7 @@ def _request_json_fix(client: OpenAI, previous_output: str) -> Optional[str]:
             "Please reformat ONLY the recipe as valid JSON (no surrounding text) using the same keys. "
             "Here is the original output:\n\n" + previous_output
         )
-        resp = client.responses.create(model="gpt-4o-mini", input=prompt)
+        resp = _create_response(client, model="gpt-4o-mini", input=prompt)
         return (resp.output_text or "").strip()
     except Exception:
         logger.exception("Error while requesting AI to fix JSON formatting")
@@ -196,7 +212,8 @@ router = APIRouter()
 @router.post("/generate-recipe-ai")
 async def generate_recipe_ai(prompt: str = Body(..., embed=True)):
     try:
-        recipe_obj = create_recipe_from_ai(prompt)
+        # Blocking OpenAI call + recipes.json read: run off the event loop
+        recipe_obj = await run_io(create_recipe_from_ai, prompt)
         if recipe_obj is None:
             raise HTTPException(status_code=500, detail="AI did not return a valid recipe")
 
@@ -1,3 +1,6 @@
+import time
+_APP_IMPORT_STARTED = time.perf_counter()  # reported as STARTUP_METRICS['app_ready_ms']
+
 from fastapi import (
     FastAPI,
     Request,
@@ -8,39 +11,66 @@ from fastapi import (
     Response,
     Body
 )
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse, StreamingResponse
 
 from pathlib import Path
 from pydantic import BaseModel
 from datetime import datetime, timedelta, date as _date
 from uuid import uuid4
 from typing import Optional
+from threading import Lock
 import logging
 import json
 
 from meal.infra.pdf_utils import generate_pdf_for_week
+from meal.infra.pdf_cache import PDF_CACHE
 from meal.logic.reporting.nutrition import compute_week_nutrition  # moved from services.Reporting_Service
 from meal.logic.pantry.analysis import compute_pantry_snapshots   # moved from services.pantry_analysis
+from meal.logic.pantry.batch import apply_pantry_batch
 from meal.infra.Plan_Repository import PlanRepository
 from meal.api.routes.recipes import load_recipes
 from meal.api.routes.pantry import load_ingredients, save_ingredients
 from meal.api.routes.logs import load_cooked_recipes, save_cooked_recipes
+from meal.infra.Cooked_Repository import get_cooked_history, parse_cooked_date
+from meal.infra.versions import catalog_version, file_version, pantry_version, plan_week_version
+from meal.infra.paths import COOKED_FILE, SHOPPING_TRANSACTIONS_FILE
+from meal.infra.recipe_index import CARD_FIELDS, get_recipe_index
+from meal.infra.recipe_search import get_search_index
+from meal.infra.recipe_suggest import suggest_recipes
+from meal.api.http_cache import make_etag, etag_matches, etag_headers, not_modified
+from meal.api.alerts_stream import alert_stream
+from meal.api.assets import AssetManifest, AssetStaticFiles
+from meal.api.compression import CompressionMiddleware
+from meal.api.fragment_cache import FragmentCache
+from meal.api.warmup import FirstRequestTimer, STARTUP_METRICS, create_templates, precompile_templates
+from meal.api.request_metrics import RequestMetricsMiddleware
+from meal.api.request_tracing import TraceMiddleware
+from meal.api.profiling import ProfilerMiddleware, list_profiles, profile_path, token_matches
+from meal.infra.tracing import format_trace, recent_traces, span, traced
+from meal.infra.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY as METRICS, record_read
+from meal.utilities.config import (
+    JINJA_BYTECODE_CACHE_DIR, PRECOMPILE_TEMPLATES,
+    PROFILE_TOKEN, PROFILE_SAMPLE_RATE, PROFILE_INTERVAL_MS, PROFILE_KEEP, PROFILE_MAX_SECONDS
+)
+from meal.tools.compress_static import compress_static
+from meal.infra.images import get_image_service
+from meal.infra.storage_io import run_io, write_json
 from meal.logic.shopping.list_builder import build_shopping_list   # moved from rules.Shopping_List_Builder
+from meal.utilities.stemming import stem
 from meal.utilities.constants import DATE_FORMAT, LOW_STOCK_THRESHOLD, DAYS_BEFORE_EXPIRY
 from meal.events.event_helpers import (
     publish_expiring_snapshot,
     publish_low_stock,
-    publish_near_expiry
+    publish_near_expiry,
+    publish_recipe_cooked
 )
 from meal.events.web_observers import start as start_event_observers, get_events as get_web_events
+from meal.events.stats_observers import start as start_stats_observers
+from meal.logic.reporting.cook_stats import get_cook_stats
 
 # Routers
 from meal.api.routes import add
 from meal.api.api_ai import router as ai_router
-from dotenv import load_dotenv
-load_dotenv()
 
 # Logging
 logger = logging.getLogger("meal_app")
@@ -70,19 +100,43 @@ except Exception:
 
 # Initialize FastAPI app
 app = FastAPI(title="Meal Planner & Pantry API")
+# Gzip dynamic JSON/HTML above 1 KB (static assets use precompressed siblings instead)
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
+app.add_middleware(FirstRequestTimer)
+# Opt-in stack sampling of single requests (PROFILE_TOKEN) or 1 in PROFILE_SAMPLE_RATE per route
+# (never the long-lived alert stream)
+app.add_middleware(ProfilerMiddleware, router=app.router, token=PROFILE_TOKEN, sample_rate=PROFILE_SAMPLE_RATE,
+                   interval_ms=PROFILE_INTERVAL_MS, keep=PROFILE_KEEP, max_seconds=PROFILE_MAX_SECONDS,
+                   exclude_routes=('/api/pantry/alerts/stream',))
+# Root tracing span per request (X-Trace-Id, /_debug/traces)
+app.add_middleware(TraceMiddleware, router=app.router)
+# Outermost: per-route latency/size/status for /metrics
+app.add_middleware(RequestMetricsMiddleware, router=app.router)
 router = APIRouter()
 
 # Include routers
 app.include_router(add.router)
 app.include_router(ai_router)
 
-# Static files
+# Static files (content-hash fingerprinted; see meal.api.assets)
 static_dir = (Path(__file__).parent.parent / 'static').resolve()
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+asset_manifest = AssetManifest(static_dir).build()
+app.mount("/static", AssetStaticFiles(directory=str(static_dir), manifest=asset_manifest), name="static")
 
 # Templates
 templates_dir = (Path(__file__).parent.parent / 'templates').resolve()
-templates = Jinja2Templates(directory=str(templates_dir))
+templates = create_templates(templates_dir, JINJA_BYTECODE_CACHE_DIR)
+templates.env.globals["static_url"] = asset_manifest.url
+image_service = get_image_service()
+
+
+def _picture_srcset(image: str, fmt: str = 'jpg') -> str:
+    """srcset of the width-bucketed derivatives of a recipe picture ('' until they exist)."""
+    return image_service.srcset(image, fmt, url=asset_manifest.url)
+
+
+templates.env.globals["picture_srcset"] = _picture_srcset
+fragment_cache = FragmentCache()
 
 
 
@@ -94,10 +148,25 @@ def _startup_web_observers():
         logger.info("Web observers for pantry events started")
     except Exception as e:  # pragma: no cover - defensive
         logger.error("Failed to start web observers: %s", e)
+    try:
+        start_stats_observers()
+        logger.info("Cook statistics observers started")
+    except Exception as e:  # pragma: no cover - defensive
+        logger.error("Failed to start stats observers: %s", e)
+    try:
+        # Refresh .gz/.br siblings of text assets (only missing/stale ones are written)
+        compress_static()
+    except Exception as e:  # pragma: no cover - read-only deployments
+        logger.warning("Static precompression skipped: %s", e)
+    if PRECOMPILE_TEMPLATES:
+        precompile_templates(templates)
+    STARTUP_METRICS['app_ready_ms'] = round((time.perf_counter() - _APP_IMPORT_STARTED) * 1000, 2)
+    logger.info("App ready in %.1f ms after import", STARTUP_METRICS['app_ready_ms'])
 
-def _ts() -> int:
-    """Cache-busting timestamp for static assets."""
-    return int(datetime.now().timestamp())
+
+@app.on_event("shutdown")
+def _shutdown_image_service():
+    image_service.shutdown()
 
 # -------------------- Helpers --------------------
 def gen_weeks(first_monday: _date, count: int = 12):
@@ -115,6 +184,23 @@ def gen_weeks(first_monday: _date, count: int = 12):
         })
     return weeks
 
+def _fragment_key(week: int, year: int) -> tuple:
+    """Version key for the cached week fragments; compute it before loading the plan."""
+    return (week, year, plan_week_version(week, year), catalog_version(),
+            _date.today().isoformat(), image_service.generation)
+
+
+def _week_fragments(key: tuple, plan) -> dict:
+    """Rendered week grid rows and nutrition panel (from fragment_cache when unchanged)."""
+    return {
+        "meal_tbody": fragment_cache.render(
+            templates.env, "partials/meal_tbody.html", key,
+            lambda: {"plan": plan, "recipe_cards": get_recipe_index().by_name}),
+        "nutrition_panel": fragment_cache.render(
+            templates.env, "partials/nutrition_panel.html", key,
+            lambda: {"plan": plan, "nutrition": compute_week_nutrition(plan, load_recipes())}),
+    }
+
 # -------------------- UI PAGES --------------------
 @app.get("/", response_class=HTMLResponse)
 def main_page(request: Request, week: Optional[int] = Query(default=None), year: Optional[int] = Query(default=None), notice: Optional[str] = Query(default=None), chg: Optional[int] = Query(default=None)):
@@ -123,11 +209,10 @@ def main_page(request: Request, week: Optional[int] = Query(default=None), year:
         iso = today.isocalendar()
         week, year = iso.week, iso.year
 
+    fragment_key = _fragment_key(week, year)
     repo = PlanRepository()
     plan = repo.get_week_plan(week, year)
 
-    recipes = load_recipes()
-
     # Expiring soon (<= DAYS_BEFORE_EXPIRY days)
     expiring_window = DAYS_BEFORE_EXPIRY
     expiring_soon = []
@@ -138,8 +223,6 @@ def main_page(request: Request, week: Optional[int] = Query(default=None), year:
     except Exception:
         expiring_soon, low_stock_items = [], []
 
-    nutrition = compute_week_nutrition(plan, recipes)
-
     notice_map = {
         "reset": "Week has been changed to default.",
         "random": "Week has been randomized.",
@@ -152,12 +235,10 @@ def main_page(request: Request, week: Optional[int] = Query(default=None), year:
         {
             "request": request,
             "plan": plan,
-            "recipes": recipes,
             "expiring_soon": expiring_soon,
             "low_stock_items": low_stock_items,
-            "time": _ts(),
             "expiring_window": expiring_window,
-            "nutrition": nutrition,
+            "fragments": _week_fragments(fragment_key, plan),
             "current_date": _date.today().strftime("%d.%m.%Y"),  # added for Cook panel visibility condition
             "notice_message": notice_message,
         }
@@ -165,10 +246,10 @@ def main_page(request: Request, week: Optional[int] = Query(default=None), year:
 
 @app.get("/meal-plan/{week}", response_class=HTMLResponse)
 def meal_plan(request: Request, week: int):
+    year = _date.today().isocalendar().year
+    fragment_key = _fragment_key(week, year)
     repo = PlanRepository()
-    plan = repo.get_week_plan(week)
-    recipes = load_recipes()
-    nutrition = compute_week_nutrition(plan, recipes)
+    plan = repo.get_week_plan(week, year)
 
     # Mirror expiring_soon logic as on home page
     expiring_window = DAYS_BEFORE_EXPIRY
@@ -185,13 +266,11 @@ def meal_plan(request: Request, week: int):
         {
             "request": request,
             "plan": plan,
-            "recipes": recipes,
             "expiring_soon": expiring_soon,
             "low_stock_items": low_stock_items,
-            "time": _ts(),
             "expiring_window": expiring_window,
             "current_date": _date.today().strftime("%d.%m.%Y"),
-            "nutrition": nutrition,
+            "fragments": _week_fragments(fragment_key, plan),
         }
     )
 
@@ -232,7 +311,6 @@ def shopping_list_page(request: Request,
             "total_items": total_items,
             "default_exp_date": default_exp_date,
             "default_exp_date_iso": default_exp_date_iso,
-            "time": _ts(),
             "excluded_past_days": skip_past
         }
     )
@@ -275,8 +353,7 @@ def recipe_detail(request: Request, recipe_name: str):
             "steps": target.get('steps', []),
             "tags": target.get('tags', []),
             "calories": calories,
-            "macros": macros,
-            "time": _ts()
+            "macros": macros
         }
     )
 
@@ -316,70 +393,43 @@ else:
         return RedirectResponse(url="/", status_code=303)
 
 # -------------------- Recipes list page --------------------
-@app.get("/recipes-page", response_class=HTMLResponse)
-def recipes_page(request: Request, tag: str = Query(default="", alias="tag")):
-    recipes = load_recipes()
-
-    # colectăm toate tag-urile pentru dropdown
-    all_tags = set()
-    for r in recipes:
-        all_tags.update(r.get('tags', []))
-    tags = sorted(all_tags)
-
-    # aplicăm filtrarea dacă e selectat un tag
-    filtered = [r for r in recipes if tag in r.get('tags', [])] if tag else recipes
-
-    recipe_dicts = []
-    for r in filtered:
-        # --- Ingrediente formatate ---
-        ingredients = r.get('ingredients', [])
-        formatted_ingredients = [
-            f"{i.get('name', '')}, {i.get('default_quantity', '')} {i.get('unit', '')}".strip(", ")
-            for i in ingredients
-        ]
+RECIPES_PAGE_SIZE = 24
+MAX_RECIPES_PAGE = 200
+MAX_SEARCH_QUERY = 200  # characters
+SUGGEST_LIMIT = 10
+MAX_SUGGEST_LIMIT = 50
+# Card fields come precomputed from the recipe index; these are derived per request
+RECIPE_URL_FIELDS = ('image_url', 'srcset', 'webp_srcset')
+RECIPE_FIELDS = CARD_FIELDS + RECIPE_URL_FIELDS
 
-        # --- Imagine ---
-        image_name = r.get('image') or (r.get('name', '').lower().replace(' ', '_') + '.jpg')
 
-        # --- Calorii + Macronutrienți ---
-        calories = r.get('calories_per_serving') or r.get('caloriesPerServing') or None
-        macros_raw = r.get('macros', {}) or {}
-
-        macros = {
-            "protein": macros_raw.get("protein", 0),
-            "carbohydrates": macros_raw.get("carbohydrates", macros_raw.get("carbs", 0)),
-            "fats": macros_raw.get("fats", macros_raw.get("fat", 0)),
-        }
-
-        # --- Construcția finală a dicționarului ---
-        recipe_dicts.append({
-            "name": r.get('name', ''),
-            "servings": r.get('servings', ''),
-            "ingredients": formatted_ingredients,
-            "image": image_name,
-            "tags": r.get('tags', []),
-            "calories_per_serving": calories,
-            "macros": macros,
-        })
-
-    # --- Returnăm template-ul complet ---
+@app.get("/recipes-page", response_class=HTMLResponse)
+def recipes_page(request: Request, tag: str = Query(default="", alias="tag")):
+    # First page of precomputed cards; the rest is fetched from /api/recipes as the user scrolls
+    index = get_recipe_index()
+    recipes, next_cursor, total = index.page(tag=tag or None, limit=RECIPES_PAGE_SIZE)
     return templates.TemplateResponse(
         "recipes.html",
         {
             "request": request,
-            "recipes": recipe_dicts,
-            "tags": tags,
+            "recipes": recipes,
+            "tags": index.tags,
             "selected_tag": tag,
-            "time": _ts()
+            "next_cursor": next_cursor,
+            "total": total,
+            "page_size": RECIPES_PAGE_SIZE,
         }
     )
 
 
 # -------------------- Camara (pantry) --------------------
+COOKED_PAGE_SIZE = 50
+
 @app.get("/camara", response_class=HTMLResponse)
 def camara_page(request: Request):
     ingredients = load_ingredients()
-    cooked_recipes = load_cooked_recipes()
+    # Only the newest page is rendered; older entries are fetched on demand from /api/cooked
+    cooked_recipes, cooked_total = get_cooked_history().page(limit=COOKED_PAGE_SIZE, newest_first=True)
     expiring_soon, low_stock_items = compute_pantry_snapshots(ingredients, window=DAYS_BEFORE_EXPIRY)
     try:
         publish_expiring_snapshot(expiring_soon)
@@ -388,7 +438,8 @@ def camara_page(request: Request):
     return templates.TemplateResponse(
         "camara.html",
         {"request": request, "ingredients": ingredients, "cooked_recipes": cooked_recipes,
-         "expiring_soon": expiring_soon, "low_stock_items": low_stock_items, "time": _ts(),
+         "cooked_total": cooked_total, "cooked_page_size": COOKED_PAGE_SIZE,
+         "expiring_soon": expiring_soon, "low_stock_items": low_stock_items,
          "expiring_window": DAYS_BEFORE_EXPIRY}
     )
 
@@ -406,8 +457,7 @@ def camara_edit_page(request: Request):
         {
             "request": request,
             "ingredients": ingredients,
-            "cooked_recipes": cooked_recipes,
-            "time": _ts()
+            "cooked_recipes": cooked_recipes
         }
     )
 
@@ -460,6 +510,29 @@ def api_pantry_alerts(
         return snapshot
     return get_web_events(since)
 
+@app.get('/api/pantry/alerts/stream')
+async def api_pantry_alerts_stream(
+    request: Request,
+    since: Optional[int] = Query(default=None, description="Replay buffered events with id greater than this value")
+):
+    """Server-Sent Events stream of pantry alerts (push alternative to polling /api/pantry/alerts).
+
+    Each event carries `id:` = the ring-buffer event id and `event:` = pantry.low_stock / pantry.near_expiry.
+    Reconnecting clients resume from the Last-Event-ID header; otherwise `since` (or nothing = only new events).
+    """
+    last_id = since
+    header = request.headers.get('last-event-id')
+    if header:
+        try:
+            last_id = int(header)
+        except ValueError:
+            pass
+    return StreamingResponse(
+        alert_stream(last_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # -------------------- API: Pantry Ingredients --------------------
 @router.post('/api/pantry/ingredient')
 def add_ingredient(data: dict):
@@ -509,11 +582,33 @@ def bulk_delete_ingredients(payload: BulkDeleteRequest):
             deleted.append(ing.get('name'))
         else:
             remaining.append(ing)
-    not_found = [n for n in payload.names if n not in deleted]
+    deleted_set = set(deleted)
+    not_found = [n for n in payload.names if n not in deleted_set]
     if deleted:
         save_ingredients(remaining)
     return {"deleted": deleted, "not_found": not_found, "total_deleted": len(deleted)}
 
+MAX_PANTRY_BATCH_OPS = 1000
+
+class PantryBatchRequest(BaseModel):
+    ops: list[dict]
+
+@router.post('/api/pantry/batch')
+def pantry_batch(payload: PantryBatchRequest):
+    """Apply mixed add/upsert/patch/delete operations with one load and one write.
+
+    Body: {"ops": [{"op": "add"|"upsert", "item": {...}} | {"op": "patch", "name": ..., "changes": {...}}
+                   | {"op": "delete", "name": ...}, ...]}
+    Returns one result per op (status added/merged/updated/deleted/error); failed ops are skipped.
+    """
+    if len(payload.ops) > MAX_PANTRY_BATCH_OPS:
+        raise HTTPException(status_code=400, detail=f"Too many operations (max {MAX_PANTRY_BATCH_OPS})")
+    pantry, results, changed = apply_pantry_batch(load_ingredients(), payload.ops)
+    if changed:
+        save_ingredients(pantry)
+    errors = sum(1 for r in results if r['status'] == 'error')
+    return {"results": results, "applied": len(results) - errors, "errors": errors, "written": changed}
+
 # -------------------- API: Cooked Recipes --------------------
 @router.post('/api/pantry/cooked')
 def add_cooked(data: dict):
@@ -558,11 +653,121 @@ try:
 except Exception:
     pass
 
+# -------------------- API: Recipe listing (keyset pagination) --------------------
+def _recipe_item(card: dict, fields: tuple) -> dict:
+    item = {f: card[f] for f in fields if f in card}
+    if 'image_url' in fields:
+        item['image_url'] = asset_manifest.url('pictures/' + card['image'])
+    if 'srcset' in fields:
+        item['srcset'] = _picture_srcset(card['image'])
+    if 'webp_srcset' in fields:
+        item['webp_srcset'] = _picture_srcset(card['image'], 'webp')
+    return item
+
+
+@app.get('/api/recipes')
+def api_recipes(request: Request, response: Response,
+                fields: Optional[str] = Query(default=None, description="Comma-separated subset of RECIPE_FIELDS"),
+                tag: str = Query(default=""),
+                cursor: Optional[str] = Query(default=None),
+                limit: int = Query(default=RECIPES_PAGE_SIZE, ge=1, le=MAX_RECIPES_PAGE)):
+    """One page of recipe cards, sorted by name.
+
+    Pass the returned `next_cursor` back as `cursor` for the following page (null on the last
+    page). `fields` trims each item to the listed keys (default: all card fields).
+
+        { "items": [...], "next_cursor": "<opaque>" | null, "total": <matching recipes>,
+          "tags": [...] (first page only) }
+    """
+    selected = tuple(f.strip() for f in fields.split(',') if f.strip()) if fields else CARD_FIELDS
+    unknown = [f for f in selected if f not in RECIPE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(RECIPE_FIELDS)})")
+
+    parts = ["recipes", catalog_version(), ",".join(selected), tag, cursor or "", limit]
+    if any(f in RECIPE_URL_FIELDS for f in selected):
+        parts.append(image_service.generation)
+    etag = make_etag(*parts)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    index = get_recipe_index()
+    try:
+        cards, next_cursor, total = index.page(tag=tag or None, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response.headers.update(etag_headers(etag))
+    return {
+        "items": [_recipe_item(c, selected) for c in cards],
+        "next_cursor": next_cursor,
+        "total": total,
+        **({"tags": index.tags} if not cursor else {}),
+    }
+
+# -------------------- API: Recipe search (inverted index + BM25) --------------------
+@app.get('/api/recipes/search')
+def api_recipes_search(request: Request, response: Response,
+                       q: str = Query(default="", max_length=MAX_SEARCH_QUERY),
+                       fields: Optional[str] = Query(default=None, description="Comma-separated subset of RECIPE_FIELDS"),
+                       limit: int = Query(default=RECIPES_PAGE_SIZE, ge=1, le=MAX_RECIPES_PAGE),
+                       prefix: bool = Query(default=False, description="Treat the last term as a prefix (type-ahead)")):
+    """Ranked full-text search over name, tags, ingredients and steps.
+
+    `q` terms are AND-ed; `OR` separates alternatives and a trailing `*` matches a prefix
+    (`chicken rice`, `curry OR stew`, `tom*`). Ingredient words are stemmed, so "tomatoes"
+    finds "tomato".
+
+        { "items": [{...card fields, "score": <bm25>}], "total": <items returned>, "query": q }
+    """
+    selected = tuple(f.strip() for f in fields.split(',') if f.strip()) if fields else CARD_FIELDS
+    unknown = [f for f in selected if f not in RECIPE_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(RECIPE_FIELDS)})")
+
+    parts = ["search", catalog_version(), q, ",".join(selected), limit, prefix]
+    if any(f in RECIPE_URL_FIELDS for f in selected):
+        parts.append(image_service.generation)
+    etag = make_etag(*parts)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    index = get_recipe_index()
+    items = []
+    for name, score in get_search_index().search(q, limit=limit, prefix_last=prefix):
+        card = index.get(name)
+        if card is not None:
+            items.append({**_recipe_item(card, selected), "score": score})
+    response.headers.update(etag_headers(etag))
+    return {"items": items, "total": len(items), "query": q}
+
+# -------------------- API: Recipe suggestions (slot picker type-ahead) --------------------
+@app.get('/api/recipes/suggest')
+def api_recipes_suggest(request: Request, response: Response,
+                        q: str = Query(default="", max_length=MAX_SEARCH_QUERY),
+                        limit: int = Query(default=SUGGEST_LIMIT, ge=1, le=MAX_SUGGEST_LIMIT)):
+    """Recipes whose name, alias or a word of them starts with `q`, most cooked recently first.
+
+        { "items": [ { name, image, calories_per_serving, recent_cooks } ], "query": q }
+    """
+    etag = make_etag("suggest", catalog_version(), file_version(COOKED_FILE), _date.today().isoformat(), q, limit)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    index = get_recipe_index()
+    items = []
+    for name, cooks in suggest_recipes(q, limit):
+        card = index.get(name) or {}
+        items.append({"name": name, "image": card.get("image"),
+                      "calories_per_serving": card.get("calories_per_serving"), "recent_cooks": cooks})
+    response.headers.update(etag_headers(etag))
+    return {"items": items, "query": q}
+
 # -------------------- API: Recipes availability (pantry has all ingredients) --------------------
 @app.get('/api/recipes/available')
-def api_recipes_available():
+def api_recipes_available(request: Request, response: Response):
     """Return list of recipes for which pantry currently has all required ingredient quantities.
 
+    Conditional: ETag over (pantry, catalog) versions; If-None-Match hit -> 304 without computing.
+
     Response JSON structure:
         {
           "count": <int>,
@@ -577,6 +782,11 @@ def api_recipes_available():
     except Exception as e:  # pragma: no cover - defensive import
         raise HTTPException(status_code=500, detail=f"Import failure: {e}")
 
+    etag = make_etag("available", pantry_version(), catalog_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+
     try:
         recipes = load_recipes()  # list[dict]
         pantry = load_ingredients()  # list[dict]
@@ -637,19 +847,26 @@ def api_recipes_available():
 # -------------------- API: Shopping List (JSON) --------------------
 @app.get('/api/shopping-list')
 @app.get('/api/shopping-list/')
-def api_shopping_list(week: Optional[int] = Query(default=None),
+def api_shopping_list(request: Request, response: Response,
+                      week: Optional[int] = Query(default=None),
                       year: Optional[int] = Query(default=None),
                       skip_past: Optional[int] = Query(default=None)):
     if week is None or year is None:
         iso = _date.today().isocalendar()
         week = iso.week if week is None else week
         year = iso.year if year is None else year
+    current_iso = _date.today().isocalendar()
+    apply_skip = (skip_past is not None and int(skip_past) == 1 and week == current_iso.week and year == current_iso.year)
+    # Skipping past days depends on today's date as well as the data
+    etag = make_etag("shopping", year, week, apply_skip and _date.today().isoformat(),
+                     plan_week_version(week, year), pantry_version(), catalog_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
     repo = PlanRepository()
     plan = repo.get_week_plan(week, year)
     recipes = load_recipes()
     pantry = load_ingredients()
-    current_iso = _date.today().isocalendar()
-    apply_skip = (skip_past is not None and int(skip_past) == 1 and week == current_iso.week and year == current_iso.year)
     items = build_shopping_list(plan, recipes, pantry, skip_past_days=True) if apply_skip else build_shopping_list(plan, recipes, pantry)
     return {"week": week, "year": year, "items": items, "count": len(items), "skipped_past_days": apply_skip}
 
@@ -666,26 +883,36 @@ def api_shopping_list_current(skip_past: Optional[int] = Query(default=None)):
     items = build_shopping_list(plan, recipes, pantry, skip_past_days=True) if apply_skip else build_shopping_list(plan, recipes, pantry)
     return {"week": week, "year": year, "items": items, "count": len(items), "skipped_past_days": apply_skip}
 
-TRANSACTIONS_FILE = (Path(__file__).parent.parent / 'data' / 'shopping_transactions.json').resolve()
+TRANSACTIONS_FILE = SHOPPING_TRANSACTIONS_FILE
 
+@traced()
 def _load_transactions():
     if TRANSACTIONS_FILE.exists():
         try:
             with open(TRANSACTIONS_FILE, encoding='utf-8') as f:
                 data = json.load(f)
+            record_read(TRANSACTIONS_FILE)
             if isinstance(data, list):
                 return data
         except Exception as e:
             logger.error("Failed to load transactions: %s", e)
     return []
 
+@traced()
 def _save_transactions(transactions):
     try:
-        with open(TRANSACTIONS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(transactions, f, ensure_ascii=False, indent=2)
+        write_json(TRANSACTIONS_FILE, transactions)  # temp file + os.replace: never half-written
     except Exception as e:
         logger.error("Failed to save transactions: %s", e)
 
+# Buy / undo are read-modify-write over pantry + transactions; they now run on worker
+# threads (storage_io), so serialize them explicitly instead of relying on the event loop.
+_shopping_tx_lock = Lock()
+
+def _with_shopping_tx_lock(fn, *args):
+    with _shopping_tx_lock:
+        return fn(*args)
+
 @app.post('/api/shopping-list/buy')
 @app.post('/api/shopping-list/buy/')
 async def api_shopping_list_buy(payload: dict):
@@ -694,7 +921,10 @@ async def api_shopping_list_buy(payload: dict):
     if not isinstance(items_to_buy, list):
         raise HTTPException(status_code=400, detail="'items' must be a list")
     logger.info("ShoppingList BUY request week=%s items=%s", week, items_to_buy)
+    # File I/O + shopping list rebuilds are blocking; keep them off the event loop
+    return await run_io(_with_shopping_tx_lock, _apply_shopping_buy, week, items_to_buy)
 
+def _apply_shopping_buy(week, items_to_buy):
     plan = PlanRepository().get_week_plan(week)
     recipes = load_recipes()
     pantry = load_ingredients()
@@ -702,14 +932,7 @@ async def api_shopping_list_buy(payload: dict):
     sl_index = {i['name'].lower(): i for i in shopping_list}
 
     def _norm(n: str): return (n or '').strip().lower().rstrip('.')
-    def _stem(word: str):
-        if word.endswith('ies') and len(word) > 3: return word[:-3] + 'y'
-        if word.endswith('oes') and len(word) > 3: return word[:-3] + 'o'
-        if word.endswith('ses') and len(word) > 3: return word[:-2]
-        if word.endswith('es') and len(word) > 2 and word[-3] not in 'aeiou': return word[:-2]
-        if word.endswith('s') and not word.endswith('ss') and len(word) > 1: return word[:-1]
-        return word
-    def _key(n: str): return _stem(_norm(n))
+    def _key(n: str): return stem(_norm(n))
 
     def categorize(name: str) -> str:
         n = _norm(name)
@@ -854,6 +1077,9 @@ def shopping_undo_status():
 @app.post('/api/shopping-list/undo')
 @app.post('/api/shopping-list/undo/')
 async def shopping_undo():
+    return await run_io(_with_shopping_tx_lock, _undo_last_shopping_transaction)
+
+def _undo_last_shopping_transaction():
     txs = _load_transactions()
     if not txs:
         raise HTTPException(status_code=400, detail='No transaction to undo')
@@ -881,21 +1107,141 @@ async def shopping_undo():
 
 # -------------------- API: Nutrition --------------------
 @app.get('/api/nutrition')
-def api_nutrition(week: Optional[int] = Query(default=None), year: Optional[int] = Query(default=None)):
+def api_nutrition(request: Request, response: Response,
+                  week: Optional[int] = Query(default=None), year: Optional[int] = Query(default=None)):
     """Return current nutrition aggregation for the given (week, year)."""
     if week is None or year is None:
         iso = _date.today().isocalendar()
         week = iso.week if week is None else week
         year = iso.year if year is None else year
+    etag = make_etag("nutrition", year, week, plan_week_version(week, year), catalog_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
     repo = PlanRepository()
     plan = repo.get_week_plan(week, year)
     recipes = load_recipes()
     nutrition = compute_week_nutrition(plan, recipes)
     return {"week": week, "year": year, **nutrition}
 
+# -------------------- API: Cooking statistics --------------------
+@app.get('/api/stats')
+def api_stats(top: int = Query(default=10, ge=1, le=100)):
+    """Return cooking statistics from the incrementally maintained snapshot.
+
+    Counters are updated on every cook (recipe.cooked event), so this never reads the cooked log.
+    Regenerate with: python -m meal.logic.reporting.cook_stats --rebuild
+    """
+    return get_cook_stats().summary(top=top)
+
+# -------------------- Debug: startup timings --------------------
+@app.get('/_debug/startup')
+def debug_startup():
+    """Template precompile/bytecode-cache timings, app ready time, first vs. steady request latency."""
+    return STARTUP_METRICS
+
+# -------------------- Debug: tracing spans --------------------
+def _require_profile_token(request: Request):
+    given = request.headers.get('x-profile') or request.query_params.get('_profile')
+    if not token_matches(given, PROFILE_TOKEN):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@app.get('/_debug/traces')
+def debug_traces(
+    request: Request,
+    limit: int = Query(default=20, ge=1, le=500),
+    trace_id: Optional[str] = Query(default=None),
+    min_ms: float = Query(default=0.0, ge=0),
+    format: str = Query(default="json", pattern="^(json|text)$"),
+):
+    """Recent request traces (newest first) with their repository / logic spans.
+
+    `format=text` renders each trace as an indented tree with start offsets and durations.
+    Needs the profile token, like /_debug/profiles.
+    """
+    _require_profile_token(request)
+    traces = recent_traces(limit=limit, trace_id=trace_id, min_ms=min_ms)
+    if format == "text":
+        return Response(content="\n\n".join(format_trace(t) for t in traces) + "\n", media_type="text/plain")
+    return {"traces": traces}
+
+# -------------------- Debug: request profiles --------------------
+@app.get('/_debug/profiles')
+def debug_profiles(request: Request):
+    """Stored request profiles (collapsed stacks), newest first. Needs the profile token."""
+    _require_profile_token(request)
+    return {"profiles": list_profiles()}
+
+
+@app.get('/_debug/profiles/{name}')
+def debug_profile(name: str, request: Request):
+    """One stored profile in collapsed-stack format (flamegraph.pl / speedscope input)."""
+    _require_profile_token(request)
+    path = profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return Response(content=path.read_text(encoding='utf-8'), media_type='text/plain')
+
+# -------------------- Metrics (Prometheus text format) --------------------
+_APP_READY = METRICS.gauge('meal_app_ready_seconds', 'Time from app import to end of startup',
+                           multiprocess_mode='all')
+_TEMPLATE_PRECOMPILE = METRICS.gauge('meal_template_precompile_seconds', 'Template precompilation time at startup',
+                                     multiprocess_mode='all')
+
+
+def _collect_startup_metrics():
+    if 'app_ready_ms' in STARTUP_METRICS:
+        _APP_READY.set(STARTUP_METRICS['app_ready_ms'] / 1000)
+    precompile = STARTUP_METRICS.get('template_precompile')
+    if precompile:
+        _TEMPLATE_PRECOMPILE.set(precompile['ms'] / 1000)
+
+
+METRICS.add_collector(_collect_startup_metrics)
+
+
+@app.get('/metrics', include_in_schema=False)
+async def metrics():
+    """Request latency/size/status, data file I/O and startup timings for Prometheus.
+
+    Per worker by default; all workers merged when METRICS_MULTIPROC_DIR is set.
+    """
+    body = await run_io(METRICS.render)
+    return Response(content=body, media_type=METRICS_CONTENT_TYPE)
+
+# -------------------- API: Cooked history --------------------
+@app.get('/api/cooked')
+def api_cooked(
+    date_from: Optional[str] = Query(default=None, alias="from", description=f"First day ({DATE_FORMAT} or YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(default=None, alias="to", description=f"Last day, inclusive ({DATE_FORMAT} or YYYY-MM-DD)"),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=COOKED_PAGE_SIZE, ge=1, le=500),
+    order: str = Query(default="desc", pattern="^(asc|desc)$"),
+):
+    """Paginated slice of the cooked log for a date range (bisect over the date index)."""
+    bounds = []
+    for raw in (date_from, date_to):
+        parsed = parse_cooked_date(raw) if raw else None
+        if raw and not parsed:
+            raise HTTPException(status_code=400, detail=f"Invalid date (expected {DATE_FORMAT} or YYYY-MM-DD)")
+        bounds.append(parsed)
+    start, end = bounds
+    items, total = get_cooked_history().page(start, end, offset=offset, limit=limit, newest_first=(order == "desc"))
+    next_offset = offset + len(items)
+    return {
+        "from": start.strftime(DATE_FORMAT) if start else None,
+        "to": end.strftime(DATE_FORMAT) if end else None,
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "next_offset": next_offset if next_offset < total else None,
+        "items": items,
+    }
+
 # -------------------- AJAX: get_week + partial --------------------
 @app.get("/get_week")
-def get_week(start: str = Query(..., description="Start date (Monday)")):
+def get_week(request: Request, response: Response, start: str = Query(..., description="Start date (Monday)")):
     # 1) parse
     start_date = None
     for fmt in (DATE_FORMAT, "%Y-%m-%d"):
@@ -916,15 +1262,39 @@ def get_week(start: str = Query(..., description="Start date (Monday)")):
     week = iso.week
     year = iso.year
 
-    # 4) data
+    # 4) conditional: the payload depends on the plan week and, for calories, the catalog
+    etag = _week_etag(start_date, plan_week_version(week, year))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
+
+    # 5) data
     repo = PlanRepository()
     plan = repo.get_week_plan(week, year)
 
-    # 5) payload
+    # 6) payload
+    return _week_payload(plan, start_date, week, year)
+
+def _week_etag(start_date: _date, week_version: str) -> str:
+    return make_etag("week", start_date.isoformat(), week_version, catalog_version())
+
+def _slot_recipe_name(value):
+    if isinstance(value, dict):
+        return value.get("name")
+    return value if isinstance(value, str) and value != "-" else None
+
+def _week_payload(plan, start_date: _date, week: int, year: int) -> dict:
+    """JSON shape shared by /get_week and /api/plan/slots.
+
+    Besides the slots, carries the calories per serving of the planned recipes (`calories`,
+    name -> kcal) and each day's total (`kcal`), so the grid does not need the catalog.
+    """
     day_names = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
     days = [start_date + timedelta(days=i) for i in range(7)]
+    cards = get_recipe_index()
 
     week_data = {}
+    calories = {}
     for i, day in enumerate(day_names):
         meals = plan.meals.get(day, {"breakfast": "-", "lunch": "-", "dinner": "-"})
         week_data[day] = {
@@ -933,8 +1303,79 @@ def get_week(start: str = Query(..., description="Start date (Monday)")):
             "lunch": meals.get("lunch", "-"),
             "dinner": meals.get("dinner", "-"),
         }
+        kcal = 0
+        for meal in ("breakfast", "lunch", "dinner"):
+            name = _slot_recipe_name(week_data[day][meal])
+            if not name:
+                continue
+            if name not in calories:
+                card = cards.get(name)
+                value = card.get("calories_per_serving") if card else None
+                calories[name] = value if isinstance(value, (int, float)) else 0
+            kcal += calories[name]
+        week_data[day]["kcal"] = kcal
+
+    return {"meta": {"week": week, "year": year}, "days": week_data, "calories": calories}
+
+# -------------------- API: batch slot edits --------------------
+MEAL_SLOTS = ("breakfast", "lunch", "dinner")
+MAX_SLOT_EDITS = 500
+
+class SlotEdit(BaseModel):
+    year: int
+    week: int
+    day: str
+    meal: str
+    recipe: str
 
-    return {"meta": {"week": week, "year": year}, "days": week_data}
+class SlotEditBatch(BaseModel):
+    edits: list[SlotEdit]
+
+@app.post('/api/plan/slots')
+def api_plan_slots(payload: SlotEditBatch):
+    """Apply many slot edits with a single plan.json load + write.
+
+    `recipe` is a recipe name from the catalog, or "-" to clear the slot. Either every edit is
+    valid and all are applied, or nothing is written (400 with per-edit errors). The response
+    carries each touched week in the /get_week shape plus its version and the ETag /get_week
+    would send, so the client can prime its conditional-request cache.
+    """
+    edits = payload.edits
+    if not edits:
+        raise HTTPException(status_code=400, detail="No edits")
+    if len(edits) > MAX_SLOT_EDITS:
+        raise HTTPException(status_code=400, detail=f"Too many edits (max {MAX_SLOT_EDITS})")
+    recipe_names = {r.get("name") for r in load_recipes()}
+    errors = []
+    for i, e in enumerate(edits):
+        if e.day not in DAY_TO_ISO:
+            errors.append({"index": i, "error": f"Invalid day '{e.day}'"})
+        elif e.meal not in MEAL_SLOTS:
+            errors.append({"index": i, "error": f"Invalid meal '{e.meal}'"})
+        elif e.recipe != "-" and e.recipe not in recipe_names:
+            errors.append({"index": i, "error": f"Unknown recipe '{e.recipe}'"})
+        else:
+            try:
+                monday = _date.fromisocalendar(e.year, e.week, 1)
+            except ValueError:
+                errors.append({"index": i, "error": f"Invalid week {e.year}-W{e.week}"})
+                continue
+            if not (ALLOWED_START <= monday <= ALLOWED_END):
+                errors.append({"index": i, "error": "Week out of allowed range (2025-09-01 .. 2026-12-31)"})
+    if errors:
+        return JSONResponse(status_code=400, content={"error": "Invalid edits", "errors": errors})
+
+    plans = PlanRepository().update_slots([e.model_dump() for e in edits])
+    weeks = []
+    for plan in plans:
+        monday = _date.fromisocalendar(plan.year, plan.week, 1)
+        version = plan_week_version(plan.week, plan.year)
+        weeks.append({
+            **_week_payload(plan, monday, plan.week, plan.year),
+            "version": version,
+            "etag": _week_etag(monday, version),
+        })
+    return {"applied": len(edits), "weeks": weeks}
 
 @app.get("/partial/meal-tbody", response_class=HTMLResponse)
 def partial_meal_tbody(request: Request, start: str = Query(...)):
@@ -956,16 +1397,15 @@ def partial_meal_tbody(request: Request, start: str = Query(...)):
     week = iso.week
     year = iso.year
 
+    fragment_key = _fragment_key(week, year)
     repo = PlanRepository()
     plan = repo.get_week_plan(week, year)
     plan.year = year
     plan.week = week
 
-    recipes = load_recipes()
-    resp = templates.TemplateResponse(
-        "partials/meal_tbody.html",
-        {"request": request, "plan": plan, "recipes": recipes, "time": _ts()}
-    )
+    html = fragment_cache.render(templates.env, "partials/meal_tbody.html", fragment_key,
+                                 lambda: {"plan": plan, "recipe_cards": get_recipe_index().by_name})
+    resp = HTMLResponse(html)
     resp.headers["Cache-Control"] = "no-store"
     return resp
 
@@ -991,16 +1431,25 @@ def randomize_week(week: int, year: int):
     return RedirectResponse(url=f"/?week={week}&year={year}&notice=random", status_code=302)
 
 @app.get("/export_pdf")
-def export_pdf(week: int, year: int):
-    repo = PlanRepository()
-    plan = repo.get_week_plan(week, year)
-    pdf_bytes = generate_pdf_for_week(plan)
+def export_pdf(request: Request, week: int, year: int):
+    # Content key of the week (computed before loading the plan, see meal.infra.pdf_cache)
+    key = PDF_CACHE.key(week, year)
+    etag = make_etag("pdf", key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    pdf_bytes = PDF_CACHE.get(week, year, key)
+    if pdf_bytes is None:
+        repo = PlanRepository()
+        plan = repo.get_week_plan(week, year)
+        pdf_bytes = generate_pdf_for_week(plan)
+        PDF_CACHE.put(week, year, key, pdf_bytes)
 
     return Response(
         content=pdf_bytes,
         media_type="application/pdf",
         headers={
-            "Content-Disposition": f"attachment; filename=meal_plan_{year}_W{week}.pdf"
+            "Content-Disposition": f"attachment; filename=meal_plan_{year}_W{week}.pdf",
+            **etag_headers(etag),
         },
     )
 
@@ -1033,7 +1482,8 @@ def cook_recipe(day: str, meal: str, week: Optional[int] = Query(None), year: Op
     available_ingredients = [Ingredient.from_dict(i) for i in load_ingredients()]
 
     # execute cook() method
-    cooked = recipe.cook(available_ingredients)
+    with span('Recipe.cook'):
+        cooked = recipe.cook(available_ingredients)
 
     if cooked:
         # mark cooked in plan
@@ -1044,8 +1494,7 @@ def cook_recipe(day: str, meal: str, week: Optional[int] = Query(None), year: Op
         save_ingredients([i.to_dict() for i in available_ingredients])
 
         # optional log
-        cooked_log = load_cooked_recipes()
-        cooked_log.append({
+        cooked_entry = {
             "name": recipe.name,
             "date_cooked": _date.today().strftime(DATE_FORMAT),
             "day": day,
@@ -1053,14 +1502,22 @@ def cook_recipe(day: str, meal: str, week: Optional[int] = Query(None), year: Op
             "servings": recipe.servings,
             "quantity": recipe.servings,
             "unit": "pcs"
-        })
+        }
+        cooked_log = load_cooked_recipes()
+        cooked_log.append(cooked_entry)
         save_cooked_recipes(cooked_log)
+        publish_recipe_cooked(cooked_entry, recipe_dict)
 
     return RedirectResponse("/", status_code=303)
 
 # -------------------- NEW: Helper for per-slot recipe fetch (for Cook panel) --------------------
 @app.get("/api/plan/slot-recipe")
-def api_get_slot_recipe(day: str, meal: str, week: int = Query(...), year: int = Query(...)):
+def api_get_slot_recipe(request: Request, response: Response, day: str, meal: str,
+                        week: int = Query(...), year: int = Query(...)):
+    etag = make_etag("slot", year, week, day, meal, plan_week_version(week, year), catalog_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
     repo = PlanRepository()
     plan = repo.get_week_plan(week, year)
     slot_val = plan.meals.get(day, {}).get(meal)
@@ -1137,7 +1594,8 @@ def api_cook_with_overrides(payload: CookRequest):
     if not base_recipe.check_ingredients(available_ingredients):
         raise HTTPException(status_code=400, detail="Insufficient ingredients in pantry for selected quantities")
 
-    cooked_obj = base_recipe.cook(available_ingredients)
+    with span('Recipe.cook'):
+        cooked_obj = base_recipe.cook(available_ingredients)
     if not cooked_obj:
         raise HTTPException(status_code=400, detail="Cook failed")
 
@@ -1149,8 +1607,7 @@ def api_cook_with_overrides(payload: CookRequest):
     save_ingredients([i.to_dict() for i in available_ingredients])
 
     # Log cooked
-    cooked_log = load_cooked_recipes()
-    cooked_log.append({
+    cooked_entry = {
         "name": recipe_name,
         "date_cooked": _date.today().strftime(DATE_FORMAT),
         "day": payload.day,
@@ -1159,8 +1616,11 @@ def api_cook_with_overrides(payload: CookRequest):
         "servings": base_recipe.servings,
         "quantity": base_recipe.servings,
         "unit": "pcs"
-    })
+    }
+    cooked_log = load_cooked_recipes()
+    cooked_log.append(cooked_entry)
     save_cooked_recipes(cooked_log)
+    publish_recipe_cooked(cooked_entry, recipe_dict)
 
     return {"success": True, "cooked": {"name": recipe_name, "overrides": overrides_map, "servings": base_recipe.servings}}
 
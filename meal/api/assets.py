@@ -0,0 +1,157 @@
+"""Content-hash fingerprinting for files under meal/static.
+
+At startup the manifest hashes every static file; templates call `static_url('script.js')`
+which renders `/static/script.js?v=<hash>`. The URL only changes when the file content
+changes, so AssetStaticFiles can serve those requests with a one-year immutable
+Cache-Control and browsers skip them entirely on repeat page loads. Hashes are cached by
+(mtime, size) and recomputed when those change, so a file rewritten in place (an upload
+replacing a picture) gets a new URL instead of new bytes under the old one.
+
+Requests without `v` (CSS url(...), JS fetches, old links) or with a stale `v` keep the
+default StaticFiles behaviour (ETag / Last-Modified revalidation).
+
+Text assets may have precompressed `.br` / `.gz` siblings (python -m meal.tools.compress_static);
+AssetStaticFiles serves the best one the client accepts, as long as it is not older than the source.
+"""
+from __future__ import annotations
+import hashlib
+import logging
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse
+from starlette.staticfiles import NotModifiedResponse
+
+from meal.api.compression import encoding_quality
+
+__all__ = ['AssetManifest', 'AssetStaticFiles', 'IMMUTABLE_CACHE_CONTROL']
+
+logger = logging.getLogger(__name__)
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+HASH_LENGTH = 12
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))  # preference order among equal q-values
+
+
+def _file_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()[:HASH_LENGTH]
+
+
+def _stat_token(path: Path) -> Tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+class AssetManifest:
+    """Maps static paths (relative, '/'-separated) to content hashes, cached by mtime/size."""
+
+    def __init__(self, static_dir: Path | str, url_prefix: str = "/static"):
+        self.static_dir = Path(static_dir)
+        self.url_prefix = url_prefix.rstrip('/')
+        self._hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}  # path -> ((mtime_ns, size), hash)
+        self._lock = Lock()
+
+    def build(self) -> "AssetManifest":
+        """Hash every file under static_dir (hidden files skipped)."""
+        hashes = {}
+        for root, dirs, files in os.walk(self.static_dir):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for name in files:
+                if name.startswith('.') or name.endswith(tuple(s for _, s in PRECOMPRESSED)):
+                    continue
+                full = Path(root) / name
+                rel = full.relative_to(self.static_dir).as_posix()
+                try:
+                    hashes[rel] = (_stat_token(full), _file_hash(full))
+                except OSError as e:
+                    logger.warning("Asset manifest: cannot hash %s: %s", rel, e)
+        with self._lock:
+            self._hashes = hashes
+        logger.info("Asset manifest built: %d files", len(hashes))
+        return self
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def hash_for(self, path: str) -> Optional[str]:
+        """Hash for a static path; new or rewritten files (e.g. uploads) are re-hashed on first use."""
+        rel = path.lstrip('/')
+        cached = self._hashes.get(rel)
+        full = self.static_dir / rel
+        if cached is None:
+            full = full.resolve()
+            if self.static_dir.resolve() not in full.parents:
+                return None
+        try:
+            token = _stat_token(full)
+            if cached and cached[0] == token:
+                return cached[1]
+            if not full.is_file():
+                return None
+            digest = _file_hash(full)
+        except OSError:
+            with self._lock:
+                self._hashes.pop(rel, None)
+            return None
+        with self._lock:
+            self._hashes[rel] = (token, digest)
+        return digest
+
+    def url(self, path: str) -> str:
+        """Fingerprinted URL for a static path (plain URL if the file is unknown)."""
+        rel = path.lstrip('/')
+        digest = self.hash_for(rel)
+        base = f"{self.url_prefix}/{rel}"
+        return f"{base}?v={digest}" if digest else base
+
+
+class AssetStaticFiles(StaticFiles):
+    """StaticFiles with precompressed variants and immutable caching for fingerprinted URLs."""
+
+    def __init__(self, *args, manifest: AssetManifest, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manifest = manifest
+
+    def _precompressed(self, response, scope):
+        """Swap a plain FileResponse for its .br/.gz sibling when accepted and fresh."""
+        if not isinstance(response, FileResponse) or response.status_code != 200:
+            return response
+        request_headers = Headers(scope=scope)
+        accepted = request_headers.get('accept-encoding', '')
+        source = Path(response.path)
+        quality = {encoding: encoding_quality(accepted, encoding) for encoding, _ in PRECOMPRESSED}
+        for encoding, suffix in sorted(PRECOMPRESSED, key=lambda e: -quality[e[0]]):
+            if quality[encoding] <= 0:
+                continue
+            sibling = source.with_name(source.name + suffix)
+            try:
+                st = sibling.stat()
+                if st.st_mtime_ns < source.stat().st_mtime_ns:
+                    continue  # stale: source changed after the build step
+            except OSError:
+                continue
+            compressed = FileResponse(sibling, stat_result=st, media_type=response.media_type,
+                                      headers={'Content-Encoding': encoding, 'Vary': 'Accept-Encoding'})
+            if self.is_not_modified(compressed.headers, request_headers):
+                return NotModifiedResponse(compressed.headers)
+            return compressed
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
+
+    async def get_response(self, path: str, scope):
+        response = self._precompressed(await super().get_response(path, scope), scope)
+        if response.status_code in (200, 304):
+            query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+            version = (query.get('v') or [None])[0]
+            if version and version == self.manifest.hash_for(path):
+                response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,98 @@
+"""Gzip for dynamic JSON/HTML responses.
+
+Unlike starlette's GZipMiddleware this only touches single-body responses whose
+Content-Type is in COMPRESSIBLE_TYPES and whose body is at least `minimum_size` bytes:
+  * static files are skipped (they carry precompressed siblings, see meal.api.assets,
+    or are already-compressed images);
+  * streaming responses (text/event-stream, PDFs, ...) pass through untouched, so SSE
+    frames are never held back in a compressor buffer;
+  * responses that already set Content-Encoding pass through.
+
+encoding_quality() reads the q-value a client gives an encoding in Accept-Encoding, so
+`gzip;q=0` (or `*;q=0`) is honoured as a refusal.
+"""
+from __future__ import annotations
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+__all__ = ['CompressionMiddleware', 'COMPRESSIBLE_TYPES', 'encoding_quality']
+
+COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/plain")
+
+
+def encoding_quality(accept_encoding: str, encoding: str) -> float:
+    """q-value of `encoding` in an Accept-Encoding header (0.0 = not acceptable).
+
+    An explicit entry wins over `*`; a malformed q-value counts as 0.
+    """
+    wildcard = 0.0
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    q = 0.0
+        if name == encoding:
+            return q
+        if name == "*":
+            wildcard = q
+    return wildcard
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, compresslevel: int = 6) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not encoding_quality(Headers(scope=scope).get("accept-encoding", ""), "gzip"):
+            await self.app(scope, receive, send)
+            return
+
+        start: Message = {}
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                media = headers.get("content-type", "").split(";")[0].strip()
+                passthrough = "content-encoding" in headers or media not in COMPRESSIBLE_TYPES
+                if passthrough:
+                    await send(message)
+                else:
+                    start = message  # hold until we see the body
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+            if start:
+                initial, start = start, {}
+                body = message.get("body", b"")
+                if message.get("more_body", False) or len(body) < self.minimum_size:
+                    passthrough = True  # streamed or too small: send as-is
+                    await send(initial)
+                    await send(message)
+                    return
+                compressed = gzip.compress(body, compresslevel=self.compresslevel, mtime=0)
+                headers = MutableHeaders(raw=initial["headers"])
+                headers["Content-Encoding"] = "gzip"
+                headers["Content-Length"] = str(len(compressed))
+                headers.add_vary_header("Accept-Encoding")
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f'W/{etag}'  # representation differs from the identity body
+                await send(initial)
+                await send({"type": "http.response.body", "body": compressed})
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,76 @@
+"""Bounded LRU cache for rendered template fragments.
+
+The week grid body and the nutrition panel are the expensive regions of index.html (21 slot
+cells with their recipe cards, and the per-day nutrition totals). Their output only depends on
+the plan week, the recipe catalog, the current date and the recipe images, so they are
+rendered once per combination of those versions and the page shell just splices the cached
+HTML in (see _fragment_key / _week_fragments in meal.api.api_run):
+
+    key = (week, year, plan_week_version(week, year), catalog_version(), today, image_service.generation)
+    html = fragment_cache.render(templates.env, "partials/meal_tbody.html", key,
+                                 lambda: {"plan": plan, "recipe_cards": get_recipe_index().by_name})
+
+Compute the version parts *before* loading the data the fragment is rendered from: if a
+write happens in between, the fragment is newer than its key and the next request (with the
+new versions) simply misses, instead of a stale fragment being cached under a fresh key.
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from jinja2 import Environment
+from markupsafe import Markup
+
+__all__ = ['FragmentCache', 'FRAGMENT_CACHE_SIZE']
+
+FRAGMENT_CACHE_SIZE = 128  # entries (~2 fragments per recently viewed week)
+
+
+class FragmentCache:
+    def __init__(self, maxsize: int = FRAGMENT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[Tuple[str, Hashable], str]" = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, template: str, key: Hashable) -> Optional[str]:
+        with self._lock:
+            html = self._entries.get((template, key))
+            if html is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((template, key))
+            self.hits += 1
+            return html
+
+    def put(self, template: str, key: Hashable, html: str) -> None:
+        with self._lock:
+            self._entries[(template, key)] = html
+            self._entries.move_to_end((template, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def render(self, env: Environment, template: str, key: Hashable,
+               context: Callable[[], Dict[str, Any]]) -> Markup:
+        """Cached HTML for (template, key); `context` is only called on a miss."""
+        html = self.get(template, key)
+        if html is None:
+            html = env.get_template(template).render(context())
+            self.put(template, key, html)
+        return Markup(html)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions}
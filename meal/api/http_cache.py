@@ -0,0 +1,52 @@
+"""ETag / If-None-Match helpers for conditional GET responses.
+
+Endpoints build the ETag from the data versions they depend on (see meal.infra.versions)
+*before* doing any work; when the client already holds that version a bare 304 is returned.
+
+    etag = make_etag("nutrition", plan_week_version(week, year), catalog_version())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    ...
+    response.headers.update(etag_headers(etag))
+"""
+from __future__ import annotations
+import hashlib
+from typing import Dict
+
+from fastapi import Request, Response
+
+__all__ = ['make_etag', 'etag_matches', 'not_modified', 'etag_headers']
+
+# Clients must revalidate every time, but may reuse their copy on 304
+CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag over the given version parts."""
+    raw = "|".join(str(p) for p in parts)
+    return 'W/"' + hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match contains etag (weak comparison, '*' matches)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    wanted = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == wanted:
+            return True
+    return False
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -0,0 +1,247 @@
+"""Opt-in per-request profiling with a stack sampler.
+
+A request is profiled when it carries the debug token (PROFILE_TOKEN) in an `X-Profile`
+header or a `_profile` query parameter, and automatically for 1 in PROFILE_SAMPLE_RATE
+requests per route. While it runs, a background thread snapshots the Python stack of every
+other thread (sys._current_frames) each PROFILE_INTERVAL_MS and counts identical stacks.
+The result is stored in collapsed-stack format ("thread;outer;...;inner count" per line,
+the input of flamegraph.pl / speedscope) under data/profiles, the newest PROFILE_KEEP files
+are kept, and the response names the file in an `X-Profile-File` header.
+
+A sampler rather than cProfile: cProfile only sees the thread that enabled it, while sync
+endpoints and run_io() work (shopping list, buy) execute in worker threads. The sampler sees
+those too, at the cost of also recording whatever concurrent requests are doing; threads
+idling in a selector or queue are skipped. For CPU-bound code the effective resolution is
+the interpreter's GIL switch interval (5 ms by default), not PROFILE_INTERVAL_MS.
+
+Streaming responses (the pantry alert SSE stream stays open for as long as the page does)
+are never auto-sampled: the routes passed as `exclude_routes` are skipped and a sampled
+request whose response turns out to be text/event-stream is dropped at its first byte. A
+capture also stops after PROFILE_MAX_SECONDS, which frees the sampling slot even when the
+request itself goes on (the profile is stored, truncated, when the request ends).
+"""
+from __future__ import annotations
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from meal.api.request_metrics import match_route
+from meal.infra.paths import PROFILES_DIR
+from meal.infra.storage_io import run_io
+
+__all__ = ['StackSampler', 'ProfilerMiddleware', 'list_profiles', 'profile_path', 'token_matches']
+
+logger = logging.getLogger(__name__)
+
+# (file name suffix, function) of frames that mean "this thread is waiting for work"
+_IDLE_LEAVES = {('selectors.py', 'select'), ('threading.py', 'wait'), ('queue.py', 'get'),
+                ('threading.py', '_wait_for_tstate_lock')}
+_SAFE_NAME = re.compile(r'[^A-Za-z0-9]+')
+_PROFILE_NAME = re.compile(r'^[\w.-]+\.folded$')
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Background thread counting the stacks of all other threads at a fixed interval.
+
+    Sampling ends at stop() or after `max_seconds` (then `truncated` is set).
+    """
+
+    def __init__(self, interval: float = 0.001, max_seconds: Optional[float] = None):
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.truncated = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+
+    def start(self) -> 'StackSampler':
+        self._thread.start()
+        return self
+
+    def stop(self, wait: bool = True) -> Counter:
+        self._stop.set()
+        if wait:
+            self._thread.join()
+        return self.stacks
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        deadline = None if self.max_seconds is None else time.monotonic() + self.max_seconds
+        while not self._stop.wait(self.interval):
+            if deadline is not None and time.monotonic() >= deadline:
+                self.truncated = True
+                break
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_LEAVES:
+                    continue
+                stack: List[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, most frequent stacks first."""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def token_matches(given: Optional[str], token: str) -> bool:
+    return bool(token) and given is not None and hmac.compare_digest(given.encode(), token.encode())
+
+
+def profile_path(name: str, directory: Path | str = PROFILES_DIR) -> Optional[Path]:
+    """Path of a stored profile (None for names that are not plain profile file names)."""
+    if not _PROFILE_NAME.match(name):
+        return None
+    path = Path(directory) / name
+    return path if path.is_file() else None
+
+
+def list_profiles(directory: Path | str = PROFILES_DIR) -> List[Dict[str, object]]:
+    """Stored profiles, newest first."""
+    try:
+        files = [p for p in Path(directory).iterdir() if _PROFILE_NAME.match(p.name)]
+    except OSError:
+        return []
+    entries = []
+    for p in files:
+        try:
+            st = p.stat()
+        except OSError:
+            continue
+        entries.append({'name': p.name, 'bytes': st.st_size, 'mtime': st.st_mtime})
+    entries.sort(key=lambda e: e['mtime'], reverse=True)
+    return entries
+
+
+def _store(directory: Path, name: str, text: str, keep: int) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / name).write_text(text, encoding='utf-8')
+    for old in list_profiles(directory)[max(keep, 1):]:
+        try:
+            (directory / str(old['name'])).unlink()
+        except OSError:
+            pass
+
+
+class ProfilerMiddleware:
+    """ASGI middleware profiling requests on demand (token) or 1 in `sample_rate` per route.
+
+    `exclude_routes` (route paths) and text/event-stream responses are never auto-sampled.
+    """
+
+    MAX_ROUTES = 256
+    STREAM_TYPE = b'text/event-stream'
+
+    def __init__(self, app: ASGIApp, router=None, token: str = '', sample_rate: int = 0,
+                 interval_ms: float = 1.0, keep: int = 50, directory: Path | str = PROFILES_DIR,
+                 max_seconds: float = 30.0, exclude_routes: Iterable[str] = ()):
+        self.app = app
+        self.router = router
+        self.token = token
+        self.sample_rate = max(int(sample_rate), 0)
+        self.interval = max(interval_ms, 0.1) / 1000
+        self.keep = keep
+        self.directory = Path(directory)
+        self.max_seconds = max_seconds if max_seconds > 0 else None
+        self.exclude_routes = frozenset(exclude_routes)
+        self._seen: Dict[str, int] = {}
+        self._active: List[StackSampler] = []
+
+    def _route(self, scope: Scope) -> str:
+        route = match_route(self.router, scope)
+        return 'unmatched' if route is None else getattr(route, 'path', '') or '/'
+
+    def _requested(self, scope: Scope) -> bool:
+        if not self.token:
+            return False
+        for key, value in scope.get('headers') or ():
+            if key == b'x-profile':
+                return token_matches(value.decode('latin-1'), self.token)
+        query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+        return token_matches((query.get('_profile') or [None])[0], self.token)
+
+    def _sampled(self, route: str) -> bool:
+        if self.sample_rate <= 0 or route in self.exclude_routes:
+            return False
+        if any(sampler.running for sampler in self._active):
+            return False
+        if route not in self._seen and len(self._seen) >= self.MAX_ROUTES:
+            return False
+        n = self._seen.get(route, 0) + 1
+        self._seen[route] = n
+        return n % self.sample_rate == 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not (self.token or self.sample_rate):
+            await self.app(scope, receive, send)
+            return
+        requested = self._requested(scope)
+        route = self._route(scope) if (requested or self.sample_rate) else ''
+        if not requested and not self._sampled(route):
+            await self.app(scope, receive, send)
+            return
+        now = time.time()
+        stamp = time.strftime('%Y%m%dT%H%M%S', time.localtime(now)) + f"{int(now * 1000) % 1000:03d}"
+        slug = _SAFE_NAME.sub('_', route).strip('_') or 'root'
+        name = f"{stamp}_{scope.get('method', 'GET')}_{slug}_{os.getpid()}.folded"
+
+        sampler = StackSampler(self.interval, self.max_seconds)
+        dropped = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal dropped
+            if message['type'] == 'http.response.start':
+                headers = list(message.get('headers') or [])
+                streaming = any(key == b'content-type' and value.startswith(self.STREAM_TYPE)
+                                for key, value in headers)
+                if streaming and not requested:
+                    dropped = True
+                    sampler.stop(wait=False)
+                else:
+                    message['headers'] = headers + [(b'x-profile-file', name.encode())]
+            await send(message)
+
+        self._active.append(sampler.start())
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+            self._active.remove(sampler)
+            if not dropped:
+                await self._save(scope, route, name, sampler, (time.perf_counter() - started) * 1000)
+
+    async def _save(self, scope: Scope, route: str, name: str, sampler: StackSampler, ms: float) -> None:
+        try:
+            await run_io(_store, self.directory, name, sampler.collapsed(), self.keep)
+            logger.info("Profiled %s %s (%.1f ms, %d samples%s) -> %s", scope.get('method'), route, ms,
+                        sampler.samples, ', truncated' if sampler.truncated else '', name)
+        except OSError as e:
+            logger.warning("Could not store profile %s: %s", name, e)
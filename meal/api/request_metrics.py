@@ -0,0 +1,97 @@
+"""Request metrics middleware: latency, in-flight requests, response sizes and status codes.
+
+Requests are labelled with the route template FastAPI matched ("/api/recipes/{name}"), not
+the raw path, so the number of series stays bounded; mounted apps use their mount path
+("/static") and anything unmatched is "unmatched". Mounts do not set scope['route'], so with
+a router the middleware matches the request against its routes (as it was before routing). The metrics live in the process-wide
+registry (meal.infra.metrics) and are exposed at /metrics. With a multiprocess directory the
+worker's snapshot file is rewritten at most once per FLUSH_INTERVAL, in a storage thread
+(run_io) after the response has gone out, never on the event loop.
+"""
+from __future__ import annotations
+import time
+from typing import Any, Optional
+
+from starlette.routing import Match, Mount
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from meal.infra.metrics import REGISTRY
+from meal.infra.storage_io import run_io
+
+__all__ = ['RequestMetricsMiddleware', 'route_label', 'match_route', 'REQUEST_LATENCY', 'REQUESTS_IN_FLIGHT',
+           'RESPONSE_SIZE', 'RESPONSES']
+
+REQUEST_LATENCY = REGISTRY.histogram(
+    'meal_http_request_duration_seconds', 'Request latency until the response body was sent',
+    ('method', 'route'))
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    'meal_http_requests_in_flight', 'Requests currently being handled', ('method',))
+RESPONSE_SIZE = REGISTRY.histogram(
+    'meal_http_response_size_bytes', 'Response body size as sent (after compression)',
+    ('method', 'route'), buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304))
+RESPONSES = REGISTRY.counter(
+    'meal_http_responses_total', 'Responses by status code', ('method', 'route', 'status'))
+
+
+def match_route(router: Any, scope: Scope) -> Any:
+    """The route of `router` fully matching a request scope (taken before routing), or None."""
+    for route in getattr(router, 'routes', ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
+
+
+def route_label(scope: Scope, router: Any = None, unrouted: Optional[Scope] = None) -> str:
+    """Low-cardinality route name; valid once routing has run (the router fills scope['route']).
+
+    Mounted apps leave scope['route'] unset; given the router, the route is looked up against
+    `unrouted`, a copy of the scope made before routing (the router rewrites root_path).
+    """
+    route = scope.get('route')
+    if route is None and router is not None:
+        route = match_route(router, unrouted if unrouted is not None else scope)
+    if isinstance(route, Mount):
+        return route.path or '/'
+    path = getattr(route, 'path', None)
+    return path if isinstance(path, str) else 'unmatched'
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording per-route request metrics; add it last so it wraps everything."""
+
+    def __init__(self, app: ASGIApp, router: Any = None):
+        self.app = app
+        self.router = router  # to label mounted apps
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        method = scope.get('method', 'GET')
+        # the route is only known after routing, so in-flight requests are counted per method
+        REQUESTS_IN_FLIGHT.inc(method=method)
+        status = 500
+        size = 0
+        unrouted = dict(scope) if self.router is not None else None
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            REQUESTS_IN_FLIGHT.dec(method=method)
+            route = route_label(scope, self.router, unrouted)
+            REQUEST_LATENCY.observe(elapsed, method=method, route=route)
+            RESPONSE_SIZE.observe(size, method=method, route=route)
+            RESPONSES.inc(method=method, route=route, status=str(status))
+            if REGISTRY.flush_due():
+                await run_io(REGISTRY.flush, True)
@@ -0,0 +1,46 @@
+"""Root tracing span per HTTP request.
+
+Every request runs inside span("<METHOD> <route template>"), so the repository / logic spans
+it triggers share one trace id; the id is returned in an `X-Trace-Id` header and the whole
+breakdown is visible at /_debug/traces?trace_id=<id>.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from meal.api.request_metrics import route_label
+from meal.infra.tracing import span
+
+__all__ = ['TraceMiddleware']
+
+
+class TraceMiddleware:
+    """ASGI middleware opening the root span of each HTTP request."""
+
+    def __init__(self, app: ASGIApp, router: Any = None):
+        self.app = app
+        self.router = router  # to name spans of mounted apps
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        method = scope.get('method', 'GET')
+        unrouted = dict(scope) if self.router is not None else None
+        with span(f"{method} {scope.get('path', '')}", path=scope.get('path', '')) as root:
+            if root is None:  # tracing disabled
+                await self.app(scope, receive, send)
+                return
+
+            async def send_wrapper(message: Message) -> None:
+                if message['type'] == 'http.response.start':
+                    root.set(status=message['status'])
+                    message['headers'] = list(message.get('headers', [])) + [(b'x-trace-id', root.trace_id.encode())]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                root.name = f"{method} {route_label(scope, self.router, unrouted)}"
@@ -2,10 +2,16 @@ import json, os, tempfile, shutil
 from fastapi import Form, UploadFile, File, APIRouter
 from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
-import httpx
 from fastapi import FastAPI
 import logging
 
+from meal.infra import paths
+from meal.infra.metrics import record_read, record_write
+from meal.infra.tracing import span, traced
+from meal.infra.storage_io import run_io, awrite_bytes
+from meal.infra.images import get_image_service
+from meal.infra.recipe_search import recipes_appended
+
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
@@ -24,23 +30,27 @@ MEAL_DIR = os.path.abspath(os.path.join(HERE, "..", ".."))
 STATIC_DIR = os.path.join(MEAL_DIR, "static")
 PICTURES_DIR = os.path.join(STATIC_DIR, "pictures")
 TEMPLATES_DIR = os.path.join(MEAL_DIR, "templates")
-RECIPES_FILE = os.path.join(MEAL_DIR, "data", "recipes.json")
+RECIPES_FILE = str(paths.RECIPES_FILE)
 
 # Ensure pictures directory exists
 os.makedirs(PICTURES_DIR, exist_ok=True)
 
 
 # === Helperi pentru recipes.json ===
+@traced()
 def _safe_load_recipes():
     if not os.path.exists(RECIPES_FILE):
         return []
     try:
         with open(RECIPES_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+            recipes = json.load(f)
+        record_read(RECIPES_FILE)
+        return recipes
     except json.JSONDecodeError:
         return []
 
 
+@traced()
 def _atomic_write(recipes: list):
     os.makedirs(os.path.dirname(RECIPES_FILE), exist_ok=True)
     fd, tmp_path = tempfile.mkstemp(
@@ -50,6 +60,7 @@ def _atomic_write(recipes: list):
         with os.fdopen(fd, "w", encoding="utf-8") as tmp:
             json.dump(recipes, tmp, indent=2, ensure_ascii=False)
         shutil.move(tmp_path, RECIPES_FILE)
+        record_write(RECIPES_FILE)
     finally:
         if os.path.exists(tmp_path):
             try:
@@ -74,7 +85,7 @@ async def add_recipe(
     tags: str = Form(""),
     image: UploadFile = File(None)
 ):
-    recipes = _safe_load_recipes()
+    recipes = await run_io(_safe_load_recipes)
     if any(r["name"].lower() == name.strip().lower() for r in recipes):
         return JSONResponse(status_code=400, content={"error": "Recipe with this name already exists"})
 
@@ -85,8 +96,9 @@ async def add_recipe(
             return JSONResponse(status_code=400, content={"error": "Invalid image type"})
         image_filename = image.filename
         file_path = os.path.join(PICTURES_DIR, image_filename)
-        with open(file_path, "wb") as f:
-            f.write(await image.read())
+        await awrite_bytes(file_path, await image.read())
+        # thumbnails/WebP are built in the image service's process pool, not in this request
+        await run_io(get_image_service().schedule, image_filename)
 
     # --- convert ingredients JSON string into list ---
     try:
@@ -114,8 +126,12 @@ async def add_recipe(
         "ingredients": spoonacular_ingredients
     }
 
+    import httpx  # imported on first use: keeps ~140 ms off every worker's startup
     async with httpx.AsyncClient() as client:
-        response = await client.post(url, json=payload)
+        with span('spoonacular.analyze', ingredients=len(spoonacular_ingredients)) as s:
+            response = await client.post(url, json=payload)
+            if s is not None:
+                s.set(status=response.status_code)
         if response.status_code != 200:
             return JSONResponse(
                 status_code=response.status_code,
@@ -147,7 +163,9 @@ async def add_recipe(
 
     # --- save to JSON ---
     recipes.append(recipe)
-    _atomic_write(recipes)
+    await run_io(_atomic_write, recipes)
+    # keep the search index warm: index just the new recipe instead of rebuilding
+    await run_io(recipes_appended, [recipe], len(recipes) - 1, RECIPES_FILE)
 
     return {"status": "success", "saved_to": RECIPES_FILE, "recipe": recipe}
 
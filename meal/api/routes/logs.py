@@ -1,6 +1,10 @@
-from pathlib import Path
 import json
 import re
+from meal.infra.Cooked_Repository import invalidate_cooked_history
+from meal.infra.metrics import record_read
+from meal.infra.storage_io import write_json
+from meal.infra.paths import COOKED_FILE
+from meal.infra.tracing import traced
 
 DATE_OLD_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
 
@@ -10,10 +14,12 @@ def _convert_to_new_format(date_str: str) -> str:
         return f"{d}-{m}-{y}"  # DD-MM-YYYY
     return date_str
 
+@traced()
 def load_cooked_recipes():
-    json_path = (Path(__file__).parent.parent.parent / 'data' / 'Pantry_recipe_cooked.json').resolve()
+    json_path = COOKED_FILE
     with open(json_path, encoding='utf-8') as f:
         cooked = json.load(f)
+    record_read(json_path)
     changed = False
     for rec in cooked:
         dc = rec.get('date_cooked')
@@ -27,7 +33,8 @@ def load_cooked_recipes():
         save_cooked_recipes(cooked)
     return cooked
 
+@traced()
 def save_cooked_recipes(cooked):
-    json_path = (Path(__file__).parent.parent.parent / 'data' / 'Pantry_recipe_cooked.json').resolve()
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(cooked, f, ensure_ascii=False, indent=2)
+    json_path = COOKED_FILE
+    write_json(json_path, cooked)
+    invalidate_cooked_history(json_path)
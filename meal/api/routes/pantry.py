@@ -1,6 +1,9 @@
 from pathlib import Path
 import json
 from meal.infra.paths import PANTRY_FILE
+from meal.infra.metrics import record_read
+from meal.infra.storage_io import write_json
+from meal.infra.tracing import traced
 
 ALLOWED_TAGS = [
     'fruits','vegetables','meat-chicken','meat-beef','meat-pork','pasta','frozen','fish'
@@ -29,9 +32,11 @@ def _sanitize_ingredient(ing: dict):
             ing[k] = ''
     return ing
 
+@traced()
 def load_ingredients():
     with open(PANTRY_FILE, encoding='utf-8') as f:
         ingredients = json.load(f)
+    record_read(PANTRY_FILE)
     changed = False
     for ing in ingredients:
         before = json.dumps(ing, sort_keys=True)
@@ -43,10 +48,10 @@ def load_ingredients():
         save_ingredients(ingredients)
     return ingredients
 
+@traced()
 def save_ingredients(ingredients):
     sanitized = []
     for ing in ingredients:
         if isinstance(ing, dict):
             sanitized.append(_sanitize_ingredient(ing))
-    with open(PANTRY_FILE, 'w', encoding='utf-8') as f:
-        json.dump(sanitized, f, ensure_ascii=False, indent=2)
+    write_json(PANTRY_FILE, sanitized)
@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Response
 from meal.infra.Recipe_Repository import reading_from_recipes
+from meal.infra.metrics import record_read
 from meal.infra.paths import RECIPES_FILE
+from meal.infra.tracing import traced
 import json
 
 router = APIRouter()
 
+@traced()
 def load_recipes():
     with open(RECIPES_FILE, encoding='utf-8') as f:
-        return json.load(f)
+        recipes = json.load(f)
+    record_read(RECIPES_FILE)
+    return recipes
 
 @router.get("/", response_class=Response)
 def list_recipes():
@@ -0,0 +1,140 @@
+"""Cold-start work: shared Jinja bytecode cache, template precompilation, startup timings.
+
+Jinja compiles a template to Python source and then to a code object the first time it is
+used, separately in every worker process. With a FileSystemBytecodeCache the compiled code
+is written once to a directory all workers share and later workers only unmarshal it.
+Entries are keyed by template name + source checksum, so an edited template is recompiled
+automatically. Without JINJA_BYTECODE_CACHE_DIR Jinja picks its own per-user directory under
+<tmp> (and checks who owns it); a configured directory is created with mode 0700 and used
+only if it is a real directory owned by this user and closed to everyone else, since
+whoever can write it can put code into every worker.
+
+precompile_templates() loads every template during startup (PRECOMPILE_TEMPLATES) so the
+first request after a deploy does not pay for compilation. Timings are kept in
+STARTUP_METRICS and exposed at /_debug/startup, together with the latency of the first
+request to each path and the mean of the requests after it (FirstRequestTimer), which
+should be close once warm-up works.
+"""
+from __future__ import annotations
+import logging
+import os
+import stat
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+
+__all__ = ['CountingBytecodeCache', 'create_templates', 'precompile_templates', 'STARTUP_METRICS',
+           'FirstRequestTimer']
+
+logger = logging.getLogger(__name__)
+
+# Filled in during import/startup; read by /_debug/startup
+STARTUP_METRICS: Dict[str, Any] = {}
+
+
+class CountingBytecodeCache(FileSystemBytecodeCache):
+    """FileSystemBytecodeCache that counts hits (loaded from disk) and misses (compiled here)."""
+
+    def __init__(self, directory: Optional[str] = None):
+        super().__init__(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def load_bytecode(self, bucket) -> None:
+        super().load_bytecode(bucket)
+        if bucket.code is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+
+def _private_dir_problem(path: Path) -> Optional[str]:
+    """Why `path` (created 0700 if missing) must not hold bytecode, or None if it is safe."""
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    st = path.lstat()
+    if not stat.S_ISDIR(st.st_mode):
+        return "not a directory (symlink?)"
+    if hasattr(os, 'getuid') and st.st_uid != os.getuid():
+        return f"owned by uid {st.st_uid}"
+    if stat.S_IMODE(st.st_mode) != 0o700:
+        return f"mode {stat.S_IMODE(st.st_mode):o}, expected 700"
+    return None
+
+
+def create_templates(directory: Path | str, cache_dir: Optional[str] = None) -> Jinja2Templates:
+    """Jinja2Templates with a filesystem bytecode cache (`cache_dir` "off" disables it)."""
+    options: Dict[str, Any] = {}
+    if cache_dir != 'off':
+        try:
+            problem = _private_dir_problem(Path(cache_dir)) if cache_dir else None
+            if problem:
+                logger.warning("Jinja bytecode cache disabled (%s): %s", cache_dir, problem)
+            else:
+                options['bytecode_cache'] = CountingBytecodeCache(cache_dir or None)
+        except (OSError, RuntimeError) as e:  # Jinja raises RuntimeError for an unsafe default dir
+            logger.warning("Jinja bytecode cache disabled (%s): %s", cache_dir or 'default', e)
+    return Jinja2Templates(directory=str(directory), **options)
+
+
+def precompile_templates(templates: Jinja2Templates) -> Dict[str, Any]:
+    """Load (compile or fetch from the bytecode cache) every template; returns timings."""
+    env = templates.env
+    cache = env.bytecode_cache
+    hits0, misses0 = (cache.hits, cache.misses) if isinstance(cache, CountingBytecodeCache) else (0, 0)
+    started = time.perf_counter()
+    count, failed = 0, []
+    for name in env.list_templates(extensions=('html', 'htm', 'xml', 'txt')):
+        try:
+            env.get_template(name)
+            count += 1
+        except Exception as e:  # a broken template should not block startup
+            failed.append(name)
+            logger.error("Template precompile failed for %s: %s", name, e)
+    result = {
+        'templates': count,
+        'failed': failed,
+        'ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+    if isinstance(cache, CountingBytecodeCache):
+        result['bytecode_hits'] = cache.hits - hits0
+        result['bytecode_misses'] = cache.misses - misses0
+    STARTUP_METRICS['template_precompile'] = result
+    logger.info("Precompiled %d templates in %.1f ms (bytecode cache hits=%s misses=%s)",
+                count, result['ms'], result.get('bytecode_hits', '-'), result.get('bytecode_misses', '-'))
+    return result
+
+
+class FirstRequestTimer:
+    """ASGI middleware: first vs. steady-state latency per path (bounded number of paths)."""
+
+    MAX_PATHS = 64
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.paths: Dict[str, Dict[str, float]] = {}
+        STARTUP_METRICS['requests'] = self.paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._record(scope.get('path', ''), (time.perf_counter() - started) * 1000)
+
+    def _record(self, path: str, ms: float) -> None:
+        entry = self.paths.get(path)
+        if entry is None:
+            if len(self.paths) < self.MAX_PATHS:
+                self.paths[path] = {'first_ms': round(ms, 2), 'count': 1, 'steady_mean_ms': 0.0}
+            return
+        entry['count'] += 1
+        n = entry['count'] - 1  # requests after the first
+        entry['steady_mean_ms'] = round(entry['steady_mean_ms'] + (ms - entry['steady_mean_ms']) / n, 2)
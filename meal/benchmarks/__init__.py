@@ -0,0 +1 @@
+"""Micro-benchmarks for the logic and domain hot paths (see conftest.py for how to run them)."""
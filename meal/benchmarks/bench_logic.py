@@ -0,0 +1,50 @@
+"""Pure logic / domain benchmarks: shopping list, nutrition, pantry snapshots, Recipe checks."""
+import copy
+import random
+
+from meal.domain.Ingredient import Ingredient
+from meal.domain.Plan import Plan
+from meal.domain.Recipe import Recipe
+from meal.logic.pantry.analysis import compute_pantry_snapshots
+from meal.logic.reporting.nutrition import compute_week_nutrition
+from meal.logic.shopping.list_builder import build_shopping_list
+
+
+def _current_plan(dataset):
+    meals = copy.deepcopy(dataset.plan[f"{dataset.year}-W{dataset.week:02d}"])
+    return Plan(dataset.week, meals, year=dataset.year)
+
+
+def test_build_shopping_list(bench, dataset):
+    items = bench(build_shopping_list, _current_plan(dataset), dataset.recipes, dataset.pantry)
+    assert isinstance(items, list)
+
+
+def test_compute_week_nutrition(bench, dataset):
+    result = bench(compute_week_nutrition, _current_plan(dataset), dataset.recipes)
+    assert result
+
+
+def test_compute_pantry_snapshots(bench, dataset):
+    expiring, low = bench(compute_pantry_snapshots, dataset.pantry)
+    assert isinstance(expiring, list) and isinstance(low, list)
+
+
+def _recipes_and_stock(dataset):
+    rng = random.Random(7)
+    recipes = [Recipe.from_dict(r) for r in rng.sample(dataset.recipes, min(20, len(dataset.recipes)))]
+    stock = [Ingredient.from_dict(i) for i in dataset.pantry]
+    return recipes, stock
+
+
+def test_recipe_check_ingredients(bench, dataset):
+    recipes, stock = _recipes_and_stock(dataset)
+    bench(lambda: [r.check_ingredients(stock) for r in recipes])
+
+
+def test_recipe_cook(bench, dataset):
+    recipes, stock = _recipes_and_stock(dataset)
+    # ample stock so cook() really consumes; a fresh copy per round (untimed)
+    for ing in stock:
+        ing.default_quantity += 10_000
+    bench(lambda pantry: [r.cook(pantry) for r in recipes], setup=lambda: (copy.deepcopy(stock),))
@@ -0,0 +1,22 @@
+"""File-backed repository benchmarks (JSON read/parse/write in a temp data dir)."""
+from meal.api.routes.pantry import load_ingredients
+from meal.infra.Plan_Repository import PlanRepository
+
+
+def test_get_week_plan(bench, dataset, data_dir):
+    plan = bench(PlanRepository().get_week_plan, dataset.week, dataset.year)
+    assert plan.meals
+
+
+def test_load_ingredients(bench, dataset, data_dir):
+    items = bench(load_ingredients)
+    assert len(items) == dataset.scale.pantry_lots
+
+
+def test_randomize_week(bench, dataset, data_dir):
+    bench(PlanRepository().randomize_week, dataset.week, dataset.year)
+
+
+def test_randomize_custom(bench, dataset, data_dir):
+    bench(PlanRepository().randomize_custom, dataset.week, dataset.year,
+          replace_existing=True, only_available=True)
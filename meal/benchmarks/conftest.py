@@ -0,0 +1,204 @@
+"""Benchmark harness (no pytest-benchmark dependency).
+
+Benchmarks live in bench_*.py files and are collected only when this directory is named
+on the command line, so the normal test run never picks them up:
+
+    python -m pytest meal/benchmarks                          # all scales (S, M, L)
+    python -m pytest meal/benchmarks --bench-scales S,M -k shopping
+    python -m pytest meal/benchmarks --bench-json out.json    # default: results/latest.json
+
+Each benchmark gets the `bench` fixture: bench(fn, *args, setup=None) calls fn repeatedly
+(after one warm-up call) until BENCH_MIN_TIME seconds or BENCH_MAX_ROUNDS rounds have
+passed; `setup`, when given, builds fresh arguments for every round outside the timed
+region. The `data_dir` fixture writes the scale's dataset to a temp directory and points
+every meal module's data-file constants at it, so nothing touches meal/data or the network.
+
+The JSON report holds per-benchmark summary statistics plus the raw per-call samples
+(seconds), which the comparison tool resamples for confidence intervals.
+"""
+from __future__ import annotations
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import pytest
+
+from meal.benchmarks.datasets import SCALES, Dataset, make_dataset
+
+BENCH_DIR = Path(__file__).parent
+DEFAULT_JSON = BENCH_DIR / "results" / "latest.json"
+BENCH_MIN_TIME = 0.25
+BENCH_MIN_ROUNDS = 5
+BENCH_MAX_ROUNDS = 2_000
+
+# meal module attributes holding data-file paths, and the file each one points to
+DATA_FILE_ATTRS = {
+    "DATA_DIR": "",
+    "RECIPES_FILE": "recipes.json",
+    "PANTRY_FILE": "Pantry_ingredients.json",
+    "PLAN_FILE": "plan.json",
+    "COOKED_FILE": "Pantry_recipe_cooked.json",
+    "SHOPPING_TRANSACTIONS_FILE": "shopping_transactions.json",
+    "TRANSACTIONS_FILE": "shopping_transactions.json",
+    "STATS_SNAPSHOT_FILE": "stats_snapshot.json",
+}
+
+
+def _requested(config) -> bool:
+    for arg in config.args:
+        path = Path(arg.split("::", 1)[0]).resolve()
+        if path == BENCH_DIR or BENCH_DIR in path.parents:
+            return True
+    return False
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("meal benchmarks")
+    group.addoption("--bench-scales", default="S,M,L", help="comma-separated dataset scales (S, M, L)")
+    group.addoption("--bench-json", default=str(DEFAULT_JSON), help="where to write the JSON report")
+
+
+def pytest_collect_file(file_path, parent):
+    if file_path.name.startswith("bench_") and file_path.suffix == ".py" and _requested(parent.config):
+        return pytest.Module.from_parent(parent, path=file_path)
+    return None
+
+
+def _scales(config) -> List[str]:
+    value = config.getoption("--bench-scales", default="S,M,L")
+    names = [s.strip().upper() for s in value.split(",") if s.strip()]
+    unknown = [s for s in names if s not in SCALES]
+    if unknown:
+        raise pytest.UsageError(f"unknown benchmark scale(s): {', '.join(unknown)}")
+    return names
+
+
+def pytest_generate_tests(metafunc):
+    if "scale" in metafunc.fixturenames:
+        metafunc.parametrize("scale", _scales(metafunc.config), scope="session")
+
+
+# --- datasets -----------------------------------------------------------------
+_datasets: Dict[str, Dataset] = {}
+
+
+@pytest.fixture(scope="session")
+def dataset(scale) -> Dataset:
+    if scale not in _datasets:
+        _datasets[scale] = make_dataset(scale)
+    return _datasets[scale]
+
+
+@pytest.fixture
+def data_dir(dataset, tmp_path, monkeypatch) -> Path:
+    """Dataset written to a temp dir; data-file constants of loaded meal modules point at it."""
+    dataset.write(tmp_path)
+    for module in list(sys.modules.values()):
+        if not getattr(module, "__name__", "").startswith("meal."):
+            continue
+        for attr, filename in DATA_FILE_ATTRS.items():
+            if isinstance(getattr(module, attr, None), (str, os.PathLike)):
+                monkeypatch.setattr(module, attr, tmp_path / filename if filename else tmp_path)
+    return tmp_path
+
+
+# --- timing -------------------------------------------------------------------
+class _Bench:
+    def __init__(self, node, scale: Optional[str]):
+        self.node = node
+        self.scale = scale
+        self.result: Optional[Dict[str, Any]] = None
+
+    def __call__(self, fn: Callable, *args, setup: Optional[Callable[[], tuple]] = None, **kwargs):
+        call_args = setup() if setup else args
+        value = fn(*call_args, **kwargs)  # warm-up (caches, imports), not recorded
+        samples: List[float] = []
+        started = time.perf_counter()
+        while len(samples) < BENCH_MAX_ROUNDS and (
+                len(samples) < BENCH_MIN_ROUNDS or time.perf_counter() - started < BENCH_MIN_TIME):
+            call_args = setup() if setup else args
+            t0 = time.perf_counter()
+            fn(*call_args, **kwargs)
+            samples.append(time.perf_counter() - t0)
+        self.result = _summary(self.node, self.scale, samples)
+        return value
+
+
+def _summary(node, scale: Optional[str], samples: List[float]) -> Dict[str, Any]:
+    ordered = sorted(samples)
+    return {
+        "name": node.name,
+        "group": node.originalname,
+        "module": node.module.__name__.rsplit(".", 1)[-1],
+        "scale": scale,
+        "rounds": len(samples),
+        "stats": {
+            "min": ordered[0],
+            "max": ordered[-1],
+            "mean": statistics.fmean(samples),
+            "median": statistics.median(ordered),
+            "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        },
+        "samples": samples,
+    }
+
+
+_results: List[Dict[str, Any]] = []
+
+
+@pytest.fixture
+def bench(request):
+    scale = request.node.callspec.params.get("scale") if hasattr(request.node, "callspec") else None
+    b = _Bench(request.node, scale)
+    yield b
+    if b.result is not None:
+        _results.append(b.result)
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True,
+                             text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if not _results:
+        return
+    report = {
+        "kind": "benchmarks",
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scales": {name: SCALES[name].__dict__ for name in sorted({r["scale"] for r in _results if r["scale"]})},
+        },
+        "benchmarks": _results,
+    }
+    path = Path(session.config.getoption("--bench-json", default=str(DEFAULT_JSON)))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=1), encoding="utf-8")
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    tr = terminalreporter
+    tr.section("benchmarks (ms per call)")
+    tr.write_line(f"{'benchmark':48s} {'rounds':>7s} {'median':>10s} {'p95':>10s} {'min':>10s}")
+    for r in _results:
+        s = r["stats"]
+        tr.write_line(f"{r['name']:48s} {r['rounds']:7d} {s['median'] * 1e3:10.3f} "
+                      f"{s['p95'] * 1e3:10.3f} {s['min'] * 1e3:10.3f}")
+    tr.write_line(f"JSON report: {tr.config.getoption('--bench-json', default=str(DEFAULT_JSON))}")
@@ -0,0 +1,71 @@
+"""Deterministic in-memory datasets for the benchmarks, at a few named scales.
+
+Records come from the synthetic data generator (meal.tools.synth): Zipf-skewed ingredient
+and recipe popularity, pantry lots over the same vocabulary so lookups hit, and plan weeks
+ending with the current one whose past slots are partly cooked, so the logic under test
+does its full amount of work.
+"""
+from __future__ import annotations
+import json
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List
+
+from meal.tools.synth import Synth, SynthConfig
+
+
+@dataclass(frozen=True)
+class Scale:
+    name: str
+    recipes: int
+    ingredients: int      # distinct ingredient names
+    pantry_lots: int
+    weeks: int            # weeks stored in plan.json
+
+
+SCALES: Dict[str, Scale] = {
+    "S": Scale("S", recipes=50, ingredients=120, pantry_lots=100, weeks=8),
+    "M": Scale("M", recipes=500, ingredients=800, pantry_lots=1_000, weeks=104),
+    "L": Scale("L", recipes=5_000, ingredients=4_000, pantry_lots=10_000, weeks=520),
+}
+
+
+@dataclass
+class Dataset:
+    scale: Scale
+    recipes: List[Dict[str, Any]]
+    pantry: List[Dict[str, Any]]
+    plan: Dict[str, Dict[str, Any]]   # plan.json content, keyed "YYYY-Www"
+    cooked: List[Dict[str, Any]]
+    week: int                         # the current ISO week (always present in plan)
+    year: int
+
+    def write(self, directory: Path) -> None:
+        """Write recipes.json, Pantry_ingredients.json, plan.json and the logs to directory."""
+        directory.mkdir(parents=True, exist_ok=True)
+        files = {
+            "recipes.json": self.recipes,
+            "Pantry_ingredients.json": self.pantry,
+            "plan.json": self.plan,
+            "Pantry_recipe_cooked.json": self.cooked,
+            "shopping_transactions.json": [],
+        }
+        for name, content in files.items():
+            with open(directory / name, "w", encoding="utf-8") as f:
+                json.dump(content, f, ensure_ascii=False, indent=2)
+
+
+def make_dataset(scale: Scale | str, seed: int = 42, today: date | None = None) -> Dataset:
+    scale = SCALES[scale] if isinstance(scale, str) else scale
+    config = SynthConfig(recipes=scale.recipes, ingredients=scale.ingredients, pantry=scale.pantry_lots,
+                         weeks=scale.weeks, future_weeks=0, transactions=0, seed=seed,
+                         today=today or date.today())
+    synth = Synth(config)
+    plan: Dict[str, Dict[str, Any]] = {}
+    cooked: List[Dict[str, Any]] = []
+    for key, meals, entries in synth.plan_weeks():
+        plan[key] = meals
+        cooked.extend(entries)
+    iso = config.today.isocalendar()
+    return Dataset(scale, list(synth.recipes()), list(synth.pantry()), plan, cooked, iso.week, iso.year)
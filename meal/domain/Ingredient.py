@@ -1,18 +1,30 @@
 """Ingredient domain entity: name, unit, default quantity, optional expiration date, tags."""
 from datetime import date, datetime
 from meal.utilities.constants import DATE_FORMAT
-from typing import List, Optional
+from typing import Iterable, Optional, Tuple
 
 
 class Ingredient:
+    # Slots instead of a per-instance __dict__: catalogs and pantries hold many thousands
+    __slots__ = ("name", "unit", "default_quantity", "data_expirare", "_tags")
+
     def __init__(self, name: str = "", unit: str = "", default_quantity: int = 0,
-                 data_expirare: Optional[date] = None, tags: Optional[List[str]] = None):
-        # Avoid mutable default arguments
+                 data_expirare: Optional[date] = None, tags: Optional[Iterable[str]] = None):
         self.name = name
         self.unit = unit
         self.default_quantity = default_quantity
         self.data_expirare = data_expirare
-        self.tags = tags[:] if tags else []
+        self.tags = tags
+
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        '''Immutable tags; assign a new sequence to change them.'''
+        return self._tags
+
+    @tags.setter
+    def tags(self, value: Optional[Iterable[str]]):
+        # The empty tuple is a shared singleton, so untagged items cost nothing extra
+        self._tags = tuple(value) if value else ()
 
     def set_quantity(self, quantity: int):
         '''Adjusts the quantity by the specified delta (can be negative).'''
@@ -56,5 +68,5 @@ class Ingredient:
             "unit": self.unit,
             "default_quantity": self.default_quantity,
             "data_expirare": exp_val,
-            "tags": self.tags
+            "tags": list(self.tags)
         }
\ No newline at end of file
@@ -9,6 +9,8 @@ from meal.utilities.constants import DAYS_BEFORE_EXPIRY, LOW_STOCK_THRESHOLD
 
 
 class Pantry:
+    __slots__ = ("items", "_event_bus")
+
     def __init__(self):
         self.items: List[Ingredient] = []  # List of PantryItem objects
         self._event_bus = GLOBAL_EVENT_BUS
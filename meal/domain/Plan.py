@@ -1,6 +1,8 @@
 """Plan domain entity: captures weekly meal schedule (week, year, meals mapping)."""
 
 class Plan:
+    __slots__ = ("week_number", "meals", "year", "week")
+
     def __init__(self, week_number, meals, year=None):
         self.week_number = week_number
         self.meals = meals
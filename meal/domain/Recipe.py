@@ -2,17 +2,20 @@
 import os, json
 from meal.domain.Ingredient import Ingredient
 from meal.domain.RecipeCooked import RecipeCooked
-from typing import List, Dict, Optional
+from meal.utilities.stemming import normalize_name
+from typing import Dict, Iterable, List, Optional, Tuple
 
 class Recipe:
+    __slots__ = ("name", "servings", "ingredients", "steps", "_tags", "calories_per_serving", "macros", "image")
+
     def __init__(self, name: str = "", servings: int = 0, ingredients: Optional[List[Ingredient]] = None,
-                 steps: Optional[List[str]] = None, tags: Optional[List[str]] = None,
+                 steps: Optional[List[str]] = None, tags: Optional[Iterable[str]] = None,
                  calories_per_serving: int = 0, macros: Optional[Dict[str, int]] = None, image: str = ""):
         self.name = name
         self.servings = servings
         self.ingredients = ingredients[:] if ingredients else []
         self.steps = steps[:] if steps else []
-        self.tags = tags[:] if tags else []
+        self.tags = tags
         self.calories_per_serving = calories_per_serving
         m = macros or {}
         # Normalize key synonyms
@@ -31,6 +34,14 @@ class Recipe:
 
     __repr__ = __str__
 
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        return self._tags
+
+    @tags.setter
+    def tags(self, value: Optional[Iterable[str]]):
+        self._tags = tuple(value) if value else ()
+
     def get_protein(self): return self.macros.get("protein", 0)
     def get_carbs(self): return self.macros.get("carbs", 0)
     def get_fats(self): return self.macros.get("fats", 0)
@@ -47,7 +58,7 @@ class Recipe:
             "servings": self.servings,
             "ingredients": [ing.to_dict() for ing in self.ingredients],
             "steps": self.steps,
-            "tags": self.tags,
+            "tags": list(self.tags),
             "calories_per_serving": self.calories_per_serving,
             "macros": {
                 "protein": self.macros.get("protein", 0),
@@ -74,21 +85,7 @@ class Recipe:
     @staticmethod
     def _normalize_name(name: str) -> str:
         """Normalize an ingredient name for matching (case + basic plural handling)."""
-        if not isinstance(name, str):
-            return ""
-        n = name.strip().lower()
-        # basic plural -> singular heuristics
-        if n.endswith('ies') and len(n) > 3:
-            n = n[:-3] + 'y'
-        elif n.endswith('oes') and len(n) > 3:  # tomatoes -> tomato
-            n = n[:-3] + 'o'
-        elif n.endswith('ses') and len(n) > 3:
-            n = n[:-2]  # classes -> classe (acceptable limitation)
-        elif n.endswith('es') and len(n) > 2 and n[-3] not in 'aeiou':
-            n = n[:-2]
-        elif n.endswith('s') and not n.endswith('ss') and len(n) > 1:
-            n = n[:-1]
-        return n
+        return normalize_name(name)
 
     def check_ingredients(self, available_ingredients: List[Ingredient]):
         """Return True if pantry has enough quantities (case & simple plural-insensitive)."""
@@ -3,6 +3,7 @@
 Event names used so far:
   pantry.low_stock -> payload {"ingredient": Ingredient, "remaining": int, "threshold": int}
   pantry.near_expiry -> payload {"ingredient": Ingredient, "days_left": int, "threshold": int}
+  recipe.cooked -> payload {"entry": dict (cooked log entry), "recipe": dict (catalog entry)}
 
 Subscribers can be callables or objects exposing handle_event(event_name, payload).
 """
@@ -14,6 +15,7 @@ from typing import Callable, Any, Dict, List
 PANTRY_LOW_STOCK = "pantry.low_stock"
 PANTRY_NEAR_EXPIRY = "pantry.near_expiry"
 PANTRY_EXPIRING_SNAPSHOT = "pantry.expiring_snapshot"
+RECIPE_COOKED = "recipe.cooked"
 
 
 class EventBus:
@@ -57,5 +59,5 @@ create_event = crea
 
 __all__ = [
 	'EventBus', 'GLOBAL_EVENT_BUS', 'crea', 'create_event', 'simple_print_listener',
-	'PANTRY_LOW_STOCK', 'PANTRY_NEAR_EXPIRY', 'PANTRY_EXPIRING_SNAPSHOT'
+	'PANTRY_LOW_STOCK', 'PANTRY_NEAR_EXPIRY', 'PANTRY_EXPIRING_SNAPSHOT', 'RECIPE_COOKED'
 ]
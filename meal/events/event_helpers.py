@@ -6,7 +6,8 @@ using the global event bus.
 Quick import:
     from meal.events.event_helpers import (
         publish_low_stock, publish_near_expiry, publish_expiring_snapshot,
-        PANTRY_LOW_STOCK, PANTRY_NEAR_EXPIRY, PANTRY_EXPIRING_SNAPSHOT
+        publish_recipe_cooked,
+        PANTRY_LOW_STOCK, PANTRY_NEAR_EXPIRY, PANTRY_EXPIRING_SNAPSHOT, RECIPE_COOKED
     )
 
 """
@@ -14,13 +15,14 @@ from __future__ import annotations
 from typing import Iterable, Any
 from .Event_Bus import (
     crea, create_event,  # aliasuri
-    PANTRY_LOW_STOCK, PANTRY_NEAR_EXPIRY, PANTRY_EXPIRING_SNAPSHOT,
+    PANTRY_LOW_STOCK, PANTRY_NEAR_EXPIRY, PANTRY_EXPIRING_SNAPSHOT, RECIPE_COOKED,
     GLOBAL_EVENT_BUS
 )
 
 __all__ = [
     'publish_low_stock', 'publish_near_expiry', 'publish_expiring_snapshot',
-    'PANTRY_LOW_STOCK', 'PANTRY_NEAR_EXPIRY', 'PANTRY_EXPIRING_SNAPSHOT',
+    'publish_recipe_cooked',
+    'PANTRY_LOW_STOCK', 'PANTRY_NEAR_EXPIRY', 'PANTRY_EXPIRING_SNAPSHOT', 'RECIPE_COOKED',
     'crea', 'create_event'
 ]
 
@@ -55,6 +57,20 @@ def publish_expiring_snapshot(items: Iterable[dict]):
         'items': items_list
     })
 
+def publish_recipe_cooked(entry: dict, recipe: dict | None = None):
+    """Publish a recipe.cooked event after a cook has been persisted.
+
+    Payload structure:
+        {
+          'entry': { name, date_cooked, day, meal, servings, ... },  # cooked log entry
+          'recipe': { name, calories_per_serving, macros, ... }      # catalog entry (may be None)
+        }
+    """
+    crea(RECIPE_COOKED, {
+        'entry': entry,
+        'recipe': recipe
+    })
+
 # Optional debug subscriber (not registered by default)
 
 def _debug_listener(event_name: str, payload):  # pragma: no cover (debug utility)
@@ -0,0 +1,38 @@
+"""Statistics observers for cook events.
+
+Subscribes to the GLOBAL_EVENT_BUS for:
+  - recipe.cooked
+
+and feeds each cooked entry into the incrementally maintained CookStats
+(meal.logic.reporting.cook_stats), which persists a small snapshot that the
+/api/stats endpoint serves without touching the cooked log.
+"""
+from __future__ import annotations
+from typing import Any
+
+from .Event_Bus import GLOBAL_EVENT_BUS, RECIPE_COOKED
+from meal.logic.reporting.cook_stats import get_cook_stats
+
+_started = False
+
+
+def _on_recipe_cooked(event_name: str, payload: Any):  # signature expected by EventBus
+    if not isinstance(payload, dict) or not isinstance(payload.get('entry'), dict):
+        return
+    try:
+        get_cook_stats().record(payload['entry'], payload.get('recipe'))
+    except Exception as e:  # pragma: no cover - defensive
+        print(f"[stats_observers] Failed to record {event_name}: {e}")
+
+
+def start():
+    """Idempotent start: subscribe observers once."""
+    global _started
+    if _started:
+        return
+    get_cook_stats()  # a missing snapshot is built from the log now, not inside the first cook
+    GLOBAL_EVENT_BUS.subscribe(RECIPE_COOKED, _on_recipe_cooked)
+    _started = True
+
+
+__all__ = ['start']
@@ -16,9 +16,12 @@ Design:
     share process; for multi-process deployment this remains per-process which
     is fine for non-critical notifications).
   * A MAX_EVENTS cap prevents unbounded memory growth.
+  * Ids are consecutive, so 'since' lookups are index arithmetic instead of a scan.
+  * Listeners (add_listener) are called after each recorded event, outside the
+    lock; the SSE stream uses this to wake its subscribers instead of polling.
 """
 from __future__ import annotations
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
 from threading import Lock
 from datetime import datetime
 
@@ -31,6 +34,7 @@ _events: List[Dict[str, Any]] = []
 _next_id = 1
 MAX_EVENTS = 300  # keep a few hundred recent events
 _started = False
+_listeners: List[Callable[[Dict[str, Any]], None]] = []
 
 
 def _record(event_name: str, payload: Any):  # signature expected by EventBus
@@ -63,8 +67,28 @@ def _record(event_name: str, payload: Any):  # signature expected by EventBus
             # Trim buffer
             if len(_events) > MAX_EVENTS:
                 del _events[: len(_events) - MAX_EVENTS]
+            listeners = list(_listeners)
     except Exception as e:  # pragma: no cover - defensive
         print(f"[web_observers] Failed to record event {event_name}: {e}")
+        return
+    for listener in listeners:
+        try:
+            listener(evt)
+        except Exception as e:  # pragma: no cover - defensive
+            print(f"[web_observers] Listener failed for event {event_name}: {e}")
+
+
+def add_listener(callback: Callable[[Dict[str, Any]], None]):
+    """Call callback(evt) after every recorded event (from the publishing thread)."""
+    with _lock:
+        if callback not in _listeners:
+            _listeners.append(callback)
+
+
+def remove_listener(callback: Callable[[Dict[str, Any]], None]):
+    with _lock:
+        if callback in _listeners:
+            _listeners.remove(callback)
 
 
 def start():
@@ -81,15 +105,25 @@ def get_events(since: int | None = None) -> Dict[str, Any]:
     """Return events newer than 'since' (exclusive).
 
     If since is None, returns the last N (up to MAX_EVENTS) events.
-    Response includes next_cursor (largest id) so client can poll with since=next_cursor.
+    Response includes next_cursor (largest id) so client can poll with since=next_cursor; a
+    cursor from before a restart or from another worker (above the newest id) is reset to it.
     """
     with _lock:
         if since is None:
             data = list(_events)
+        elif not _events:
+            data = []
         else:
-            data = [e for e in _events if e['id'] > since]
-        next_cursor = _events[-1]['id'] if _events else since or 0
+            # ids are consecutive: the first id > since sits at (since + 1 - first_id)
+            data = _events[max(0, since + 1 - _events[0]['id']):]
+        next_cursor = _events[-1]['id'] if _events else 0
     return {'events': data, 'next_cursor': next_cursor}
 
 
-__all__ = ['start', 'get_events']
+def latest_id() -> int:
+    """Id of the newest recorded event (0 when none)."""
+    with _lock:
+        return _events[-1]['id'] if _events else 0
+
+
+__all__ = ['start', 'get_events', 'latest_id', 'add_listener', 'remove_listener']
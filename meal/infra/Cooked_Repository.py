@@ -0,0 +1,125 @@
+"""Cooked-history store: cooked log entries indexed by date for range queries.
+
+Entries are kept sorted by the ordinal of their `date_cooked` (DD-MM-YYYY, legacy YYYY-MM-DD
+also accepted), so a date range is two bisects plus a slice instead of parsing and comparing
+every entry of the log. Entries without a parseable date sort first (ordinal 0) and are only
+returned by unbounded queries.
+
+The parsed index is cached per file and rebuilt when the file changes on disk.
+"""
+from __future__ import annotations
+import json
+import logging
+from bisect import bisect_left, bisect_right
+from datetime import date as _date, datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from meal.infra.metrics import record_read
+from meal.infra.paths import COOKED_FILE
+from meal.utilities.constants import DATE_FORMAT
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['CookedHistory', 'parse_cooked_date', 'get_cooked_history', 'invalidate_cooked_history']
+
+
+def parse_cooked_date(value: Any) -> Optional[_date]:
+    """Parse a date_cooked value (DD-MM-YYYY or YYYY-MM-DD); None when invalid."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, _date):
+        return value
+    if isinstance(value, str):
+        for fmt in (DATE_FORMAT, '%Y-%m-%d'):
+            try:
+                return datetime.strptime(value.strip(), fmt).date()
+            except ValueError:
+                continue
+    return None
+
+
+class CookedHistory:
+    """Immutable, date-sorted view over cooked log entries."""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        keyed = []
+        for seq, entry in enumerate(entries or []):
+            if not isinstance(entry, dict):
+                continue
+            d = parse_cooked_date(entry.get('date_cooked'))
+            keyed.append((d.toordinal() if d else 0, seq, entry))
+        keyed.sort(key=lambda t: (t[0], t[1]))
+        self._ordinals: List[int] = [k[0] for k in keyed]
+        self._entries: List[Dict[str, Any]] = [k[2] for k in keyed]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _bounds(self, start: Optional[_date], end: Optional[_date]) -> Tuple[int, int]:
+        lo = bisect_left(self._ordinals, start.toordinal()) if start else 0
+        hi = bisect_right(self._ordinals, end.toordinal()) if end else len(self._ordinals)
+        return lo, max(lo, hi)
+
+    def count(self, start: Optional[_date] = None, end: Optional[_date] = None) -> int:
+        lo, hi = self._bounds(start, end)
+        return hi - lo
+
+    def range(self, start: Optional[_date] = None, end: Optional[_date] = None) -> List[Dict[str, Any]]:
+        """Entries with start <= date_cooked <= end (both inclusive, None = unbounded), oldest first."""
+        lo, hi = self._bounds(start, end)
+        return self._entries[lo:hi]
+
+    def page(self, start: Optional[_date] = None, end: Optional[_date] = None, *,
+             offset: int = 0, limit: int = 50, newest_first: bool = False) -> Tuple[List[Dict[str, Any]], int]:
+        """Return (items, total) for one page of a date range."""
+        lo, hi = self._bounds(start, end)
+        total = hi - lo
+        offset = max(0, offset)
+        limit = max(0, limit)
+        if newest_first:
+            stop = max(lo, hi - offset)
+            items = self._entries[max(lo, stop - limit):stop][::-1]
+        else:
+            first = min(hi, lo + offset)
+            items = self._entries[first:min(hi, first + limit)]
+        return items, total
+
+
+_cache: Dict[Path, Tuple[Tuple[int, int], CookedHistory]] = {}
+_cache_lock = Lock()
+
+
+def get_cooked_history(path: Path | str | None = None) -> CookedHistory:
+    """Return the CookedHistory for the given cooked log file (default COOKED_FILE), cached until it changes."""
+    p = Path(path) if path else COOKED_FILE
+    try:
+        st = p.stat()
+        token = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return CookedHistory([])
+    with _cache_lock:
+        hit = _cache.get(p)
+        if hit and hit[0] == token:
+            return hit[1]
+    try:
+        with open(p, encoding='utf-8') as f:
+            entries = json.load(f)
+        record_read(p)
+    except Exception as e:
+        logger.error("Failed to load cooked history from %s: %s", p, e)
+        entries = []
+    history = CookedHistory(entries if isinstance(entries, list) else [])
+    with _cache_lock:
+        _cache[p] = (token, history)
+    return history
+
+
+def invalidate_cooked_history(path: Path | str | None = None) -> None:
+    """Drop the cached index (all files when path is None)."""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(Path(path), None)
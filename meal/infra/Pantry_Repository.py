@@ -4,6 +4,7 @@ import json
 from datetime import datetime
 from meal.domain.Pantry import Pantry
 from meal.domain.Ingredient import Ingredient
+from meal.infra.metrics import record_read
 from meal.infra.paths import PANTRY_FILE
 
 
@@ -12,6 +13,7 @@ def reading_from_ingredients():
     try:
         with open(PANTRY_FILE, 'r', encoding='utf-8') as f:
             ingredient_data = json.load(f)
+        record_read(PANTRY_FILE)
         pantry = Pantry()
         for entry in ingredient_data:
             if entry.get("data_expirare"):
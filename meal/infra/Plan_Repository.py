@@ -3,31 +3,51 @@ from typing import Optional, List
 from datetime import timedelta, date, datetime
 from meal.domain.Plan import Plan
 from meal.api.routes.recipes import load_recipes
+from meal.infra.metrics import record_read
 from meal.infra.paths import PLAN_FILE, PANTRY_FILE
+from meal.infra.pdf_cache import invalidate_pdf_week
+from meal.infra.storage_io import write_json
+from meal.infra.tracing import traced
 from meal.domain.Recipe import Recipe
 
 def _week_key(year: int, week_number: int) -> str:
     return f"{year}-W{week_number:02d}"
 
+@traced('plan.read')
+def _read_store() -> dict:
+    """Whole plan.json as a dict ({} when missing or unreadable)."""
+    try:
+        with open(PLAN_FILE, "r", encoding="utf-8") as f:
+            store = json.load(f) or {}
+        record_read(PLAN_FILE)
+    except Exception:
+        store = {}
+    return store
+
+@traced('plan.write')
+def _write_store(store: dict) -> None:
+    # atomic replace: concurrent readers must never see a half-written plan (they would
+    # treat it as empty)
+    write_json(PLAN_FILE, store)
+
 class PlanRepository:
+    @traced()
     def get_week_plan(self, week_number: int, year: Optional[int] = None) -> Plan:
         if year is None:
             year = date.today().isocalendar().year
         if not os.path.exists(PLAN_FILE):
-            with open(PLAN_FILE, "w", encoding="utf-8") as f:
-                json.dump({}, f)
-        try:
-            with open(PLAN_FILE, "r", encoding="utf-8") as f:
-                store = json.load(f) or {}
-        except Exception:
-            store = {}
+            _write_store({})
+        store = _read_store()
         key = _week_key(year, week_number)
         if key not in store:
             store[key] = {d: {"breakfast": "-", "lunch": "-", "dinner": "-"}
                           for d in ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]}
-            with open(PLAN_FILE, "w", encoding="utf-8") as f:
-                json.dump(store, f, indent=2, ensure_ascii=False)
-        meals = store[key]
+            _write_store(store)
+        return self._plan_from_meals(store[key], week_number, year)
+
+    @staticmethod
+    def _plan_from_meals(meals: dict, week_number: int, year: int) -> Plan:
+        """Fill missing slots and per-day dates, then wrap the stored week in a Plan."""
         monday = date.fromisocalendar(year, week_number, 1)
         days = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
         for i, day_name in enumerate(days):
@@ -42,21 +62,45 @@ class PlanRepository:
         plan.year = year
         return plan
 
+    @traced()
     def save_week_plan(self, week_number: int, plan: Plan, year: Optional[int] = None) -> None:
         if year is None:
             year = getattr(plan, "year", date.today().isocalendar().year)
-        try:
-            with open(PLAN_FILE, "r", encoding="utf-8") as f:
-                store = json.load(f) or {}
-        except Exception:
-            store = {}
+        store = _read_store()
         key = _week_key(year, week_number)
         clean_meals = {day: {k: v for k, v in meals.items() if k != "date"}
                        for day, meals in plan.meals.items()}
         store[key] = clean_meals
-        with open(PLAN_FILE, "w", encoding="utf-8") as f:
-            json.dump(store, f, indent=2, ensure_ascii=False)
+        _write_store(store)
+        invalidate_pdf_week(week_number, year)
+
+    @traced()
+    def update_slots(self, edits: List[dict]) -> List[Plan]:
+        """Apply many slot edits ({year, week, day, meal, recipe}) with one read and one write of plan.json.
+
+        Edits are applied in order (a later edit of the same slot wins). Weeks that do not exist yet
+        are created empty first. Validation is the caller's job. Returns the touched weeks as Plans
+        (in first-touched order).
+        """
+        store = _read_store()
+        touched = []
+        for edit in edits:
+            key = _week_key(edit["year"], edit["week"])
+            if key not in touched:
+                touched.append(key)
+                store.setdefault(key, {d: {"breakfast": "-", "lunch": "-", "dinner": "-"}
+                                       for d in ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]})
+            store[key].setdefault(edit["day"], {"breakfast": "-", "lunch": "-", "dinner": "-"})[edit["meal"]] = edit["recipe"]
+        if touched:
+            _write_store(store)
+        plans = []
+        for key in touched:
+            year, week = int(key[:4]), int(key[6:])
+            invalidate_pdf_week(week, year)
+            plans.append(self._plan_from_meals(store[key], week, year))
+        return plans
 
+    @traced()
     def reset_week(self, week_number: int, year: Optional[int] = None):
         """Reset non-cooked meals for future (or today) days only.
 
@@ -86,6 +130,7 @@ class PlanRepository:
                 meals[slot] = "-"
         self.save_week_plan(week_number, plan, year)
 
+    @traced()
     def randomize_week(self, week_number: int, year: Optional[int] = None):
         """Fill meal plan with random recipes ensuring no duplicate recipe appears twice in the same day.
 
@@ -171,6 +216,7 @@ class PlanRepository:
                 used.add(choice)
         self.save_week_plan(week_number, plan, year)
 
+    @traced()
     def randomize_custom(self, week_number: int, year: Optional[int] = None, days: Optional[List[str]] = None, replace_existing: bool = False, only_available: bool = False) -> int:
         """Randomize specific days with uniqueness (no recipe appears twice in the same day).
 
@@ -197,6 +243,7 @@ class PlanRepository:
             try:
                 with open(PANTRY_FILE, 'r', encoding='utf-8') as f:
                     pantry_items = json.load(f) or []
+                record_read(PANTRY_FILE)
             except Exception:
                 pantry_items = []
             stock = {}
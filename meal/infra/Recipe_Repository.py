@@ -1,6 +1,7 @@
 import json
 import logging
 from meal.domain.Recipe import Recipe
+from meal.infra.metrics import record_read
 from meal.infra.paths import RECIPES_FILE
 
 logger = logging.getLogger(__name__)
@@ -10,6 +11,7 @@ def reading_from_recipes():
     try:
         with open(RECIPES_FILE, 'r', encoding='utf-8') as f:
             recipes_data = json.load(f)
+        record_read(RECIPES_FILE)
         recipes = [Recipe.from_dict(entry) for entry in recipes_data]
         return recipes
     except FileNotFoundError:
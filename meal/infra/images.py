@@ -0,0 +1,259 @@
+"""Width-bucketed derivatives (thumbnails) of recipe pictures.
+
+Originals live in static/pictures (uploads can be several MB). For each source this
+service writes downscaled copies for every width in WIDTHS that is smaller than the
+original, as JPEG and, when Pillow was built with WebP support, WebP:
+
+    static/pictures/_derived/<source hash>/<width>.jpg
+    static/pictures/_derived/<source hash>/<width>.webp
+
+The directory is keyed by the content hash of the source, so replacing a picture under the
+same file name produces a new set and a stale set is never served. Resizing runs in a
+process pool (never on the request path): uploads schedule it right away, existing pictures
+are backfilled lazily the first time a page asks for their srcset. Until a set exists the
+templates simply fall back to the original file.
+
+Pillow is listed in requirements.txt but stays optional: without it `available` is False,
+every srcset is empty and get_image_service() logs a warning once.
+"""
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, wait as futures_wait
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+
+try:  # optional dependency
+    from PIL import Image, ImageOps, features as _pil_features
+except ImportError:  # pragma: no cover - exercised only without Pillow
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['ImageDerivativeService', 'generate_derivatives', 'get_image_service', 'WIDTHS', 'PICTURES_DIR']
+
+PICTURES_DIR = (Path(__file__).parent.parent / 'static' / 'pictures').resolve()
+DERIVED_DIRNAME = '_derived'
+WIDTHS = (320, 640, 1024)
+JPEG_QUALITY = 80
+WEBP_QUALITY = 75
+HASH_LENGTH = 16
+MAX_WORKERS = 2
+
+
+def webp_supported() -> bool:
+    return Image is not None and bool(_pil_features.check('webp'))
+
+
+def _source_hash(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            h.update(chunk)
+    return h.hexdigest()[:HASH_LENGTH]
+
+
+def _save_atomic(img, target: Path, fmt: str, **options) -> None:
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f'.{target.stem}_', suffix=target.suffix)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            img.save(f, fmt, **options)
+        os.replace(tmp, target)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def generate_derivatives(source: str, out_dir: str, widths: Tuple[int, ...] = WIDTHS,
+                         webp: bool = True) -> List[int]:
+    """Write <width>.jpg (and .webp) into out_dir; returns the widths produced.
+
+    Runs in a worker process, so it only takes and returns plain values.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    with Image.open(source) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.mode not in ('RGB', 'L'):
+            im = im.convert('RGB')
+        produced = []
+        for width in sorted(w for w in widths if w < im.width):
+            height = max(1, round(im.height * width / im.width))
+            resized = im.resize((width, height), Image.LANCZOS)
+            _save_atomic(resized, out / f'{width}.jpg', 'JPEG', quality=JPEG_QUALITY,
+                         optimize=True, progressive=True)
+            if webp:
+                _save_atomic(resized, out / f'{width}.webp', 'WEBP', quality=WEBP_QUALITY, method=4)
+            produced.append(width)
+    return produced
+
+
+class ImageDerivativeService:
+    """Looks up and schedules derivative sets for files in a pictures directory."""
+
+    def __init__(self, pictures_dir: Path | str = PICTURES_DIR, widths: Tuple[int, ...] = WIDTHS,
+                 max_workers: int = MAX_WORKERS):
+        self.pictures_dir = Path(pictures_dir)
+        self.derived_dir = self.pictures_dir / DERIVED_DIRNAME
+        self.widths = tuple(sorted(widths))
+        self.max_workers = max_workers
+        self.webp = webp_supported()
+        self._hashes: Dict[str, Tuple[Tuple[int, int], str]] = {}  # name -> ((mtime_ns, size), hash)
+        self._pending: Dict[str, Future] = {}  # source hash -> future
+        self._failed: Set[str] = set()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+        self.generation = 0  # bumped whenever a derivative set appears (cache key for rendered HTML)
+
+    @property
+    def available(self) -> bool:
+        return Image is not None
+
+    # --- lookup -----------------------------------------------------------
+    def _source(self, filename: str) -> Optional[Path]:
+        if not filename:
+            return None
+        path = (self.pictures_dir / filename).resolve()
+        if path.parent != self.pictures_dir.resolve() or not path.is_file():
+            return None
+        return path
+
+    def source_key(self, filename: str) -> Optional[str]:
+        """Content hash of a picture (cached by mtime/size); None when it does not exist."""
+        path = self._source(filename)
+        if path is None:
+            return None
+        st = path.stat()
+        token = (st.st_mtime_ns, st.st_size)
+        cached = self._hashes.get(filename)
+        if cached and cached[0] == token:
+            return cached[1]
+        digest = _source_hash(path)
+        self._hashes[filename] = (token, digest)
+        return digest
+
+    def variants(self, filename: str, fmt: str = 'jpg') -> List[Tuple[int, str]]:
+        """[(width, static-relative path)] of existing derivatives, smallest first.
+
+        Schedules generation (lazy backfill) when the set is missing.
+        """
+        if not self.available:
+            return []
+        try:
+            key = self.source_key(filename)
+        except OSError:
+            return []
+        if key is None:
+            return []
+        folder = self.derived_dir / key
+        if not folder.is_dir():
+            self._submit(filename, key)
+            return []
+        found = []
+        for width in self.widths:
+            if (folder / f'{width}.{fmt}').is_file():
+                found.append((width, f'pictures/{DERIVED_DIRNAME}/{key}/{width}.{fmt}'))
+        return found
+
+    # --- generation -------------------------------------------------------
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def _submit(self, filename: str, key: str) -> Optional[Future]:
+        with self._lock:
+            if key in self._failed:
+                return None
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            source = self.pictures_dir / filename
+            # Write into a temp folder and rename, so a half-written set is never visible
+            staging = self.derived_dir / f'.{key}.tmp'
+            future = self._executor().submit(generate_derivatives, str(source), str(staging),
+                                             self.widths, self.webp)
+            self._pending[key] = future
+        future.add_done_callback(lambda f, k=key, s=staging, n=filename: self._finish(f, k, s, n))
+        return future
+
+    def _finish(self, future: Future, key: str, staging: Path, filename: str) -> None:
+        try:
+            produced = future.result()
+            target = self.derived_dir / key
+            try:
+                os.replace(staging, target)
+            except OSError:
+                if not target.is_dir():
+                    raise
+            with self._lock:
+                self.generation += 1
+            logger.info("Image derivatives for %s: %s", filename, produced or 'none (already small)')
+        except Exception as e:
+            logger.warning("Image derivatives for %s failed: %s", filename, e)
+            with self._lock:
+                self._failed.add(key)
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def schedule(self, filename: str) -> Optional[Future]:
+        """Queue derivative generation for a picture (e.g. right after an upload)."""
+        if not self.available:
+            return None
+        key = self.source_key(filename)
+        if key is None or (self.derived_dir / key).is_dir():
+            return None
+        return self._submit(filename, key)
+
+    def backfill(self) -> List[Future]:
+        """Queue every picture that has no derivative set yet."""
+        futures = []
+        if not self.pictures_dir.is_dir():
+            return futures
+        for entry in sorted(os.listdir(self.pictures_dir)):
+            if not entry.startswith(('.', '_')) and (self.pictures_dir / entry).is_file():
+                f = self.schedule(entry)
+                if f is not None:
+                    futures.append(f)
+        return futures
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until pending jobs (and their bookkeeping) are done; for tests and the CLI."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                futures = list(self._pending.values())
+            if not futures or (deadline is not None and time.monotonic() > deadline):
+                return
+            futures_wait(futures, timeout=None if deadline is None else max(0.0, deadline - time.monotonic()))
+            time.sleep(0.005)  # done callbacks run right after the result is set
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    # --- template helpers -------------------------------------------------
+    def srcset(self, filename: str, fmt: str = 'jpg', url=None) -> str:
+        """`url 320w, url 640w` for the existing derivatives (empty string when none)."""
+        url = url or (lambda rel: f'/static/{rel}')
+        return ', '.join(f'{url(rel)} {width}w' for width, rel in self.variants(filename, fmt))
+
+
+_service: Optional[ImageDerivativeService] = None
+
+
+def get_image_service() -> ImageDerivativeService:
+    """Process-wide service for static/pictures."""
+    global _service
+    if _service is None:
+        _service = ImageDerivativeService()
+        if not _service.available:
+            logger.warning("Pillow is not installed: recipe pictures are served without thumbnails, "
+                           "WebP or srcset (pip install pillow)")
+    return _service
@@ -0,0 +1,349 @@
+"""In-process metrics (counters, gauges, histograms) in Prometheus text format.
+
+No client library: the few metric types the app needs are small, lock-protected dicts keyed
+by label values, and `render()` writes the text exposition format (version 0.0.4):
+
+    REQUESTS = REGISTRY.counter('meal_http_requests_total', 'HTTP requests', ('route', 'status'))
+    REQUESTS.inc(route='/get_week', status='200')
+
+Each worker process has its own registry. With several workers (uvicorn --workers N) set
+METRICS_MULTIPROC_DIR to a directory shared by them: every worker then writes a JSON snapshot
+of its registry there (at most every FLUSH_INTERVAL seconds, and on every scrape) and
+/metrics merges all snapshots. Counters and histograms are summed over all snapshots (also
+of workers that have exited, so totals never go backwards); gauges are summed over live
+workers only, or reported per worker (`pid` label) when created with multiprocess_mode='all'.
+
+Data file I/O is counted here too (record_read / record_write), labelled with the file name,
+so repository traffic per data file shows up next to request latency.
+"""
+from __future__ import annotations
+import json
+import logging
+import math
+import os
+import tempfile
+import time
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from meal.utilities.config import METRICS_MULTIPROC_DIR
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['Counter', 'Gauge', 'Histogram', 'Registry', 'REGISTRY', 'record_read', 'record_write',
+           'DATA_FILE_READS', 'DATA_FILE_WRITES', 'DATA_FILE_READ_BYTES', 'DATA_FILE_WRITTEN_BYTES',
+           'CONTENT_TYPE']
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+FLUSH_INTERVAL = 1.0  # seconds between multiprocess snapshots of one worker
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = '') -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+class _Metric:
+    type = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = Lock()
+        self._values: Dict[LabelValues, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: expected labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> Dict[LabelValues, Any]:
+        with self._lock:
+            return {k: (list(v) if isinstance(v, list) else v) for k, v in self._values.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    type = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 multiprocess_mode: str = 'sum'):
+        super().__init__(name, documentation, labelnames)
+        self.multiprocess_mode = multiprocess_mode  # 'sum' over live workers, or 'all' (pid label)
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def get(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram; a sample is [count per bucket..., +Inf count, sum]."""
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            sample = self._values.get(key)
+            if sample is None:
+                sample = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    sample[i] += 1
+                    break
+            else:
+                sample[len(self.buckets)] += 1
+            sample[-1] += value
+
+
+class Registry:
+    def __init__(self, multiproc_dir: Optional[str] = None):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = Lock()
+        self.multiproc_dir = Path(multiproc_dir) if multiproc_dir else None
+        self._last_flush = 0.0
+
+    # --- registration -----------------------------------------------------
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered differently")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+              multiprocess_mode: str = 'sum') -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, multiprocess_mode))
+
+    def histogram(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Optional[Tuple[float, ...]] = None) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, **({'buckets': buckets} if buckets else {}))
+        return self._register(metric)
+
+    def add_collector(self, fn: Callable[[], None]) -> None:
+        """Callback run before every snapshot (e.g. to copy values kept elsewhere into gauges)."""
+        self._collectors.append(fn)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    # --- snapshots --------------------------------------------------------
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """JSON-able view of every metric of this process."""
+        for fn in list(self._collectors):
+            try:
+                fn()
+            except Exception as e:  # a broken collector must not break /metrics
+                logger.warning("Metrics collector failed: %s", e)
+        out = {}
+        for metric in list(self._metrics.values()):
+            out[metric.name] = {
+                'type': metric.type,
+                'help': metric.documentation,
+                'labelnames': list(metric.labelnames),
+                'buckets': list(getattr(metric, 'buckets', ())),
+                'mode': getattr(metric, 'multiprocess_mode', ''),
+                'samples': [[list(k), v] for k, v in metric.samples().items()],
+            }
+        return out
+
+    def flush_due(self) -> bool:
+        """Claim the next throttled snapshot: True at most once per FLUSH_INTERVAL, no I/O.
+
+        Lets async callers decide on the event loop and do the flush(force=True) in a thread.
+        """
+        if self.multiproc_dir is None:
+            return False
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_flush < FLUSH_INTERVAL:
+                return False
+            self._last_flush = now
+        return True
+
+    def flush(self, force: bool = False) -> None:
+        """Write this worker's snapshot into the multiprocess directory (throttled)."""
+        if self.multiproc_dir is None:
+            return
+        if force:
+            self._last_flush = time.monotonic()
+        elif not self.flush_due():
+            return
+        try:
+            self.multiproc_dir.mkdir(parents=True, exist_ok=True)
+            target = self.multiproc_dir / f'metrics_{os.getpid()}.json'
+            fd, tmp = tempfile.mkstemp(dir=self.multiproc_dir, prefix='.metrics_', suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'pid': os.getpid(), 'metrics': self.snapshot()}, f, separators=(',', ':'))
+            os.replace(tmp, target)
+        except OSError as e:
+            logger.warning("Metrics snapshot to %s failed: %s", self.multiproc_dir, e)
+
+    def _worker_snapshots(self) -> List[Tuple[int, Dict[str, Any]]]:
+        self.flush(force=True)
+        found = []
+        for path in sorted(self.multiproc_dir.glob('metrics_*.json')):
+            try:
+                data = json.loads(path.read_text(encoding='utf-8'))
+                found.append((int(data['pid']), data['metrics']))
+            except (OSError, ValueError, KeyError):
+                continue
+        return found
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """This worker's metrics, or all workers' merged when a multiprocess dir is set."""
+        if self.multiproc_dir is None:
+            return self.snapshot()
+        merged: Dict[str, Dict[str, Any]] = {}
+        sums: Dict[str, Dict[Tuple[str, ...], Any]] = {}
+        for pid, metrics in self._worker_snapshots():
+            alive = _pid_alive(pid)
+            for name, m in metrics.items():
+                if name not in merged:
+                    merged[name] = {**m, 'samples': []}
+                    if m['type'] == 'gauge' and m.get('mode') == 'all':
+                        merged[name]['labelnames'] = list(m['labelnames']) + ['pid']
+                    sums[name] = {}
+                target = sums[name]
+                for labels, value in m['samples']:
+                    if m['type'] == 'gauge':
+                        if not alive:
+                            continue
+                        if m.get('mode') == 'all':
+                            target[tuple(labels) + (str(pid),)] = value
+                            continue
+                    key = tuple(labels)
+                    if isinstance(value, list):
+                        prev = target.get(key)
+                        target[key] = value if prev is None else [a + b for a, b in zip(prev, value)]
+                    else:
+                        target[key] = target.get(key, 0.0) + value
+        for name, samples in sums.items():
+            merged[name]['samples'] = [[list(k), v] for k, v in samples.items()]
+        return merged
+
+    # --- exposition -------------------------------------------------------
+    def render(self, metrics: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """Prometheus text exposition of `metrics` (default: collect())."""
+        metrics = self.collect() if metrics is None else metrics
+        lines = []
+        for name in sorted(metrics):
+            m = metrics[name]
+            lines.append(f"# HELP {name} {m['help']}")
+            lines.append(f"# TYPE {name} {m['type']}")
+            names = m['labelnames']
+            for labels, value in sorted(m['samples'], key=lambda s: s[0]):
+                if m['type'] == 'histogram':
+                    cumulative = 0.0
+                    bounds = list(m['buckets']) + [math.inf]
+                    for bound, count in zip(bounds, value[:-1]):
+                        cumulative += count
+                        le = f'le="{_format_value(bound)}"'
+                        lines.append(f"{name}_bucket{_labels(names, labels, le)} {_format_value(cumulative)}")
+                    lines.append(f"{name}_sum{_labels(names, labels)} {_format_value(value[-1])}")
+                    lines.append(f"{name}_count{_labels(names, labels)} {_format_value(cumulative)}")
+                else:
+                    lines.append(f"{name}{_labels(names, labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists but owned by someone else
+    return True
+
+
+REGISTRY = Registry(METRICS_MULTIPROC_DIR or None)
+
+# --- data file I/O ------------------------------------------------------------
+DATA_FILE_READS = REGISTRY.counter('meal_data_file_reads_total', 'Data file loads', ('file',))
+DATA_FILE_WRITES = REGISTRY.counter('meal_data_file_writes_total', 'Data file writes', ('file',))
+DATA_FILE_READ_BYTES = REGISTRY.counter('meal_data_file_read_bytes_total', 'Bytes loaded from data files', ('file',))
+DATA_FILE_WRITTEN_BYTES = REGISTRY.counter('meal_data_file_written_bytes_total', 'Bytes written to data files', ('file',))
+
+
+def _size(path: Path | str) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def record_read(path: Path | str) -> None:
+    """Count one load of a data file (call after reading it)."""
+    name = os.path.basename(str(path))
+    DATA_FILE_READS.inc(file=name)
+    DATA_FILE_READ_BYTES.inc(_size(path), file=name)
+
+
+def record_write(path: Path | str) -> None:
+    """Count one write of a data file (call after it was written and closed)."""
+    name = os.path.basename(str(path))
+    DATA_FILE_WRITES.inc(file=name)
+    DATA_FILE_WRITTEN_BYTES.inc(_size(path), file=name)
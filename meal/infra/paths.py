@@ -1,12 +1,18 @@
+import os
 from pathlib import Path
 
-# Centralized paths for data files (single source of truth)
-DATA_DIR = (Path(__file__).parent.parent / 'data').resolve()
+# Centralized paths for data files (single source of truth); MEAL_DATA_DIR points the app
+# at another data directory (e.g. a synthetic dataset for load tests)
+DATA_DIR = Path(os.getenv('MEAL_DATA_DIR') or Path(__file__).parent.parent / 'data').resolve()
 RECIPES_FILE = DATA_DIR / 'recipes.json'
 PANTRY_FILE = DATA_DIR / 'Pantry_ingredients.json'
 PLAN_FILE = DATA_DIR / 'plan.json'
 COOKED_FILE = DATA_DIR / 'Pantry_recipe_cooked.json'
 SHOPPING_TRANSACTIONS_FILE = DATA_DIR / 'shopping_transactions.json'
+STATS_SNAPSHOT_FILE = DATA_DIR / 'stats_snapshot.json'
+PROFILES_DIR = DATA_DIR / 'profiles'
+PDF_CACHE_DIR = DATA_DIR / 'pdf_cache'
 
-__all__ = ['DATA_DIR','RECIPES_FILE','PANTRY_FILE','PLAN_FILE','COOKED_FILE','SHOPPING_TRANSACTIONS_FILE']
+__all__ = ['DATA_DIR','RECIPES_FILE','PANTRY_FILE','PLAN_FILE','COOKED_FILE','SHOPPING_TRANSACTIONS_FILE',
+           'STATS_SNAPSHOT_FILE','PROFILES_DIR','PDF_CACHE_DIR']
 
@@ -0,0 +1,173 @@
+"""Disk cache for the rendered week PDFs of /export_pdf.
+
+A PDF only depends on the content of its plan week and on the layout, so it is stored as
+
+    data/pdf_cache/<year>-W<week>_<key>.pdf     key = hash(plan_week_version, week, year,
+                                                          PDF_TEMPLATE_VERSION)
+
+and served again while the week is unchanged; the key doubles as the response ETag. Editing
+a week changes its content hash, so the old file can never be served for the new plan; the
+plan repository also calls invalidate_pdf_week() on every write, which deletes the week's
+files right away. Like the fragment cache, compute the key *before* loading the plan.
+
+The cache is shared by all workers through the file system. Recency is the file mtime
+(touched on every hit); beyond PDF_CACHE_MAX_MB / PDF_CACHE_MAX_ENTRIES the least recently
+used files are deleted. PDF_CACHE_MAX_MB=0 disables the cache.
+"""
+from __future__ import annotations
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from meal.infra.metrics import record_read, record_write
+from meal.infra.paths import PDF_CACHE_DIR
+from meal.infra.pdf_utils import PDF_TEMPLATE_VERSION
+from meal.infra.versions import plan_week_version
+from meal.utilities.config import PDF_CACHE_MAX_ENTRIES, PDF_CACHE_MAX_MB
+
+__all__ = ['PdfCache', 'PDF_CACHE', 'invalidate_pdf_week']
+
+logger = logging.getLogger(__name__)
+
+# Any int the route accepts (year 5, week 123, negatives): a name the pattern missed would never be evicted
+_ENTRY = re.compile(r'^(-?\d+)-W(-?\d+)_([0-9a-f]+)\.pdf$')
+
+
+def _prefix(week: int, year: int) -> str:
+    return f"{year}-W{week:02d}_"
+
+
+class PdfCache:
+    def __init__(self, directory: Path | str = PDF_CACHE_DIR, max_bytes: int = int(PDF_CACHE_MAX_MB * 1024 * 1024),
+                 max_entries: int = PDF_CACHE_MAX_ENTRIES, template_version: int = PDF_TEMPLATE_VERSION):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.template_version = template_version
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.max_entries > 0
+
+    def key(self, week: int, year: int) -> str:
+        """Content key of the week's PDF (also its ETag); cheap, reads plan.json only when it changed."""
+        raw = f"{plan_week_version(week, year)}|{year}|{week}|{self.template_version}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
+
+    def _path(self, week: int, year: int, key: str) -> Path:
+        return self.directory / f"{_prefix(week, year)}{key}.pdf"
+
+    def get(self, week: int, year: int, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        path = self._path(week, year, key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        record_read(path)
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, week: int, year: int, key: str, data: bytes) -> None:
+        if not self.enabled:
+            return
+        path = self._path(week, year, key)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix='.tmp_', suffix='.pdf')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            finally:
+                if os.path.exists(tmp):
+                    os.remove(tmp)
+        except OSError as e:
+            logger.warning("Could not cache PDF %s: %s", path.name, e)
+            return
+        record_write(path)
+        # older versions of the same week can never be hit again
+        self._remove(entry for entry in self._entries()
+                     if entry[0].name.startswith(_prefix(week, year)) and entry[0] != path)
+        self._evict()
+
+    def invalidate_week(self, week: int, year: int) -> int:
+        """Delete every cached PDF of the week; returns how many were removed."""
+        removed = self._remove(entry for entry in self._entries() if entry[0].name.startswith(_prefix(week, year)))
+        with self._lock:
+            self.invalidations += removed
+        return removed
+
+    def clear(self) -> None:
+        self._remove(self._entries())
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        """(path, size, mtime) of the cached PDFs."""
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            if not _ENTRY.match(name):
+                continue
+            path = self.directory / name
+            try:
+                st = path.stat()
+            except OSError:
+                continue  # removed concurrently
+            entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def _remove(self, entries) -> int:
+        removed = 0
+        for path, _, _ in list(entries):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass
+        return removed
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda e: e[2])  # least recently used first
+        total = sum(size for _, size, _ in entries)
+        victims = []
+        while entries and (total > self.max_bytes or len(entries) > self.max_entries):
+            victim = entries.pop(0)
+            victims.append(victim)
+            total -= victim[1]
+        evicted = self._remove(victims)
+        with self._lock:
+            self.evictions += evicted
+
+    def stats(self) -> Dict[str, int]:
+        entries = self._entries()
+        with self._lock:
+            return {'entries': len(entries), 'bytes': sum(size for _, size, _ in entries),
+                    'max_entries': self.max_entries, 'max_bytes': self.max_bytes, 'hits': self.hits,
+                    'misses': self.misses, 'evictions': self.evictions, 'invalidations': self.invalidations}
+
+
+PDF_CACHE = PdfCache()
+
+
+def invalidate_pdf_week(week: int, year: int) -> None:
+    """Drop the cached PDFs of a plan week (called by the plan repository after writes)."""
+    if PDF_CACHE.enabled:
+        PDF_CACHE.invalidate_week(week, year)
@@ -1,11 +1,18 @@
 import io
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
+from meal.infra.tracing import traced
 
+# Bump whenever the PDF layout below changes: cached PDFs (meal.infra.pdf_cache) are keyed by it
+PDF_TEMPLATE_VERSION = 1
+
+@traced()
 def generate_pdf_for_week(plan):
     """Generate a simple PDF table: Day / Breakfast / Lunch / Dinner for the provided plan."""
+    # reportlab takes ~100 ms to import and PDF export is rare: load it on first use
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
     buf = io.BytesIO()
     doc = SimpleDocTemplate(
         buf, pagesize=landscape(A4),
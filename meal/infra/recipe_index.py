@@ -0,0 +1,159 @@
+"""Recipe catalog index: precomputed card projections + keyset pagination.
+
+recipes.json is parsed once per file version into card dicts (the shape the recipes page
+and the slot pickers render: formatted ingredient lines, image file, calories, macros),
+sorted by name. Listing a page is then a bisect on the sort key plus a slice, and a tag
+filter is a bisect into that tag's precomputed position list.
+
+Pagination is keyset based: the cursor is the (opaque, base64) sort key of the last item
+returned, so pages stay stable when recipes are added before the cursor, and fetching page
+N costs the same as page 1.
+
+    index = get_recipe_index()
+    items, next_cursor, total = index.page(tag='vegan', cursor=None, limit=24)
+"""
+from __future__ import annotations
+import base64
+import json
+import logging
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from meal.infra.metrics import record_read
+from meal.infra.paths import RECIPES_FILE
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['RecipeIndex', 'recipe_card', 'CARD_FIELDS', 'encode_cursor', 'decode_cursor',
+           'get_recipe_index', 'invalidate_recipe_index']
+
+CARD_FIELDS = ('name', 'servings', 'ingredients', 'image', 'tags', 'calories_per_serving', 'macros')
+
+SortKey = Tuple[str, str]
+
+
+def _sort_key(name: str) -> SortKey:
+    return (name.casefold(), name)
+
+
+def recipe_card(r: Dict[str, Any]) -> Dict[str, Any]:
+    """Card projection of a raw recipe dict (what list views render)."""
+    name = r.get('name', '')
+    calories = r.get('calories_per_serving')
+    if calories is None:
+        calories = r.get('kalories_per_serving', r.get('caloriesPerServing'))
+    macros_raw = r.get('macros', {}) or {}
+    return {
+        "name": name,
+        "servings": r.get('servings', ''),
+        "ingredients": [
+            f"{i.get('name', '')}, {i.get('default_quantity', '')} {i.get('unit', '')}".strip(", ")
+            for i in r.get('ingredients', []) if isinstance(i, dict)
+        ],
+        "image": r.get('image') or (name.lower().replace(' ', '_') + '.jpg'),
+        "tags": list(r.get('tags', []) or []),
+        "calories_per_serving": calories,
+        "macros": {
+            "protein": macros_raw.get("protein", 0),
+            "carbohydrates": macros_raw.get("carbohydrates", macros_raw.get("carbs", 0)),
+            "fats": macros_raw.get("fats", macros_raw.get("fat", 0)),
+        },
+    }
+
+
+def encode_cursor(key: SortKey) -> str:
+    raw = json.dumps(list(key), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        folded, name = json.loads(raw.decode('utf-8'))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(folded, str) or not isinstance(name, str):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return folded, name
+
+
+class RecipeIndex:
+    """Immutable, name-sorted view of the catalog as card projections."""
+
+    def __init__(self, recipes: List[Dict[str, Any]]):
+        cards = [recipe_card(r) for r in recipes or [] if isinstance(r, dict) and r.get('name')]
+        cards.sort(key=lambda c: _sort_key(c['name']))
+        self._cards: List[Dict[str, Any]] = cards
+        self._keys: List[SortKey] = [_sort_key(c['name']) for c in cards]
+        self.by_name: Dict[str, Dict[str, Any]] = {c['name']: c for c in cards}
+        self._tag_positions: Dict[str, List[int]] = {}
+        for pos, card in enumerate(cards):
+            for tag in dict.fromkeys(card['tags']):
+                self._tag_positions.setdefault(tag, []).append(pos)
+        self.tags: List[str] = sorted(self._tag_positions)
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self.by_name.get(name)
+
+    def page(self, *, tag: Optional[str] = None, cursor: Optional[str] = None,
+             limit: int = 24) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+        """Return (cards, next_cursor, total matching) for the page after `cursor`."""
+        start = bisect_right(self._keys, decode_cursor(cursor)) if cursor else 0
+        limit = max(0, limit)
+        if tag:
+            positions = self._tag_positions.get(tag, [])
+            first = bisect_left(positions, start)
+            chosen = positions[first:first + limit]
+            more = first + limit < len(positions)
+            total = len(positions)
+        else:
+            chosen = range(start, min(len(self._cards), start + limit))
+            more = start + limit < len(self._cards)
+            total = len(self._cards)
+        items = [self._cards[p] for p in chosen]
+        next_cursor = encode_cursor(self._keys[chosen[-1]]) if more and items else None
+        return items, next_cursor, total
+
+
+_cache: Dict[Path, Tuple[Tuple[int, int], RecipeIndex]] = {}
+_cache_lock = Lock()
+
+
+def get_recipe_index(path: Path | str | None = None) -> RecipeIndex:
+    """Return the RecipeIndex for a recipes file (default RECIPES_FILE), cached until it changes."""
+    p = Path(path) if path else RECIPES_FILE
+    try:
+        st = p.stat()
+        token = (st.st_mtime_ns, st.st_size)
+    except OSError:
+        return RecipeIndex([])
+    with _cache_lock:
+        hit = _cache.get(p)
+        if hit and hit[0] == token:
+            return hit[1]
+    try:
+        with open(p, encoding='utf-8') as f:
+            recipes = json.load(f)
+        record_read(p)
+    except Exception as e:
+        logger.error("Failed to load recipe index from %s: %s", p, e)
+        recipes = []
+    index = RecipeIndex(recipes if isinstance(recipes, list) else [])
+    with _cache_lock:
+        _cache[p] = (token, index)
+    return index
+
+
+def invalidate_recipe_index(path: Path | str | None = None) -> None:
+    """Drop the cached index (all files when path is None)."""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(Path(path), None)
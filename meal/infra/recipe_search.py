@@ -0,0 +1,705 @@
+"""In-memory full-text search over recipes (inverted index + BM25).
+
+Every recipe is tokenized with the shared stemmer (meal.utilities.stemming) over four
+fields, weighted when counting term frequency:
+
+    name x3, tags x2, ingredient names x1.5, steps x1
+
+Query syntax (case-insensitive terms, operators in upper case):
+
+    chicken rice          AND (default): both terms must match
+    chicken OR tofu       OR between groups; a group is a run of AND-ed terms
+    tom*                  prefix match (expands to the MAX_PREFIX_EXPANSIONS most frequent indexed
+                          terms; 1-2 character prefixes to SHORT_PREFIX_EXPANSIONS)
+
+Results are ranked by BM25 (k1=1.2, b=0.75), summed over the terms of the matching groups;
+a term or group repeated in the query counts once.
+
+Speed at large catalogs (tens of thousands of recipes) comes from:
+    * top-k retrieval with the threshold algorithm over impact-ordered (best score first)
+      posting lists, so a query usually reads only the heads of its lists instead of scoring
+      every matching recipe;
+    * when the lists are too flat for that to stop early (common, uncorrelated terms), match
+      patterns: the documents matching a set of query groups are found with C-level set
+      intersections, best possible pattern first, and scoring stops at the first pattern whose
+      upper bound cannot reach the current k-th score;
+    * prefixes merge their expansions' impact lists lazily (a type-ahead query reads about k
+      entries) and stay cached (PREFIX_CACHE_SIZE) with what was merged so far, so the next
+      query with the same prefix does not merge again; the expansions of every 1-2 character
+      prefix are kept precomputed instead of scanning thousands of vocabulary entries;
+    * impact lists of frequent terms are kept (and updated in place on appends), rarer ones
+      are built on demand into a bounded LRU;
+    * per-document length normalisation is precomputed and only refreshed when the average
+      document length drifts by more than NORM_DRIFT;
+    * a small LRU of recent query results, cleared whenever the index changes.
+
+`python -m meal.tools.bench_search` measures query latency on a 50k-recipe synthetic catalog.
+
+The index is built once per recipes.json version (get_search_index) and updated in place
+when recipes are appended (recipes_appended), instead of being rebuilt from scratch.
+"""
+from __future__ import annotations
+import heapq
+import json
+import logging
+import math
+import re
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from itertools import islice
+from operator import itemgetter
+from pathlib import Path
+from threading import Lock, RLock
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from meal.infra.metrics import record_read
+from meal.infra.paths import RECIPES_FILE
+from meal.utilities.stemming import tokenize
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['RecipeSearchIndex', 'parse_query', 'get_search_index', 'recipes_appended', 'invalidate_search_index']
+
+FIELD_WEIGHTS = {'name': 3.0, 'tags': 2.0, 'ingredients': 1.5, 'steps': 1.0}
+K1 = 1.2
+B = 0.75
+MAX_PREFIX_EXPANSIONS = 64
+SHORT_PREFIX_EXPANSIONS = {1: 8, 2: 16}  # fewer, precomputed expansions for 1-2 character prefixes
+NORM_DRIFT = 0.02        # recompute length norms when avgdl moved by more than 2%
+IMPACT_CACHE_SIZE = 512  # rarer terms with a cached score-ordered posting list
+EAGER_IMPACT_DF = 256    # terms in at least this many recipes keep their list permanently
+QUERY_CACHE_SIZE = 256
+TA_DEPTH = 32            # list heads read by the threshold algorithm before pruning by match pattern
+MAX_PATTERN_GROUPS = 6   # OR groups enumerated as match patterns (2**6 - 1 subsets)
+PATTERN_SCORE_ALL = 256  # match patterns with at most this many recipes are scored outright
+PREFIX_CACHE_SIZE = 64   # resolved prefix terms (merged impact list read so far, document set)
+
+_PREFIX_RE = re.compile(r"[^\W_]+")
+
+# (term, is_prefix); a group is AND-ed, groups are OR-ed
+Query = List[List[Tuple[str, bool]]]
+
+
+def parse_query(q: str, *, prefix_last: bool = False) -> Query:
+    """Parse a query string into OR-groups of (term, is_prefix) AND-terms."""
+    groups: Query = [[]]
+    raw_terms = (q or '').split()
+    for pos, raw in enumerate(raw_terms):
+        if raw in ('OR', '|'):
+            if groups[-1]:
+                groups.append([])
+            continue
+        if raw == 'AND':
+            continue
+        is_prefix = raw.endswith('*') or (prefix_last and pos == len(raw_terms) - 1)
+        if is_prefix:
+            # prefixes are matched unstemmed ("chees*" must not become "chee")
+            words = _PREFIX_RE.findall(raw.rstrip('*').casefold())
+            groups[-1].extend((w, False) for w in (tokenize(' '.join(words[:-1])) if words[:-1] else []))
+            if words:
+                groups[-1].append((words[-1], True))
+        else:
+            groups[-1].extend((t, False) for t in tokenize(raw))
+    return [g for g in groups if g]
+
+
+def _recipe_fields(recipe: Dict[str, Any]) -> Dict[str, List[str]]:
+    ingredients = recipe.get('ingredients') or []
+    steps = recipe.get('steps') or []
+    return {
+        'name': tokenize(recipe.get('name', '')),
+        'tags': [t for tag in recipe.get('tags') or [] for t in tokenize(str(tag))],
+        'ingredients': [t for ing in ingredients if isinstance(ing, dict) for t in tokenize(ing.get('name', ''))],
+        'steps': [t for step in (steps if isinstance(steps, list) else [steps]) for t in tokenize(str(step))],
+    }
+
+
+class RecipeSearchIndex:
+    def __init__(self, recipes: Iterable[Dict[str, Any]] = ()):
+        self._names: List[str] = []
+        self._lengths: List[float] = []
+        self._total_length = 0.0
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._terms: List[str] = []   # sorted vocabulary for prefix lookups
+        self._short_prefixes: Dict[str, List[Tuple[int, str]]] = {}  # prefix -> min-heap of (df, term)
+        self._norm: List[float] = []
+        self._norm_avgdl = 0.0
+        self._impacts: "OrderedDict[str, List[Tuple[float, int]]]" = OrderedDict()
+        self._eager: Dict[str, List[Tuple[float, int]]] = {}  # impact lists of frequent terms, always kept
+        self._prefixes: "OrderedDict[Tuple[str, ...], _QueryTerm]" = OrderedDict()  # expansions -> prefix term
+        self._queries: "OrderedDict[Tuple[str, int, bool], List[Tuple[str, float]]]" = OrderedDict()
+        self._lock = RLock()
+        self.version = 0
+        self.source_count = 0  # entries consumed from the recipes file, including skipped ones
+        self.add_many(recipes)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    # --- building ---------------------------------------------------------
+    def add_many(self, recipes: Iterable[Dict[str, Any]]) -> int:
+        """Index recipes (appended after the existing ones); returns how many were added."""
+        added = 0
+        with self._lock:
+            touched = set()
+            new_terms = []
+            for recipe in recipes:
+                self.source_count += 1
+                if not isinstance(recipe, dict) or not recipe.get('name'):
+                    continue
+                doc = len(self._names)
+                self._names.append(recipe['name'])
+                tf: Dict[str, float] = {}
+                for field, tokens in _recipe_fields(recipe).items():
+                    weight = FIELD_WEIGHTS[field]
+                    for t in tokens:
+                        tf[t] = tf.get(t, 0.0) + weight
+                length = sum(tf.values())
+                self._lengths.append(length)
+                self._total_length += length
+                for term, freq in tf.items():
+                    posting = self._postings.get(term)
+                    if posting is None:
+                        posting = self._postings[term] = {}
+                        new_terms.append(term)
+                    posting[doc] = freq
+                touched.update(tf)
+                added += 1
+            if added:
+                self._update_vocabulary(new_terms, touched)
+                first_new = len(self._names) - added
+                if self._refresh_norms():
+                    for term, posting in self._postings.items():
+                        if len(posting) >= EAGER_IMPACT_DF:
+                            self._impact_list(term)
+                else:
+                    # norms unchanged: slot the new documents into the frequent terms' lists
+                    for term in touched:
+                        self._impacts.pop(term, None)
+                        ordered = self._eager.get(term)
+                        if ordered is not None:
+                            posting = self._postings[term]
+                            for doc in range(first_new, len(self._names)):
+                                if doc in posting:
+                                    insort(ordered, (-self._saturation(posting[doc], doc), doc))
+                self._prefixes.clear()
+                self._queries.clear()
+                self.version += 1
+        return added
+
+    def clear_query_cache(self) -> None:
+        with self._lock:
+            self._queries.clear()
+
+    def add(self, recipe: Dict[str, Any]) -> bool:
+        return self.add_many([recipe]) == 1
+
+    def _avgdl(self) -> float:
+        return (self._total_length / len(self._lengths)) if self._lengths else 1.0
+
+    def _refresh_norms(self) -> bool:
+        """Extend the length norms; returns True when they were all recomputed."""
+        avgdl = self._avgdl() or 1.0
+        if not self._norm_avgdl or abs(avgdl - self._norm_avgdl) / self._norm_avgdl > NORM_DRIFT:
+            self._norm_avgdl = avgdl
+            self._norm = [K1 * (1 - B + B * dl / avgdl) for dl in self._lengths]
+            self._impacts.clear()
+            self._eager.clear()
+            return True
+        for dl in self._lengths[len(self._norm):]:  # new documents only
+            self._norm.append(K1 * (1 - B + B * dl / self._norm_avgdl))
+        return False
+
+    def _update_vocabulary(self, new_terms: List[str], touched: Iterable[str]) -> None:
+        """Keep the sorted vocabulary and the short-prefix expansions current after an add."""
+        if len(new_terms) > 64 or not self._terms:
+            self._terms = sorted(self._postings)
+        else:
+            for term in new_terms:
+                insort(self._terms, term)
+        fresh = not self._short_prefixes
+        postings = self._postings
+        for term in (self._terms if fresh else touched):
+            df = len(postings[term])
+            for n, cap in SHORT_PREFIX_EXPANSIONS.items():
+                if len(term) < n:
+                    continue
+                heap = self._short_prefixes.setdefault(term[:n], [])
+                if not fresh and any(t == term for _, t in heap):
+                    heap[:] = [(len(postings[t]), t) for _, t in heap]  # its df grew
+                    heapq.heapify(heap)
+                elif len(heap) < cap:
+                    heapq.heappush(heap, (df, term))
+                elif (df, term) > heap[0]:
+                    heapq.heapreplace(heap, (df, term))
+
+    # --- scoring ----------------------------------------------------------
+    def _idf(self, df: int) -> float:
+        n = len(self._names)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _saturation(self, tf: float, doc: int) -> float:
+        """BM25 term-frequency component (the score without the idf factor)."""
+        return tf * (K1 + 1) / (tf + self._norm[doc])
+
+    def _impact_list(self, term: str) -> List[Tuple[float, int]]:
+        """Postings of a term as (-saturation, doc), best first.
+
+        The idf factor is left out (it changes with every added recipe but is the same for the
+        whole list), so appends keep the stored lists valid; callers multiply by `_idf`.
+        """
+        cached = self._eager.get(term)
+        if cached is not None:
+            return cached
+        cached = self._impacts.get(term)
+        if cached is not None:
+            self._impacts.move_to_end(term)
+            return cached
+        norm = self._norm
+        k = K1 + 1
+        ordered = sorted((-tf * k / (tf + norm[d]), d) for d, tf in self._postings[term].items())
+        if len(ordered) >= EAGER_IMPACT_DF:
+            self._eager[term] = ordered
+        else:
+            self._impacts[term] = ordered
+            while len(self._impacts) > IMPACT_CACHE_SIZE:
+                self._impacts.popitem(last=False)
+        return ordered
+
+    def _expand(self, prefix: str) -> List[str]:
+        """The most frequent indexed terms starting with `prefix` (precomputed for short ones)."""
+        if len(prefix) in SHORT_PREFIX_EXPANSIONS:
+            return [t for _, t in self._short_prefixes.get(prefix, ())]
+        terms = self._terms
+        i = bisect_left(terms, prefix)
+        found = []
+        while i < len(terms) and terms[i].startswith(prefix):
+            found.append(terms[i])
+            i += 1
+        if len(found) > MAX_PREFIX_EXPANSIONS:
+            found = heapq.nlargest(MAX_PREFIX_EXPANSIONS, found, key=lambda t: (len(self._postings[t]), t))
+        return found
+
+    def _query_term(self, terms: List[str]) -> "_QueryTerm":
+        """A word, or the expansions of a prefix; prefix terms are kept (LRU) with what was merged so far."""
+        key = tuple(terms)
+        term = self._prefixes.get(key)
+        if term is not None:
+            self._prefixes.move_to_end(key)
+            return term
+        postings = self._postings
+        term = _QueryTerm(key, [(postings[t], self._idf(len(postings[t])), self._impact_list(t)) for t in terms])
+        if len(terms) > 1:
+            self._prefixes[key] = term
+            while len(self._prefixes) > PREFIX_CACHE_SIZE:
+                self._prefixes.popitem(last=False)
+        return term
+
+    def _top_k(self, groups: List[List["_QueryTerm"]], limit: int) -> List[Tuple[int, float]]:
+        """Threshold algorithm over the heads of impact-ordered posting lists.
+
+        The first TA_DEPTH entries of every list are read and the documents found are scored
+        exactly. A document not seen yet scores at most the sum, over the groups that can still
+        match new documents, of the list scores at that depth (an AND group is finished once any
+        of its lists is exhausted). When the k-th best seen score reaches that bound the top k
+        is final, which settles correlated lists (terms most recipes share) and rare terms;
+        otherwise the match patterns take over.
+        """
+        top = _TopK(limit)
+        score = _scorer(groups, self._norm)
+        depth = max(limit, TA_DEPTH)
+        for group in groups:
+            for term in group:
+                for doc in term.docs(0, depth):
+                    if doc not in top.seen:
+                        top.offer(doc, score(doc))
+        threshold = 0.0
+        open_groups = False
+        for group in groups:
+            bounds = [term.bound(depth) for term in group]
+            if None not in bounds:
+                open_groups = True
+                threshold += sum(bounds)
+        if not open_groups or top.reaches(threshold):
+            return top.result()
+        return self._top_by_pattern(groups, top, score)
+
+    def _top_by_pattern(self, groups: List[List["_QueryTerm"]], top: "_TopK",
+                        score: Callable[[int], float]) -> List[Tuple[int, float]]:
+        """Exact top k by match pattern, for lists too flat to stop early.
+
+        A document matching exactly the groups in P scores at most the sum of their best scores.
+        Patterns are visited from the highest bound down, so when P comes up every document that
+        also matches another group has been seen or cannot reach the top k. The documents of P
+        are a set intersection (C speed); a small one is scored outright. A large one is read in
+        the impact order of P's strongest term, until that term's score plus the best scores the
+        other terms reach within P cannot reach the k-th score. Stops at the first pattern whose
+        bound cannot either.
+        """
+        if len(groups) > MAX_PATTERN_GROUPS:
+            return self._score_all(groups, top.limit)
+        matches = [self._group_docs(group) for group in groups]
+        uppers = [sum(term.bound(0) for term in group) for group in groups]
+        patterns = []
+        for mask in range(1, 1 << len(groups)):
+            members = [i for i in range(len(groups)) if mask >> i & 1]
+            patterns.append((sum(uppers[i] for i in members), members))
+        patterns.sort(key=itemgetter(0), reverse=True)
+        seen = top.seen
+        for bound, members in patterns:
+            if top.reaches(bound):
+                break
+            candidates = _intersect([matches[i] for i in members])
+            if len(candidates) <= PATTERN_SCORE_ALL:
+                for doc in candidates:
+                    if doc not in seen:
+                        top.offer(doc, score(doc))
+                continue
+            bounds = []
+            for i in members:
+                for term in groups[i]:
+                    bound_in, few = term.bound_within(candidates)
+                    for doc in few:  # candidates with the term's rare strong expansions
+                        if doc not in seen:
+                            top.offer(doc, score(doc))
+                    bounds.append((bound_in, term))
+            bounds.sort(key=itemgetter(0), reverse=True)
+            if top.reaches(sum(b for b, _ in bounds)):
+                continue
+            driver = bounds[0][1]
+            rest = sum(b for b, _ in bounds[1:])
+            position, step = 0, max(top.limit, TA_DEPTH)
+            while True:
+                for doc in driver.docs(position, position + step):
+                    if doc not in seen and doc in candidates:
+                        top.offer(doc, score(doc))
+                position += step
+                step *= 2
+                below = driver.bound(position)
+                if below is None or top.reaches(below + rest):
+                    break
+        return top.result()
+
+    def _group_docs(self, group: List["_QueryTerm"]) -> Any:
+        """Documents matching every term of an AND group; terms in every document are left out."""
+        count = len(self._names)
+        sets = [term.doc_set() for term in group]
+        narrowing = [docs for term, docs in zip(group, sets)
+                     if not any(len(posting) == count for posting, _, _ in term.parts)]
+        return _intersect(narrowing or sets[:1])
+
+    def _score_all(self, groups: List[List["_QueryTerm"]], limit: int) -> List[Tuple[int, float]]:
+        score = _scorer(groups, self._norm)
+        docs = set().union(*(self._group_docs(group) for group in groups))
+        return heapq.nlargest(limit, ((d, score(d)) for d in docs), key=lambda e: (e[1], -e[0]))  # ties: doc order
+
+    def _top_exhaustive(self, groups: List[List[List[str]]], limit: int) -> List[Tuple[int, float]]:
+        """Score every matching recipe (reference for the early-terminating paths)."""
+        with self._lock:
+            return self._score_all([[self._query_term(terms) for terms in group] for group in groups], limit)
+
+    def search(self, q: str, *, limit: int = 20, prefix_last: bool = False) -> List[Tuple[str, float]]:
+        """Top `limit` (recipe name, score) pairs for a query, best first."""
+        key = (q.strip(), limit, prefix_last)
+        with self._lock:
+            hit = self._queries.get(key)
+            if hit is not None:
+                self._queries.move_to_end(key)
+                return hit
+            groups = {}  # repeated terms and groups count once: "rice OR rice" is "rice"
+            for group in parse_query(q, prefix_last=prefix_last):
+                resolved: Optional[Dict[Tuple[str, ...], _QueryTerm]] = {}
+                for term, is_prefix in group:
+                    terms = tuple(t for t in (self._expand(term) if is_prefix else [term]) if t in self._postings)
+                    if not terms:
+                        resolved = None  # an AND group with an unknown term matches nothing
+                        break
+                    if terms not in resolved:
+                        resolved[terms] = self._query_term(list(terms))
+                if resolved:
+                    groups.setdefault(frozenset(resolved), list(resolved.values()))
+            groups = list(groups.values())
+            if not groups or limit <= 0:
+                top = []
+            elif len(groups) == 1 and len(groups[0]) == 1:
+                top = groups[0][0].top(limit)  # one word or prefix: the head of its list
+            else:
+                top = self._top_k(groups, limit)
+            result = [(self._names[d], round(s, 4)) for d, s in top]
+            self._queries[key] = result
+            while len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+            return result
+
+
+def _intersect(sets: List[Any]) -> Any:
+    """Intersection of doc sets / dict key views, smallest first, at C speed.
+
+    A prefix's documents (_PrefixDocs) are intersected expansion by expansion instead of
+    building their union first.
+    """
+    sets = sorted(sets, key=len)
+    result = sets[0]
+    if isinstance(result, _PrefixDocs):
+        result = result.materialize()
+    for other in sets[1:]:
+        if not result:
+            break
+        if isinstance(other, _PrefixDocs):
+            # largest expansion first: a common one often covers every document already
+            found: set = set()
+            for posting in sorted(other.postings, key=len, reverse=True):
+                found |= _and(posting.keys(), result)
+                if len(found) == len(result):
+                    break
+            result = found
+        else:
+            result = _and(result, other)
+    return result
+
+
+def _and(a: Any, b: Any) -> Any:
+    # set & view iterates the whole view; view & set (or set & set) iterates the smaller side
+    if isinstance(a, (set, frozenset)) and not isinstance(b, (set, frozenset)):
+        a, b = b, a
+    return a & b
+
+
+class _TopK:
+    """The best `limit` (score, doc) pairs seen so far, as a min-heap; `seen` holds every doc offered."""
+    __slots__ = ('limit', 'heap', 'seen')
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.heap: List[Tuple[float, int]] = []
+        self.seen: set = set()
+
+    def offer(self, doc: int, score: float) -> None:
+        self.seen.add(doc)
+        if score <= 0:
+            return
+        if len(self.heap) < self.limit:
+            heapq.heappush(self.heap, (score, -doc))
+        elif (score, -doc) > self.heap[0]:
+            heapq.heapreplace(self.heap, (score, -doc))
+
+    def reaches(self, bound: float) -> bool:
+        """True when no unseen document scoring at most `bound` can enter the top k."""
+        return len(self.heap) == self.limit and self.heap[0][0] >= bound
+
+    def result(self) -> List[Tuple[int, float]]:
+        return [(-neg_doc, score) for score, neg_doc in sorted(self.heap, reverse=True)]
+
+
+def _scorer(groups: List[List["_QueryTerm"]], norm: List[float]) -> Callable[[int], float]:
+    """Full query score of a document: the sum over the OR groups it matches completely.
+
+    A word scores idf * tf * (k1 + 1) / (tf + norm); a prefix the best of its expansions.
+    """
+    plan = [[[(posting.get, idf * (K1 + 1)) for posting, idf, _ in term.parts] for term in group]
+            for group in groups]
+
+    def score(doc: int) -> float:
+        n = norm[doc]
+        total = 0.0
+        for group in plan:
+            part = 0.0
+            for parts in group:
+                best = 0.0
+                for get, weight in parts:
+                    tf = get(doc)
+                    if tf is not None:
+                        s = weight * tf / (tf + n)
+                        if s > best:
+                            best = s
+                if not best:
+                    part = 0.0
+                    break
+                part += best
+            total += part
+        return total
+
+    return score
+
+
+class _QueryTerm:
+    """One resolved query term: an indexed word, or the expansions of a prefix.
+
+    Its impact list is the word's, or the expansions' lists (scaled by their idf) merged
+    lazily; in the merged stream a document first shows up with its best expansion, which is
+    its score for the prefix. Entries are only pulled from the merge as far as they are read,
+    and the index keeps prefix terms between queries, so what was merged once is reused.
+    """
+    __slots__ = ('terms', 'parts', '_buffer', '_factor', '_stream', 'docs_union')
+
+    def __init__(self, terms: Tuple[str, ...], parts: List[Tuple[Dict[int, float], float, List[Tuple[float, int]]]]):
+        self.terms = terms
+        self.parts = parts  # (posting, idf, impact list) per term
+        self.docs_union: Optional[frozenset] = None  # a prefix's documents, once built
+        if len(parts) == 1:
+            self._buffer, self._factor, self._stream = parts[0][2], parts[0][1], None
+        else:
+            self._buffer, self._factor = [], 1.0
+            self._stream = heapq.merge(*[_scaled(lst, idf) for _, idf, lst in parts])
+
+    def _fill(self, n: int) -> None:
+        if self._stream is not None and len(self._buffer) < n:
+            self._buffer.extend(islice(self._stream, n - len(self._buffer)))
+            if len(self._buffer) < n:
+                self._stream = None
+
+    def bound(self, position: int) -> Optional[float]:
+        """Score at `position` of the impact list (an upper bound past it); None once exhausted."""
+        self._fill(position + 1)
+        if position >= len(self._buffer):
+            return None
+        return -self._buffer[position][0] * self._factor
+
+    def docs(self, start: int, end: int) -> List[int]:
+        self._fill(end)
+        return [d for _, d in self._buffer[start:end]]
+
+    def top(self, limit: int) -> List[Tuple[int, float]]:
+        """Best `limit` documents for this term alone."""
+        if self._stream is None and len(self.parts) == 1:
+            return [(d, -neg * self._factor) for neg, d in self._buffer[:limit]]
+        found: Dict[int, float] = {}
+        position = 0
+        while len(found) < limit:
+            self._fill(position + limit)
+            chunk = self._buffer[position:position + limit]
+            if not chunk:
+                break
+            for neg, d in chunk:
+                if d not in found and len(found) < limit:
+                    found[d] = -neg
+            position += len(chunk)
+        return list(found.items())
+
+    def bound_within(self, docs: Any) -> Tuple[float, List[int]]:
+        """Best score of the term among `docs`, and the documents that bound leaves out.
+
+        Each list is read up to the first of `docs`. A prefix's strongest expansions are peeled
+        off while only a few of `docs` contain them: those documents are returned (to be scored
+        outright) and the bound drops to the next expansion, so one rare strong expansion does
+        not loosen the bound for all the others.
+        """
+        found = []
+        for _, idf, impacts in self.parts:
+            for neg, doc in impacts:
+                if doc in docs:
+                    found.append(-neg * idf)
+                    break
+            else:
+                found.append(0.0)
+        if len(self.parts) == 1:
+            return found[0], []
+        few: List[int] = []
+        for best, (posting, _, _) in sorted(zip(found, self.parts), key=itemgetter(0), reverse=True):
+            if not best:
+                return 0.0, few
+            inside = _intersect([docs, posting.keys()])
+            if len(few) + len(inside) > PATTERN_SCORE_ALL:
+                return best, few
+            few.extend(inside)
+        return 0.0, few
+
+    def doc_set(self) -> Any:
+        """Documents containing the term: a dict key view, or the union of a prefix's expansions."""
+        if len(self.parts) == 1:
+            return self.parts[0][0].keys()
+        return self.docs_union if self.docs_union is not None else _PrefixDocs(self)
+
+
+class _PrefixDocs:
+    """Documents of a prefix term, before (or instead of) building the union of its expansions.
+
+    len() is the sum of the expansions' lengths, an upper bound of the union's.
+    """
+    __slots__ = ('term', 'postings', '_size')
+
+    def __init__(self, term: _QueryTerm):
+        self.term = term
+        self.postings = [posting for posting, _, _ in term.parts]
+        self._size = sum(len(posting) for posting in self.postings)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def materialize(self) -> frozenset:
+        docs = self.term.docs_union = frozenset().union(*(posting.keys() for posting in self.postings))
+        return docs
+
+
+def _scaled(impacts: List[Tuple[float, int]], idf: float) -> Iterator[Tuple[float, int]]:
+    for neg, d in impacts:
+        yield neg * idf, d
+
+
+_cache: Dict[Path, Tuple[Tuple[int, int], RecipeSearchIndex]] = {}
+_cache_lock = Lock()
+
+
+def _token(p: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = p.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def get_search_index(path: Path | str | None = None) -> RecipeSearchIndex:
+    """Search index for a recipes file (default RECIPES_FILE), rebuilt when the file changes."""
+    p = Path(path) if path else RECIPES_FILE
+    token = _token(p)
+    if token is None:
+        return RecipeSearchIndex()
+    with _cache_lock:
+        hit = _cache.get(p)
+        if hit and hit[0] == token:
+            return hit[1]
+    try:
+        with open(p, encoding='utf-8') as f:
+            recipes = json.load(f)
+        record_read(p)
+    except Exception as e:
+        logger.error("Failed to load recipes for search from %s: %s", p, e)
+        recipes = []
+    index = RecipeSearchIndex(recipes if isinstance(recipes, list) else [])
+    with _cache_lock:
+        _cache[p] = (token, index)
+    return index
+
+
+def recipes_appended(new_recipes: List[Dict[str, Any]], previous_count: int,
+                     path: Path | str | None = None) -> None:
+    """Update a cached index in place after `new_recipes` were appended to the file.
+
+    `previous_count` is the number of recipes in the file before the append; if the cached
+    index does not match it (another writer got in between) the entry is dropped and the next
+    search rebuilds from the file.
+    """
+    p = Path(path) if path else RECIPES_FILE
+    with _cache_lock:
+        hit = _cache.get(p)
+        if hit is None:
+            return
+        index = hit[1]
+        if index.source_count != previous_count:
+            _cache.pop(p, None)
+            return
+        index.add_many(new_recipes)
+        token = _token(p)
+        if token is None:
+            _cache.pop(p, None)
+        else:
+            _cache[p] = (token, index)
+
+
+def invalidate_search_index(path: Path | str | None = None) -> None:
+    """Drop the cached index (all files when path is None)."""
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(Path(path), None)
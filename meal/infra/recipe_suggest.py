@@ -0,0 +1,192 @@
+"""Type-ahead recipe suggestions for the meal-slot picker.
+
+Every recipe name and alias (optional `aliases` list in recipes.json) is folded (case, accents,
+punctuation) and stored in sorted arrays together with each of its word suffixes, so
+"chi" finds "Chicken Curry" and "cur" finds it too:
+
+    NAME  ("chicken curry", doc)   # whole name: best match
+    ALIAS ("murgh masala", doc)
+    WORD  ("curry", doc)           # later word of a name or alias
+
+Matches are ranked by how often the recipe was cooked in the last RECENT_DAYS days (cooked
+log), then by match kind, then alphabetically. There is one array per match kind, so after a
+bisect the uncooked matches are already in rank order and a query reads about `limit` entries.
+
+The key arrays depend only on the catalog and is rebuilt when recipes.json changes; the cook
+counts are recomputed when the cooked log changes (or the day rolls over), which is a range
+query on the date-indexed cooked history.
+"""
+from __future__ import annotations
+import heapq
+import json
+import logging
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from datetime import date as _date, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Tuple
+
+from meal.infra.Cooked_Repository import get_cooked_history
+from meal.infra.metrics import record_read
+from meal.infra.paths import COOKED_FILE, RECIPES_FILE
+from meal.infra.versions import file_version
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['SuggestIndex', 'fold', 'recent_cook_counts', 'suggest_recipes', 'RECENT_DAYS']
+
+RECENT_DAYS = 90
+RESULT_CACHE_SIZE = 256
+
+# match kinds, best first
+NAME, ALIAS, WORD = 0, 1, 2
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def fold(text: str) -> str:
+    """Lower-cased, accent-free words joined by single spaces ("Sauté  Onions!" -> "saute onions")."""
+    if not isinstance(text, str):
+        return ""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(_WORD_RE.findall(stripped))
+
+
+class SuggestIndex:
+    """Per match kind, a sorted (folded key, doc) array over recipe names, aliases and word suffixes."""
+
+    def __init__(self, recipes: List[Dict[str, Any]]):
+        self.names: List[str] = []
+        self._doc_of: Dict[str, int] = {}
+        self._doc_keys: List[Dict[str, int]] = []  # doc -> {key: best kind}
+        entries: Dict[int, List[Tuple[str, int]]] = {NAME: [], ALIAS: [], WORD: []}
+        for recipe in recipes or []:
+            if not isinstance(recipe, dict) or not isinstance(recipe.get('name'), str):
+                continue
+            name = recipe['name']
+            if not name or name in self._doc_of:
+                continue
+            doc = len(self.names)
+            self.names.append(name)
+            self._doc_of[name] = doc
+            aliases = recipe.get('aliases') or []
+            keys: Dict[str, int] = {}
+            for kind, text in [(NAME, name)] + [(ALIAS, a) for a in aliases if isinstance(a, str)]:
+                words = fold(text).split()
+                for i in range(len(words)):
+                    key = ' '.join(words[i:])
+                    k = kind if i == 0 else WORD
+                    if k < keys.get(key, WORD + 1):
+                        keys[key] = k
+            self._doc_keys.append(keys)
+            for key, kind in keys.items():
+                entries[kind].append((key, doc))
+        self._arrays: Dict[int, Tuple[List[str], List[int]]] = {}
+        for kind, pairs in entries.items():
+            pairs.sort()
+            self._arrays[kind] = ([k for k, _ in pairs], [d for _, d in pairs])
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _kind(self, doc: int, prefix: str) -> Optional[int]:
+        """Best match kind of a document for a folded prefix (None: no match)."""
+        kinds = [kind for key, kind in self._doc_keys[doc].items() if key.startswith(prefix)]
+        return min(kinds) if kinds else None
+
+    def suggest(self, q: str, counts: Dict[str, int], limit: int = 10) -> List[Tuple[str, int]]:
+        """Top `limit` (name, recent cooks): most cooked first, then by match kind and name.
+
+        Only the recently cooked recipes (usually a few dozen) are checked one by one; the
+        rest come straight from the sorted arrays, in order, so short prefixes matching
+        thousands of recipes cost `limit` steps instead of a scan of the whole range.
+        """
+        prefix = fold(q)
+        if not prefix or limit <= 0:
+            return []
+        names = self.names
+        cooked = []
+        for name, count in counts.items():
+            doc = self._doc_of.get(name)
+            if doc is None or count <= 0:
+                continue
+            kind = self._kind(doc, prefix)
+            if kind is not None:
+                cooked.append((-count, kind, name.casefold(), doc))
+        chosen = [item[3] for item in heapq.nsmallest(limit, cooked)]
+        taken = set(chosen)
+        for kind in (NAME, ALIAS, WORD):
+            keys, docs = self._arrays[kind]
+            i = bisect_left(keys, prefix)
+            while len(chosen) < limit and i < len(keys) and keys[i].startswith(prefix):
+                doc = docs[i]
+                if doc not in taken and counts.get(names[doc], 0) <= 0 and self._kind(doc, prefix) == kind:
+                    chosen.append(doc)
+                    taken.add(doc)
+                i += 1
+        return [(names[doc], counts.get(names[doc], 0)) for doc in chosen]
+
+
+def recent_cook_counts(today: Optional[_date] = None, days: int = RECENT_DAYS,
+                       path: Path | str | None = None) -> Dict[str, int]:
+    """{recipe name: times cooked in the last `days` days (today included)}."""
+    today = today or _date.today()
+    entries = get_cooked_history(path).range(today - timedelta(days=days - 1), today)
+    return dict(Counter(e.get('name') for e in entries if isinstance(e.get('name'), str)))
+
+
+_lock = Lock()
+_index: Optional[Tuple[str, SuggestIndex]] = None           # (catalog version, index)
+_counts: Optional[Tuple[Tuple[str, str], Dict[str, int]]] = None  # ((cooked version, day), counts)
+_results: "OrderedDict[tuple, List[Tuple[str, int]]]" = OrderedDict()
+
+
+def _load_index(version: str) -> SuggestIndex:
+    global _index
+    with _lock:
+        if _index and _index[0] == version:
+            return _index[1]
+    try:
+        with open(RECIPES_FILE, encoding='utf-8') as f:
+            recipes = json.load(f)
+        record_read(RECIPES_FILE)
+    except Exception as e:
+        logger.error("Failed to load recipes for suggestions from %s: %s", RECIPES_FILE, e)
+        recipes = []
+    index = SuggestIndex(recipes if isinstance(recipes, list) else [])
+    with _lock:
+        _index = (version, index)
+    return index
+
+
+def _load_counts(token: Tuple[str, str]) -> Dict[str, int]:
+    global _counts
+    with _lock:
+        if _counts and _counts[0] == token:
+            return _counts[1]
+    counts = recent_cook_counts(_date.fromisoformat(token[1]))
+    with _lock:
+        _counts = (token, counts)
+    return counts
+
+
+def suggest_recipes(q: str, limit: int = 10) -> List[Tuple[str, int]]:
+    """Suggestions for the live catalog and cooked log: [(name, recent cooks)]."""
+    catalog = file_version(RECIPES_FILE)
+    cooked = (file_version(COOKED_FILE), _date.today().isoformat())
+    key = (catalog, cooked, fold(q), limit)
+    with _lock:
+        hit = _results.get(key)
+        if hit is not None:
+            _results.move_to_end(key)
+            return hit
+    result = _load_index(catalog).suggest(q, _load_counts(cooked), limit)
+    with _lock:
+        _results[key] = result
+        while len(_results) > RESULT_CACHE_SIZE:
+            _results.popitem(last=False)
+    return result
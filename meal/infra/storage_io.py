@@ -0,0 +1,96 @@
+"""Async-safe entry points for blocking storage (and other blocking) I/O.
+
+The repositories read and write JSON files with plain open()/json calls. That is fine in
+sync endpoints (FastAPI already runs those in its threadpool) but stalls every request on
+the worker when done directly inside an `async def` handler. Async handlers go through
+this module instead:
+
+    data = await aread_json(PANTRY_FILE, default=[])
+    await awrite_json(PANTRY_FILE, data)
+    result = await run_io(some_blocking_function, arg)
+
+Work runs on anyio worker threads gated by a dedicated CapacityLimiter (STORAGE_IO_LIMIT),
+so a burst of storage calls cannot exhaust the threadpool that sync endpoints share.
+Context variables are propagated into the worker thread.
+"""
+from __future__ import annotations
+import asyncio
+import functools
+import json
+import os
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Any, Callable, TypeVar
+
+import anyio
+import anyio.to_thread
+
+from meal.infra.metrics import record_read, record_write
+
+__all__ = ['run_io', 'read_json', 'write_json', 'aread_json', 'awrite_json', 'awrite_bytes', 'STORAGE_IO_LIMIT']
+
+T = TypeVar('T')
+
+STORAGE_IO_LIMIT = 8  # concurrent blocking storage operations per event loop
+
+# One limiter per event loop (tests may run several loops in one process)
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, anyio.CapacityLimiter]" = weakref.WeakKeyDictionary()
+
+
+def _limiter() -> anyio.CapacityLimiter:
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = _limiters[loop] = anyio.CapacityLimiter(STORAGE_IO_LIMIT)
+    return limiter
+
+
+async def run_io(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking callable off the event loop on the bounded storage pool."""
+    return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs), limiter=_limiter())
+
+
+# --- Sync primitives (usable from threads / sync endpoints) ---------------
+def read_json(path: Path | str, default: Any = None) -> Any:
+    """Load JSON from path; default when missing or unreadable."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return default
+    record_read(path)
+    return data
+
+
+def write_json(path: Path | str, data: Any, *, indent: int = 2) -> None:
+    """Atomically replace path with data serialized as JSON (temp file + os.replace)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.stem}_", suffix=".json")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as tmp:
+            json.dump(data, tmp, ensure_ascii=False, indent=indent)
+        os.replace(tmp_path, path)
+        record_write(path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_bytes(path: Path | str, data: bytes) -> None:
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+# --- Async entry points ---------------------------------------------------
+async def aread_json(path: Path | str, default: Any = None) -> Any:
+    return await run_io(read_json, path, default)
+
+
+async def awrite_json(path: Path | str, data: Any, *, indent: int = 2) -> None:
+    await run_io(write_json, path, data, indent=indent)
+
+
+async def awrite_bytes(path: Path | str, data: bytes) -> None:
+    await run_io(_write_bytes, path, data)
@@ -0,0 +1,239 @@
+"""Lightweight tracing: nested timing spans with parent/child ids.
+
+    with span('plan.read', week=week):
+        ...
+
+    @traced('shopping.build')
+    def build_shopping_list(...): ...
+
+The current span lives in a ContextVar, so children started in the same task, in awaited
+coroutines or in run_io()/threadpool calls (both copy the context) get its trace and parent
+ids. Finished spans go to an in-memory ring (the newest TRACE_RING_SIZE, read by
+/_debug/traces) and, when TRACE_FILE is set, are appended to that file as JSON lines by a
+background thread: span() only queues the record, the writer serializes whatever has
+queued up and appends it in one write. When the writer falls more than MAX_PENDING spans
+behind, new spans are dropped from the file (counted in `dropped`), never from the ring;
+flush_trace_file() waits for the queue to drain (also run at exit).
+TRACING=false turns span() into a no-op.
+
+A span record:
+    {"trace_id", "span_id", "parent_id", "name", "start" (epoch s), "ms", "thread",
+     "attrs": {...}, "error": "ValueError: ..." (only on failure)}
+"""
+from __future__ import annotations
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from meal.utilities.config import TRACE_FILE, TRACE_RING_SIZE, TRACING
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['Span', 'span', 'traced', 'current_span', 'recent_spans', 'recent_traces', 'format_trace',
+           'clear_spans', 'flush_trace_file']
+
+
+class Span:
+    __slots__ = ('trace_id', 'span_id', 'parent_id', 'name', 'attrs', 'start', '_t0', 'ms', 'error')
+
+    def __init__(self, name: str, parent: Optional['Span'], attrs: Dict[str, Any]):
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.parent_id = parent.span_id if parent else None
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+        self.ms = 0.0
+        self.error: Optional[str] = None
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {'trace_id': self.trace_id, 'span_id': self.span_id, 'parent_id': self.parent_id,
+                  'name': self.name, 'start': round(self.start, 6), 'ms': round(self.ms, 3),
+                  'thread': threading.current_thread().name, 'attrs': self.attrs}
+        if self.error:
+            record['error'] = self.error
+        return record
+
+
+_current: ContextVar[Optional[Span]] = ContextVar('meal_current_span', default=None)
+_ring: deque = deque(maxlen=max(TRACE_RING_SIZE, 1))
+
+
+class _TraceFileWriter:
+    """Daemon thread appending queued span records to one file, in batches."""
+
+    MAX_PENDING = 10_000
+    MAX_BATCH = 1_000
+
+    def __init__(self, path: str):
+        self.path = path
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=self.MAX_PENDING)
+        threading.Thread(target=self._run, name='trace-writer', daemon=True).start()
+
+    def put(self, record: Dict[str, Any]) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is written; False on timeout."""
+        done = self._queue.all_tasks_done
+        with done:
+            return done.wait_for(lambda: not self._queue.unfinished_tasks, timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.MAX_BATCH:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                text = ''.join(json.dumps(r, ensure_ascii=False, default=str) + '\n' for r in batch)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(text)
+            except (OSError, ValueError) as e:
+                logger.warning("Could not append %d spans to %s: %s", len(batch), self.path, e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+_writers: Dict[str, _TraceFileWriter] = {}
+_writers_lock = Lock()
+
+
+def _writer(path: str) -> _TraceFileWriter:
+    writer = _writers.get(path)
+    if writer is None:
+        with _writers_lock:
+            writer = _writers.get(path)
+            if writer is None:
+                writer = _writers[path] = _TraceFileWriter(path)
+    return writer
+
+
+def flush_trace_file(timeout: Optional[float] = 5.0) -> None:
+    """Block until queued spans are in TRACE_FILE (at most `timeout` seconds per file)."""
+    for writer in list(_writers.values()):
+        if not writer.flush(timeout):
+            logger.warning("Trace writer for %s did not drain within %s s", writer.path, timeout)
+
+
+atexit.register(flush_trace_file)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def _export(record: Dict[str, Any]) -> None:
+    _ring.append(record)
+    if TRACE_FILE:
+        _writer(TRACE_FILE).put(record)
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Time the block as a child of the current span (a new trace when there is none)."""
+    if not TRACING:
+        yield None
+        return
+    s = Span(name, _current.get(), attrs)
+    token = _current.set(s)
+    try:
+        yield s
+    except BaseException as e:
+        s.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        s.ms = (time.perf_counter() - s._t0) * 1000
+        _current.reset(token)
+        _export(s.to_dict())
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """Decorator: run every call of a (sync or async) function inside span(name)."""
+    def decorate(fn: Callable) -> Callable:
+        label = name or fn.__qualname__
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(label):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def recent_spans() -> List[Dict[str, Any]]:
+    return list(_ring)
+
+
+def recent_traces(limit: int = 20, trace_id: Optional[str] = None, min_ms: float = 0.0) -> List[Dict[str, Any]]:
+    """Newest traces from the ring, each with its spans in start order plus a tree depth.
+
+    Spans are exported when they end, so a trace only appears once its root span finished;
+    spans whose parent fell out of the ring are shown at depth 0.
+    """
+    by_trace: Dict[str, List[Dict[str, Any]]] = {}
+    roots: Dict[str, Dict[str, Any]] = {}
+    for record in list(_ring):
+        if trace_id and record['trace_id'] != trace_id:
+            continue
+        by_trace.setdefault(record['trace_id'], []).append(record)
+        if record['parent_id'] is None:
+            roots[record['trace_id']] = record
+    traces = []
+    for tid, root in sorted(roots.items(), key=lambda kv: kv[1]['start'], reverse=True):
+        if root['ms'] < min_ms:
+            continue
+        spans = sorted(by_trace[tid], key=lambda r: r['start'])
+        depth: Dict[str, int] = {}
+        for record in spans:
+            depth[record['span_id']] = depth.get(record['parent_id'], -1) + 1 if record['parent_id'] else 0
+        traces.append({
+            'trace_id': tid, 'name': root['name'], 'start': root['start'], 'ms': root['ms'],
+            'spans': [{**r, 'depth': depth[r['span_id']]} for r in spans],
+        })
+        if len(traces) >= limit:
+            break
+    return traces
+
+
+def format_trace(trace: Dict[str, Any]) -> str:
+    """Indented text view of one recent_traces() entry."""
+    lines = [f"trace {trace['trace_id']}  {trace['name']}  {trace['ms']:.1f} ms"]
+    for record in trace['spans']:
+        offset = (record['start'] - trace['start']) * 1000
+        attrs = ' '.join(f"{k}={v}" for k, v in record['attrs'].items())
+        error = f"  !{record['error']}" if record.get('error') else ''
+        lines.append(f"{offset:9.1f} ms {'  ' * record['depth']}{record['name']}  {record['ms']:.2f} ms  {attrs}{error}".rstrip())
+    return '\n'.join(lines)
+
+
+def clear_spans() -> None:
+    _ring.clear()
@@ -0,0 +1,74 @@
+"""Cheap data-version tokens for conditional responses and caches.
+
+A version token changes whenever the data a response depends on changes:
+    - file_version(path): stat-based (mtime_ns + size), no read
+    - catalog_version(): recipes.json
+    - pantry_version(): Pantry_ingredients.json
+    - plan_week_version(week, year): content hash of one week in plan.json, so editing week 40
+      does not invalidate cached responses for week 41. The per-week hashes are recomputed
+      only when plan.json itself changes.
+"""
+from __future__ import annotations
+import hashlib
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+from meal.infra.metrics import record_read
+from meal.infra.paths import PLAN_FILE, PANTRY_FILE, RECIPES_FILE
+
+__all__ = ['file_version', 'catalog_version', 'pantry_version', 'plan_week_version']
+
+_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+# Missing weeks are materialized by PlanRepository as all-empty; hash them the same way
+_EMPTY_WEEK = {d: {"breakfast": "-", "lunch": "-", "dinner": "-"} for d in _DAYS}
+
+
+def _stat_token(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = Path(path).stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def file_version(path: Path | str) -> str:
+    """Stat-based version of a data file ('0' when it does not exist)."""
+    token = _stat_token(Path(path))
+    return f"{token[0]:x}-{token[1]:x}" if token else "0"
+
+
+def catalog_version() -> str:
+    return file_version(RECIPES_FILE)
+
+
+def pantry_version() -> str:
+    return file_version(PANTRY_FILE)
+
+
+def _digest(value) -> str:
+    raw = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+_plan_lock = Lock()
+_plan_token: Optional[Tuple[int, int]] = None
+_plan_hashes: Dict[str, str] = {}
+
+
+def plan_week_version(week: int, year: int) -> str:
+    """Content hash of a single plan week (stable across unrelated week edits)."""
+    global _plan_token, _plan_hashes
+    token = _stat_token(PLAN_FILE)
+    with _plan_lock:
+        if token != _plan_token:
+            try:
+                with open(PLAN_FILE, encoding="utf-8") as f:
+                    store = json.load(f) or {}
+                record_read(PLAN_FILE)
+            except Exception:
+                store = {}
+            _plan_hashes = {k: _digest(v) for k, v in store.items()} if isinstance(store, dict) else {}
+            _plan_token = token
+        return _plan_hashes.get(f"{year}-W{week:02d}") or _digest(_EMPTY_WEEK)
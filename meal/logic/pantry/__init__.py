@@ -1,3 +1,3 @@
 """Pantry related analytics and helpers."""
-__all__ = ["analysis"]
+__all__ = ["analysis", "batch"]
 
@@ -5,6 +5,7 @@ Moved from meal.services.pantry_analysis to meal.logic.pantry.analysis.
 from __future__ import annotations
 from datetime import datetime, date as _date
 from typing import List, Dict, Any
+from meal.infra.tracing import traced
 from meal.utilities.constants import DATE_FORMAT, LOW_STOCK_THRESHOLD, DAYS_BEFORE_EXPIRY
 
 __all__ = ["compute_expiring_soon", "compute_low_stock", "compute_pantry_snapshots"]
@@ -56,6 +57,7 @@ def compute_low_stock(ingredients: List[Dict[str, Any]]) -> List[Dict[str, Any]]
     low.sort(key=lambda x: (x['quantity'], x['name']))
     return low
 
+@traced()
 def compute_pantry_snapshots(ingredients: List[Dict[str, Any]], *, window: int | None = None):
     exp = compute_expiring_soon(ingredients, window=window)
     low = compute_low_stock(ingredients)
@@ -0,0 +1,112 @@
+"""Batch pantry edits applied against a name-keyed index.
+
+apply_pantry_batch(pantry, ops) runs a list of mixed operations in one pass over an
+index {name -> [positions]} (no per-item list scans) and returns the new pantry list plus
+one result per operation. The caller persists the list once.
+
+Operations (names match exactly, like the single-item endpoints):
+    {"op": "add",    "item": {...}}                 fail if an item with that name exists
+    {"op": "upsert", "item": {...}}                 merge quantity into the lot with the same name
+                                                    and expiry date, otherwise append a new lot
+    {"op": "patch",  "name": "X", "changes": {...}} update fields of the first item named X
+                                                    (renaming checks for conflicts)
+    {"op": "delete", "name": "X"}                   remove every lot named X
+
+Failed operations are reported and skipped; the others are still applied.
+"""
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple
+
+__all__ = ["apply_pantry_batch", "BATCH_OPS"]
+
+BATCH_OPS = ("add", "upsert", "patch", "delete")
+
+
+def _qty(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def apply_pantry_batch(pantry: List[Dict[str, Any]], ops: List[Dict[str, Any]]
+                       ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool]:
+    """Return (new_pantry, results, changed)."""
+    items: List[Optional[Dict[str, Any]]] = list(pantry)  # None marks a deleted slot
+    index: Dict[str, List[int]] = {}
+    for pos, ing in enumerate(items):
+        index.setdefault(ing.get('name', ''), []).append(pos)
+
+    results: List[Dict[str, Any]] = []
+    changed = False
+
+    def _fail(i, op, name, error):
+        results.append({'index': i, 'op': op, 'name': name, 'status': 'error', 'error': error})
+
+    for i, raw in enumerate(ops):
+        op = raw.get('op') if isinstance(raw, dict) else None
+        if op not in BATCH_OPS:
+            _fail(i, op, None, f"Unknown op (expected one of {', '.join(BATCH_OPS)})")
+            continue
+
+        if op in ('add', 'upsert'):
+            item = raw.get('item')
+            name = item.get('name') if isinstance(item, dict) else None
+            if not isinstance(name, str) or not name.strip():
+                _fail(i, op, name, "'item' with a non-empty 'name' is required")
+                continue
+            positions = index.get(name, [])
+            if op == 'add' and positions:
+                _fail(i, op, name, 'Ingredient already exists')
+                continue
+            if op == 'upsert':
+                exp = item.get('data_expirare', '')
+                target = next((p for p in positions if items[p].get('data_expirare', '') == exp), None)
+                if target is not None:
+                    lot = items[target]
+                    lot['default_quantity'] = _qty(lot.get('default_quantity')) + _qty(item.get('default_quantity'))
+                    results.append({'index': i, 'op': op, 'name': name, 'status': 'merged',
+                                    'quantity': lot['default_quantity']})
+                    changed = True
+                    continue
+            items.append(dict(item))
+            index.setdefault(name, []).append(len(items) - 1)
+            results.append({'index': i, 'op': op, 'name': name, 'status': 'added'})
+            changed = True
+
+        elif op == 'patch':
+            name = raw.get('name')
+            changes = raw.get('changes')
+            positions = index.get(name) if isinstance(name, str) else None
+            if not positions:
+                _fail(i, op, name, 'Ingredient not found')
+                continue
+            if not isinstance(changes, dict) or not changes:
+                _fail(i, op, name, "'changes' must be a non-empty object")
+                continue
+            new_name = changes.get('name', name)
+            if new_name != name and index.get(new_name):
+                _fail(i, op, name, 'Another ingredient with this name already exists')
+                continue
+            pos = positions[0]
+            items[pos].update(changes)
+            if new_name != name:
+                positions.pop(0)
+                if not positions:
+                    del index[name]
+                index[new_name] = [pos]
+            results.append({'index': i, 'op': op, 'name': new_name, 'status': 'updated'})
+            changed = True
+
+        else:  # delete
+            name = raw.get('name')
+            positions = index.pop(name, None) if isinstance(name, str) else None
+            if not positions:
+                _fail(i, op, name, 'Ingredient not found')
+                continue
+            for pos in positions:
+                items[pos] = None
+            results.append({'index': i, 'op': op, 'name': name, 'status': 'deleted', 'count': len(positions)})
+            changed = True
+
+    return [ing for ing in items if ing is not None], results, changed
@@ -1,3 +1,3 @@
 """Reporting and analytics logic."""
-__all__ = ["nutrition"]
+__all__ = ["nutrition", "cook_stats"]
 
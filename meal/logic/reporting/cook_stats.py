@@ -0,0 +1,249 @@
+"""Incrementally maintained cooking statistics.
+
+Instead of re-reading the whole cooked log (like utilities.statistics.MealPlannerStats),
+the counters below are updated once per cook through the `recipe.cooked` event and
+persisted as a small JSON snapshot. Reading the stats is then constant time with
+respect to the size of the cooked log.
+
+Snapshot layout (STATS_SNAPSHOT_FILE):
+    {
+      'version': 1,
+      'total_cooked': int,
+      'recipe_counts': { recipe_name: int },
+      'weekday_counts': { 'Monday': int, ... },
+      'weeks': { 'YYYY-Www': { calories, protein, carbs, fats, meals, recipes: [names] } },
+      'updated_at': iso timestamp
+    }
+
+Only the last ROLLING_WEEKS ISO weeks are kept in 'weeks' (rolling nutrition + diversity).
+
+The snapshot is not versioned with the data: when it is missing (fresh checkout, new data
+dir) the first get_cook_stats() builds it from the cooked log. Rebuild it by hand with:
+    python -m meal.logic.reporting.cook_stats --rebuild
+"""
+from __future__ import annotations
+import json
+import logging
+import os
+import tempfile
+from collections import Counter
+from datetime import date as _date, datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional
+
+from meal.infra.Cooked_Repository import parse_cooked_date
+from meal.infra.paths import STATS_SNAPSHOT_FILE
+from meal.logic.reporting.nutrition import _normalize_macros
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["CookStats", "ROLLING_WEEKS", "get_cook_stats", "rebuild_cook_stats"]
+
+ROLLING_WEEKS = 4
+SNAPSHOT_VERSION = 1
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def _week_key(d: _date) -> str:
+    iso = d.isocalendar()
+    return f"{iso.year}-W{iso.week:02d}"
+
+
+def _empty_week() -> Dict[str, Any]:
+    return {'calories': 0, 'protein': 0, 'carbs': 0, 'fats': 0, 'meals': 0, 'recipes': set()}
+
+
+class CookStats:
+    """In-memory counters + rolling week buckets, persisted as a JSON snapshot."""
+
+    def __init__(self, snapshot_file: Path | str | None = None, *, rolling_weeks: int = ROLLING_WEEKS):
+        self.snapshot_file = Path(snapshot_file) if snapshot_file else None
+        self.rolling_weeks = rolling_weeks
+        self._lock = Lock()
+        self._loaded_mtime: Optional[int] = None
+        self._reset()
+
+    def _reset(self):
+        self.total_cooked = 0
+        self.recipe_counts: Counter = Counter()
+        self.weekday_counts: Counter = Counter()
+        self.weeks: Dict[str, Dict[str, Any]] = {}
+        self.updated_at: Optional[str] = None
+
+    # --- Updates ----------------------------------------------------------
+    def _apply(self, entry: Dict[str, Any], recipe: Optional[Dict[str, Any]]):
+        name = (entry or {}).get('name') or (recipe or {}).get('name')
+        if not name:
+            return
+        cooked_on = parse_cooked_date(entry.get('date_cooked')) or _date.today()
+        self.total_cooked += 1
+        self.recipe_counts[name] += 1
+        self.weekday_counts[DAY_NAMES[cooked_on.weekday()]] += 1
+
+        key = _week_key(cooked_on)
+        if key < self._oldest_week_key(_date.today()):
+            return  # outside the rolling window; only lifetime counters change
+        bucket = self.weeks.setdefault(key, _empty_week())
+        recipe = recipe or {}
+        bucket['calories'] += recipe.get('calories_per_serving', recipe.get('kalories_per_serving', 0)) or 0
+        macros = _normalize_macros(recipe.get('macros', {}))
+        bucket['protein'] += macros['protein']
+        bucket['carbs'] += macros['carbs']
+        bucket['fats'] += macros['fats']
+        bucket['meals'] += 1
+        bucket['recipes'].add(name)
+        self._prune(_date.today())
+
+    def record(self, entry: Dict[str, Any], recipe: Optional[Dict[str, Any]] = None):
+        """Apply one cooked entry and persist the snapshot."""
+        with self._lock:
+            self._refresh_from_disk()
+            self._apply(entry, recipe)
+            self.updated_at = datetime.now().isoformat()
+            self._save()
+
+    def rebuild(self, cooked_log: Iterable[Dict[str, Any]], recipes: Iterable[Dict[str, Any]]):
+        """Replay the whole cooked log, replacing the current counters."""
+        index = {(r.get('name') or '').lower(): r for r in recipes}
+        with self._lock:
+            self._reset()
+            for entry in cooked_log:
+                if not isinstance(entry, dict):
+                    continue
+                self._apply(entry, index.get((entry.get('name') or '').lower()))
+            self.updated_at = datetime.now().isoformat()
+            self._save()
+        return self
+
+    # --- Rolling window ---------------------------------------------------
+    def _oldest_week_key(self, today: _date) -> str:
+        return _week_key(today - timedelta(weeks=self.rolling_weeks - 1))
+
+    def _prune(self, today: _date):
+        oldest = self._oldest_week_key(today)
+        for key in [k for k in self.weeks if k < oldest]:
+            del self.weeks[key]
+
+    # --- Read side --------------------------------------------------------
+    def summary(self, *, top: int = 10, today: Optional[_date] = None) -> Dict[str, Any]:
+        """Return the stats payload served by /api/stats."""
+        today = today or _date.today()
+        with self._lock:
+            self._refresh_from_disk()
+            oldest = self._oldest_week_key(today)
+            current = _week_key(today)
+            window = [b for k, b in self.weeks.items() if oldest <= k <= current]
+            totals = {k: sum(b[k] for b in window) for k in ('calories', 'protein', 'carbs', 'fats', 'meals')}
+            distinct = set().union(*(b['recipes'] for b in window)) if window else set()
+            days = self.rolling_weeks * 7
+            if totals['meals']:
+                nutrition = {
+                    'calories_per_day': round(totals['calories'] / days, 2),
+                    'protein_per_day': round(totals['protein'] / days, 2),
+                    'carbs_per_day': round(totals['carbs'] / days, 2),
+                    'fats_per_day': round(totals['fats'] / days, 2),
+                    'meals_per_week': round(totals['meals'] / self.rolling_weeks, 2),
+                }
+            else:
+                nutrition = {'calories_per_day': 0, 'protein_per_day': 0, 'carbs_per_day': 0,
+                             'fats_per_day': 0, 'meals_per_week': 0}
+            diversity = round(len(distinct) / totals['meals'] * 100, 2) if totals['meals'] else 0.0
+            return {
+                'total_cooked': self.total_cooked,
+                'most_cooked': self.recipe_counts.most_common(top),
+                'cooking_by_day': {d: self.weekday_counts[d] for d in DAY_NAMES if self.weekday_counts[d]},
+                'rolling_weeks': self.rolling_weeks,
+                'nutrition_averages': nutrition,
+                'distinct_recipes': len(distinct),
+                'diversity_score': diversity,
+                'updated_at': self.updated_at,
+            }
+
+    # --- Persistence ------------------------------------------------------
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'version': SNAPSHOT_VERSION,
+            'total_cooked': self.total_cooked,
+            'recipe_counts': dict(self.recipe_counts),
+            'weekday_counts': dict(self.weekday_counts),
+            'weeks': {k: {**b, 'recipes': sorted(b['recipes'])} for k, b in sorted(self.weeks.items())},
+            'updated_at': self.updated_at,
+        }
+
+    def load_dict(self, data: Dict[str, Any]):
+        self._reset()
+        if not isinstance(data, dict) or data.get('version') != SNAPSHOT_VERSION:
+            return self
+        self.total_cooked = int(data.get('total_cooked', 0))
+        self.recipe_counts = Counter(data.get('recipe_counts') or {})
+        self.weekday_counts = Counter(data.get('weekday_counts') or {})
+        self.weeks = {k: {**b, 'recipes': set(b.get('recipes') or [])} for k, b in (data.get('weeks') or {}).items()}
+        self.updated_at = data.get('updated_at')
+        return self
+
+    def _refresh_from_disk(self):
+        """Reload the snapshot if another process rewrote it since we last saw it."""
+        if not self.snapshot_file:
+            return
+        try:
+            mtime = self.snapshot_file.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+        try:
+            with open(self.snapshot_file, encoding='utf-8') as f:
+                self.load_dict(json.load(f))
+        except Exception as e:
+            logger.error("Failed to load stats snapshot: %s", e)
+        self._loaded_mtime = mtime
+
+    def _save(self):
+        if not self.snapshot_file:
+            return
+        try:
+            self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.snapshot_file.parent, prefix=".stats_", suffix=".json")
+            with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+                json.dump(self.to_dict(), tmp, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.snapshot_file)
+            self._loaded_mtime = self.snapshot_file.stat().st_mtime_ns
+        except Exception as e:
+            logger.error("Failed to save stats snapshot: %s", e)
+
+
+_stats: Optional[CookStats] = None
+
+
+def get_cook_stats() -> CookStats:
+    """Process-wide CookStats bound to STATS_SNAPSHOT_FILE (built from the cooked log if missing)."""
+    global _stats
+    if _stats is None:
+        _stats = CookStats(STATS_SNAPSHOT_FILE)
+        if not _stats.snapshot_file.exists():
+            logger.info("No stats snapshot at %s, rebuilding from the cooked log", _stats.snapshot_file)
+            try:
+                rebuild_cook_stats()
+            except Exception as e:
+                logger.error("Failed to build stats snapshot: %s", e)
+    return _stats
+
+
+def rebuild_cook_stats() -> CookStats:
+    """Regenerate the snapshot by replaying the cooked log against the recipe catalog."""
+    from meal.api.routes.logs import load_cooked_recipes
+    from meal.api.routes.recipes import load_recipes
+    return get_cook_stats().rebuild(load_cooked_recipes(), load_recipes())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Cooking statistics snapshot")
+    parser.add_argument("--rebuild", action="store_true", help="replay the cooked log to regenerate the snapshot")
+    args = parser.parse_args()
+    stats = rebuild_cook_stats() if args.rebuild else get_cook_stats()
+    print(json.dumps(stats.summary(), indent=2, ensure_ascii=False))
+    if args.rebuild:
+        print(f"✓ Snapshot written to: {stats.snapshot_file}")
@@ -5,6 +5,8 @@ Moved from meal.services.Reporting_Service to meal.logic.reporting.nutrition.
 from collections import defaultdict
 from typing import Dict, Any, List
 
+from meal.infra.tracing import traced
+
 def _normalize_macros(macros: Dict[str, Any]):
     if not isinstance(macros, dict):
         return {'protein': 0, 'carbs': 0, 'fats': 0}
@@ -14,6 +16,7 @@ def _normalize_macros(macros: Dict[str, Any]):
         'fats': macros.get('fats', macros.get('fat', 0) or 0) or 0,
     }
 
+@traced()
 def compute_week_nutrition(plan, recipes: List[dict]):
     """Aggregate nutrition stats for the given week plan.
 
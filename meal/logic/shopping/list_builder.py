@@ -7,27 +7,16 @@ from collections import defaultdict
 from typing import Dict, List, Any
 from datetime import date as _date, datetime
 from meal.domain.Plan import Plan
+from meal.infra.tracing import traced
+from meal.utilities.stemming import stem as _stem
 
 def _normalize(name: str) -> str:
     return (name or '').strip().lower()
 
-def _stem(word: str) -> str:
-    # Simple plural to singular heuristics (not perfect, acceptable for this use case)
-    if word.endswith('ies') and len(word) > 3:
-        return word[:-3] + 'y'  # candies -> candy
-    if word.endswith('oes') and len(word) > 3:
-        return word[:-3] + 'o'  # tomatoes -> tomato, potatoes -> potato
-    if word.endswith('ses') and len(word) > 3:
-        return word[:-2]  # classes -> classe (limitation acknowledged)
-    if word.endswith('es') and len(word) > 2 and word[-3] not in 'aeiou':
-        return word[:-2]  # boxes -> box, dishes -> dish
-    if word.endswith('s') and not word.endswith('ss') and len(word) > 1:
-        return word[:-1]
-    return word
-
 def _key(name: str) -> str:
     return _stem(_normalize(name))
 
+@traced()
 def build_shopping_list(plan: Plan, recipes: List[Dict[str, Any]], pantry_ingredients: List[Dict[str, Any]], *, skip_past_days: bool = False):
     """Compute missing ingredients for a weekly plan.
 
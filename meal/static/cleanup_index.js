@@ -155,7 +155,7 @@ setTimeout(()=>{const el=document.getElementById('flashNotice');if(el){el.classL
     if(inflight) return; inflight=true;
     panel.classList.add('refreshing');
     try {
-      const resp=await fetch(`/api/nutrition?week=${week}&year=${year}`, {cache:'no-store'});
+      const resp=await (window.conditionalFetch || fetch)(`/api/nutrition?week=${week}&year=${year}`, {cache:'no-store'});
       if(resp.ok){
         const data=await resp.json();
         applyNutrition(data);
@@ -171,5 +171,41 @@
         if(ingSort) ingSort.addEventListener('change', ()=> { applyIngredientSort(); applyIngredientFilter(); markExpiringSoon(); });
         if(cookedSort) cookedSort.addEventListener('change', ()=> { applyCookedSort(); markExpiringSoon(); });
         if(tagOrderBtn) tagOrderBtn.addEventListener('click', ()=>{ sortIngredientsByTagOrder(); applyIngredientFilter(); markExpiringSoon(); });
+
+        // ===== Cooked history: older pages on demand =====
+        const moreBtn = document.getElementById('view-cooked-more');
+        function appendCookedRow(item){
+            const tr = document.createElement('tr');
+            ['name','servings','unit','date_cooked'].forEach(key => {
+                const td = document.createElement('td');
+                td.className = key === 'date_cooked' ? 'date' : key;
+                td.textContent = item[key] ?? '';
+                tr.appendChild(td);
+            });
+            cookedTbody.appendChild(tr);
+        }
+        if(moreBtn) moreBtn.addEventListener('click', async ()=>{
+            const offset = parseInt(moreBtn.dataset.offset || '0', 10);
+            const limit = parseInt(moreBtn.dataset.limit || '50', 10);
+            moreBtn.disabled = true;
+            try {
+                const res = await fetch(`/api/cooked?order=desc&offset=${offset}&limit=${limit}`);
+                if(!res.ok) throw new Error(`HTTP ${res.status}`);
+                const data = await res.json();
+                (data.items || []).forEach(appendCookedRow);
+                applyCookedSort();
+                markExpiringSoon();
+                if(data.next_offset == null){
+                    moreBtn.remove();
+                } else {
+                    moreBtn.dataset.offset = String(data.next_offset);
+                    moreBtn.textContent = `Load older (${data.next_offset} of ${data.total})`;
+                    moreBtn.disabled = false;
+                }
+            } catch(err){
+                console.error('Failed to load cooked history', err);
+                moreBtn.disabled = false;
+            }
+        });
     });
 })();
@@ -1,9 +1,162 @@
+// ---------- Conditional GET (ETag / If-None-Match) ----------
+// Keeps the last body + ETag per URL; a 304 from the server is answered from that copy,
+// so callers always get a normal 200-like Response they can .json().
+const _etagCache = new Map();
+async function conditionalFetch(url, options = {}) {
+  const cached = _etagCache.get(url);
+  const headers = new Headers(options.headers || {});
+  if (cached) headers.set('If-None-Match', cached.etag);
+  const resp = await fetch(url, { ...options, headers, cache: 'no-store' });
+  if (resp.status === 304 && cached) {
+    return new Response(cached.body, { status: 200, headers: { 'Content-Type': 'application/json', 'ETag': cached.etag } });
+  }
+  const etag = resp.headers.get('ETag');
+  if (resp.ok && etag) {
+    _etagCache.set(url, { etag, body: await resp.clone().text() });
+  }
+  return resp;
+}
+window.conditionalFetch = conditionalFetch;
+
+// ---------- Batch slot edits ----------
+// POST /api/plan/slots applies all edits with one plan write and returns the updated weeks
+// (same shape as /get_week) + their ETags; we prime the /get_week cache so the next
+// conditional fetch of that week is a 304.
+async function saveSlotEdits(edits) {
+  const resp = await fetch('/api/plan/slots', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ edits })
+  });
+  if (!resp.ok) throw new Error(`Slot update failed: ${resp.status}`);
+  const data = await resp.json();
+  (data.weeks || []).forEach(w => {
+    const { version, etag, ...weekPayload } = w;
+    const monday = weekPayload.days?.Monday?.date?.split('.').reverse().join('-'); // dd.mm.yyyy -> yyyy-mm-dd
+    if (etag && monday) {
+      _etagCache.set(`/get_week?start=${encodeURIComponent(monday)}`, { etag, body: JSON.stringify(weekPayload) });
+    }
+    const shownWeek = window.CURRENT_WEEK || document.body.dataset.week;
+    const shownYear = window.CURRENT_YEAR || document.body.dataset.year;
+    if (String(shownWeek) === String(w.meta.week) && String(shownYear) === String(w.meta.year)) {
+      updateTable(weekPayload);
+    }
+  });
+  return data;
+}
+window.saveSlotEdits = saveSlotEdits;
+
 // ---------- Modal helpers ----------
 function openModal(day, meal) {
   const popup = document.getElementById(`${day}-${meal}-popup`);
-  if (popup) popup.style.display = "flex";
+  if (popup) {
+    popup.style.display = "flex";
+    const list = popup.querySelector('.recipes-scroll');
+    if (list) loadRecipeOptions(list);
+  }
+}
+
+// ---------- Recipe picker (paged from /api/recipes) ----------
+// Pages are shared by all 21 slot popups; each popup renders them on first open and
+// fetches the next page when scrolled near the bottom.
+const RECIPE_OPTION_FIELDS = 'name,image,calories_per_serving';
+const _recipeOptionPages = new Map(); // cursor ('' = first page) -> Promise<page JSON>
+window.RECIPES_KCAL = window.RECIPES_KCAL || {};
+
+function fetchRecipeOptionPage(cursor) {
+  const key = cursor || '';
+  if (!_recipeOptionPages.has(key)) {
+    const qs = new URLSearchParams({ fields: RECIPE_OPTION_FIELDS, limit: '50' });
+    if (cursor) qs.set('cursor', cursor);
+    const p = conditionalFetch(`/api/recipes?${qs}`)
+      .then(r => { if (!r.ok) throw new Error(`Recipe list failed: ${r.status}`); return r.json(); })
+      .then(page => { rememberRecipeCalories(page.items); return page; })
+      .catch(err => { _recipeOptionPages.delete(key); throw err; });
+    _recipeOptionPages.set(key, p);
+  }
+  return _recipeOptionPages.get(key);
+}
+
+function rememberRecipeCalories(items) {
+  (items || []).forEach(r => {
+    const c = r.calories_per_serving;
+    window.RECIPES_KCAL[r.name] = (typeof c === 'number') ? c : (parseInt(c, 10) || 0);
+  });
+}
+
+function appendRecipeOption(list, r) {
+  const { day, meal } = list.dataset;
+  const opt = document.createElement('div');
+  opt.className = 'recipe-option';
+  opt.textContent = r.name;
+  opt.addEventListener('click', () => selectRecipe(r.name, r.image, day, meal));
+  list.appendChild(opt);
+}
+
+async function loadRecipeOptions(list) {
+  if (list.dataset.loading === '1' || list.dataset.done === '1' || list.dataset.query) return;
+  list.dataset.loading = '1';
+  try {
+    const page = await fetchRecipeOptionPage(list.dataset.next || '');
+    if (list.dataset.query) return; // the user started typing meanwhile
+    (page.items || []).forEach(r => appendRecipeOption(list, r));
+    if (page.next_cursor) list.dataset.next = page.next_cursor;
+    else list.dataset.done = '1';
+  } catch (e) {
+    console.error('Error loading recipes:', e);
+  } finally {
+    list.dataset.loading = '';
+  }
+  if (!list.dataset.scrollBound) {
+    list.dataset.scrollBound = '1';
+    list.addEventListener('scroll', () => {
+      if (list.scrollTop + list.clientHeight >= list.scrollHeight - 80) loadRecipeOptions(list);
+    });
+  }
 }
 
+// Type-ahead over /api/recipes/suggest (name/alias prefixes, most cooked recently first);
+// an empty box goes back to the paged list.
+let _suggestSeq = 0;
+async function suggestRecipeOptions(input) {
+  const list = input.closest('.recipe-modal-right')?.querySelector('.recipes-scroll');
+  if (!list) return;
+  const q = input.value.trim();
+  const mine = ++_suggestSeq;
+  list.dataset.query = q;
+  if (!q) {
+    list.replaceChildren();
+    delete list.dataset.next;
+    delete list.dataset.done;
+    loadRecipeOptions(list);
+    return;
+  }
+  try {
+    const resp = await conditionalFetch(`/api/recipes/suggest?${new URLSearchParams({ q, limit: '20' })}`);
+    if (!resp.ok) throw new Error(`Suggest failed: ${resp.status}`);
+    const data = await resp.json();
+    if (mine !== _suggestSeq) return; // a newer keystroke is in flight
+    rememberRecipeCalories(data.items);
+    list.replaceChildren();
+    (data.items || []).forEach(r => appendRecipeOption(list, r));
+    if (!(data.items || []).length) {
+      const empty = document.createElement('div');
+      empty.className = 'recipe-option muted';
+      empty.textContent = 'No matching recipes';
+      list.appendChild(empty);
+    }
+  } catch (e) {
+    console.error('Error loading suggestions:', e);
+  }
+}
+
+document.addEventListener('input', (ev) => {
+  const input = ev.target;
+  if (!input.classList || !input.classList.contains('recipe-suggest')) return;
+  clearTimeout(input._suggestTimer);
+  input._suggestTimer = setTimeout(() => suggestRecipeOptions(input), 120);
+});
+
 function closeModal(day, meal) {
   const popup = document.getElementById(`${day}-${meal}-popup`);
   if (popup) popup.style.display = "none";
@@ -25,6 +178,7 @@ function selectRecipe(name, image, day, meal) {
       left.innerHTML = `<img id="recipePreview-${day}-${meal}" src="/static/pictures/${image}" alt="${name}" style="max-width:250px;border-radius:10px;">`;
     }
   } else if (preview.tagName && preview.tagName.toLowerCase() === "img") {
+    preview.removeAttribute("srcset"); // server-rendered derivatives belong to the previous recipe
     preview.src = "/static/pictures/" + image;
     preview.alt = name;
   } else {
@@ -47,26 +201,6 @@ function selectRecipe(name, image, day, meal) {
   }
 }
 
-// NEW: Initialize global calories map from hidden JSON if not present
-(function initRecipeCalories(){
-  if(window.RECIPES_KCAL) return; // already built
-  const holder = document.getElementById('recipes-json');
-  if(!holder) return;
-  try {
-    const raw = holder.getAttribute('data-recipes');
-    if(!raw) return;
-    const arr = JSON.parse(raw);
-    window.RECIPES_KCAL = {};
-    arr.forEach(r => {
-      if(!r || typeof r !== 'object') return;
-      const name = r.name;
-      if(!name) return;
-      const c = r.calories_per_serving ?? r.kalories_per_serving ?? 0;
-      window.RECIPES_KCAL[name] = (typeof c === 'number') ? c : (parseInt(c,10) || 0);
-    });
-  } catch(e){ console.warn('Failed to init RECIPES_KCAL', e); }
-})();
-
 // ---------- Close modal on outside click (optional) ----------
 window.onclick = function (event) {
   // If you want to close when clicking the internal overlay, keep this; otherwise you can remove it
@@ -153,7 +287,7 @@ function selectWeek(mondayDate) {
 
   const start = toYMD(mondayDate);
   window.CURRENT_MONDAY_YMD = start; // remember current Monday
-  fetch(`/get_week?start=${encodeURIComponent(start)}`, { cache: "no-store" })
+  conditionalFetch(`/get_week?start=${encodeURIComponent(start)}`)
     .then((r) => {
       if (!r.ok) throw new Error("Week out of allowed range or bad date");
       return r.json();
@@ -281,11 +415,12 @@ function slotMenuEsc(e){ if(e.key === 'Escape'){ closeAllSlotMenus(); } }
 
 // ---------- Update only labels + recipe spans + hidden week/year ----------
 function updateTable(data) {
-  // data = { meta:{week,year}, days:{ Monday:{date,breakfast,lunch,dinner}, ... } }
+  // data = { meta:{week,year}, days:{ Monday:{date,breakfast,lunch,dinner,kcal}, ... }, calories:{name:kcal} }
   const mealsOrder = ["breakfast", "lunch", "dinner"];
   const week = data?.meta?.week;
   const year = data?.meta?.year;
   const days = data?.days || {};
+  Object.assign(window.RECIPES_KCAL, data?.calories || {});
 
   // 1) update day labels
   Object.entries(days).forEach(([day, meals]) => {
@@ -316,8 +451,13 @@ function updateTable(data) {
     });
   });
 
-  // Recompute per-day calories using mapping (supports cooked objects)
+  // Per-day calories come with the week; fall back to the mapping (supports cooked objects)
   Object.entries(days).forEach(([day, meals]) => {
+    if (typeof meals.kcal === 'number') {
+      const kcalCell = document.getElementById(`${day}-kcal`);
+      if (kcalCell) kcalCell.textContent = meals.kcal;
+      return;
+    }
     let sum = 0;
     mealsOrder.forEach(meal => {
       const raw = meals[meal];
@@ -427,7 +567,7 @@ async function refreshShoppingListBadge(weekOverride){
     base = `/api/shopping-list?skip_past=1`;
   }
   try {
-    const resp = await fetch(base, {cache:'no-store'});
+    const resp = await conditionalFetch(base);
     if(!resp.ok) return;
     const data = await resp.json();
     const countEl = document.getElementById('shoppingListCount');
@@ -455,24 +595,16 @@ function hookMealForms(){
       const fd = new FormData(form);
 
       try {
-        const resp = await fetch('/update_meal', { method:'POST', body: fd });
-
         const week = fd.get('week');
         const year = fd.get('year');
 
         if(week && year){
-          const monday = window.CURRENT_MONDAY_YMD;
-          if(monday){
-            try {
-              const r2 = await fetch(`/get_week?start=${encodeURIComponent(monday)}`, {cache:'no-store'});
-              if(r2.ok){
-                const json = await r2.json();
-                updateTable(json);
-                if(typeof window.refreshNutritionPanel === 'function'){
-                  window.refreshNutritionPanel();
-                }
-              }
-            } catch(e){ console.warn('Failed refresh after save', e); }
+          await saveSlotEdits([{
+            year: parseInt(year, 10), week: parseInt(week, 10),
+            day: fd.get('day'), meal: fd.get('meal'), recipe: fd.get('recipe')
+          }]);
+          if(typeof window.refreshNutritionPanel === 'function'){
+            window.refreshNutritionPanel();
           }
           await refreshShoppingListBadge(week);
         }
@@ -549,12 +681,6 @@ async function deleteMeal(day, meal){
       console.warn('Cannot delete meal: missing week/year');
       return;
     }
-    const fd = new FormData();
-    fd.append('day', day);
-    fd.append('meal', meal);
-    fd.append('recipe', '-');
-    fd.append('week', week);
-    fd.append('year', year);
     // Optimistic UI update
     const slot = document.getElementById(`slot-${day}-${meal}`);
     if(slot) slot.textContent='-';
@@ -577,18 +703,10 @@ async function deleteMeal(day, meal){
         kcalCell.textContent = sum;
       }
     } catch(e){/* ignore */}
-    const resp = await fetch('/update_meal', { method:'POST', body: fd });
-    // After server update, re-fetch full week to stay in sync
-    const monday = window.CURRENT_MONDAY_YMD;
-    if(monday){
-      try {
-        const r2 = await fetch(`/get_week?start=${encodeURIComponent(monday)}`, {cache:'no-store'});
-        if(r2.ok){
-          const json = await r2.json();
-          updateTable(json);
-        }
-      } catch(e){ console.warn('Delete refresh failed', e); }
-    }
+    // Server update returns the fresh week; no separate /get_week round-trip
+    try {
+      await saveSlotEdits([{ year: parseInt(year, 10), week: parseInt(week, 10), day, meal, recipe: '-' }]);
+    } catch(e){ console.warn('Delete refresh failed', e); }
     if(typeof window.refreshNutritionPanel === 'function') window.refreshNutritionPanel();
     refreshShoppingListBadge(week);
   } catch(err){
@@ -644,7 +762,7 @@ observer.observe(document.body, {subtree:true, childList:true});
       }
       if(!week || !year) throw new Error('Missing week/year');
       const url = `/api/plan/slot-recipe?day=${encodeURIComponent(day)}&meal=${encodeURIComponent(meal)}&week=${week}&year=${year}`;
-      const resp = await fetch(url, {cache:'no-store'});
+      const resp = await conditionalFetch(url);
       if(!resp.ok) throw new Error(`Slot recipe fetch failed: ${resp.status}`);
       return resp.json();
     }
@@ -727,7 +845,7 @@ observer.observe(document.body, {subtree:true, childList:true});
         const monday = window.CURRENT_MONDAY_YMD;
         if(monday){
           try {
-            const r2 = await fetch(`/get_week?start=${encodeURIComponent(monday)}`, {cache:'no-store'});
+            const r2 = await conditionalFetch(`/get_week?start=${encodeURIComponent(monday)}`);
             if(r2.ok){ const j = await r2.json(); updateTable(j); }
           } catch(e){ /* ignore */ }
         }
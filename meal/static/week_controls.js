@@ -35,7 +35,7 @@
     if(availError) availError.style.display='none';
     if(availLoading) availLoading.style.display='block';
     try {
-      const resp = await fetch('/api/recipes/available');
+      const resp = await (window.conditionalFetch || fetch)('/api/recipes/available');
       if(!resp.ok) throw new Error('HTTP '+resp.status);
       const data = await resp.json();
       const list = data.recipes || [];
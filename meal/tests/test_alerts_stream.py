@@ -0,0 +1,71 @@
+import asyncio, json, unittest
+
+from meal.api.alerts_stream import alert_stream
+from meal.events import web_observers
+from meal.events.event_helpers import publish_low_stock
+
+def _ing(name):
+    return {"name": name, "unit": "g", "default_quantity": 1}
+
+def _parse(frame):
+    fields = dict(line.split(": ", 1) for line in frame.strip().splitlines() if not line.startswith(":"))
+    return int(fields["id"]), fields["event"], json.loads(fields["data"])
+
+class TestAlertStream(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        web_observers.start()
+
+    async def _next_event(self, stream):
+        while True:
+            frame = await asyncio.wait_for(stream.__anext__(), timeout=2)
+            if frame.startswith("id:"):
+                return _parse(frame)
+
+    async def test_live_events_reach_many_subscribers(self):
+        streams = [alert_stream(heartbeat=5) for _ in range(200)]
+        for s in streams:
+            self.assertTrue((await s.__anext__()).startswith("retry:"))
+        pending = [asyncio.ensure_future(self._next_event(s)) for s in streams]
+        await asyncio.sleep(0)
+        # published from another thread, like a sync FastAPI endpoint would
+        await asyncio.to_thread(publish_low_stock, _ing("SSE flour"), 1, 50)
+        results = await asyncio.gather(*pending)
+        ids = {r[0] for r in results}
+        self.assertEqual(len(ids), 1)
+        self.assertTrue(all(r[1] == "pantry.low_stock" and r[2]["name"] == "SSE flour" for r in results))
+        for s in streams:
+            await s.aclose()
+
+    async def test_resume_replays_after_last_event_id(self):
+        publish_low_stock(_ing("SSE a"), 1, 50)
+        first_id = web_observers.latest_id()
+        publish_low_stock(_ing("SSE b"), 1, 50)
+        publish_low_stock(_ing("SSE c"), 1, 50)
+        stream = alert_stream(first_id, heartbeat=5)
+        await stream.__anext__()
+        names = [(await self._next_event(stream))[2]["name"] for _ in range(2)]
+        self.assertEqual(names, ["SSE b", "SSE c"])
+        await stream.aclose()
+
+    async def test_reconnect_with_id_from_before_a_restart(self):
+        # Last-Event-ID from a previous process (or another worker) is above every id here
+        stale = web_observers.latest_id() + 1000
+        stream = alert_stream(stale, heartbeat=5)
+        await stream.__anext__()
+        pending = asyncio.ensure_future(self._next_event(stream))
+        await asyncio.sleep(0)
+        publish_low_stock(_ing("SSE after restart"), 1, 50)
+        event_id, _, data = await pending
+        self.assertEqual(data["name"], "SSE after restart")
+        self.assertEqual(event_id, web_observers.latest_id())
+        await stream.aclose()
+
+    async def test_heartbeat_when_idle(self):
+        stream = alert_stream(heartbeat=0.05)
+        await stream.__anext__()
+        frame = await asyncio.wait_for(stream.__anext__(), timeout=2)
+        self.assertEqual(frame, ": keep-alive\n\n")
+        await stream.aclose()
+
+if __name__ == '__main__':
+    unittest.main()
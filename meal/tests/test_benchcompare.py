@@ -0,0 +1,119 @@
+import contextlib
+import io
+import json
+import random
+import tempfile
+import unittest
+from pathlib import Path
+
+from meal.tools.benchcompare import (BASELINES_DIR, bootstrap_ratio, compare_runs, entries, load_run, main,
+                                     merge_runs, store_run)
+
+
+def _samples(center, n=200, spread=0.05, seed=1):
+    rng = random.Random(seed)
+    return [center * (1 + rng.uniform(-spread, spread)) for _ in range(n)]
+
+
+def _bench_report(**timings):
+    return {'kind': 'benchmarks', 'meta': {'git_rev': 'abc1234'},
+            'benchmarks': [{'name': name, 'samples': samples} for name, samples in timings.items()]}
+
+
+class TestBenchCompare(unittest.TestCase):
+    def test_bootstrap_interval_brackets_the_ratio(self):
+        ratio, low, high = bootstrap_ratio(_samples(1.0), _samples(2.0, seed=2), resamples=300)
+        self.assertAlmostEqual(ratio, 2.0, delta=0.05)
+        self.assertLess(low, ratio)
+        self.assertGreater(high, ratio)
+        self.assertGreater(low, 1.9)
+
+    def test_verdicts(self):
+        old = _bench_report(a=_samples(1.0), b=_samples(1.0), c=_samples(1.0), gone=_samples(1.0))
+        new = _bench_report(a=_samples(1.0, seed=2), b=_samples(1.5, seed=3), c=_samples(0.5, seed=4),
+                            fresh=_samples(1.0))
+        verdicts = {c.name: c.verdict for c in compare_runs(old, new, resamples=200)}
+        self.assertEqual(verdicts, {'a': 'same', 'b': 'regression', 'c': 'improvement', 'gone': 'removed',
+                                    'fresh': 'added'})
+        # a per-entry threshold above the slowdown accepts it
+        relaxed = compare_runs(old, new, resamples=200, overrides=[('b*', 0.6)])
+        self.assertEqual({c.name: c.verdict for c in relaxed}['b'], 'same')
+
+    def test_a_a_comparison_with_run_to_run_variance(self):
+        # every process run is shifted as a whole (CPU frequency, layout, load); calls within
+        # a run vary far less, so resampling calls alone calls these differences regressions
+        rng = random.Random(11)
+
+        def run(center, seed):
+            return _samples(center * rng.uniform(0.85, 1.15), spread=0.03, seed=seed)
+
+        names = [f"bench_{i}" for i in range(9)]
+        old_runs = [_bench_report(**{n: run(1.0, 10 * r + i) for i, n in enumerate(names)}) for r in range(3)]
+        new_runs = [_bench_report(**{n: run(1.0, 100 + 10 * r + i) for i, n in enumerate(names)}) for r in range(3)]
+        old, new = merge_runs(old_runs), merge_runs(new_runs)
+        self.assertEqual(len(entries(old)['bench_0']['repeats']), 3)
+        verdicts = [c.verdict for c in compare_runs(old, new, resamples=300)]
+        self.assertEqual(verdicts, ['same'] * 9)
+        # a real slowdown still reproduces across the repeats
+        slower = merge_runs([_bench_report(bench_0=_samples(1.6 * rng.uniform(0.95, 1.05), seed=200 + r))
+                             for r in range(3)])
+        [c] = [c for c in compare_runs(old, slower, resamples=300) if c.name == 'bench_0']
+        self.assertEqual(c.verdict, 'regression')
+
+    def test_store_repeats_and_compare_comma_separated_runs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for r in range(3):
+                path = Path(tmp) / f"run{r}.json"
+                path.write_text(json.dumps(_bench_report(a=_samples(1.0, seed=r))), encoding='utf-8')
+                paths.append(path)
+            stored = store_run(paths, name='repeats', directory=Path(tmp) / 'results', max_samples=50)
+            item = entries(load_run(str(stored)))['a']
+            self.assertEqual([len(run) for run in item['repeats']], [50, 50, 50])
+            self.assertEqual(len(item['samples']), 150)
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(main(['compare', str(stored), ','.join(str(p) for p in paths),
+                                       '--resamples', '200']), 0)
+
+    def test_noisy_samples_are_not_a_regression(self):
+        old = _bench_report(x=_samples(1.0, n=10, spread=0.6))
+        new = _bench_report(x=_samples(1.15, n=10, spread=0.6, seed=9))
+        self.assertEqual(compare_runs(old, new, resamples=300)[0].verdict, 'same')
+
+    def test_loadtest_error_rate_regression(self):
+        def report(error_rate):
+            return {'kind': 'loadtest', 'meta': {},
+                    'routes': [{'name': 'GET /get_week', 'samples': _samples(0.01), 'error_rate': error_rate}]}
+        [same] = compare_runs(report(0.0), report(0.005), resamples=100)
+        self.assertEqual(same.verdict, 'same')
+        [worse] = compare_runs(report(0.0), report(0.05), resamples=100)
+        self.assertEqual(worse.verdict, 'regression')
+        self.assertIn('error rate', worse.note)
+
+    def test_store_and_compare_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            old_path, new_path = Path(tmp) / 'old.json', Path(tmp) / 'new.json'
+            old_path.write_text(json.dumps(_bench_report(a=_samples(1.0, n=1000))), encoding='utf-8')
+            new_path.write_text(json.dumps(_bench_report(a=_samples(1.3, n=1000, seed=5))), encoding='utf-8')
+            stored = store_run(old_path, directory=Path(tmp) / 'results', max_samples=100)
+            self.assertIn('abc1234_benchmarks', stored.name)
+            self.assertEqual(len(entries(load_run(str(stored)))['a']['samples']), 100)
+            with contextlib.redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(main(['compare', str(stored), str(new_path), '--resamples', '200']), 1)
+            self.assertIn('regression', out.getvalue())
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(main(['compare', str(stored), str(new_path), '--resamples', '200',
+                                       '--threshold-for', 'a=0.5']), 0)
+            with contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(main(['compare', str(stored), str(Path(tmp) / 'missing.json')]), 2)
+
+    def test_committed_baselines_load(self):
+        bench = load_run('json-storage')
+        self.assertEqual(bench['kind'], 'benchmarks')
+        self.assertTrue(any(name.endswith('[L]') for name in entries(bench)))
+        self.assertEqual(load_run('json-storage-loadtest')['kind'], 'loadtest')
+        self.assertTrue((BASELINES_DIR / 'json-storage.json').is_file())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import gzip, os, tempfile, unittest
+from pathlib import Path
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from meal.api.assets import AssetManifest, AssetStaticFiles
+from meal.api.compression import CompressionMiddleware, encoding_quality
+from meal.tools.compress_static import compress_static
+from meal.tools.bench_wire import measure_home_page
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get('/big')
+    def big():
+        return {"items": ["x" * 20] * 200}
+
+    @app.get('/small')
+    def small():
+        return {"ok": True}
+
+    @app.get('/stream')
+    def stream():
+        return StreamingResponse(iter([b"data: 1\n\n", b"data: 2\n\n" * 600]), media_type="text/event-stream")
+    return app
+
+class TestCompressionMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(_app())
+
+    def test_size_floor_and_content_types(self):
+        big = self.client.get('/big', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(big.headers.get('content-encoding'), 'gzip')
+        self.assertIn('Accept-Encoding', big.headers.get('vary', ''))
+        self.assertLess(big.num_bytes_downloaded, len(big.content))
+        self.assertEqual(len(big.json()['items']), 200)
+        self.assertIsNone(self.client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers.get('content-encoding'))
+        self.assertIsNone(self.client.get('/big', headers={'Accept-Encoding': 'identity'}).headers.get('content-encoding'))
+        self.assertIsNone(self.client.get('/big', headers={'Accept-Encoding': 'gzip;q=0'}).headers.get('content-encoding'))
+        sse = self.client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+        self.assertIsNone(sse.headers.get('content-encoding'))
+
+class TestPrecompressedStatic(unittest.TestCase):
+    def test_serves_fresh_sibling_only(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / 'app.js'
+            src.write_text('console.log("hello");\n' * 100, encoding='utf-8')
+            compress_static(Path(tmp))
+            self.assertTrue((Path(tmp) / 'app.js.gz').exists())
+            app = FastAPI()
+            app.mount('/static', AssetStaticFiles(directory=tmp, manifest=AssetManifest(tmp).build()))
+            client = TestClient(app)
+            resp = client.get('/static/app.js', headers={'Accept-Encoding': 'gzip'})
+            self.assertEqual(resp.headers.get('content-encoding'), 'gzip')
+            self.assertEqual(resp.headers['content-type'].split(';')[0], 'text/javascript')
+            self.assertEqual(resp.text, src.read_text(encoding='utf-8'))
+            again = client.get('/static/app.js', headers={'Accept-Encoding': 'gzip', 'If-None-Match': resp.headers['etag']})
+            self.assertEqual(again.status_code, 304)
+            plain = client.get('/static/app.js', headers={'Accept-Encoding': 'identity'})
+            self.assertIsNone(plain.headers.get('content-encoding'))
+            # source edited after the build -> stale sibling is ignored
+            st = src.stat()
+            os.utime(src, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            stale = client.get('/static/app.js', headers={'Accept-Encoding': 'gzip'})
+            self.assertIsNone(stale.headers.get('content-encoding'))
+
+    def test_refused_encodings_are_not_served(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = Path(tmp) / 'app.js'
+            src.write_text('console.log("hello");\n' * 100, encoding='utf-8')
+            src.chmod(0o644)
+            compress_static(Path(tmp))
+            sibling = Path(tmp) / 'app.js.gz'
+            self.assertEqual(sibling.stat().st_mode & 0o777, 0o644)
+            self.assertEqual([p.name for p in Path(tmp).iterdir() if p.name.startswith('.')], [])  # no temp files left
+            (Path(tmp) / 'app.js.br').write_bytes(b'not really brotli')
+            app = FastAPI()
+            app.mount('/static', AssetStaticFiles(directory=tmp, manifest=AssetManifest(tmp).build()))
+            client = TestClient(app)
+            for accept, expected in (('gzip;q=0', None), ('br;q=0, gzip', 'gzip'), ('*;q=0', None),
+                                     ('gzip, br;q=0.5', 'gzip'), ('br, gzip', 'br'), ('GZIP', 'gzip')):
+                resp = client.get('/static/app.js', headers={'Accept-Encoding': accept})
+                self.assertEqual(resp.headers.get('content-encoding'), expected, accept)
+
+    def test_encoding_quality(self):
+        self.assertEqual(encoding_quality('gzip, deflate', 'gzip'), 1.0)
+        self.assertEqual(encoding_quality('gzip;q=0', 'gzip'), 0.0)
+        self.assertEqual(encoding_quality('xgzip', 'gzip'), 0.0)
+        self.assertEqual(encoding_quality('*;q=0.3, br;q=0', 'gzip'), 0.3)
+        self.assertEqual(encoding_quality('gzip;q=oops', 'gzip'), 0.0)
+        self.assertEqual(encoding_quality('', 'gzip'), 0.0)
+
+class TestHomePageWireBytes(unittest.TestCase):
+    def test_compressed_and_warm_loads_are_smaller(self):
+        res = measure_home_page()
+        self.assertLess(res['compressed-cold']['html'], res['identity-cold']['html'] / 4)
+        self.assertEqual(res['compressed-warm']['assets'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
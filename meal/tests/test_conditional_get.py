@@ -0,0 +1,78 @@
+import unittest
+from datetime import date
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app
+from meal.infra.Plan_Repository import PlanRepository
+from meal.infra.versions import plan_week_version
+
+class TestConditionalGet(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+        iso = date.today().isocalendar()
+        cls.week, cls.year = iso.week, iso.year
+        cls.monday = date.fromisocalendar(cls.year, cls.week, 1).isoformat()
+
+    def _assert_revalidates(self, url):
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200, url)
+        etag = first.headers.get('etag')
+        self.assertTrue(etag, url)
+        second = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(second.status_code, 304, url)
+        self.assertEqual(second.headers.get('etag'), etag)
+        self.assertEqual(second.content, b'')
+        return etag
+
+    def test_polled_endpoints_return_304_on_match(self):
+        for url in (
+            f'/get_week?start={self.monday}',
+            f'/api/shopping-list?week={self.week}&year={self.year}',
+            f'/api/nutrition?week={self.week}&year={self.year}',
+            '/api/recipes/available',
+        ):
+            self._assert_revalidates(url)
+
+    def test_plan_edit_changes_only_that_week(self):
+        repo = PlanRepository()
+        plan = repo.get_week_plan(self.week, self.year)
+        other_week = self.week + 1 if self.week < 52 else 1
+        other_year = self.year if self.week < 52 else self.year + 1
+        other_before = plan_week_version(other_week, other_year)
+        url = f'/api/nutrition?week={self.week}&year={self.year}'
+        etag = self._assert_revalidates(url)
+
+        slot = plan.meals['Sunday']
+        original = slot['dinner']
+        slot['dinner'] = 'Chicken Curry' if original != 'Chicken Curry' else 'Spaghetti Bolognese'
+        repo.save_week_plan(self.week, plan, self.year)
+        try:
+            resp = self.client.get(url, headers={'If-None-Match': etag})
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotEqual(resp.headers.get('etag'), etag)
+            self.assertEqual(plan_week_version(other_week, other_year), other_before)
+        finally:
+            slot['dinner'] = original
+            repo.save_week_plan(self.week, plan, self.year)
+
+    def test_slot_recipe_conditional(self):
+        repo = PlanRepository()
+        plan = repo.get_week_plan(self.week, self.year)
+        original = plan.meals['Sunday']['lunch']
+        plan.meals['Sunday']['lunch'] = 'Chicken Curry'
+        repo.save_week_plan(self.week, plan, self.year)
+        try:
+            self._assert_revalidates(
+                f'/api/plan/slot-recipe?day=Sunday&meal=lunch&week={self.week}&year={self.year}')
+        finally:
+            plan.meals['Sunday']['lunch'] = original
+            repo.save_week_plan(self.week, plan, self.year)
+
+    def test_stale_etag_gets_full_response(self):
+        resp = self.client.get('/api/recipes/available', headers={'If-None-Match': 'W/"stale"'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn('recipes', resp.json())
+
+if __name__ == '__main__':
+    unittest.main()
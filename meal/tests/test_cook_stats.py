@@ -0,0 +1,94 @@
+import unittest, tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app
+from meal.events import stats_observers
+from meal.events.event_helpers import publish_recipe_cooked
+from meal.logic.reporting import cook_stats
+from meal.logic.reporting.cook_stats import CookStats
+from meal.utilities.constants import DATE_FORMAT
+
+RECIPES = [
+    {"name": "Pancakes", "calories_per_serving": 400, "macros": {"protein": 10, "carbohydrates": 60, "fats": 12}},
+    {"name": "Omelette", "calories_per_serving": 300, "macros": {"protein": 20, "carbs": 2, "fats": 22}},
+]
+
+def _entry(name, days_ago=0):
+    return {"name": name, "date_cooked": (date.today() - timedelta(days=days_ago)).strftime(DATE_FORMAT), "servings": 2}
+
+class TestCookStats(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.snapshot = Path(self._tmp.name) / 'stats_snapshot.json'
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_record_updates_counters_and_persists(self):
+        stats = CookStats(self.snapshot)
+        stats.record(_entry("Pancakes"), RECIPES[0])
+        stats.record(_entry("Pancakes", 1), RECIPES[0])
+        stats.record(_entry("Omelette", 2), RECIPES[1])
+        summary = stats.summary()
+        self.assertEqual(summary['total_cooked'], 3)
+        self.assertEqual(summary['most_cooked'][0], ("Pancakes", 2))
+        self.assertEqual(sum(summary['cooking_by_day'].values()), 3)
+        self.assertEqual(summary['distinct_recipes'], 2)
+        self.assertAlmostEqual(summary['diversity_score'], 66.67)
+        self.assertAlmostEqual(summary['nutrition_averages']['calories_per_day'], round(1100 / 28, 2))
+        # A fresh instance reads the persisted snapshot
+        reloaded = CookStats(self.snapshot).summary()
+        self.assertEqual(reloaded['total_cooked'], 3)
+        self.assertEqual(reloaded['distinct_recipes'], 2)
+
+    def test_old_entries_only_count_towards_lifetime_totals(self):
+        stats = CookStats(self.snapshot)
+        stats.record(_entry("Omelette", 120), RECIPES[1])
+        summary = stats.summary()
+        self.assertEqual(summary['total_cooked'], 1)
+        self.assertEqual(summary['nutrition_averages']['meals_per_week'], 0)
+        self.assertEqual(summary['diversity_score'], 0.0)
+
+    def test_rebuild_replays_cooked_log(self):
+        stats = CookStats(self.snapshot)
+        stats.record(_entry("Omelette"), RECIPES[1])
+        log = [_entry("Pancakes"), _entry("Pancakes", 3), {"name": "Unknown", "date_cooked": "not-a-date"}]
+        stats.rebuild(log, RECIPES)
+        summary = stats.summary()
+        self.assertEqual(summary['total_cooked'], 3)
+        self.assertEqual(dict(summary['most_cooked'])["Pancakes"], 2)
+        self.assertNotIn("Omelette", dict(summary['most_cooked']))
+
+    def test_cook_event_feeds_stats_and_api(self):
+        stats = CookStats(self.snapshot)
+        original = cook_stats._stats
+        cook_stats._stats = stats
+        try:
+            stats_observers.start()
+            publish_recipe_cooked(_entry("Pancakes"), RECIPES[0])
+            self.assertEqual(stats.summary()['total_cooked'], 1)
+            resp = TestClient(app).get('/api/stats')
+            self.assertEqual(resp.status_code, 200)
+            self.assertEqual(resp.json()['most_cooked'], [["Pancakes", 1]])
+        finally:
+            cook_stats._stats = original
+    def test_missing_snapshot_is_built_from_cooked_log(self):
+        log = [_entry("Pancakes"), _entry("Omelette", 1), _entry("Pancakes", 2)]
+        original = cook_stats._stats
+        cook_stats._stats = None
+        try:
+            with mock.patch.object(cook_stats, 'STATS_SNAPSHOT_FILE', self.snapshot), \
+                    mock.patch('meal.api.routes.logs.load_cooked_recipes', return_value=log), \
+                    mock.patch('meal.api.routes.recipes.load_recipes', return_value=RECIPES):
+                summary = cook_stats.get_cook_stats().summary()
+            self.assertEqual(summary['total_cooked'], 3)
+            self.assertEqual(dict(summary['most_cooked'])["Pancakes"], 2)
+            self.assertTrue(self.snapshot.exists())
+        finally:
+            cook_stats._stats = original
+
+if __name__ == '__main__':
+    unittest.main()
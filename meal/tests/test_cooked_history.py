@@ -0,0 +1,104 @@
+import unittest, tempfile, json, os, time
+from datetime import date, timedelta
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app
+from meal.infra.Cooked_Repository import CookedHistory, get_cooked_history, parse_cooked_date
+from meal.utilities.constants import DATE_FORMAT
+from meal.utilities.statistics import MealPlannerStats
+
+def _entry(name, d):
+    return {"name": name, "servings": 1, "unit": "portion", "date_cooked": d.strftime(DATE_FORMAT)}
+
+class TestCookedHistory(unittest.TestCase):
+    def setUp(self):
+        base = date(2025, 10, 1)
+        # deliberately unsorted, with a legacy ISO date and an invalid one
+        self.entries = [
+            _entry("C", base + timedelta(days=2)),
+            _entry("A", base),
+            {"name": "Legacy", "servings": 1, "unit": "portion", "date_cooked": "2025-10-02"},
+            _entry("D", base + timedelta(days=10)),
+            {"name": "Broken", "date_cooked": "??"},
+        ]
+        self.history = CookedHistory(self.entries)
+
+    def test_parse_accepts_both_formats(self):
+        self.assertEqual(parse_cooked_date("05-10-2025"), date(2025, 10, 5))
+        self.assertEqual(parse_cooked_date("2025-10-05"), date(2025, 10, 5))
+        self.assertIsNone(parse_cooked_date("5th of October"))
+
+    def test_range_is_sorted_and_inclusive(self):
+        names = [e["name"] for e in self.history.range(date(2025, 10, 1), date(2025, 10, 3))]
+        self.assertEqual(names, ["A", "Legacy", "C"])
+        self.assertEqual(self.history.count(date(2025, 10, 4)), 1)
+        # invalid dates only show up in unbounded queries
+        self.assertEqual(self.history.range()[0]["name"], "Broken")
+
+    def test_page_newest_first(self):
+        items, total = self.history.page(date(2025, 10, 1), None, offset=0, limit=2, newest_first=True)
+        self.assertEqual(total, 4)
+        self.assertEqual([e["name"] for e in items], ["D", "C"])
+        items, _ = self.history.page(date(2025, 10, 1), None, offset=2, limit=2, newest_first=True)
+        self.assertEqual([e["name"] for e in items], ["Legacy", "A"])
+        items, _ = self.history.page(date(2025, 10, 1), None, offset=4, limit=2, newest_first=True)
+        self.assertEqual(items, [])
+
+    def test_file_cache_reloads_on_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "cooked.json"
+            path.write_text(json.dumps(self.entries[:2]), encoding="utf-8")
+            first = get_cooked_history(path)
+            self.assertIs(first, get_cooked_history(path))
+            path.write_text(json.dumps(self.entries), encoding="utf-8")
+            st = path.stat()
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            self.assertEqual(len(get_cooked_history(path)), len(self.entries))
+
+class TestStatsWindow(unittest.TestCase):
+    def test_cutoff_day_included_and_name_key_counted(self):
+        cutoff = date.today() - timedelta(weeks=4)
+        cooked = [
+            _entry("Soup", cutoff - timedelta(days=1)),  # outside the window
+            _entry("Soup", cutoff),  # the cutoff day itself counts (whole days)
+            {"recipe_name": "Salad", "servings_cooked": 2, "date_cooked": date.today().strftime(DATE_FORMAT)},
+        ]
+        recipes = [{"name": "Soup", "calories_per_serving": 280, "macros": {"protein": 7, "carbs": 28, "fats": 14}},
+                   {"name": "Salad", "calories_per_serving": 140, "macros": {"protein": 0, "carbs": 0, "fats": 0}}]
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / "Pantry_recipe_cooked.json").write_text(json.dumps(cooked), encoding="utf-8")
+            (Path(tmp) / "recipes.json").write_text(json.dumps(recipes), encoding="utf-8")
+            stats = MealPlannerStats(Path(tmp))
+            nutrition = stats.average_nutrition_per_week(4)
+            diversity = stats.meal_diversity_score(4)
+        # Soup via `name` on the cutoff day (1 serving) + Salad via `recipe_name` (2 servings)
+        self.assertEqual(nutrition["meals_per_week"], 0.5)
+        self.assertEqual(nutrition["calories_per_day"], round((280 + 2 * 140) / 28, 2))
+        self.assertEqual(nutrition["protein_per_day"], 0.25)
+        self.assertEqual(diversity, 100.0)
+
+class TestCookedApi(unittest.TestCase):
+    def setUp(self):
+        self.client = TestClient(app)
+
+    def test_pagination_walks_whole_history(self):
+        total = len(get_cooked_history())
+        seen, offset = 0, 0
+        while offset is not None:
+            resp = self.client.get(f"/api/cooked?offset={offset}&limit=7")
+            self.assertEqual(resp.status_code, 200)
+            data = resp.json()
+            self.assertEqual(data["total"], total)
+            seen += len(data["items"])
+            offset = data["next_offset"]
+        self.assertEqual(seen, total)
+
+    def test_date_filter_and_validation(self):
+        resp = self.client.get("/api/cooked?from=2999-01-01")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["total"], 0)
+        self.assertEqual(self.client.get("/api/cooked?from=yesterday").status_code, 400)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from datetime import date
+from unittest import mock
+from fastapi.testclient import TestClient
+from jinja2 import DictLoader, Environment
+
+from meal.api import api_run
+from meal.api.api_run import app
+from meal.api.fragment_cache import FragmentCache
+from meal.infra.Plan_Repository import PlanRepository
+
+
+class TestFragmentCacheLRU(unittest.TestCase):
+    def setUp(self):
+        self.env = Environment(loader=DictLoader({"t.html": "<b>{{ v }}</b>"}), autoescape=True)
+
+    def test_context_built_only_on_miss_and_lru_eviction(self):
+        cache = FragmentCache(maxsize=2)
+        calls = []
+        ctx = lambda v: (lambda: calls.append(v) or {"v": v})
+        self.assertEqual(cache.render(self.env, "t.html", 1, ctx("a")), "<b>a</b>")
+        self.assertEqual(cache.render(self.env, "t.html", 1, ctx("ignored")), "<b>a</b>")
+        cache.render(self.env, "t.html", 2, ctx("b"))
+        cache.render(self.env, "t.html", 1, ctx("ignored"))  # 1 becomes most recent
+        cache.render(self.env, "t.html", 3, ctx("c"))        # evicts 2
+        self.assertEqual(calls, ["a", "b", "c"])
+        self.assertIsNone(cache.get("t.html", 2))
+        self.assertEqual(cache.get("t.html", 1), "<b>a</b>")
+        self.assertEqual(cache.stats()["evictions"], 1)
+        self.assertEqual(len(cache), 2)
+
+
+class TestWeekFragments(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+        iso = date.today().isocalendar()
+        cls.week, cls.year = iso.week, iso.year
+
+    def setUp(self):
+        self.repo = PlanRepository()
+        self.original = self.repo.get_week_plan(self.week, self.year)
+        api_run.fragment_cache.clear()
+
+    def tearDown(self):
+        self.repo.save_week_plan(self.week, self.original, self.year)
+
+    def test_unchanged_week_reuses_rendered_regions(self):
+        url = f"/?week={self.week}&year={self.year}"
+        first = self.client.get(url)
+        with mock.patch.object(api_run, "compute_week_nutrition") as nutrition:
+            second = self.client.get(url)
+        nutrition.assert_not_called()
+        self.assertEqual(first.text, second.text)
+        self.assertIn('id="statsPanel"', second.text)
+        self.assertIn('id="Monday-breakfast"', second.text)
+
+    def test_plan_edit_invalidates_fragments(self):
+        url = f"/?week={self.week}&year={self.year}"
+        self.client.get(url)
+        resp = self.client.post("/api/plan/slots", json={"edits": [
+            {"year": self.year, "week": self.week, "day": "Wednesday", "meal": "lunch", "recipe": "Shakshuka"}]})
+        self.assertEqual(resp.status_code, 200, resp.text)
+        page = self.client.get(url).text
+        self.assertIn('href="/recipe/Shakshuka"', page)
+        monday = date.fromisocalendar(self.year, self.week, 1).isoformat()
+        rows = self.client.get(f"/partial/meal-tbody?start={monday}")
+        self.assertEqual(rows.status_code, 200)
+        self.assertIn('href="/recipe/Shakshuka"', rows.text)
+        self.assertEqual(rows.text.count("<tr>"), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
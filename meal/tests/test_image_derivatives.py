@@ -0,0 +1,81 @@
+import shutil, tempfile, unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from fastapi.testclient import TestClient
+
+from meal.api import api_run
+from meal.infra.images import Image, ImageDerivativeService, webp_supported
+
+PICTURES = Path(api_run.__file__).parent.parent / 'static' / 'pictures'
+
+
+def _write_jpeg(path, size, color):
+    Image.new('RGB', size, color).save(path, 'JPEG', quality=95)
+
+
+@unittest.skipIf(Image is None, 'Pillow not installed')
+class TestImageDerivativeService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.service = ImageDerivativeService(self.tmp, widths=(320, 640, 1024))
+
+    def tearDown(self):
+        self.service.shutdown()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_lazy_backfill_buckets_and_formats(self):
+        _write_jpeg(Path(self.tmp) / 'big.jpg', (800, 600), 'red')
+        self.assertEqual(self.service.variants('big.jpg'), [])  # first lookup schedules the job
+        self.service.wait(timeout=60)
+        jpg = self.service.variants('big.jpg')
+        self.assertEqual([w for w, _ in jpg], [320, 640])  # no upscaling past the original width
+        with Image.open(Path(self.tmp) / '_derived' / jpg[0][1].split('_derived/')[1]) as im:
+            self.assertEqual(im.size, (320, 240))
+        if webp_supported():
+            self.assertEqual([w for w, _ in self.service.variants('big.jpg', 'webp')], [320, 640])
+        self.assertIn('320w', self.service.srcset('big.jpg'))
+
+    def test_small_and_missing_sources(self):
+        _write_jpeg(Path(self.tmp) / 'tiny.jpg', (200, 150), 'blue')
+        self.service.schedule('tiny.jpg')
+        self.service.wait(timeout=60)
+        self.assertEqual(self.service.srcset('tiny.jpg'), '')
+        self.assertEqual(self.service.variants('nope.jpg'), [])
+        self.assertEqual(self.service.variants('../escape.jpg'), [])
+
+    def test_cache_is_keyed_by_source_content(self):
+        src = Path(self.tmp) / 'dish.jpg'
+        _write_jpeg(src, (700, 700), 'green')
+        self.service.schedule('dish.jpg')
+        self.service.wait(timeout=60)
+        old = self.service.srcset('dish.jpg')
+        _write_jpeg(src, (900, 450), 'yellow')  # replaced under the same name
+        self.assertEqual(self.service.srcset('dish.jpg'), '')  # stale set is not served
+        self.service.wait(timeout=60)
+        new = self.service.srcset('dish.jpg')
+        self.assertTrue(new and new != old)
+
+
+@unittest.skipIf(Image is None, 'Pillow not installed')
+class TestTemplatesEmitSrcset(unittest.TestCase):
+    def test_recipes_page_uses_derivatives(self):
+        tmp = tempfile.mkdtemp()
+        service = ImageDerivativeService(tmp)
+        try:
+            shutil.copy(PICTURES / 'beef_stew.jpg', tmp)
+            service.schedule('beef_stew.jpg')
+            service.wait(timeout=60)
+            with patch.object(api_run, 'image_service', service):
+                html = TestClient(api_run.app).get('/recipes-page').text
+            self.assertIn('320.jpg', html)
+            self.assertIn('srcset=', html)
+            if webp_supported():
+                self.assertIn('type="image/webp"', html)
+        finally:
+            service.shutdown()
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
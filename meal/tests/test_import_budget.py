@@ -0,0 +1,42 @@
+import os
+import unittest
+
+from meal.tools.bench_import import (APP_MODULE, LAZY_MODULES, import_children, measure_import, own_import_us,
+                                     parse_importtime)
+
+# Budget for the app's own import time: its cumulative time minus the fastapi import inside
+# it, both from the same -X importtime report. Measured on a loaded dev box: 150-190 ms own
+# (fastapi alone 400-650 ms); importing reportlab / openai / httpx eagerly adds 600-750 ms.
+# The budget leaves 3x headroom for slow CI machines; the lazy-module check is the strict one.
+IMPORT_BUDGET_MS = float(os.getenv('IMPORT_BUDGET_MS', '600'))
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     b
+import time:       200 |        300 |   a
+import time:        50 |         50 |   c
+import time:      1000 |       1350 | app
+"""
+
+
+class TestImportBudget(unittest.TestCase):
+    def test_parse_importtime(self):
+        records = parse_importtime(SAMPLE)
+        self.assertEqual([(r.name, r.depth) for r in records], [('b', 2), ('a', 1), ('c', 1), ('app', 0)])
+        self.assertEqual(records[-1].cumulative_us, 1350)
+        self.assertEqual({r.name for r in import_children(records, 'app')}, {'a', 'c'})
+        self.assertEqual([r.name for r in import_children(records, 'a')], ['b'])
+        self.assertEqual(own_import_us(records, 'app', exclude=('a',)), 1050)
+        self.assertEqual(own_import_us(records, 'app', exclude=()), 1350)
+        self.assertIsNone(own_import_us(records, 'missing'))
+
+    def test_cold_app_import_within_budget(self):
+        result = measure_import(APP_MODULE, runs=3)
+        self.assertEqual(result['lazy'], {name: False for name in LAZY_MODULES},
+                         "rarely used subsystems must be imported on first use, not with the app")
+        self.assertLessEqual(result['own_min_ms'], IMPORT_BUDGET_MS,
+                             f"cold import of {APP_MODULE} took {result['min_ms']:.0f} ms, {result['own_min_ms']:.0f} ms "
+                             f"without fastapi (budget {IMPORT_BUDGET_MS:.0f} ms); slowest imports: {result['top'][:5]}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -11,3 +11,20 @@ class TestIngredient(unittest.TestCase):
         self.assertEqual(ingredient.default_quantity, 150)
         ingredient.set_quantity(-30)
         self.assertEqual(ingredient.default_quantity, 120)
+
+    def test_tags_are_an_immutable_copy(self):
+        source = ["baking"]
+        ingredient = Ingredient("Sugar", "grams", 100, tags=source)
+        source.append("other")
+        self.assertEqual(ingredient.tags, ("baking",))
+        self.assertEqual(Ingredient("Salt").tags, ())
+        ingredient.tags = ["spice"]
+        self.assertEqual(ingredient.tags, ("spice",))
+        self.assertEqual(ingredient.to_dict()["tags"], ["spice"])
+        self.assertEqual(Ingredient.from_dict(ingredient.to_dict()).tags, ("spice",))
+
+    def test_slotted(self):
+        ingredient = Ingredient("Sugar", "grams", 100)
+        self.assertFalse(hasattr(ingredient, "__dict__"))
+        with self.assertRaises(AttributeError):
+            ingredient.colour = "white"
@@ -0,0 +1,88 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from meal.tools.loadtest import DEFAULT_MIX, Sample, build_report, parse_mix, percentile, run_load, serve
+from meal.tools.synth import SynthConfig, write_dataset
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+class TestLoadTestReport(unittest.TestCase):
+    def test_percentile_nearest_rank(self):
+        ordered = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(ordered, 50), 50.0)
+        self.assertEqual(percentile(ordered, 99), 99.0)
+        self.assertEqual(percentile(ordered, 100), 100.0)
+        self.assertEqual(percentile([0.3], 95), 0.3)
+        self.assertEqual(percentile([], 50), 0.0)
+
+    def test_report_counts_errors_per_route(self):
+        samples = [Sample('GET /get_week', 0.010, 200), Sample('GET /get_week', 0.020, 304),
+                   Sample('GET /get_week', 0.030, 500), Sample('GET /get_week', 9.0, 200, phase='warmup'),
+                   Sample('POST /api/cook', 0.005, 404), Sample('POST /api/cook', 0.050, 0)]
+        report = build_report(samples, duration=2.0, meta={'rps': 3})
+        self.assertEqual(report['kind'], 'loadtest')
+        self.assertEqual(report['meta']['requests'], 5)  # warmup sample dropped
+        self.assertEqual(report['meta']['errors'], 2)
+        routes = {r['name']: r for r in report['routes']}
+        week = routes['GET /get_week']
+        self.assertEqual((week['count'], week['errors'], week['not_modified']), (3, 1, 1))
+        self.assertAlmostEqual(week['stats']['p50'], 0.020)
+        self.assertAlmostEqual(week['stats']['max'], 0.030)
+        self.assertEqual(len(week['samples']), 3)
+        cook = routes['POST /api/cook']
+        self.assertEqual((cook['errors'], cook['client_errors']), (1, 1))  # 404 is not an error, a transport failure is
+        self.assertEqual(cook['error_rate'], 0.5)
+        json.dumps(report)
+
+    def test_parse_mix(self):
+        mix = parse_mix('get_week=5, buy=0')
+        self.assertEqual(mix['get_week'], 5.0)
+        self.assertEqual(mix['buy'], 0.0)
+        self.assertEqual(mix['alerts'], DEFAULT_MIX['alerts'])
+        with self.assertRaises(ValueError):
+            parse_mix('nope=1')
+        with self.assertRaises(ValueError):
+            parse_mix('alerts=x')
+        with self.assertRaises(ValueError):
+            parse_mix(','.join(f'{name}=0' for name in DEFAULT_MIX))
+
+
+class TestMealDataDir(unittest.TestCase):
+    def test_env_var_moves_every_data_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            code = ("import json; from meal.infra import paths; from meal.utilities import config; "
+                    "from meal.api.routes import add; "
+                    "print(json.dumps([str(paths.DATA_DIR), str(paths.PLAN_FILE), str(config.DATA_DIR), add.RECIPES_FILE]))")
+            out = subprocess.run([sys.executable, '-c', code], cwd=PROJECT_ROOT, capture_output=True, text=True,
+                                 env={**os.environ, 'MEAL_DATA_DIR': tmp}, check=True)
+            data_dir, plan_file, config_dir, recipes_file = json.loads(out.stdout.strip().splitlines()[-1])
+            root = str(Path(tmp).resolve())
+            self.assertEqual(data_dir, root)
+            self.assertEqual(config_dir, root)
+            self.assertEqual(plan_file, str(Path(root) / 'plan.json'))
+            self.assertEqual(recipes_file, str(Path(root) / 'recipes.json'))
+
+
+class TestLoadTestRun(unittest.TestCase):
+    def test_short_run_against_uvicorn(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            write_dataset(tmp, SynthConfig(recipes=30, ingredients=40, pantry=30, weeks=6, future_weeks=2,
+                                           transactions=5, seed=5, today=date.today()))
+            with serve(tmp) as base_url:
+                samples = asyncio.run(run_load(base_url, rps=25, duration=1.0, mix=DEFAULT_MIX, seed=2))
+        report = build_report(samples, duration=1.0)
+        self.assertGreater(report['meta']['requests'], 5)
+        self.assertEqual(report['meta']['errors'], 0, report['routes'])
+        self.assertTrue(all(s.status for s in samples))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app
+from meal.api.request_metrics import RequestMetricsMiddleware
+from meal.infra.metrics import DATA_FILE_READS, REGISTRY, Registry, record_read
+from meal.infra.paths import PANTRY_FILE
+
+
+DEAD_PID = 2 ** 30  # above any pid_max, so never a live process
+
+
+class TestRegistry(unittest.TestCase):
+    def test_render_text_format(self):
+        reg = Registry()
+        hits = reg.counter('hits_total', 'Hits', ('route',))
+        hits.inc(route='/a "b"')
+        hits.inc(2, route='/a "b"')
+        reg.gauge('temp', 'Temperature').set(1.5)
+        lat = reg.histogram('lat_seconds', 'Latency', ('route',), buckets=(0.1, 1))
+        lat.observe(0.05, route='/x')
+        lat.observe(0.5, route='/x')
+        lat.observe(3, route='/x')
+        text = reg.render()
+        self.assertIn('# TYPE hits_total counter', text)
+        self.assertIn('hits_total{route="/a \\"b\\""} 3', text)
+        self.assertIn('temp 1.5', text)
+        self.assertIn('lat_seconds_bucket{route="/x",le="0.1"} 1', text)
+        self.assertIn('lat_seconds_bucket{route="/x",le="1"} 2', text)
+        self.assertIn('lat_seconds_bucket{route="/x",le="+Inf"} 3', text)
+        self.assertIn('lat_seconds_count{route="/x"} 3', text)
+        self.assertIn('lat_seconds_sum{route="/x"} 3.55', text)
+        with self.assertRaises(ValueError):
+            hits.inc(route='/a', extra='x')
+        with self.assertRaises(ValueError):
+            hits.inc(-1, route='/a')
+
+    def test_multiprocess_merge(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            reg = Registry(tmp)
+            reg.counter('hits_total', 'Hits').inc(2)
+            reg.gauge('busy', 'Busy').set(1)
+            reg.gauge('ready_seconds', 'Ready', multiprocess_mode='all').set(0.5)
+            # a worker that has exited: its counters still count, its gauges do not
+            other = Registry()
+            other.counter('hits_total', 'Hits').inc(3)
+            other.gauge('busy', 'Busy').set(4)
+            other.gauge('ready_seconds', 'Ready', multiprocess_mode='all').set(0.7)
+            Path(tmp, f'metrics_{DEAD_PID}.json').write_text(
+                json.dumps({'pid': DEAD_PID, 'metrics': other.snapshot()}), encoding='utf-8')
+            text = reg.render()
+            self.assertIn('hits_total 5', text)
+            self.assertIn('busy 1', text)
+            self.assertIn(f'ready_seconds{{pid="{os.getpid()}"}} 0.5', text)
+            self.assertNotIn(f'pid="{DEAD_PID}"', text)
+
+    def test_flush_is_throttled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            reg = Registry(tmp)
+            self.assertTrue(reg.flush_due())
+            self.assertFalse(reg.flush_due())
+            reg.flush()  # throttled: nothing written
+            self.assertEqual(list(Path(tmp).iterdir()), [])
+            reg.flush(force=True)
+            self.assertTrue(Path(tmp, f'metrics_{os.getpid()}.json').is_file())
+        self.assertFalse(Registry().flush_due())
+
+    def test_record_read_counts_bytes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'metrics_probe.json'
+            path.write_text('[1, 2, 3]', encoding='utf-8')
+            before = DATA_FILE_READS.get(file='metrics_probe.json')
+            record_read(path)
+            self.assertEqual(DATA_FILE_READS.get(file='metrics_probe.json'), before + 1)
+
+
+class TestMetricsEndpoint(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def test_request_and_data_file_metrics(self):
+        self.client.get('/api/pantry/alerts')
+        self.client.get('/no/such/page')
+        resp = self.client.get('/metrics')
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers['content-type'].startswith('text/plain; version=0.0.4'))
+        text = resp.text
+        self.assertIn('meal_http_request_duration_seconds_bucket{method="GET",route="/api/pantry/alerts",le="+Inf"}', text)
+        self.assertIn('meal_http_responses_total{method="GET",route="/api/pantry/alerts",status="200"}', text)
+        self.assertIn('meal_http_responses_total{method="GET",route="unmatched",status="404"}', text)
+        self.assertIn('meal_http_requests_in_flight{method="GET"}', text)
+        self.assertIn(f'meal_data_file_reads_total{{file="{PANTRY_FILE.name}"}}', text)
+        self.assertIn(f'meal_data_file_read_bytes_total{{file="{PANTRY_FILE.name}"}}', text)
+
+    def test_static_files_use_the_mount_label(self):
+        self.assertEqual(self.client.get('/static/index.css').status_code, 200)
+        self.client.get('/static/no-such-file.css')
+        text = self.client.get('/metrics').text
+        self.assertIn('meal_http_responses_total{method="GET",route="/static",status="200"}', text)
+        self.assertIn('meal_http_responses_total{method="GET",route="/static",status="404"}', text)
+        self.assertIn('meal_http_response_size_bytes_count{method="GET",route="/static"}', text)
+
+
+class TestMiddlewareFlush(unittest.TestCase):
+    def test_snapshot_is_written_off_the_event_loop(self):
+        threads = {}
+        small = FastAPI()
+
+        @small.get('/ping')
+        async def ping():
+            threads['loop'] = threading.get_ident()
+            return {}
+
+        small.add_middleware(RequestMetricsMiddleware, router=small.router)
+        real_flush = REGISTRY.flush
+
+        def flush(force=False):
+            threads['flush'] = threading.get_ident()
+            real_flush(force)
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(REGISTRY, 'multiproc_dir', Path(tmp)), \
+                mock.patch.object(REGISTRY, '_last_flush', 0.0), \
+                mock.patch.object(REGISTRY, 'flush', flush):
+            TestClient(small).get('/ping')
+            self.assertTrue(Path(tmp, f'metrics_{os.getpid()}.json').is_file())
+        self.assertNotEqual(threads['flush'], threads['loop'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from unittest import mock
+from fastapi.testclient import TestClient
+
+from meal.api import api_run
+from meal.api.api_run import app
+from meal.logic.pantry.batch import apply_pantry_batch
+
+def _item(name, qty, exp="01-01-2030", unit="g"):
+    return {"name": name, "default_quantity": qty, "unit": unit, "data_expirare": exp, "tags": ["other"]}
+
+class TestApplyPantryBatch(unittest.TestCase):
+    def test_mixed_ops_single_pass(self):
+        pantry = [_item("Flour", 500), _item("Milk", 1, unit="l"), _item("Rice", 200), _item("Rice", 300, exp="01-02-2030")]
+        ops = [
+            {"op": "add", "item": _item("Sugar", 250)},
+            {"op": "add", "item": _item("Flour", 1)},               # exists
+            {"op": "upsert", "item": _item("Flour", 100)},          # same expiry -> merge
+            {"op": "upsert", "item": _item("Flour", 100, exp="05-05-2030")},  # new lot
+            {"op": "patch", "name": "Milk", "changes": {"name": "Whole milk", "default_quantity": 2}},
+            {"op": "patch", "name": "Sugar", "changes": {"name": "Flour"}},   # rename conflict
+            {"op": "delete", "name": "Rice"},                        # removes both lots
+            {"op": "delete", "name": "Rice"},                        # already gone
+            {"op": "explode"},
+        ]
+        new_pantry, results, changed = apply_pantry_batch(pantry, ops)
+        self.assertTrue(changed)
+        self.assertEqual([r["status"] for r in results],
+                         ["added", "error", "merged", "added", "updated", "error", "deleted", "error", "error"])
+        self.assertEqual(results[6]["count"], 2)
+        names = [(i["name"], i["default_quantity"]) for i in new_pantry]
+        self.assertEqual(names, [("Flour", 600), ("Whole milk", 2), ("Sugar", 250), ("Flour", 100)])
+
+    def test_no_changes_reported(self):
+        _, results, changed = apply_pantry_batch([_item("Flour", 1)], [{"op": "delete", "name": "Salt"}])
+        self.assertFalse(changed)
+        self.assertEqual(results[0]["status"], "error")
+
+class TestPantryBatchAPI(unittest.TestCase):
+    def test_receipt_import_is_one_write(self):
+        ops = [{"op": "upsert", "item": _item(f"Receipt item {n}", n + 1)} for n in range(80)]
+        saves = []
+        with mock.patch.object(api_run, "save_ingredients", side_effect=saves.append):
+            resp = TestClient(app).post("/api/pantry/batch", json={"ops": ops})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual((data["applied"], data["errors"], data["written"]), (80, 0, True))
+        self.assertEqual(len(saves), 1)
+        self.assertEqual(sum(1 for i in saves[0] if i["name"].startswith("Receipt item")), 80)
+
+if __name__ == '__main__':
+    unittest.main()
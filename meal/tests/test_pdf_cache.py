@@ -0,0 +1,137 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app
+from meal.infra import pdf_cache
+from meal.infra.pdf_cache import PdfCache
+from meal.infra.pdf_utils import generate_pdf_for_week
+from meal.infra.Plan_Repository import PlanRepository
+
+
+class TestPdfCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _files(self):
+        return sorted(p.name for p in self.dir.glob('*.pdf'))
+
+    def test_put_get_and_stale_versions(self):
+        cache = PdfCache(self.dir, max_bytes=10_000, max_entries=10)
+        self.assertIsNone(cache.get(40, 2026, 'aaa'))
+        cache.put(40, 2026, 'aaa', b'%PDF-old')
+        self.assertEqual(cache.get(40, 2026, 'aaa'), b'%PDF-old')
+        cache.put(41, 2026, 'ccc', b'%PDF-41')
+        # a new version of week 40 replaces the old one, other weeks stay
+        cache.put(40, 2026, 'bbb', b'%PDF-new')
+        self.assertEqual(self._files(), ['2026-W40_bbb.pdf', '2026-W41_ccc.pdf'])
+        self.assertEqual(cache.invalidate_week(40, 2026), 1)
+        self.assertEqual(self._files(), ['2026-W41_ccc.pdf'])
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['invalidations']), (1, 1, 1))
+
+    def test_lru_limits(self):
+        cache = PdfCache(self.dir, max_bytes=250, max_entries=3)
+        now = time.time()
+        for i, week in enumerate((1, 2, 3)):
+            cache.put(week, 2026, f'c{week}', b'x' * 50)
+            os.utime(self.dir / f'2026-W0{week}_c{week}.pdf', (now - 100 + i, now - 100 + i))
+        cache.get(1, 2026, 'c1')  # week 1 becomes the most recently used
+        cache.put(4, 2026, 'c4', b'x' * 50)  # 4 entries > max_entries: week 2 goes
+        self.assertEqual(self._files(), ['2026-W01_c1.pdf', '2026-W03_c3.pdf', '2026-W04_c4.pdf'])
+        cache.put(5, 2026, 'c5', b'x' * 220)  # byte limit: the oldest ones go until it fits
+        self.assertEqual(self._files(), ['2026-W05_c5.pdf'])
+        self.assertEqual(cache.stats()['evictions'], 4)
+
+    def test_years_outside_four_digits_are_evicted(self):
+        cache = PdfCache(self.dir, max_bytes=10_000, max_entries=2)
+        now = time.time()
+        for i, (week, year) in enumerate(((1, 5), (123, 12026), (2, -1))):
+            cache.put(week, year, 'abc', b'%PDF')
+            os.utime(next(self.dir.glob(f'{year}-W*.pdf')), (now - 100 + i, now - 100 + i))
+        self.assertEqual(len(self._files()), 2)
+        self.assertNotIn('5-W01_abc.pdf', self._files())
+        self.assertEqual(cache.invalidate_week(123, 12026), 1)
+        self.assertEqual(self._files(), ['-1-W02_abc.pdf'])
+        cache.clear()
+        self.assertEqual(self._files(), [])
+
+    def test_disabled(self):
+        cache = PdfCache(self.dir, max_bytes=0)
+        cache.put(1, 2026, 'k', b'%PDF')
+        self.assertIsNone(cache.get(1, 2026, 'k'))
+        self.assertEqual(self._files(), [])
+
+    def test_key_depends_on_template_version(self):
+        self.assertNotEqual(PdfCache(self.dir, template_version=1).key(40, 2026),
+                            PdfCache(self.dir, template_version=2).key(40, 2026))
+
+
+class TestExportPdfCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+        iso = date.today().isocalendar()
+        cls.week, cls.year = iso.week, iso.year
+        cls.url = f'/export_pdf?week={cls.week}&year={cls.year}'
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = PdfCache(self.tmp.name)
+        patcher = mock.patch.object(pdf_cache, 'PDF_CACHE', self.cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        api_patcher = mock.patch('meal.api.api_run.PDF_CACHE', self.cache)
+        api_patcher.start()
+        self.addCleanup(api_patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_cached_and_revalidated(self):
+        with mock.patch('meal.api.api_run.generate_pdf_for_week', wraps=generate_pdf_for_week) as render:
+            first = self.client.get(self.url)
+            self.assertEqual(first.status_code, 200)
+            self.assertEqual(first.headers['content-type'], 'application/pdf')
+            etag = first.headers.get('etag')
+            self.assertTrue(etag)
+            second = self.client.get(self.url)
+            self.assertEqual(second.content, first.content)
+            self.assertEqual(second.headers.get('etag'), etag)
+            not_modified = self.client.get(self.url, headers={'If-None-Match': etag})
+            self.assertEqual(not_modified.status_code, 304)
+            self.assertEqual(render.call_count, 1)
+        self.assertEqual(self.cache.stats()['hits'], 1)
+
+    def test_plan_edit_invalidates_week(self):
+        first = self.client.get(self.url)
+        etag = first.headers['etag']
+        self.assertEqual(self.cache.stats()['entries'], 1)
+        repo = PlanRepository()
+        plan = repo.get_week_plan(self.week, self.year)
+        slot = plan.meals['Sunday']
+        original = slot['dinner']
+        slot['dinner'] = 'Chicken Curry' if original != 'Chicken Curry' else 'Spaghetti Bolognese'
+        repo.save_week_plan(self.week, plan, self.year)
+        try:
+            self.assertEqual(self.cache.stats()['entries'], 0)  # dropped on write
+            resp = self.client.get(self.url, headers={'If-None-Match': etag})
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotEqual(resp.headers['etag'], etag)
+        finally:
+            slot['dinner'] = original
+            repo.save_week_plan(self.week, plan, self.year)
+        # back to the original content: the original key again
+        self.assertEqual(self.client.get(self.url, headers={'If-None-Match': etag}).status_code, 304)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from datetime import date
+from unittest import mock
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app
+from meal.infra import Plan_Repository
+from meal.infra.Plan_Repository import PlanRepository
+
+class TestPlanSlotsAPI(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+        iso = date.today().isocalendar()
+        cls.week, cls.year = iso.week, iso.year
+
+    def setUp(self):
+        self.repo = PlanRepository()
+        self.original = self.repo.get_week_plan(self.week, self.year)
+
+    def tearDown(self):
+        self.repo.save_week_plan(self.week, self.original, self.year)
+
+    def _edit(self, day, meal, recipe):
+        return {"year": self.year, "week": self.week, "day": day, "meal": meal, "recipe": recipe}
+
+    def test_batch_applied_with_single_write(self):
+        edits = [self._edit("Monday", "breakfast", "Chicken Curry"),
+                 self._edit("Tuesday", "dinner", "Spaghetti Bolognese"),
+                 self._edit("Monday", "breakfast", "Vegetable Stir Fry")]  # later edit wins
+        real_dump = Plan_Repository.json.dump
+        with mock.patch.object(Plan_Repository.json, "dump", side_effect=real_dump) as dump:
+            resp = self.client.post("/api/plan/slots", json={"edits": edits})
+        self.assertEqual(resp.status_code, 200, resp.text)
+        self.assertEqual(dump.call_count, 1)
+        data = resp.json()
+        self.assertEqual(data["applied"], 3)
+        week = data["weeks"][0]
+        self.assertEqual(week["meta"], {"week": self.week, "year": self.year})
+        self.assertEqual(week["days"]["Monday"]["breakfast"], "Vegetable Stir Fry")
+        self.assertEqual(week["days"]["Tuesday"]["dinner"], "Spaghetti Bolognese")
+        # The returned ETag is the one /get_week will send for that week
+        monday = date.fromisocalendar(self.year, self.week, 1).isoformat()
+        again = self.client.get(f"/get_week?start={monday}", headers={"If-None-Match": week["etag"]})
+        self.assertEqual(again.status_code, 304)
+
+    def test_invalid_edit_rejects_whole_batch(self):
+        before = self.repo.get_week_plan(self.week, self.year).meals["Wednesday"]["lunch"]
+        edits = [self._edit("Wednesday", "lunch", "Chicken Curry" if before != "Chicken Curry" else "-"),
+                 self._edit("Wednesday", "brunch", "Chicken Curry"),
+                 self._edit("Thursday", "lunch", "No Such Recipe")]
+        resp = self.client.post("/api/plan/slots", json={"edits": edits})
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual([e["index"] for e in resp.json()["errors"]], [1, 2])
+        self.assertEqual(self.repo.get_week_plan(self.week, self.year).meals["Wednesday"]["lunch"], before)
+
+if __name__ == '__main__':
+    unittest.main()
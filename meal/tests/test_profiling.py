@@ -0,0 +1,92 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app as meal_app
+from meal.api.profiling import ProfilerMiddleware, StackSampler, list_profiles, profile_path
+
+
+def busy_loop(ms):
+    end = time.perf_counter() + ms / 1000
+    while time.perf_counter() < end:
+        pass
+
+
+def make_app(directory, **options):
+    app = FastAPI()
+
+    @app.get('/work/{n}')
+    def work(n: int):  # sync: runs in a worker thread
+        busy_loop(30)
+        return {'n': n}
+
+    @app.get('/events')
+    def events():
+        return StreamingResponse(iter(['data: 1\n\n']), media_type='text/event-stream')
+
+    app.add_middleware(ProfilerMiddleware, router=app.router, directory=directory, **options)
+    return TestClient(app)
+
+
+class TestProfilerMiddleware(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_token_profiles_single_request(self):
+        client = make_app(self.dir, token='s3cret')
+        self.assertNotIn('x-profile-file', client.get('/work/1').headers)
+        self.assertNotIn('x-profile-file', client.get('/work/1', headers={'X-Profile': 'wrong'}).headers)
+        resp = client.get('/work/1', params={'_profile': 's3cret'})
+        self.assertEqual(resp.json(), {'n': 1})
+        name = resp.headers['x-profile-file']
+        self.assertIn('_GET_work_n_', name)
+        text = profile_path(name, self.dir).read_text(encoding='utf-8')
+        # the worker-thread frames of the sync endpoint are in the collapsed stacks
+        self.assertIn('busy_loop (test_profiling.py:', text)
+        stack, count = text.splitlines()[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        self.assertIsNone(profile_path('../secrets.folded', self.dir))
+
+    def test_sampling_rate_and_retention(self):
+        client = make_app(self.dir, sample_rate=2, keep=2)
+        profiled = [('x-profile-file' in client.get(f'/work/{i}').headers) for i in range(6)]
+        self.assertEqual(profiled, [False, True] * 3)
+        self.assertEqual(len(list_profiles(self.dir)), 2)
+
+    def test_streams_are_not_auto_sampled(self):
+        client = make_app(self.dir, sample_rate=1, exclude_routes=('/work/{n}',))
+        self.assertNotIn('x-profile-file', client.get('/work/1').headers)
+        self.assertNotIn('x-profile-file', client.get('/events').headers)
+        self.assertEqual(list_profiles(self.dir), [])
+        # asking for it with the token still works
+        client = make_app(self.dir, token='s3cret', sample_rate=1)
+        self.assertIn('x-profile-file', client.get('/events', headers={'X-Profile': 's3cret'}).headers)
+
+    def test_sampler_stops_after_max_seconds(self):
+        sampler = StackSampler(0.001, max_seconds=0.05).start()
+        deadline = time.monotonic() + 5
+        while sampler.running and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(sampler.running)
+        self.assertTrue(sampler.truncated)
+        sampler.stop()
+
+
+class TestProfileEndpoints(unittest.TestCase):
+    def test_hidden_without_token(self):
+        client = TestClient(meal_app)
+        self.assertEqual(client.get('/_debug/profiles').status_code, 404)
+        self.assertEqual(client.get('/_debug/profiles/x.folded', params={'_profile': ''}).status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
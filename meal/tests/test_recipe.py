@@ -36,6 +36,14 @@ class TestRecipe(unittest.TestCase):
         self.pantry.add_item(Ingredient("Milk", "ml", 300, date.today()))
         self.pantry.add_item(Ingredient("Eggs", "pcs", 2, date.today()))
 
+    def test_slotted_with_tuple_tags(self):
+        self.assertEqual(self.recipe_pancakes.tags, ("breakfast", "vegetarian"))
+        self.assertEqual(self.recipe_pancakes.to_dict()["tags"], ["breakfast", "vegetarian"])
+        for obj in (self.recipe_pancakes, self.pantry, RecipeCooked("Pancakes", 4)):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+        cooked = self.recipe_pancakes.cook(self.pantry.get_items())
+        self.assertEqual(cooked.tags, ("breakfast", "vegetarian"))
+
     def test_check_ingredients(self):
         self.assertTrue(self.recipe_pancakes.check_ingredients(self.pantry.get_items()))
         self.assertFalse(self.recipe_omelette.check_ingredients(self.pantry.get_items()))
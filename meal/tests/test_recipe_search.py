@@ -0,0 +1,154 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app
+from meal.infra import recipe_search
+from meal.infra.recipe_search import RecipeSearchIndex, get_search_index, parse_query, recipes_appended
+from meal.tools.bench_search import KINDS, measure_search, query_mix
+from meal.tools.synth import Synth, SynthConfig
+from meal.utilities.stemming import normalize_name, stem, tokenize
+
+
+def _recipe(name, ingredients=(), tags=(), steps=()):
+    return {"name": name, "tags": list(tags), "steps": list(steps),
+            "ingredients": [{"name": i, "default_quantity": 1, "unit": "pcs"} for i in ingredients]}
+
+
+RECIPES = [
+    _recipe("Tomato Soup", ["Tomatoes", "Onion"], ["soup"], ["Simmer the tomatoes."]),
+    _recipe("Chicken Curry", ["Chicken breast", "Rice", "Curry paste"], ["dinner"]),
+    _recipe("Garlic Fried Rice", ["Rice", "Garlic", "Eggs"], ["asian"]),
+    _recipe("Cheese Omelette", ["Eggs", "Cheese"], ["breakfast"]),
+    _recipe("Tomato Basil Pasta", ["Pasta", "Tomato", "Basil"], ["dinner", "pasta"]),
+]
+
+
+class TestStemming(unittest.TestCase):
+    def test_shared_stemmer(self):
+        self.assertEqual(stem("tomatoes"), stem("tomato"))
+        self.assertEqual(stem("berries"), stem("berry"))
+        self.assertEqual(normalize_name("  Red Onions "), "red onion")
+        self.assertEqual(tokenize("Eggs, Cheese!"), ["egg", "cheese"])
+
+
+class TestRecipeSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = RecipeSearchIndex(RECIPES)
+
+    def names(self, q, **kw):
+        return [n for n, _ in self.index.search(q, **kw)]
+
+    def test_parse_query(self):
+        self.assertEqual(parse_query("Chicken rice OR tom*"),
+                         [[("chicken", False), ("rice", False)], [("tom", True)]])
+        self.assertEqual(parse_query("chees", prefix_last=True), [[("chees", True)]])
+        self.assertEqual(parse_query("  OR  "), [])
+
+    def test_and_or_and_ranking(self):
+        self.assertEqual(self.names("rice chicken"), ["Chicken Curry"])
+        self.assertEqual(set(self.names("curry OR omelette")), {"Chicken Curry", "Cheese Omelette"})
+        self.assertEqual(self.names("rice unknownword"), [])
+        # a name match outranks an ingredient-only match
+        self.assertEqual(self.names("rice"), ["Garlic Fried Rice", "Chicken Curry"])
+
+    def test_stemmed_and_prefix_terms(self):
+        self.assertEqual(set(self.names("tomatoes")), {"Tomato Soup", "Tomato Basil Pasta"})
+        self.assertEqual(set(self.names("egg")), {"Garlic Fried Rice", "Cheese Omelette"})
+        self.assertEqual(self.names("chee*"), ["Cheese Omelette"])
+        self.assertEqual(self.names("garlic fri", prefix_last=True), ["Garlic Fried Rice"])
+        self.assertEqual(self.names("limit", limit=0), [])
+
+    def test_top_k_matches_exhaustive_scoring(self):
+        many = [_recipe(f"{r['name']} {i}", [x["name"] for x in r["ingredients"]] + ["Salt"] * (i % 3), r["tags"])
+                for i in range(400) for r in RECIPES[i % 5:i % 5 + 1]]
+        index = RecipeSearchIndex(many)
+        for q in ("tomato OR egg", "t* OR rice", "salt ri*", "rice"):
+            groups = [[[t] if not p else index._expand(t) for t, p in g] for g in parse_query(q)]
+            exhaustive = [round(s, 4) for _, s in index._top_exhaustive(groups, 10)]
+            self.assertEqual([s for _, s in index.search(q, limit=10)], exhaustive, q)
+
+    def test_flat_lists_match_exhaustive_scoring(self):
+        # synthetic names and steps make long, flat lists: the match-pattern path does the work
+        catalog = list(Synth(SynthConfig(recipes=3000, ingredients=300, seed=3)).recipes())
+        index = RecipeSearchIndex(catalog)
+        for q in ("quick s*", "spicy onion", "pasta st*", "soup OR salad OR curry", "garlic OR ingredient OR onion",
+                  "quick OR s* OR dinner", "o*", "ingredient o*"):
+            groups = [[[t] if not p else index._expand(t) for t, p in g] for g in parse_query(q)]
+            exhaustive = [(recipe, round(s, 4)) for recipe, s in index._top_exhaustive(groups, 20)]
+            found = index.search(q, limit=20)
+            self.assertEqual([s for _, s in found], [s for _, s in exhaustive], q)
+            self.assertEqual([n for n, _ in found], [index._names[d] for d, _ in exhaustive], q)
+
+    def test_repeated_terms_count_once(self):
+        index = RecipeSearchIndex(RECIPES)
+        self.assertEqual(index.search("rice OR rice"), index.search("rice"))
+        self.assertEqual(index.search("rice rice eggs"), index.search("rice eggs"))
+
+    def test_search_benchmark(self):
+        result = measure_search(recipes=400, queries=60)
+        self.assertEqual(result['recipes'], 400)
+        for label in ('first', 'warm'):
+            self.assertEqual(result[label]['all']['count'], result['queries'])
+            self.assertLessEqual(result[label]['all']['p50'], result[label]['all']['p99'])
+        self.assertTrue({kind for kind, _, _ in query_mix(list(Synth(SynthConfig(recipes=50)).recipes()), 40)}
+                        <= set(KINDS))
+
+    def test_incremental_add(self):
+        version = self.index.version
+        self.assertEqual(self.names("shakshuka"), [])
+        self.assertTrue(self.index.add(_recipe("Shakshuka", ["Eggs", "Tomatoes"])))
+        self.assertGreater(self.index.version, version)
+        self.assertEqual(self.names("shakshuka"), ["Shakshuka"])
+        self.assertIn("Shakshuka", self.names("tomato"))
+        self.assertFalse(self.index.add({"tags": ["no name"]}))
+
+
+class TestSearchIndexCache(unittest.TestCase):
+    def test_appended_recipes_update_cached_index(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "recipes.json"
+            path.write_text(json.dumps(RECIPES), encoding="utf-8")
+            index = get_search_index(path)
+            new = _recipe("Shakshuka", ["Eggs"])
+            path.write_text(json.dumps(RECIPES + [new]), encoding="utf-8")
+            recipes_appended([new], len(RECIPES), path)
+            self.assertIs(get_search_index(path), index)
+            self.assertEqual([n for n, _ in index.search("shakshuka")], ["Shakshuka"])
+            # count mismatch (someone else wrote in between): dropped and rebuilt from the file
+            recipes_appended([new], 0, path)
+            self.assertIsNot(get_search_index(path), index)
+            recipe_search.invalidate_search_index(path)
+
+
+class TestRecipeSearchAPI(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def test_search_endpoint(self):
+        resp = self.client.get("/api/recipes/search", params={"q": "tomatoes", "fields": "name,tags"})
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        names = [r["name"] for r in data["items"]]
+        self.assertIn("Tomato Soup", names)
+        self.assertEqual(set(data["items"][0]), {"name", "tags", "score"})
+        scores = [r["score"] for r in data["items"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        again = self.client.get("/api/recipes/search", params={"q": "tomatoes", "fields": "name,tags"},
+                                headers={"If-None-Match": resp.headers["etag"]})
+        self.assertEqual(again.status_code, 304)
+
+    def test_prefix_and_bad_fields(self):
+        data = self.client.get("/api/recipes/search", params={"q": "spagh", "prefix": "true", "fields": "name"}).json()
+        names = [r["name"] for r in data["items"]]
+        self.assertEqual(names[:2], ["Spaghetti Bolognese", "Spaghetti Carbonara"])
+        self.assertEqual(self.client.get("/api/recipes/search", params={"q": "x", "fields": "nope"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/recipes/search", params={"q": ""}).json()["items"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app
+from meal.infra.recipe_suggest import SuggestIndex, fold
+
+
+RECIPES = [
+    {"name": "Chicken Curry", "aliases": ["Murgh Masala"]},
+    {"name": "Chili con Carne"},
+    {"name": "Sautéed Chickpeas"},
+    {"name": "Caesar Salad"},
+    {"name": "Chicken Curry"},  # duplicate names are indexed once
+]
+
+
+class TestSuggestIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = SuggestIndex(RECIPES)
+
+    def names(self, q, counts=None, limit=10):
+        return [n for n, _ in self.index.suggest(q, counts or {}, limit)]
+
+    def test_fold(self):
+        self.assertEqual(fold("  Sautéed   Chickpeas! "), "sauteed chickpeas")
+        self.assertEqual(fold(None), "")
+
+    def test_prefix_word_and_alias_matches(self):
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.names("chi"), ["Chicken Curry", "Chili con Carne", "Sautéed Chickpeas"])
+        self.assertEqual(self.names("CURR"), ["Chicken Curry"])
+        self.assertEqual(self.names("masala"), ["Chicken Curry"])
+        self.assertEqual(self.names("saute"), ["Sautéed Chickpeas"])
+        self.assertEqual(self.names("chicken c"), ["Chicken Curry"])
+        self.assertEqual(self.names(""), [])
+        self.assertEqual(self.names("zzz"), [])
+
+    def test_ranked_by_recent_cooks_then_match_kind(self):
+        counts = {"Sautéed Chickpeas": 3, "Chili con Carne": 1}
+        self.assertEqual(self.names("chi", counts), ["Sautéed Chickpeas", "Chili con Carne", "Chicken Curry"])
+        self.assertEqual(self.index.suggest("chi", counts, 1), [("Sautéed Chickpeas", 3)])
+
+
+class TestSuggestAPI(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def test_suggest_endpoint(self):
+        resp = self.client.get("/api/recipes/suggest", params={"q": "spa", "limit": 5})
+        self.assertEqual(resp.status_code, 200)
+        items = resp.json()["items"]
+        self.assertEqual({i["name"] for i in items}, {"Spaghetti Bolognese", "Spaghetti Carbonara"})
+        self.assertEqual(set(items[0]), {"name", "image", "calories_per_serving", "recent_cooks"})
+        again = self.client.get("/api/recipes/suggest", params={"q": "spa", "limit": 5},
+                                headers={"If-None-Match": resp.headers["etag"]})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(self.client.get("/api/recipes/suggest", params={"limit": 0}).status_code, 422)
+
+    def test_home_page_does_not_embed_catalog(self):
+        html = self.client.get("/").text
+        self.assertNotIn('id="recipes-json"', html)
+        self.assertIn('class="recipe-suggest"', html)
+
+    def test_get_week_carries_calories(self):
+        monday = date.today() - timedelta(days=date.today().weekday())
+        data = self.client.get(f"/get_week?start={monday.isoformat()}").json()
+        for day in data["days"].values():
+            planned = [day[m] if isinstance(day[m], str) else day[m].get("name")
+                       for m in ("breakfast", "lunch", "dinner")]
+            expected = sum(data["calories"][n] for n in planned if n and n != "-")
+            self.assertEqual(day["kcal"], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
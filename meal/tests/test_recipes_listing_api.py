@@ -0,0 +1,75 @@
+import unittest
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app
+from meal.infra.recipe_index import RecipeIndex, decode_cursor
+
+
+def _recipes(n):
+    return [{"name": f"Dish {i:05d}", "tags": ["even" if i % 2 == 0 else "odd"],
+             "ingredients": [{"name": "salt", "default_quantity": 1, "unit": "g"}],
+             "calories_per_serving": i} for i in range(n)]
+
+
+class TestRecipeIndex(unittest.TestCase):
+    def test_keyset_pages_cover_catalog_once(self):
+        index = RecipeIndex(list(reversed(_recipes(1000))))
+        seen, cursor = [], None
+        while True:
+            items, cursor, total = index.page(cursor=cursor, limit=64)
+            seen.extend(c["name"] for c in items)
+            if not cursor:
+                break
+        self.assertEqual(total, 1000)
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(len(set(seen)), 1000)
+
+    def test_tag_filter_and_cards(self):
+        index = RecipeIndex(_recipes(10))
+        items, cursor, total = index.page(tag="odd", limit=3)
+        self.assertEqual(total, 5)
+        self.assertEqual([c["name"] for c in items], ["Dish 00001", "Dish 00003", "Dish 00005"])
+        rest, cursor, _ = index.page(tag="odd", cursor=cursor, limit=3)
+        self.assertEqual([c["name"] for c in rest], ["Dish 00007", "Dish 00009"])
+        self.assertIsNone(cursor)
+        self.assertEqual(items[0]["ingredients"], ["salt, 1 g"])
+        self.assertEqual(items[0]["image"], "dish_00001.jpg")
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+class TestRecipesListingAPI(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def test_fields_cursor_and_etag(self):
+        first = self.client.get("/api/recipes", params={"fields": "name,tags", "limit": 5})
+        self.assertEqual(first.status_code, 200)
+        data = first.json()
+        self.assertEqual(len(data["items"]), 5)
+        self.assertEqual(set(data["items"][0]), {"name", "tags"})
+        self.assertIn("tags", data)
+        second = self.client.get("/api/recipes", params={"fields": "name", "limit": 5, "cursor": data["next_cursor"]}).json()
+        self.assertNotIn("tags", second)
+        names = [r["name"] for r in data["items"]] + [r["name"] for r in second["items"]]
+        self.assertEqual(len(set(names)), 10)
+        again = self.client.get("/api/recipes", params={"fields": "name,tags", "limit": 5},
+                                headers={"If-None-Match": first.headers["etag"]})
+        self.assertEqual(again.status_code, 304)
+
+    def test_bad_requests(self):
+        self.assertEqual(self.client.get("/api/recipes?fields=secret").status_code, 400)
+        self.assertEqual(self.client.get("/api/recipes?cursor=%%%").status_code, 400)
+        self.assertEqual(self.client.get("/api/recipes?limit=0").status_code, 422)
+
+    def test_pages_do_not_embed_catalog_per_slot(self):
+        index_html = self.client.get("/").text
+        self.assertNotIn('class="recipe-option"', index_html)
+        self.assertEqual(index_html.count('class="recipes-scroll"'), 21)
+        page = self.client.get("/recipes-page", params={"tag": "vegetarian"}).text
+        self.assertIn("recipe-card", page)
+
+
+if __name__ == "__main__":
+    unittest.main()
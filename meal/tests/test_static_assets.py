@@ -0,0 +1,58 @@
+import re, tempfile, unittest
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app, asset_manifest
+from meal.api.assets import AssetManifest, IMMUTABLE_CACHE_CONTROL
+
+class TestAssetManifest(unittest.TestCase):
+    def test_hash_changes_with_content_only(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            (Path(tmp) / 'app.js').write_text('console.log(1)', encoding='utf-8')
+            manifest = AssetManifest(tmp).build()
+            url = manifest.url('app.js')
+            self.assertRegex(url, r'^/static/app\.js\?v=[0-9a-f]{12}$')
+            self.assertEqual(AssetManifest(tmp).build().url('app.js'), url)
+            (Path(tmp) / 'app.js').write_text('console.log(2)', encoding='utf-8')
+            self.assertNotEqual(AssetManifest(tmp).build().url('app.js'), url)
+            # unknown / outside files fall back to the plain URL
+            self.assertEqual(manifest.url('missing.js'), '/static/missing.js')
+            self.assertEqual(manifest.url('../secret.txt'), '/static/../secret.txt')
+
+    def test_rewritten_file_gets_a_new_hash(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            picture = Path(tmp) / 'pictures' / 'soup.jpg'
+            picture.parent.mkdir()
+            picture.write_bytes(b'old image')
+            manifest = AssetManifest(tmp).build()
+            url = manifest.url('pictures/soup.jpg')
+            self.assertEqual(manifest.url('pictures/soup.jpg'), url)
+            picture.write_bytes(b'new image bytes')  # upload overwriting the same name
+            self.assertNotEqual(manifest.url('pictures/soup.jpg'), url)
+            picture.unlink()
+            self.assertEqual(manifest.url('pictures/soup.jpg'), '/static/pictures/soup.jpg')
+
+class TestFingerprintedStatic(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def test_page_links_are_fingerprinted_and_immutable(self):
+        html = self.client.get('/').text
+        self.assertNotIn('?ts=', html)
+        urls = re.findall(r'(?:src|href)="(/static/[^"]+\?v=[0-9a-f]+)"', html)
+        self.assertTrue(any('script.js' in u for u in urls))
+        for url in urls:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200, url)
+            self.assertEqual(resp.headers['cache-control'], IMMUTABLE_CACHE_CONTROL)
+
+    def test_stale_or_missing_version_is_not_immutable(self):
+        for url in ('/static/script.js', '/static/script.js?v=000000000000'):
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, 200)
+            self.assertNotIn('immutable', resp.headers.get('cache-control', ''))
+        self.assertEqual(asset_manifest.hash_for('script.js'), asset_manifest.url('script.js').split('=')[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import asyncio, json, tempfile, threading, time, unittest
+from pathlib import Path
+from unittest import mock
+
+import httpx
+
+from meal.api import api_run
+from meal.api.api_run import app
+from meal.infra.storage_io import aread_json, awrite_json, run_io
+
+BUY_DELAY = 0.6
+
+class TestStorageIO(unittest.IsolatedAsyncioTestCase):
+    async def test_json_round_trip_runs_off_loop(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'data.json'
+            await awrite_json(path, {'a': [1, 2]})
+            self.assertEqual(json.loads(path.read_text(encoding='utf-8')), {'a': [1, 2]})
+            self.assertEqual(await aread_json(path), {'a': [1, 2]})
+            self.assertEqual(await aread_json(Path(tmp) / 'missing.json', default=[]), [])
+        self.assertNotEqual(await run_io(threading.get_ident), threading.get_ident())
+
+    async def test_transactions_file_is_replaced_atomically(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'shopping_transactions.json'
+            with mock.patch.object(api_run, 'TRANSACTIONS_FILE', path):
+                api_run._save_transactions([{'id': 'a'}])
+                # a write that fails half-way leaves the previous file, not a truncated one
+                api_run._save_transactions([{'id': 'b', 'bad': object()}])
+                self.assertEqual(api_run._load_transactions(), [{'id': 'a'}])
+            self.assertEqual([p.name for p in Path(tmp).iterdir()], [path.name])
+
+    async def test_large_buy_does_not_block_other_requests(self):
+        real_build = api_run.build_shopping_list
+
+        def slow_build(*args, **kwargs):
+            time.sleep(BUY_DELAY)  # stands in for a large pantry / plan
+            return real_build(*args, **kwargs)
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+            with mock.patch.object(api_run, 'build_shopping_list', slow_build):
+                started = time.perf_counter()
+                buy = asyncio.create_task(client.post('/api/shopping-list/buy', json={'week': 1, 'items': []}))
+                await asyncio.sleep(0.05)  # let the buy start; a blocked loop would stall right here
+                resp = await client.get('/api/pantry/alerts?since=0')
+                # measured from the start of the buy: includes any time the loop was blocked
+                latency = time.perf_counter() - started
+                buy_resp = await buy
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(buy_resp.status_code, 200)
+        self.assertLess(latency, BUY_DELAY / 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from meal.tools.synth import SynthConfig, write_dataset
+
+
+class TestSynth(unittest.TestCase):
+    def generate(self, directory, **overrides):
+        config = SynthConfig(recipes=40, ingredients=60, pantry=30, weeks=12, future_weeks=2,
+                             transactions=15, seed=3, today=date(2026, 3, 11), **overrides)
+        summary = write_dataset(directory, config)
+        data = {name: json.loads((Path(directory) / name).read_text(encoding='utf-8')) for name in summary}
+        return summary, data
+
+    def test_consistent_data_directory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            summary, data = self.generate(tmp)
+            self.assertEqual(len(data['recipes.json']), 40)
+            self.assertEqual(len(data['Pantry_ingredients.json']), 30)
+            self.assertEqual(len(data['shopping_transactions.json']), 15)
+            self.assertEqual(summary['plan.json']['records'], 12)
+            plan = data['plan.json']
+            self.assertIn('2026-W11', plan)
+            self.assertIn('2026-W13', plan)  # future weeks
+            names = {r['name'] for r in data['recipes.json']}
+            units = {i['name']: i['unit'] for r in data['recipes.json'] for i in r['ingredients']}
+            for lot in data['Pantry_ingredients.json']:
+                # same vocabulary and units as the recipes
+                self.assertEqual(units.get(lot['name'], lot['unit']), lot['unit'])
+                self.assertEqual(len(lot['tags']), 1)  # already sanitized, loading must not rewrite the file
+            self.assertTrue(any(lot['name'] in units for lot in data['Pantry_ingredients.json']))
+            cooked_slots = []
+            for week in plan.values():
+                for day in week.values():
+                    for slot in day.values():
+                        if isinstance(slot, dict):
+                            cooked_slots.append(slot['name'])
+                        elif slot != '-':
+                            self.assertIn(slot, names)
+            cooked_log = data['Pantry_recipe_cooked.json']
+            self.assertEqual(sorted(e['name'] for e in cooked_log), sorted(cooked_slots))
+            self.assertTrue(all(e['name'] in names for e in cooked_log))
+            last = max(date(*map(int, reversed(e['date_cooked'].split('-')))) for e in cooked_log)
+            self.assertLess(last, date(2026, 3, 11))  # only past slots are cooked
+
+    def test_deterministic_per_seed(self):
+        with tempfile.TemporaryDirectory() as a, tempfile.TemporaryDirectory() as b, \
+                tempfile.TemporaryDirectory() as c:
+            self.assertEqual(self.generate(a)[1], self.generate(b)[1])
+            self.assertNotEqual(self.generate(c, skew=0.0)[1]['recipes.json'], self.generate(a)[1]['recipes.json'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os, shutil, tempfile, unittest
+from pathlib import Path
+from fastapi.testclient import TestClient
+
+from meal.api.api_run import app, templates_dir
+from meal.api.warmup import CountingBytecodeCache, create_templates, precompile_templates
+
+
+class TestBytecodeCache(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_second_worker_loads_compiled_templates(self):
+        first = precompile_templates(create_templates(templates_dir, self.cache_dir))
+        self.assertGreaterEqual(first['templates'], 8)
+        self.assertEqual(first['failed'], [])
+        self.assertEqual(first['bytecode_misses'], first['templates'])
+        self.assertTrue(any(Path(self.cache_dir).iterdir()))
+        # A fresh environment (another worker process) finds everything in the shared dir
+        second = precompile_templates(create_templates(templates_dir, self.cache_dir))
+        self.assertEqual(second['bytecode_hits'], second['templates'])
+        self.assertEqual(second['bytecode_misses'], 0)
+
+    def test_cache_can_be_disabled(self):
+        templates = create_templates(templates_dir, 'off')
+        self.assertNotIsInstance(templates.env.bytecode_cache, CountingBytecodeCache)
+        self.assertNotIn('bytecode_hits', precompile_templates(templates))
+
+
+    def test_default_uses_jinja_per_user_directory(self):
+        cache = create_templates(templates_dir).env.bytecode_cache
+        self.assertIsInstance(cache, CountingBytecodeCache)
+        self.assertNotEqual(Path(cache.directory), Path(tempfile.gettempdir()))
+
+    def test_configured_directory_is_created_private(self):
+        path = Path(self.cache_dir) / 'nested' / 'bytecode'
+        cache = create_templates(templates_dir, str(path)).env.bytecode_cache
+        self.assertIsInstance(cache, CountingBytecodeCache)
+        self.assertEqual(path.stat().st_mode & 0o777, 0o700)
+
+    def test_unsafe_directory_disables_the_cache(self):
+        shared = Path(self.cache_dir) / 'shared'
+        shared.mkdir()
+        shared.chmod(0o777)
+        link = Path(self.cache_dir) / 'link'
+        os.symlink(self.cache_dir, link)
+        for path in (shared, link):
+            with self.assertLogs('meal.api.warmup', 'WARNING'):
+                templates = create_templates(templates_dir, str(path))
+            self.assertNotIsInstance(templates.env.bytecode_cache, CountingBytecodeCache)
+
+
+class TestStartupMetrics(unittest.TestCase):
+    def test_debug_startup_reports_warmup_and_first_requests(self):
+        with TestClient(app) as client:
+            client.get('/recipes-page')
+            client.get('/recipes-page')
+            data = client.get('/_debug/startup').json()
+        self.assertIn('app_ready_ms', data)
+        self.assertGreaterEqual(data['template_precompile']['templates'], 8)
+        page = data['requests']['/recipes-page']
+        self.assertGreaterEqual(page['count'], 2)
+        self.assertIn('first_ms', page)
+        self.assertIn('steady_mean_ms', page)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import ast
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from fastapi.testclient import TestClient
+
+from meal.api import api_run
+from meal.api.api_run import app
+from meal.infra import tracing
+from meal.infra.storage_io import run_io
+from meal.infra.tracing import (clear_spans, current_span, flush_trace_file, recent_spans, recent_traces, span,
+                                traced)
+
+
+@traced()
+def parse_step():
+    return current_span().parent_id
+
+
+@traced('compute')
+async def compute_step():
+    return await run_io(parse_step)
+
+
+class TestSpans(unittest.TestCase):
+    def setUp(self):
+        clear_spans()
+
+    def by_name(self):
+        return {r['name']: r for r in recent_spans()}
+
+    def test_nesting_and_errors(self):
+        with span('root', kind='test') as root:
+            parent_seen = parse_step()
+            with self.assertRaises(ValueError):
+                with span('failing'):
+                    raise ValueError('boom')
+        spans = self.by_name()
+        self.assertEqual(parent_seen, root.span_id)
+        self.assertEqual(spans['parse_step']['parent_id'], spans['root']['span_id'])
+        self.assertEqual(spans['parse_step']['trace_id'], spans['root']['trace_id'])
+        self.assertIsNone(spans['root']['parent_id'])
+        self.assertEqual(spans['root']['attrs'], {'kind': 'test'})
+        self.assertEqual(spans['failing']['error'], 'ValueError: boom')
+        self.assertIsNone(current_span())
+
+    def test_async_decorator_and_thread_offload(self):
+        async def main():
+            with span('request'):
+                return await compute_step()
+        parent_of_thread_span = asyncio.run(main())
+        spans = self.by_name()
+        self.assertEqual(spans['compute']['parent_id'], spans['request']['span_id'])
+        self.assertEqual(parent_of_thread_span, spans['compute']['span_id'])
+        trace = recent_traces()[0]
+        self.assertEqual([(s['name'], s['depth']) for s in trace['spans']],
+                         [('request', 0), ('compute', 1), ('parse_step', 2)])
+
+
+class TestTraceFile(unittest.TestCase):
+    def test_spans_are_appended_by_the_writer(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / 'spans.jsonl')
+            with mock.patch.object(tracing, 'TRACE_FILE', path):
+                for i in range(50):
+                    with span('outer', i=i):
+                        with span('inner'):
+                            pass
+                flush_trace_file()
+            records = [json.loads(line) for line in Path(path).read_text(encoding='utf-8').splitlines()]
+        self.assertEqual(len(records), 100)
+        self.assertEqual([r['attrs']['i'] for r in records if r['name'] == 'outer'], list(range(50)))
+
+
+class TestTracesEndpoint(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.client = TestClient(app)
+
+    def test_hidden_without_token(self):
+        with mock.patch.object(api_run, 'PROFILE_TOKEN', 's3cret'):
+            self.assertEqual(self.client.get('/_debug/traces').status_code, 404)
+            self.assertEqual(self.client.get('/_debug/traces', headers={'X-Profile': 'wrong'}).status_code, 404)
+        self.assertEqual(self.client.get('/_debug/traces', params={'_profile': ''}).status_code, 404)
+
+    @mock.patch.object(api_run, 'PROFILE_TOKEN', 's3cret')
+    def test_request_trace_breakdown(self):
+        resp = self.client.get('/api/shopping-list')
+        self.assertEqual(resp.status_code, 200)
+        trace_id = resp.headers['x-trace-id']
+        token = {'X-Profile': 's3cret'}
+        traces = self.client.get('/_debug/traces', params={'trace_id': trace_id}, headers=token).json()['traces']
+        self.assertEqual(len(traces), 1)
+        self.assertEqual(traces[0]['name'], 'GET /api/shopping-list')
+        names = {s['name']: s for s in traces[0]['spans']}
+        for expected in ('PlanRepository.get_week_plan', 'plan.read', 'load_recipes', 'load_ingredients',
+                         'build_shopping_list'):
+            self.assertIn(expected, names)
+        self.assertEqual(names['plan.read']['depth'], 2)
+        text = self.client.get('/_debug/traces', params={'trace_id': trace_id, 'format': 'text'}, headers=token).text
+        self.assertIn('build_shopping_list', text)
+
+
+class TestLayering(unittest.TestCase):
+    def test_domain_does_not_import_infra(self):
+        # instrumentation belongs to the repository / route call sites, not to the entities
+        domain = Path(__file__).resolve().parents[1] / 'domain'
+        for path in domain.glob('*.py'):
+            for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+                names = [a.name for a in node.names] if isinstance(node, ast.Import) else \
+                    [node.module or ''] if isinstance(node, ast.ImportFrom) else []
+                for name in names:
+                    self.assertFalse(name.startswith(('meal.infra', 'meal.api')), f"{path.name} imports {name}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,6 @@
+"""Developer / build tooling (run as modules, not imported by the web app at request time).
+
+- compress_static: write .gz / .br siblings for text assets in meal/static
+- bench_wire: bytes-on-wire benchmark for the home page
+"""
+__all__ = ["compress_static", "bench_wire"]
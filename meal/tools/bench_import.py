@@ -0,0 +1,188 @@
+"""Cold import time of the app, from `python -X importtime`.
+
+Every run imports the module in a fresh interpreter (bytecode caches warm, nothing else
+loaded) and parses the importtime report from stderr: the module's cumulative time, its
+own share (minus the frameworks in FRAMEWORKS, taken from the same report, so machine
+load between interpreters does not skew it), its slowest direct imports and whether the
+lazily loaded subsystems (PDF, AI, Spoonacular client) were pulled in anyway.
+
+    python -m meal.tools.bench_import                    # 5 runs of `import meal.api.api_run`
+    python -m meal.tools.bench_import --runs 10 --top 15
+    python -m meal.tools.bench_import --json             # -> meal/benchmarks/results/import.json
+
+The JSON report has the benchmark harness format, so meal.tools.benchcompare can diff it.
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+__all__ = ['ImportRecord', 'parse_importtime', 'import_children', 'own_import_us', 'measure_import', 'LAZY_MODULES',
+           'FRAMEWORKS']
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_JSON = PROJECT_ROOT / 'meal' / 'benchmarks' / 'results' / 'import.json'
+APP_MODULE = 'meal.api.api_run'
+# loaded on first use only; importing the app must not pull them in
+LAZY_MODULES = ('reportlab', 'openai', 'httpx')
+# a fixed cost the app cannot shrink; left out of its own share
+FRAMEWORKS = ('fastapi',)
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """Records of an `-X importtime` report, in report order (children before parents)."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # the header line
+        raw = parts[2].rstrip()
+        name = raw.lstrip()
+        records.append(ImportRecord(name, self_us, cumulative_us, (len(raw) - len(name)) // 2))
+    return records
+
+
+def import_children(records: List[ImportRecord], module: str) -> List[ImportRecord]:
+    """Direct imports of `module` (records one level deeper, since its previous sibling)."""
+    for i, record in enumerate(records):
+        if record.name == module:
+            children = []
+            for earlier in reversed(records[:i]):
+                if earlier.depth <= record.depth:
+                    break
+                if earlier.depth == record.depth + 1:
+                    children.append(earlier)
+            return children
+    return []
+
+
+def _subtree(records: List[ImportRecord], module: str) -> List[ImportRecord]:
+    """The record of `module` and every import made while importing it."""
+    for i, record in enumerate(records):
+        if record.name == module:
+            start = i
+            while start > 0 and records[start - 1].depth > record.depth:
+                start -= 1
+            return records[start:i + 1]
+    return []
+
+
+def own_import_us(records: List[ImportRecord], module: str, exclude: Tuple[str, ...] = FRAMEWORKS) -> Optional[int]:
+    """Cumulative import time of `module` minus that of the `exclude` packages it imported.
+
+    Both come from the same report, so the difference does not depend on how busy the
+    machine was in another interpreter. None when `module` is not in the report.
+    """
+    tree = _subtree(records, module)
+    if not tree:
+        return None
+    return tree[-1].cumulative_us - sum(r.cumulative_us for r in tree[:-1] if r.name in exclude)
+
+
+def _run_once(module: str) -> List[ImportRecord]:
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=PROJECT_ROOT,
+                          capture_output=True, text=True, timeout=120)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def measure_import(module: str = APP_MODULE, runs: int = 5, top: int = 10) -> Dict[str, Any]:
+    """Cumulative and own (minus FRAMEWORKS) import time of `module` over `runs` fresh interpreters (ms)."""
+    timings: List[float] = []
+    own: List[float] = []
+    fastest: List[ImportRecord] = []
+    for _ in range(max(runs, 1)):
+        records = _run_once(module)
+        total = next((r.cumulative_us for r in records if r.name == module), None)
+        if total is None:
+            raise RuntimeError(f"{module} missing from the importtime report")
+        timings.append(total / 1000)
+        own.append(own_import_us(records, module) / 1000)
+        if total / 1000 <= min(timings):
+            fastest = records
+    imported = {r.name for r in fastest}
+    children = sorted(import_children(fastest, module), key=lambda r: r.cumulative_us, reverse=True)
+    return {
+        'module': module,
+        'runs_ms': timings,
+        'min_ms': min(timings),
+        'median_ms': statistics.median(timings),
+        'own_runs_ms': own,
+        'own_min_ms': min(own),
+        'excluding': list(FRAMEWORKS),
+        'modules_imported': len(imported),
+        'top': [{'name': r.name, 'ms': r.cumulative_us / 1000} for r in children[:top]],
+        'lazy': {name: name in imported for name in LAZY_MODULES},
+    }
+
+
+def _report(result: Dict[str, Any]) -> Dict[str, Any]:
+    samples = [ms / 1000 for ms in result['runs_ms']]
+    ordered = sorted(samples)
+    return {
+        'kind': 'benchmarks',
+        'meta': {'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                 'python': platform.python_version(), 'platform': platform.platform(), 'import': result},
+        'benchmarks': [{
+            'name': f"import {result['module']}", 'group': 'import', 'module': 'bench_import', 'scale': None,
+            'rounds': len(samples),
+            'stats': {'min': ordered[0], 'max': ordered[-1], 'mean': statistics.fmean(samples),
+                      'median': statistics.median(ordered),
+                      'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                      'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]},
+            'samples': samples,
+        }],
+    }
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Cold import time (python -X importtime)")
+    parser.add_argument('--module', default=APP_MODULE)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help="slowest direct imports to list")
+    parser.add_argument('--json', nargs='?', const=str(DEFAULT_JSON), default=None, metavar='PATH',
+                        help=f"write a benchmark report (default path: {DEFAULT_JSON.relative_to(PROJECT_ROOT)})")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = _parse_args(argv)
+    result = measure_import(args.module, args.runs, args.top)
+    print(f"import {result['module']}: min {result['min_ms']:.0f} ms, median {result['median_ms']:.0f} ms "
+          f"over {len(result['runs_ms'])} runs, {result['modules_imported']} modules; "
+          f"own min {result['own_min_ms']:.0f} ms (without {', '.join(result['excluding'])})")
+    for entry in result['top']:
+        print(f"  {entry['ms']:8.1f} ms  {entry['name']}")
+    print("lazy subsystems imported: " + ', '.join(f"{k}={'yes' if v else 'no'}" for k, v in result['lazy'].items()))
+    if args.json:
+        path = Path(args.json)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(_report(result), indent=1), encoding='utf-8')
+        print(f"JSON report: {path}")
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Memory footprint of the domain objects, measured with tracemalloc.
+
+Builds Recipe / Ingredient (pantry lot) / Plan objects from synthetic records (the dicts
+json.load would return, created before measuring) and reports the bytes the domain
+objects add per instance: everything allocated while converting and still alive
+afterwards, divided by the number of records. Strings shared with the source dicts are
+not counted, as they would not be once the parsed JSON is dropped either.
+
+    python -m meal.tools.bench_memory                      # 5 000 recipes, 10 000 pantry lots
+    python -m meal.tools.bench_memory --recipes 20000 --pantry 50000 --json
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
+
+from meal.domain.Ingredient import Ingredient
+from meal.domain.Pantry import Pantry
+from meal.domain.Plan import Plan
+from meal.domain.Recipe import Recipe
+from meal.events.Event_Bus import EventBus
+from meal.tools.synth import Synth, SynthConfig
+
+__all__ = ['measure', 'measure_domain']
+
+
+def measure(build: Callable[[], Any], count: int) -> Dict[str, float]:
+    """Bytes still allocated after build() (kept alive) per item, and the peak per item."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        result = build()
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    count = max(count, 1)
+    return {'count': count, 'bytes_per_item': (after - before) / count, 'peak_per_item': (peak - before) / count,
+            'total_bytes': after - before}
+
+
+def measure_domain(recipes: int = 5_000, pantry: int = 10_000, weeks: int = 104, seed: int = 42) -> Dict[str, Dict[str, float]]:
+    synth = Synth(SynthConfig(recipes=recipes, pantry=pantry, weeks=weeks, ingredients=max(pantry // 5, 100),
+                              seed=seed, today=date(2026, 1, 5)))
+    recipe_dicts = list(synth.recipes())
+    pantry_dicts = list(synth.pantry())
+    plan_weeks = [(key, meals) for key, meals, _ in synth.plan_weeks()]
+    quiet_bus = EventBus()  # no subscribers: measure the aggregate, not the alert handlers
+
+    def pantry_aggregate() -> Pantry:
+        return Pantry().set_event_bus(quiet_bus).from_dict(pantry_dicts)
+
+    def plans() -> List[Plan]:
+        return [Plan(int(key[-2:]), meals, int(key[:4])) for key, meals in plan_weeks]
+
+    return {
+        'recipe': measure(lambda: [Recipe.from_dict(d) for d in recipe_dicts], len(recipe_dicts)),
+        'pantry_lot': measure(lambda: [Ingredient.from_dict(d) for d in pantry_dicts], len(pantry_dicts)),
+        'pantry_aggregate': measure(pantry_aggregate, len(pantry_dicts)),
+        'plan_week': measure(plans, len(plan_weeks)),
+    }
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bytes per domain object (tracemalloc)")
+    parser.add_argument('--recipes', type=int, default=5_000)
+    parser.add_argument('--pantry', type=int, default=10_000)
+    parser.add_argument('--weeks', type=int, default=104)
+    parser.add_argument('--json', action='store_true', help="print the result as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Dict[str, float]]:
+    args = _parse_args(argv)
+    result = measure_domain(args.recipes, args.pantry, args.weeks)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print(f"{'object':18s} {'count':>8s} {'bytes/item':>11s} {'peak/item':>10s} {'total MB':>9s}")
+        for name, r in result.items():
+            print(f"{name:18s} {r['count']:8d} {r['bytes_per_item']:11.0f} {r['peak_per_item']:10.0f} "
+                  f"{r['total_bytes'] / 1e6:9.2f}")
+    return result
+
+
+if __name__ == '__main__':
+    main()
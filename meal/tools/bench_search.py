@@ -0,0 +1,172 @@
+"""Recipe search latency on a synthetic catalog (meal.infra.recipe_search).
+
+Builds the index over a Synth catalog (50 000 recipes by default) and runs a seeded mix of
+queries made of the catalog's own words, the way the search box sends them:
+
+    word        one word                          "curry"
+    and         two words of the same recipe       "spicy onion"
+    or          2-3 words joined by OR             "pasta OR garlic OR soup"
+    typeahead   a word cut after 1..n characters   "cur", optionally after a word ("spicy o")
+
+Every distinct query is timed twice, the result cache cleared each time: `first` runs with
+the lazily built parts of the index (rare terms' impact lists, merged prefix lists) still
+cold, `warm` right after. Reports p50/p95/p99/max per kind in milliseconds.
+
+    python -m meal.tools.bench_search                      # 50 000 recipes, 1 000 queries
+    python -m meal.tools.bench_search --recipes 10000 --queries 500
+    python -m meal.tools.bench_search --json               # -> meal/benchmarks/results/search.json
+
+The JSON report has the benchmark harness format, so meal.tools.benchcompare can diff it.
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import random
+import re
+import statistics
+import time
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from meal.infra.recipe_search import RecipeSearchIndex
+from meal.tools.synth import Synth, SynthConfig
+
+__all__ = ['query_mix', 'measure_search', 'KINDS']
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_JSON = PROJECT_ROOT / 'meal' / 'benchmarks' / 'results' / 'search.json'
+KINDS = ('word', 'and', 'or', 'typeahead')
+_WORD = re.compile(r"[a-z]{3,}")
+
+
+def _words(recipe: Dict[str, Any]) -> List[str]:
+    text = ' '.join([recipe['name'], *recipe['tags'], *(i['name'] for i in recipe['ingredients'])])
+    return _WORD.findall(text.lower())
+
+
+def query_mix(recipes: List[Dict[str, Any]], count: int = 1_000, seed: int = 7) -> List[Tuple[str, str, bool]]:
+    """Distinct (kind, query, prefix_last) triples drawn from the recipes' words."""
+    rng = random.Random(seed)
+    found: Dict[Tuple[str, bool], str] = {}
+    for _ in range(count * 20):
+        if len(found) >= count:
+            break
+        words = _words(rng.choice(recipes))
+        kind = rng.choices(KINDS, weights=(25, 20, 15, 40))[0]
+        if kind == 'word':
+            query = rng.choice(words)
+        elif kind == 'and':
+            query = ' '.join(rng.sample(words, 2))
+        elif kind == 'or':
+            query = ' OR '.join(rng.choice(_words(rng.choice(recipes))) for _ in range(rng.randint(2, 3)))
+        else:
+            word = rng.choice(words)
+            query = word[:rng.randint(1, len(word))]
+            if rng.random() < 0.4:
+                query = f"{rng.choice(words)} {query}"
+        found.setdefault((query, kind == 'typeahead'), kind)
+    return [(kind, query, prefix) for (query, prefix), kind in found.items()]
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+
+    def at(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+    return {'count': len(ordered), 'p50': at(0.5), 'p95': at(0.95), 'p99': at(0.99), 'max': ordered[-1]}
+
+
+def measure_search(recipes: int = 50_000, queries: int = 1_000, limit: int = 20, seed: int = 42) -> Dict[str, Any]:
+    """Build time of the index and per-kind query latencies (ms), first and warm."""
+    synth = Synth(SynthConfig(recipes=recipes, ingredients=max(recipes // 10, 100), seed=seed,
+                              today=date(2026, 1, 5)))
+    catalog = list(synth.recipes())
+    started = time.perf_counter()
+    index = RecipeSearchIndex(catalog)
+    build_ms = (time.perf_counter() - started) * 1000
+    mix = query_mix(catalog, queries, seed)
+    passes: Dict[str, Dict[str, List[float]]] = {}
+    slowest: Dict[str, List[Tuple[float, str]]] = {}
+    for label in ('first', 'warm'):
+        timings: Dict[str, List[float]] = {kind: [] for kind in KINDS}
+        ranked = []
+        for kind, query, prefix in mix:
+            index.clear_query_cache()
+            started = time.perf_counter()
+            index.search(query, limit=limit, prefix_last=prefix)
+            ms = (time.perf_counter() - started) * 1000
+            timings[kind].append(ms)
+            ranked.append((ms, query))
+        passes[label] = timings
+        slowest[label] = sorted(ranked, reverse=True)[:5]
+    result: Dict[str, Any] = {'recipes': len(index), 'queries': len(mix), 'limit': limit, 'build_ms': build_ms}
+    for label, timings in passes.items():
+        result[label] = {kind: _percentiles(samples) for kind, samples in timings.items() if samples}
+        result[label]['all'] = _percentiles([ms for samples in timings.values() for ms in samples])
+        result[label]['slowest'] = [{'ms': ms, 'query': query} for ms, query in slowest[label]]
+    result['samples'] = passes
+    return result
+
+
+def _report(result: Dict[str, Any]) -> Dict[str, Any]:
+    benchmarks = []
+    for label in ('first', 'warm'):
+        for kind, samples_ms in result['samples'][label].items():
+            if not samples_ms:
+                continue
+            samples = [ms / 1000 for ms in samples_ms]
+            ordered = sorted(samples)
+            benchmarks.append({
+                'name': f"search {kind} [{label}]", 'group': 'search', 'module': 'bench_search',
+                'scale': result['recipes'], 'rounds': len(samples),
+                'stats': {'min': ordered[0], 'max': ordered[-1], 'mean': statistics.fmean(samples),
+                          'median': statistics.median(ordered),
+                          'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                          'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]},
+                'samples': samples,
+            })
+    summary = {key: value for key, value in result.items() if key != 'samples'}
+    return {
+        'kind': 'benchmarks',
+        'meta': {'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                 'python': platform.python_version(), 'platform': platform.platform(), 'search': summary},
+        'benchmarks': benchmarks,
+    }
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Recipe search latency on a synthetic catalog")
+    parser.add_argument('--recipes', type=int, default=50_000)
+    parser.add_argument('--queries', type=int, default=1_000)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', nargs='?', const=str(DEFAULT_JSON), default=None, metavar='PATH',
+                        help=f"write a benchmark report (default path: {DEFAULT_JSON.relative_to(PROJECT_ROOT)})")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = _parse_args(argv)
+    result = measure_search(args.recipes, args.queries, args.limit, args.seed)
+    print(f"{result['recipes']} recipes, index built in {result['build_ms'] / 1000:.1f} s; "
+          f"{result['queries']} distinct queries, limit {result['limit']}")
+    print(f"{'pass':6s} {'kind':10s} {'count':>6s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'max ms':>8s}")
+    for label in ('first', 'warm'):
+        for kind in (*KINDS, 'all'):
+            r = result[label].get(kind)
+            if r:
+                print(f"{label:6s} {kind:10s} {r['count']:6d} {r['p50']:8.2f} {r['p95']:8.2f} {r['p99']:8.2f} "
+                      f"{r['max']:8.2f}")
+        print("       slowest: " + ', '.join(f"{e['query']!r} {e['ms']:.1f}" for e in result[label]['slowest']))
+    if args.json:
+        path = Path(args.json)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(_report(result), indent=1), encoding='utf-8')
+        print(f"JSON report: {path}")
+    return result
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Bytes-on-wire benchmark for the home page.
+
+Loads `/` in-process (TestClient, no network) and every static asset it references
+(<link>/<script>/<img> plus CSS url(...)), then reports transferred body bytes for:
+Images with a srcset count as the candidate a browser would pick for a TARGET_WIDTH
+device-pixel slot (WebP <source> first, like a browser that supports it).
+
+    identity-cold    no Accept-Encoding, empty browser cache
+    compressed-cold  Accept-Encoding: gzip, br, empty browser cache
+    compressed-warm  repeat visit: immutable assets are not requested at all, the rest are
+                     revalidated with If-None-Match / If-Modified-Since
+
+    python -m meal.tools.bench_wire            # table
+    python -m meal.tools.bench_wire --json     # machine-readable
+    python -m meal.tools.bench_wire --path /recipes-page
+"""
+from __future__ import annotations
+import argparse
+import json
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+__all__ = ["measure_home_page"]
+
+TARGET_WIDTH = 640  # ~320 CSS px at 2x DPR
+_CSS_URL_RE = re.compile(r"url\(['\"]?(/static/[^'\")]+)['\"]?\)")
+
+
+def _wire(resp) -> int:
+    # body bytes as received (before httpx decodes Content-Encoding)
+    return resp.num_bytes_downloaded
+
+
+def _pick(srcset: str, target: int = TARGET_WIDTH) -> Optional[str]:
+    """Smallest candidate at least `target` wide (else the largest one)."""
+    candidates = []
+    for part in srcset.split(','):
+        bits = part.split()
+        if len(bits) == 2 and bits[1].endswith('w') and bits[1][:-1].isdigit():
+            candidates.append((int(bits[1][:-1]), bits[0]))
+    if not candidates:
+        return None
+    candidates.sort()
+    return next((u for w, u in candidates if w >= target), candidates[-1][1])
+
+
+class _AssetParser(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.urls: List[str] = []
+        self._webp: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        url = None
+        if tag == 'picture':
+            self._webp = None
+        elif tag == 'source' and a.get('type') == 'image/webp' and a.get('srcset'):
+            self._webp = a['srcset']
+        elif tag == 'img':
+            srcset = self._webp or a.get('srcset')
+            url = (_pick(srcset) if srcset else None) or a.get('src')
+        elif tag in ('script', 'link'):
+            url = a.get('src') or a.get('href')
+        if url and url.startswith('/static/'):
+            self.urls.append(url)
+
+    def handle_endtag(self, tag):
+        if tag == 'picture':
+            self._webp = None
+
+
+def _assets(client, html: str, headers: Dict[str, str]) -> List[str]:
+    parser = _AssetParser()
+    parser.feed(html)
+    urls = list(dict.fromkeys(parser.urls))
+    for url in [u for u in urls if u.split('?')[0].endswith('.css')]:
+        css = client.get(url, headers=headers).text
+        urls.extend(u for u in _CSS_URL_RE.findall(css) if u not in urls)
+    return urls
+
+
+def _load(client, path: str, headers: Dict[str, str], cache: Dict[str, Dict[str, str]] | None = None
+          ) -> Tuple[int, int, Dict[str, Dict[str, str]], int]:
+    """One page view; returns (html_bytes, asset_bytes, validators, requests)."""
+    page = client.get(path, headers=headers)
+    html_bytes = _wire(page)
+    assets = _assets(client, page.text, headers)
+    seen: Dict[str, Dict[str, str]] = {}
+    asset_bytes, requests = 0, 1
+    for url in assets:
+        prior = (cache or {}).get(url)
+        if prior and 'immutable' in prior.get('cache-control', ''):
+            seen[url] = prior
+            continue  # browser serves it from cache without a request
+        req_headers = dict(headers)
+        if prior:
+            if prior.get('etag'):
+                req_headers['If-None-Match'] = prior['etag']
+            if prior.get('last-modified'):
+                req_headers['If-Modified-Since'] = prior['last-modified']
+        resp = client.get(urljoin('http://testserver', url), headers=req_headers)
+        requests += 1
+        asset_bytes += _wire(resp)
+        seen[url] = {k: resp.headers.get(k, '') for k in ('etag', 'last-modified', 'cache-control')}
+    return html_bytes, asset_bytes, seen, requests
+
+
+def measure_home_page(path: str = '/') -> Dict[str, Dict[str, int]]:
+    from fastapi.testclient import TestClient
+    from meal.api.api_run import app
+
+    client = TestClient(app)
+    results = {}
+    identity = {'Accept-Encoding': 'identity'}
+    compressed = {'Accept-Encoding': 'gzip, br'}
+    h, a, _, n = _load(client, path, identity)
+    results['identity-cold'] = {'html': h, 'assets': a, 'total': h + a, 'requests': n}
+    h, a, cache, n = _load(client, path, compressed)
+    results['compressed-cold'] = {'html': h, 'assets': a, 'total': h + a, 'requests': n}
+    h, a, _, n = _load(client, path, compressed, cache)
+    results['compressed-warm'] = {'html': h, 'assets': a, 'total': h + a, 'requests': n}
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Home page bytes-on-wire benchmark")
+    parser.add_argument("--path", default="/", help="page to load (default: /)")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+    res = measure_home_page(args.path)
+    if args.json:
+        print(json.dumps(res, indent=2))
+    else:
+        print(f"{'scenario':<18}{'requests':>9}{'html B':>12}{'assets B':>14}{'total B':>14}")
+        for name, r in res.items():
+            print(f"{name:<18}{r['requests']:>9}{r['html']:>12}{r['assets']:>14}{r['total']:>14}")
@@ -0,0 +1,374 @@
+"""Store and compare benchmark / load-test results.
+
+Both the benchmark harness (meal/benchmarks, kind "benchmarks") and the load test
+(meal.tools.loadtest --json, kind "loadtest") write JSON reports holding raw samples per
+entry. This tool keeps them and diffs two runs entry by entry:
+
+    python -m meal.tools.benchcompare store meal/benchmarks/results/latest.json    # -> results/<stamp>_<rev>_benchmarks.json
+    python -m meal.tools.benchcompare list
+    python -m meal.tools.benchcompare compare json-storage meal/benchmarks/results/latest.json
+    python -m meal.tools.benchcompare compare OLD NEW --threshold 0.05 --threshold-for '*[L]=0.2'
+    python -m meal.tools.benchcompare store a.json b.json c.json --name before     # 3 repeats, one run
+    python -m meal.tools.benchcompare compare before a2.json,b2.json,c2.json
+
+A run is given as a path or as the name of a stored run (results/<name>.json) or of a
+committed baseline (baselines/<name>.json); several comma-separated runs (or a run stored
+from several reports) are repeats of the same measurement. For every entry present in
+both runs the statistic (--stat, median by default) is compared as a ratio new/old with a
+bootstrap confidence interval. Samples of one process are not independent (CPU frequency,
+caches, memory layout and background load shift a whole run), so whole repeats are
+resampled with replacement, --resamples times. A single run is cut into BLOCKS blocks of
+consecutive rounds instead, which covers drift within the run but not between runs: gate
+on repeats. An entry regressed when the whole interval lies above 1 + threshold, i.e. it
+is slower by more than the threshold beyond run-to-run noise; improvements are the mirror
+image, anything else is "same". For load tests the error rate regresses when it grows by
+more than --max-error-increase. `compare` exits 1 when anything regressed, so it can gate
+CI.
+
+Baselines are only comparable with runs from the same machine; regenerate them locally
+before gating on them (see README, Benchmarks).
+"""
+from __future__ import annotations
+import argparse
+import fnmatch
+import json
+import random
+import subprocess
+import sys
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+__all__ = ['Comparison', 'load_run', 'load_runs', 'merge_runs', 'entries', 'repeats', 'bootstrap_ratio',
+           'compare_runs', 'store_run', 'resolve_run']
+
+BENCH_DIR = Path(__file__).resolve().parents[1] / 'benchmarks'
+RESULTS_DIR = BENCH_DIR / 'results'
+BASELINES_DIR = BENCH_DIR / 'baselines'
+STATS = ('median', 'mean', 'p95', 'p99', 'min')
+MAX_BOOTSTRAP_SAMPLES = 500  # per side; more only slows the resampling down
+BLOCKS = 10                  # resampling units a single run is cut into (consecutive rounds)
+
+
+@dataclass
+class Comparison:
+    name: str
+    old: Optional[float]            # statistic in seconds (None: entry missing from that run)
+    new: Optional[float]
+    ratio: Optional[float] = None   # new / old
+    low: Optional[float] = None     # confidence interval of the ratio
+    high: Optional[float] = None
+    threshold: float = 0.0
+    verdict: str = 'same'           # same | regression | improvement | added | removed
+    note: str = ''
+
+
+# --- runs ------------------------------------------------------------------------
+def resolve_run(ref: str) -> Path:
+    """A path, or the name of a stored run / committed baseline."""
+    path = Path(ref)
+    if path.is_file():
+        return path
+    for directory in (RESULTS_DIR, BASELINES_DIR):
+        candidate = directory / (ref if ref.endswith('.json') else f"{ref}.json")
+        if candidate.is_file():
+            return candidate
+    raise FileNotFoundError(f"no result file or stored run named {ref!r}")
+
+
+def load_run(ref: str) -> Dict[str, Any]:
+    report = json.loads(resolve_run(ref).read_text(encoding='utf-8'))
+    if report.get('kind') not in ('benchmarks', 'loadtest'):
+        raise ValueError(f"{ref}: not a benchmark or load-test report")
+    return report
+
+
+def entries(report: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """name -> entry ({"samples": [...], ...}) for either report kind."""
+    items = report['benchmarks'] if report['kind'] == 'benchmarks' else report['routes']
+    return {item['name']: item for item in items}
+
+
+def repeats(item: Dict[str, Any]) -> List[List[float]]:
+    """Samples of an entry per repeat (process run); a plain entry is one repeat."""
+    if item.get('repeats'):
+        return [list(run) for run in item['repeats'] if run]
+    return [list(item['samples'])] if item.get('samples') else []
+
+
+def merge_runs(reports: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """One report holding several runs of the same benchmarks as repeats.
+
+    Every entry keeps its samples per run in "repeats" (and all of them in "samples"); meta
+    data and the other fields come from the first report having the entry. Load-test error
+    rates are averaged over the runs.
+    """
+    if len(reports) == 1:
+        return reports[0]
+    kinds = {report['kind'] for report in reports}
+    if len(kinds) != 1:
+        raise ValueError(f"cannot merge {' and '.join(sorted(kinds))} runs")
+    merged: Dict[str, Dict[str, Any]] = {}
+    error_rates: Dict[str, List[float]] = {}
+    for report in reports:
+        for name, item in entries(report).items():
+            merged.setdefault(name, {**item, 'repeats': []})['repeats'].extend(repeats(item))
+            if 'error_rate' in item:
+                error_rates.setdefault(name, []).append(item['error_rate'])
+    for name, item in merged.items():
+        item['samples'] = [value for run in item['repeats'] for value in run]
+        if name in error_rates:
+            item['error_rate'] = sum(error_rates[name]) / len(error_rates[name])
+    first = reports[0]
+    key = 'benchmarks' if first['kind'] == 'benchmarks' else 'routes'
+    return {**first, 'meta': {**first.get('meta', {}), 'repeats': len(reports)}, key: list(merged.values())}
+
+
+def load_runs(refs: str) -> Dict[str, Any]:
+    """A run, or several comma-separated runs merged as repeats."""
+    return merge_runs([load_run(ref) for ref in refs.split(',') if ref])
+
+
+def _git_rev() -> str:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR, capture_output=True,
+                             text=True, timeout=5)
+        return out.stdout.strip() or 'norev'
+    except (OSError, subprocess.SubprocessError):
+        return 'norev'
+
+
+def _thin(samples: List[float], count: int) -> List[float]:
+    if len(samples) <= count:
+        return samples
+    step = len(samples) / count
+    return [samples[int(i * step)] for i in range(count)]
+
+
+def store_run(source: Path | str | Sequence[Path | str], name: Optional[str] = None,
+              directory: Path | str = RESULTS_DIR, max_samples: int = 0) -> Path:
+    """Copy a report into the results directory (default name: <stamp>_<rev>_<kind>).
+
+    Several reports are stored as one run with repeats (merge_runs). max_samples > 0 thins
+    every entry's samples (per repeat) to that many, evenly spaced in run order, which
+    keeps committed baselines small.
+    """
+    reports = []
+    for path in [source] if isinstance(source, (str, Path)) else source:
+        report = json.loads(Path(path).read_text(encoding='utf-8'))
+        if report.get('kind') not in ('benchmarks', 'loadtest'):
+            raise ValueError(f"{path}: not a benchmark or load-test report")
+        reports.append(report)
+    report = merge_runs(reports)
+    if max_samples > 0:
+        for item in entries(report).values():
+            if item.get('repeats'):
+                item['repeats'] = [_thin(run, max_samples) for run in item['repeats']]
+                item['samples'] = [value for run in item['repeats'] for value in run]
+            else:
+                item['samples'] = _thin(item.get('samples') or [], max_samples)
+    if not name:
+        name = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}_{report.get('meta', {}).get('git_rev') or _git_rev()}_{report['kind']}"
+    target = Path(directory) / f"{name}.json"
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(report, indent=1), encoding='utf-8')
+    return target
+
+
+def list_runs() -> List[Tuple[str, Path, Dict[str, Any]]]:
+    runs = []
+    for directory in (BASELINES_DIR, RESULTS_DIR):
+        for path in sorted(directory.glob('*.json')) if directory.is_dir() else ():
+            try:
+                report = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                continue
+            if report.get('kind') in ('benchmarks', 'loadtest'):
+                runs.append((path.stem, path, report))
+    return runs
+
+
+# --- statistics --------------------------------------------------------------------
+def _stat(values: Sequence[float], stat: str) -> float:
+    if stat == 'mean':
+        return sum(values) / len(values)
+    ordered = sorted(values)
+    if stat == 'min':
+        return ordered[0]
+    if stat == 'median':
+        mid = len(ordered) // 2
+        return ordered[mid] if len(ordered) % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+    q = {'p95': 95, 'p99': 99}[stat]
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[min(int(rank), len(ordered)) - 1]
+
+
+def _units(samples: Sequence[Any], rng: random.Random) -> List[List[float]]:
+    """Resampling units: the repeats (a list of sample lists), or BLOCKS blocks of one run's rounds.
+
+    Units are thinned so that together they hold at most MAX_BOOTSTRAP_SAMPLES samples.
+    """
+    if samples and isinstance(samples[0], (list, tuple)):
+        units = [list(run) for run in samples if run]
+    else:
+        values = list(samples)
+        count = BLOCKS if len(values) >= 2 * BLOCKS else len(values)
+        units = [values[i * len(values) // count:(i + 1) * len(values) // count] for i in range(count)]
+    share = max(MAX_BOOTSTRAP_SAMPLES // len(units), 1)
+    return [rng.sample(unit, share) if len(unit) > share else unit for unit in units]
+
+
+def bootstrap_ratio(old: Sequence[Any], new: Sequence[Any], stat: str = 'median', resamples: int = 1000,
+                    confidence: float = 0.95, seed: int = 0) -> Tuple[float, float, float]:
+    """(ratio, low, high): stat(new) / stat(old) with a percentile bootstrap interval.
+
+    `old` and `new` are the samples of one run each, or lists of samples per repeat. Whole
+    repeats (or blocks of consecutive rounds) are resampled, not single calls, so the interval
+    carries the variance between runs and not only the one between calls.
+    """
+    rng = random.Random(seed)
+    old_units, new_units = _units(old, rng), _units(new, rng)
+    base = _stat([v for unit in old_units for v in unit], stat)
+    ratio = _stat([v for unit in new_units for v in unit], stat) / base if base > 0 else float('inf')
+    ratios = []
+    for _ in range(max(resamples, 1)):
+        a = _stat([v for unit in rng.choices(old_units, k=len(old_units)) for v in unit], stat)
+        b = _stat([v for unit in rng.choices(new_units, k=len(new_units)) for v in unit], stat)
+        ratios.append(b / a if a > 0 else float('inf'))
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    low = ratios[int(tail * (len(ratios) - 1))]
+    high = ratios[int(round((1 - tail) * (len(ratios) - 1)))]
+    return ratio, low, high
+
+
+def _threshold_for(name: str, default: float, overrides: Sequence[Tuple[str, float]]) -> float:
+    for pattern, value in overrides:
+        if fnmatch.fnmatchcase(name, pattern):
+            return value
+    return default
+
+
+def compare_runs(old_report: Dict[str, Any], new_report: Dict[str, Any], stat: str = 'median',
+                 threshold: float = 0.10, overrides: Sequence[Tuple[str, float]] = (), resamples: int = 1000,
+                 confidence: float = 0.95, max_error_increase: float = 0.01, seed: int = 0) -> List[Comparison]:
+    old_entries, new_entries = entries(old_report), entries(new_report)
+    results = []
+    for name in sorted(old_entries.keys() | new_entries.keys()):
+        old_item, new_item = old_entries.get(name), new_entries.get(name)
+        limit = _threshold_for(name, threshold, overrides)
+        old_samples = (old_item or {}).get('samples') or []
+        new_samples = (new_item or {}).get('samples') or []
+        if not old_samples or not new_samples:
+            results.append(Comparison(name, _stat(old_samples, stat) if old_samples else None,
+                                      _stat(new_samples, stat) if new_samples else None, threshold=limit,
+                                      verdict='added' if new_samples else 'removed'))
+            continue
+        old_runs, new_runs = repeats(old_item), repeats(new_item)
+        ratio, low, high = bootstrap_ratio(old_runs if len(old_runs) > 1 else old_samples,
+                                           new_runs if len(new_runs) > 1 else new_samples,
+                                           stat, resamples, confidence, seed)
+        verdict = 'regression' if low > 1 + limit else 'improvement' if high < 1 - limit else 'same'
+        c = Comparison(name, _stat(old_samples, stat), _stat(new_samples, stat), ratio, low, high, limit, verdict)
+        if verdict != 'same' and min(len(old_runs), len(new_runs)) < 2:
+            c.note = 'single run per side: repeat to rule out run-to-run variance'
+        if 'error_rate' in new_item:
+            increase = new_item['error_rate'] - old_item.get('error_rate', 0.0)
+            if increase > max_error_increase:
+                c.verdict = 'regression'
+                c.note = f"error rate {old_item.get('error_rate', 0.0):.1%} -> {new_item['error_rate']:.1%}"
+        results.append(c)
+    return results
+
+
+def format_comparisons(results: List[Comparison], stat: str) -> str:
+    def ms(value: Optional[float]) -> str:
+        return f"{value * 1e3:10.3f}" if value is not None else f"{'-':>10s}"
+
+    width = max([40] + [len(c.name) for c in results])
+    lines = [f"{'entry':{width}s} {'old ms':>10s} {'new ms':>10s} {'change':>8s} {'ci':>17s} {'limit':>6s}  verdict",
+             f"({stat}; ci = confidence interval of the change)"]
+    for c in results:
+        if c.ratio is None:
+            change, ci = f"{'':8s}", f"{'':17s}"
+        else:
+            change = f"{(c.ratio - 1) * 100:+7.1f}%"
+            ci = f"[{(c.low - 1) * 100:+6.1f}%,{(c.high - 1) * 100:+6.1f}%]"
+        lines.append(f"{c.name:{width}s} {ms(c.old)} {ms(c.new)} {change} {ci} {c.threshold * 100:5.0f}%  "
+                     f"{c.verdict}{'  ' + c.note if c.note else ''}")
+    counts = {v: sum(1 for c in results if c.verdict == v) for v in ('regression', 'improvement', 'same')}
+    lines.append(f"{counts['regression']} regressed, {counts['improvement']} improved, {counts['same']} unchanged")
+    return '\n'.join(lines)
+
+
+# --- CLI ---------------------------------------------------------------------------
+def _override(text: str) -> Tuple[str, float]:
+    pattern, sep, value = text.rpartition('=')
+    if not sep or not pattern:
+        raise argparse.ArgumentTypeError(f"expected PATTERN=FRACTION, got {text!r}")
+    try:
+        return pattern, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad threshold in {text!r}") from None
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Store and compare benchmark / load-test results")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    store = sub.add_parser('store', help="copy a report (several: repeats of one run) into the results directory")
+    store.add_argument('report', type=Path, nargs='+')
+    store.add_argument('--name', help="stored run name (default: <timestamp>_<git rev>_<kind>)")
+    store.add_argument('--baseline', action='store_true', help=f"store under {BASELINES_DIR.name}/ instead")
+    store.add_argument('--max-samples', type=int, default=0, help="thin samples per entry to at most this many")
+
+    sub.add_parser('list', help="list stored runs and baselines")
+
+    cmp = sub.add_parser('compare', help="diff two runs; exit 1 on regressions")
+    cmp.add_argument('old', help="baseline run (path or stored name; comma-separated: repeats)")
+    cmp.add_argument('new', help="candidate run (path or stored name; comma-separated: repeats)")
+    cmp.add_argument('--stat', choices=STATS, default='median')
+    cmp.add_argument('--threshold', type=float, default=0.10, help="allowed slowdown as a fraction (0.10 = 10%%)")
+    cmp.add_argument('--threshold-for', type=_override, action='append', default=[], metavar='PATTERN=FRACTION',
+                     help="per-entry threshold for names matching a glob (first match wins)")
+    cmp.add_argument('--max-error-increase', type=float, default=0.01,
+                     help="load tests: allowed error-rate increase (absolute fraction)")
+    cmp.add_argument('--resamples', type=int, default=1000)
+    cmp.add_argument('--confidence', type=float, default=0.95)
+    cmp.add_argument('--seed', type=int, default=0)
+    cmp.add_argument('--json', action='store_true', help="print the comparison as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    if args.command == 'store':
+        target = store_run(args.report, args.name, BASELINES_DIR if args.baseline else RESULTS_DIR, args.max_samples)
+        print(f"stored {target}")
+        return 0
+    if args.command == 'list':
+        for name, path, report in list_runs():
+            meta = report.get('meta', {})
+            print(f"{name:48s} {report['kind']:11s} {meta.get('timestamp', ''):26s} {meta.get('git_rev') or ''}"
+                  f"  ({path.parent.name})")
+        return 0
+    try:
+        old, new = load_runs(args.old), load_runs(args.new)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    if old['kind'] != new['kind']:
+        print(f"error: cannot compare a {old['kind']} run with a {new['kind']} run", file=sys.stderr)
+        return 2
+    results = compare_runs(old, new, args.stat, args.threshold, args.threshold_for, args.resamples,
+                           args.confidence, args.max_error_increase, args.seed)
+    if args.json:
+        print(json.dumps([c.__dict__ for c in results], indent=1))
+    else:
+        print(format_comparisons(results, args.stat))
+    return 1 if any(c.verdict == 'regression' for c in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
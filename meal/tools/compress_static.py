@@ -0,0 +1,103 @@
+"""Precompress text assets under meal/static.
+
+Writes `<file>.gz` (and `<file>.br` when the optional `brotli` package is installed) next to
+each CSS/JS/HTML/SVG/JSON file. The static handler (meal.api.assets.AssetStaticFiles) serves
+the sibling when the client accepts that encoding and the sibling is not older than the source.
+
+    python -m meal.tools.compress_static            # build / refresh siblings
+    python -m meal.tools.compress_static --clean    # remove them
+"""
+from __future__ import annotations
+import argparse
+import gzip
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator
+
+try:  # optional dependency
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+__all__ = ["TEXT_EXTENSIONS", "ENCODINGS", "compress_static", "iter_text_assets"]
+
+STATIC_DIR = (Path(__file__).parent.parent / 'static').resolve()
+TEXT_EXTENSIONS = {'.css', '.js', '.html', '.svg', '.json', '.txt', '.map'}
+ENCODINGS = {'br': '.br', 'gzip': '.gz'}  # preference order when serving
+MIN_SIZE = 256  # not worth compressing below this
+
+
+def iter_text_assets(static_dir: Path = STATIC_DIR) -> Iterator[Path]:
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for name in files:
+            p = Path(root) / name
+            if p.suffix.lower() in TEXT_EXTENSIONS and not name.startswith('.'):
+                yield p
+
+
+def _fresh(sibling: Path, source: Path) -> bool:
+    try:
+        return sibling.stat().st_mtime_ns >= source.stat().st_mtime_ns
+    except OSError:
+        return False
+
+
+def _write_atomic(path: Path, data: bytes, mode: int) -> None:
+    """Replace path with data via a temp file in the same directory, so readers never see half a file."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}_")
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(data)
+        os.chmod(tmp_path, mode)  # mkstemp creates 0600; keep the source's permissions
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def compress_static(static_dir: Path = STATIC_DIR, *, force: bool = False) -> Dict[str, int]:
+    """Create missing/stale siblings; returns byte totals for reporting."""
+    totals = {'files': 0, 'written': 0, 'raw': 0, 'gzip': 0, 'br': 0}
+    for src in iter_text_assets(static_dir):
+        data = src.read_bytes()
+        mode = src.stat().st_mode & 0o777
+        if len(data) < MIN_SIZE:
+            continue
+        totals['files'] += 1
+        totals['raw'] += len(data)
+        variants = {'.gz': lambda d: gzip.compress(d, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = lambda d: brotli.compress(d, quality=11)
+        for suffix, fn in variants.items():
+            sibling = src.with_name(src.name + suffix)
+            if force or not _fresh(sibling, src):
+                _write_atomic(sibling, fn(data), mode)
+                totals['written'] += 1
+            totals['gzip' if suffix == '.gz' else 'br'] += sibling.stat().st_size
+    return totals
+
+
+def clean(static_dir: Path = STATIC_DIR) -> int:
+    removed = 0
+    for src in iter_text_assets(static_dir):
+        for suffix in ENCODINGS.values():
+            sibling = src.with_name(src.name + suffix)
+            if sibling.exists():
+                sibling.unlink()
+                removed += 1
+    return removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write precompressed siblings for static text assets")
+    parser.add_argument("--force", action="store_true", help="rewrite even if siblings are up to date")
+    parser.add_argument("--clean", action="store_true", help="remove .gz/.br siblings")
+    args = parser.parse_args()
+    if args.clean:
+        print(f"✓ Removed {clean()} precompressed files")
+    else:
+        t = compress_static(force=args.force)
+        print(f"✓ {t['files']} assets, {t['written']} files written: raw {t['raw']} B -> gzip {t['gzip']} B"
+              + (f", br {t['br']} B" if brotli is not None else " (brotli not installed, .br skipped)"))
@@ -0,0 +1,377 @@
+"""HTTP load test: boots the app with uvicorn against a synthetic data directory and
+drives a weighted mix of browser-like requests at a fixed arrival rate.
+
+    python -m meal.tools.loadtest                              # 20 rps for 30 s, synthetic data
+    python -m meal.tools.loadtest --rps 100 --duration 60 --workers 2 --recipes 5000
+    python -m meal.tools.loadtest --data meal/data --mix get_week=5,alerts=5
+    python -m meal.tools.loadtest --url http://127.0.0.1:8000  # an already running server
+
+The data directory (generated with meal.tools.synth, or a copy of --data) lives in a temp
+dir for the run, because buy and cook mutate it; the server gets it through MEAL_DATA_DIR.
+Everything stays on 127.0.0.1, so the test runs offline.
+
+Arrivals are open-loop (Poisson at --rps): requests are scheduled independently of how fast
+earlier ones complete, and latency is measured from the scheduled send time, so a slow
+server shows up as latency instead of silently lowering the offered load (coordinated
+omission). --concurrency caps requests in flight; time spent waiting for a slot counts.
+Like a browser, the client revalidates GETs with If-None-Match once it has an ETag.
+
+Per route the report gives p50/p95/p99/max latency, the error rate (5xx and transport
+failures) and the 4xx count; expected client errors (cooking an empty or already cooked
+slot) are not errors. --json writes the report with raw samples for the comparison tool.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from meal.tools.synth import DAYS, MEALS, SynthConfig, write_dataset
+
+__all__ = ['Sample', 'DEFAULT_MIX', 'percentile', 'parse_mix', 'build_report', 'run_load', 'serve']
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_JSON = PROJECT_ROOT / 'meal' / 'benchmarks' / 'results' / 'loadtest.json'
+APP = 'meal.api.api_run:app'
+
+# scenario -> relative weight; roughly what an open planner tab plus occasional edits produce
+DEFAULT_MIX = {'home': 10, 'get_week': 25, 'shopping_list': 20, 'buy': 5, 'cook': 5, 'alerts': 35}
+
+
+@dataclass
+class Sample:
+    route: str
+    latency: float           # seconds from the scheduled send time to the full response
+    status: int              # 0 for transport failures (connection refused, timeout, ...)
+    phase: str = 'measure'   # 'warmup' samples are dropped from the report
+
+
+@dataclass
+class _State:
+    """What a browser session would know: the current week and the last shopping list."""
+    rng: random.Random
+    monday: date
+    shopping_items: List[str] = field(default_factory=list)
+    etags: Dict[str, str] = field(default_factory=dict)
+
+
+Request = Tuple[str, str, Optional[Dict[str, Any]]]  # method, path, JSON body
+
+
+def _home(state: _State) -> Request:
+    return 'GET', '/', None
+
+
+def _get_week(state: _State) -> Request:
+    # week navigation: mostly the current week, sometimes a few weeks back or ahead
+    offset = 0 if state.rng.random() < 0.5 else state.rng.randint(-4, 4)
+    monday = state.monday + timedelta(weeks=offset)
+    return 'GET', f"/get_week?start={monday.isoformat()}", None
+
+
+def _shopping_list(state: _State) -> Request:
+    iso = state.monday.isocalendar()
+    return 'GET', f"/api/shopping-list?week={iso.week}&year={iso.year}", None
+
+
+def _buy(state: _State) -> Request:
+    items = state.rng.sample(state.shopping_items, min(len(state.shopping_items), state.rng.randint(1, 3)))
+    return 'POST', '/api/shopping-list/buy', {'week': state.monday.isocalendar().week, 'items': items}
+
+
+def _cook(state: _State) -> Request:
+    iso = state.monday.isocalendar()
+    return 'POST', '/api/cook', {'day': state.rng.choice(DAYS), 'meal': state.rng.choice(MEALS),
+                                 'week': iso.week, 'year': iso.year}
+
+
+def _alerts(state: _State) -> Request:
+    return 'GET', '/api/pantry/alerts', None
+
+
+SCENARIOS: Dict[str, Tuple[str, Callable[[_State], Request]]] = {
+    'home': ('GET /', _home),
+    'get_week': ('GET /get_week', _get_week),
+    'shopping_list': ('GET /api/shopping-list', _shopping_list),
+    'buy': ('POST /api/shopping-list/buy', _buy),
+    'cook': ('POST /api/cook', _cook),
+    'alerts': ('GET /api/pantry/alerts', _alerts),
+}
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """'get_week=5,alerts=5' -> weights; scenarios not named keep their default weight."""
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, (p.strip() for p in text.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in SCENARIOS:
+            raise ValueError(f"unknown scenario {name!r} (known: {', '.join(SCENARIOS)})")
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise ValueError(f"bad weight in {part!r}") from None
+        if mix[name] < 0:
+            raise ValueError(f"negative weight in {part!r}")
+    if not any(mix.values()):
+        raise ValueError("all scenario weights are zero")
+    return mix
+
+
+# --- load generation ------------------------------------------------------------
+async def _send(client: httpx.AsyncClient, state: _State, scenario: str, scheduled: float,
+                gate: asyncio.Semaphore, revalidate: bool) -> Sample:
+    route, build = SCENARIOS[scenario]
+    method, path, body = build(state)
+    headers = {}
+    if revalidate and method == 'GET' and path in state.etags:
+        headers['If-None-Match'] = state.etags[path]
+    async with gate:
+        try:
+            resp = await client.request(method, path, json=body, headers=headers)
+            status = resp.status_code
+        except httpx.HTTPError:
+            return Sample(route, time.perf_counter() - scheduled, 0)
+    latency = time.perf_counter() - scheduled
+    if method == 'GET' and resp.headers.get('etag'):
+        state.etags[path] = resp.headers['etag']
+    if scenario == 'shopping_list' and status == 200:
+        state.shopping_items = [i['name'] for i in resp.json().get('items', []) if i.get('name')]
+    return Sample(route, latency, status)
+
+
+async def run_load(base_url: str, rps: float, duration: float, mix: Dict[str, float], warmup: float = 0.0,
+                   concurrency: int = 64, timeout: float = 30.0, seed: int = 1,
+                   revalidate: bool = True) -> List[Sample]:
+    """Offer Poisson arrivals at `rps` for warmup + duration seconds; returns every sample."""
+    rng = random.Random(seed)
+    today = date.today()
+    state = _State(rng=rng, monday=today - timedelta(days=today.weekday()))
+    names = [n for n, w in mix.items() if w > 0]
+    weights = [mix[n] for n in names]
+    gate = asyncio.Semaphore(max(concurrency, 1))
+    limits = httpx.Limits(max_connections=max(concurrency, 1), max_keepalive_connections=max(concurrency, 1))
+    tasks: List[Tuple[str, asyncio.Task]] = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        end = started + warmup + duration
+        scheduled = started
+        while True:
+            scheduled += rng.expovariate(rps)
+            if scheduled >= end:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            phase = 'warmup' if scheduled - started < warmup else 'measure'
+            scenario = rng.choices(names, weights)[0]
+            tasks.append((phase, asyncio.ensure_future(_send(client, state, scenario, scheduled, gate, revalidate))))
+        samples = []
+        for phase, task in tasks:
+            sample = await task
+            sample.phase = phase
+            samples.append(sample)
+    return samples
+
+
+# --- report ----------------------------------------------------------------------
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100) of an already sorted list."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil(n * q / 100)
+    return ordered[min(int(rank), len(ordered)) - 1]
+
+
+def build_report(samples: List[Sample], duration: float, meta: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Per-route latency percentiles and error counts over the measured samples."""
+    by_route: Dict[str, List[Sample]] = {}
+    for s in samples:
+        if s.phase == 'measure':
+            by_route.setdefault(s.route, []).append(s)
+    routes = []
+    for route, group in sorted(by_route.items()):
+        latencies = [s.latency for s in group]
+        ordered = sorted(latencies)
+        errors = sum(1 for s in group if s.status == 0 or s.status >= 500)
+        routes.append({
+            'name': route,
+            'count': len(group),
+            'errors': errors,
+            'client_errors': sum(1 for s in group if 400 <= s.status < 500),
+            'not_modified': sum(1 for s in group if s.status == 304),
+            'error_rate': errors / len(group),
+            'rps': len(group) / duration if duration > 0 else 0.0,
+            'stats': {
+                'mean': sum(latencies) / len(latencies),
+                'p50': percentile(ordered, 50),
+                'p95': percentile(ordered, 95),
+                'p99': percentile(ordered, 99),
+                'max': ordered[-1],
+            },
+            'samples': latencies,
+        })
+    total = sum(r['count'] for r in routes)
+    return {
+        'kind': 'loadtest',
+        'meta': {**(meta or {}), 'duration': duration, 'requests': total,
+                 'achieved_rps': total / duration if duration > 0 else 0.0,
+                 'errors': sum(r['errors'] for r in routes)},
+        'routes': routes,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    meta = report['meta']
+    lines = [f"{meta['requests']} requests in {meta['duration']:.0f} s ({meta['achieved_rps']:.1f} rps), "
+             f"{meta['errors']} errors",
+             f"{'route':32s} {'count':>7s} {'err%':>6s} {'4xx':>5s} {'304':>5s} "
+             f"{'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}"]
+    for r in report['routes']:
+        s = r['stats']
+        lines.append(f"{r['name']:32s} {r['count']:7d} {r['error_rate'] * 100:6.2f} {r['client_errors']:5d} "
+                     f"{r['not_modified']:5d} {s['p50'] * 1e3:9.1f} {s['p95'] * 1e3:9.1f} "
+                     f"{s['p99'] * 1e3:9.1f} {s['max'] * 1e3:9.1f}")
+    return '\n'.join(lines)
+
+
+# --- server ----------------------------------------------------------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(base_url: str, proc: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"server exited with code {proc.returncode} before becoming ready")
+        try:
+            if httpx.get(base_url + '/metrics', timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"server not ready after {timeout:.0f} s")
+
+
+@contextmanager
+def serve(data_dir: Path | str, workers: int = 1, port: Optional[int] = None,
+          startup_timeout: float = 60.0, env: Optional[Dict[str, str]] = None) -> Iterator[str]:
+    """Run the app under uvicorn on 127.0.0.1 with MEAL_DATA_DIR=data_dir; yields the base URL."""
+    port = port or _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    cmd = [sys.executable, '-m', 'uvicorn', APP, '--host', '127.0.0.1', '--port', str(port),
+           '--workers', str(max(workers, 1)), '--log-level', 'warning', '--no-access-log']
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT,
+                            env={**os.environ, **(env or {}), 'MEAL_DATA_DIR': str(Path(data_dir).resolve())})
+    try:
+        _wait_ready(base_url, proc, startup_timeout)
+        yield base_url
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def _prepare_data(args: argparse.Namespace, work_dir: Path) -> Dict[str, Any]:
+    if args.data:
+        shutil.copytree(args.data, work_dir, dirs_exist_ok=True)
+        return {'source': str(args.data)}
+    config = SynthConfig(recipes=args.recipes, ingredients=args.ingredients, pantry=args.pantry,
+                         weeks=args.weeks, transactions=args.transactions, seed=args.seed)
+    write_dataset(work_dir, config)
+    return {'synthetic': {k: v for k, v in config.__dict__.items() if k != 'today'}}
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True,
+                             text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    defaults = SynthConfig()
+    parser = argparse.ArgumentParser(description="Load test the meal planner HTTP API")
+    parser.add_argument('--rps', type=float, default=20.0, help="offered requests per second")
+    parser.add_argument('--duration', type=float, default=30.0, help="measured seconds")
+    parser.add_argument('--warmup', type=float, default=5.0, help="seconds of load before measuring")
+    parser.add_argument('--concurrency', type=int, default=64, help="max requests in flight")
+    parser.add_argument('--timeout', type=float, default=30.0, help="per-request timeout (s)")
+    parser.add_argument('--mix', default='', help="scenario weights, e.g. get_week=5,buy=0 "
+                                                  f"(defaults: {','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items())})")
+    parser.add_argument('--no-revalidate', action='store_true', help="never send If-None-Match")
+    parser.add_argument('--seed', type=int, default=1, help="seed for arrivals, the mix and the dataset")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--url', help="target an already running server instead of booting one")
+    target.add_argument('--data', type=Path, help="copy this data dir instead of generating one")
+    parser.add_argument('--workers', type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument('--recipes', type=int, default=defaults.recipes)
+    parser.add_argument('--ingredients', type=int, default=defaults.ingredients)
+    parser.add_argument('--pantry', type=int, default=defaults.pantry)
+    parser.add_argument('--weeks', type=int, default=defaults.weeks)
+    parser.add_argument('--transactions', type=int, default=defaults.transactions)
+    parser.add_argument('--json', nargs='?', const=str(DEFAULT_JSON), default=None, metavar='PATH',
+                        help=f"write the JSON report (default path: {DEFAULT_JSON.relative_to(PROJECT_ROOT)})")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = _parse_args(argv)
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        raise SystemExit(f"--mix: {e}")
+    meta: Dict[str, Any] = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_rev': _git_rev(), 'python': platform.python_version(), 'platform': platform.platform(),
+        'rps': args.rps, 'warmup': args.warmup, 'concurrency': args.concurrency, 'mix': mix,
+        'workers': None if args.url else args.workers,
+    }
+
+    def load(base_url: str) -> List[Sample]:
+        return asyncio.run(run_load(base_url, args.rps, args.duration, mix, warmup=args.warmup,
+                                    concurrency=args.concurrency, timeout=args.timeout, seed=args.seed,
+                                    revalidate=not args.no_revalidate))
+
+    if args.url:
+        meta['dataset'] = {'url': args.url}
+        samples = load(args.url.rstrip('/'))
+    else:
+        with tempfile.TemporaryDirectory(prefix='meal-loadtest-') as tmp:
+            meta['dataset'] = _prepare_data(args, Path(tmp))
+            with serve(tmp, workers=args.workers) as base_url:
+                samples = load(base_url)
+    report = build_report(samples, args.duration, meta)
+    print(format_report(report))
+    if args.json:
+        path = Path(args.json)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=1), encoding='utf-8')
+        print(f"JSON report: {path}")
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""Synthetic data directory generator for scale testing.
+
+Writes a consistent set of data files in the layout of meal/data:
+
+    recipes.json                 recipes over a shared ingredient vocabulary
+    Pantry_ingredients.json      pantry lots with expiry dates around today
+    plan.json                    consecutive ISO weeks ending a few weeks after today;
+                                 past slots are partly marked cooked
+    Pantry_recipe_cooked.json    one cooked-log entry per cooked plan slot (same names/dates)
+    shopping_transactions.json   buy transactions spread over the plan weeks
+
+Ingredient and recipe popularity follow a Zipf law (weight 1/rank**skew; skew 0 is
+uniform), so a few staples appear in most recipes and a few recipes dominate the plan,
+like real data. Records are generated and written one at a time (one JSON record per
+line inside the array / object), so memory stays flat however large the output; only
+the ingredient vocabulary and the popularity tables are held in memory.
+
+    python -m meal.tools.synth --out /tmp/meal-data --recipes 50000 --pantry 20000 --years 5
+    python -m meal.tools.synth --out /tmp/meal-data --seed 7 --skew 1.3 --transactions 100000
+"""
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from meal.api.routes.pantry import ALLOWED_TAGS
+from meal.utilities.constants import DATE_FORMAT
+
+__all__ = ['SynthConfig', 'Synth', 'write_dataset']
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+MEALS = ("breakfast", "lunch", "dinner")
+UNITS = ("g", "ml", "pcs", "cloves")
+STAPLES = ["Onion", "Garlic", "Olive oil", "Salt", "Tomato", "Eggs", "Butter", "Rice", "Milk", "Flour",
+           "Chicken breast", "Carrot", "Potato", "Lemon", "Pasta", "Cheese", "Bell pepper", "Ground beef",
+           "Spinach", "Mushrooms"]
+STYLES = ["Classic", "Spicy", "Creamy", "Quick", "Roasted", "Grilled", "Baked", "Smoky", "Fresh", "Hearty"]
+DISHES = ["Soup", "Stew", "Salad", "Curry", "Pasta", "Bowl", "Stir Fry", "Omelette", "Tacos", "Casserole"]
+TAGS = ["dinner", "lunch", "breakfast", "vegetarian", "quick", "soup", "pasta", "asian", "italian"]
+
+
+@dataclass
+class SynthConfig:
+    recipes: int = 1_000
+    ingredients: int = 2_000          # vocabulary size
+    pantry: int = 2_000               # pantry lots
+    weeks: int = 104                  # plan weeks, the last `future_weeks` of them after today
+    future_weeks: int = 4
+    transactions: int = 500
+    skew: float = 1.1                 # Zipf exponent for ingredient and recipe popularity
+    fill: float = 0.8                 # share of plan slots holding a recipe
+    cooked: float = 0.4               # share of past filled slots marked cooked
+    seed: int = 42
+    today: date = field(default_factory=date.today)
+
+
+def _cumulative(n: int, skew: float) -> List[float]:
+    return list(itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, n + 1)))
+
+
+class Synth:
+    """Record generators for one configuration; each call restarts from the same seed."""
+
+    def __init__(self, config: SynthConfig):
+        self.config = config
+        n = max(config.ingredients, 1)
+        self.ingredient_names = (STAPLES + [f"Ingredient {i:06d}" for i in range(len(STAPLES), n)])[:n]
+        rng = random.Random(config.seed)
+        self.units = [rng.choice(UNITS) for _ in self.ingredient_names]
+        # pantry tags already in the app's sanitized form, so loading never rewrites the file
+        self.categories = [rng.choice(ALLOWED_TAGS) for _ in self.ingredient_names]
+        self._ing_cum = _cumulative(n, config.skew)
+        self._recipe_cum = _cumulative(max(config.recipes, 1), config.skew)
+
+    def _rng(self, stream: str) -> random.Random:
+        # independent, reproducible stream per file
+        return random.Random(f"{self.config.seed}:{stream}")
+
+    def recipe_name(self, i: int) -> str:
+        return f"{STYLES[i % len(STYLES)]} {DISHES[(i // len(STYLES)) % len(DISHES)]} {i:06d}"
+
+    def _ingredient(self, rng: random.Random) -> int:
+        return rng.choices(range(len(self.ingredient_names)), cum_weights=self._ing_cum)[0]
+
+    def recipes(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng('recipes')
+        for i in range(self.config.recipes):
+            chosen = sorted({self._ingredient(rng) for _ in range(rng.randint(4, 12))})
+            yield {
+                "name": self.recipe_name(i),
+                "servings": rng.randint(1, 6),
+                "ingredients": [{"name": self.ingredient_names[k], "default_quantity": rng.randint(1, 500),
+                                 "unit": self.units[k]} for k in chosen],
+                "steps": [f"Step {s + 1}: prepare and cook." for s in range(rng.randint(2, 6))],
+                "tags": rng.sample(TAGS, 2),
+                "calories_per_serving": rng.randint(150, 900),
+                "macros": {"protein": rng.randint(5, 60), "carbohydrates": rng.randint(5, 120),
+                           "fats": rng.randint(2, 50)},
+                "image": "",
+            }
+
+    def pantry(self) -> Iterator[Dict[str, Any]]:
+        rng = self._rng('pantry')
+        for _ in range(self.config.pantry):
+            k = self._ingredient(rng)
+            expiry = self.config.today + timedelta(days=rng.randint(-10, 180))
+            yield {"name": self.ingredient_names[k], "unit": self.units[k],
+                   "default_quantity": rng.randint(0, 2000), "data_expirare": expiry.strftime(DATE_FORMAT),
+                   "tags": [self.categories[k]]}
+
+    def first_monday(self) -> date:
+        cfg = self.config
+        this_monday = cfg.today - timedelta(days=cfg.today.weekday())
+        return this_monday - timedelta(weeks=cfg.weeks - 1 - cfg.future_weeks)
+
+    def plan_weeks(self) -> Iterator[Tuple[str, Dict[str, Any], List[Dict[str, Any]]]]:
+        """(plan key, week meals, cooked-log entries of that week), oldest week first."""
+        cfg = self.config
+        rng = self._rng('plan')
+        recipes = range(max(cfg.recipes, 1))
+        monday = self.first_monday()
+        for w in range(cfg.weeks):
+            week_start = monday + timedelta(weeks=w)
+            iso = week_start.isocalendar()
+            meals, cooked = {}, []
+            for offset, day in enumerate(DAYS):
+                d = week_start + timedelta(days=offset)
+                slots = {}
+                for meal in MEALS:
+                    if rng.random() >= cfg.fill:
+                        slots[meal] = "-"
+                        continue
+                    name = self.recipe_name(rng.choices(recipes, cum_weights=self._recipe_cum)[0])
+                    if d < cfg.today and rng.random() < cfg.cooked:
+                        servings = rng.randint(1, 4)
+                        slots[meal] = {"name": name, "cooked": True, "servings": servings, "quantity": servings}
+                        cooked.append({"name": name, "date_cooked": d.strftime(DATE_FORMAT),
+                                       "servings": servings, "unit": "pcs"})
+                    else:
+                        slots[meal] = name
+                meals[day] = slots
+            yield f"{iso.year}-W{iso.week:02d}", meals, cooked
+
+    def transactions(self) -> Iterator[Dict[str, Any]]:
+        cfg = self.config
+        rng = self._rng('transactions')
+        monday = self.first_monday()
+        span_days = max(cfg.weeks * 7, 1)
+        for _ in range(cfg.transactions):
+            when = datetime.combine(monday, datetime.min.time()) + timedelta(
+                seconds=rng.randrange(span_days * 86_400))
+            added = []
+            for _ in range(rng.randint(1, 8)):
+                k = self._ingredient(rng)
+                added.append({"name": self.ingredient_names[k], "quantity": rng.randint(1, 1000),
+                              "exp_date": (when.date() + timedelta(days=rng.randint(3, 60))).strftime(DATE_FORMAT)})
+            yield {"id": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+                   "timestamp": when.isoformat(), "week": when.isocalendar().week,
+                   "merged": [], "added": added}
+
+
+class _JsonStream:
+    """Writes a JSON array or object one record per line, without building it in memory."""
+
+    def __init__(self, path: Path, kind: str = 'array'):
+        self._f = open(path, 'w', encoding='utf-8')
+        self._close = ']' if kind == 'array' else '}'
+        self._f.write('[' if kind == 'array' else '{')
+        self.count = 0
+
+    def _sep(self) -> None:
+        self._f.write(',\n' if self.count else '\n')
+        self.count += 1
+
+    def item(self, value: Any) -> None:
+        self._sep()
+        self._f.write(json.dumps(value, ensure_ascii=False))
+
+    def entry(self, key: str, value: Any) -> None:
+        self._sep()
+        self._f.write(f"{json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}")
+
+    def close(self) -> int:
+        self._f.write(('\n' if self.count else '') + self._close + '\n')
+        size = self._f.tell()
+        self._f.close()
+        return size
+
+
+def _write_array(path: Path, records: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+    out = _JsonStream(path)
+    try:
+        for record in records:
+            out.item(record)
+    finally:
+        size = out.close()
+    return out.count, size
+
+
+def write_dataset(out_dir: Path | str, config: SynthConfig) -> Dict[str, Dict[str, int]]:
+    """Generate every data file into out_dir; returns {file: {"records", "bytes"}}."""
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    synth = Synth(config)
+    summary: Dict[str, Dict[str, int]] = {}
+    for name, records in (("recipes.json", synth.recipes()), ("Pantry_ingredients.json", synth.pantry()),
+                          ("shopping_transactions.json", synth.transactions())):
+        count, size = _write_array(out / name, records)
+        summary[name] = {"records": count, "bytes": size}
+    plan = _JsonStream(out / "plan.json", kind='object')
+    cooked = _JsonStream(out / "Pantry_recipe_cooked.json")
+    try:
+        for key, meals, cooked_entries in synth.plan_weeks():
+            plan.entry(key, meals)
+            for entry in cooked_entries:
+                cooked.item(entry)
+    finally:
+        summary["plan.json"] = {"records": plan.count, "bytes": plan.close()}
+        summary["Pantry_recipe_cooked.json"] = {"records": cooked.count, "bytes": cooked.close()}
+    return summary
+
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    defaults = SynthConfig()
+    parser = argparse.ArgumentParser(description="Generate a synthetic meal planner data directory")
+    parser.add_argument("--out", required=True, help="output directory (created if missing)")
+    parser.add_argument("--recipes", type=int, default=defaults.recipes)
+    parser.add_argument("--ingredients", type=int, default=defaults.ingredients, help="ingredient vocabulary size")
+    parser.add_argument("--pantry", type=int, default=defaults.pantry, help="pantry lots")
+    weeks = parser.add_mutually_exclusive_group()
+    weeks.add_argument("--weeks", type=int, default=defaults.weeks, help="plan weeks")
+    weeks.add_argument("--years", type=float, help="plan length in years (overrides --weeks)")
+    parser.add_argument("--future-weeks", type=int, default=defaults.future_weeks,
+                        help="plan weeks after the current one")
+    parser.add_argument("--transactions", type=int, default=defaults.transactions)
+    parser.add_argument("--skew", type=float, default=defaults.skew, help="Zipf exponent (0 = uniform)")
+    parser.add_argument("--fill", type=float, default=defaults.fill, help="share of filled plan slots")
+    parser.add_argument("--cooked", type=float, default=defaults.cooked, help="share of past slots cooked")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--today", type=date.fromisoformat, default=defaults.today, help="YYYY-MM-DD")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+    args = _parse_args(argv)
+    config = SynthConfig(
+        recipes=args.recipes, ingredients=args.ingredients, pantry=args.pantry,
+        weeks=round(args.years * 52.18) if args.years else args.weeks, future_weeks=args.future_weeks,
+        transactions=args.transactions, skew=args.skew, fill=args.fill, cooked=args.cooked,
+        seed=args.seed, today=args.today,
+    )
+    started = time.perf_counter()
+    summary = write_dataset(args.out, config)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for name, s in summary.items():
+            print(f"{name:<28}{s['records']:>12,} records{s['bytes'] / 1e6:>12.1f} MB")
+        print(f"written to {args.out} in {time.perf_counter() - started:.1f} s")
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -3,14 +3,17 @@ import os
 from typing import Final
 from pathlib import Path
 
-# Load environment variables from .env file if it exists
-try:
-    from dotenv import load_dotenv
-    env_path = Path(__file__).parent.parent / '.env'
-    if env_path.exists():
-        load_dotenv(env_path)
-except ImportError:
-    pass  # dotenv not installed, using defaults
+# Load environment variables from .env files if they exist (meal/.env first, then the
+# project root); dotenv is only imported when there is something to load
+_env_paths = [p for p in (Path(__file__).parent.parent / '.env', Path(__file__).parent.parent.parent / '.env')
+              if p.is_file()]
+if _env_paths:
+    try:
+        from dotenv import load_dotenv
+        for env_path in _env_paths:
+            load_dotenv(env_path)
+    except ImportError:
+        pass  # dotenv not installed, using defaults
 
 # API Configuration
 SPOONACULAR_API_KEY: Final[str] = os.getenv('SPOONACULAR_API_KEY', '5ff4f96c305e44fd8a8bb9d94278e058')
@@ -34,7 +37,34 @@ LOW_STOCK_THRESHOLD: Final[dict[str, int]] = {
 
 # File Paths
 BASE_DIR: Final[Path] = Path(__file__).parent.parent
-DATA_DIR: Final[Path] = BASE_DIR / 'data'
+DATA_DIR: Final[Path] = Path(os.getenv('MEAL_DATA_DIR') or BASE_DIR / 'data').resolve()
 STATIC_DIR: Final[Path] = BASE_DIR / 'static'
 TEMPLATES_DIR: Final[Path] = BASE_DIR / 'templates'
 
+
+# Templates: Jinja bytecode cache shared by all workers ("off" disables it) and eager
+# compilation of every template at startup
+JINJA_BYTECODE_CACHE_DIR: Final[str] = os.getenv('JINJA_BYTECODE_CACHE_DIR', '')
+PRECOMPILE_TEMPLATES: Final[bool] = os.getenv('PRECOMPILE_TEMPLATES', 'True').lower() == 'true'
+
+# Metrics: directory shared by all workers for merged /metrics output (empty: per worker)
+METRICS_MULTIPROC_DIR: Final[str] = os.getenv('METRICS_MULTIPROC_DIR', '')
+
+# Profiling: requests carrying PROFILE_TOKEN (X-Profile header or ?_profile=) are sampled and
+# the stacks stored under data/profiles; PROFILE_SAMPLE_RATE=N also profiles 1 in N requests per route
+PROFILE_TOKEN: Final[str] = os.getenv('PROFILE_TOKEN', '')
+PROFILE_SAMPLE_RATE: Final[int] = int(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_INTERVAL_MS: Final[float] = float(os.getenv('PROFILE_INTERVAL_MS', '1'))
+PROFILE_KEEP: Final[int] = int(os.getenv('PROFILE_KEEP', '50'))
+PROFILE_MAX_SECONDS: Final[float] = float(os.getenv('PROFILE_MAX_SECONDS', '30'))
+
+# PDF export: rendered week PDFs are cached under data/pdf_cache, least recently used
+# entries evicted beyond these limits (PDF_CACHE_MAX_MB=0 disables the cache)
+PDF_CACHE_MAX_MB: Final[float] = float(os.getenv('PDF_CACHE_MAX_MB', '64'))
+PDF_CACHE_MAX_ENTRIES: Final[int] = int(os.getenv('PDF_CACHE_MAX_ENTRIES', '512'))
+
+# Tracing: spans are kept in an in-memory ring (/_debug/traces) and, when TRACE_FILE is set,
+# appended to it as JSON lines by a background writer
+TRACING: Final[bool] = os.getenv('TRACING', 'True').lower() == 'true'
+TRACE_RING_SIZE: Final[int] = int(os.getenv('TRACE_RING_SIZE', '5000'))
+TRACE_FILE: Final[str] = os.getenv('TRACE_FILE', '')
@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Dict, List
 import logging
 
+from meal.infra.recipe_search import invalidate_search_index, recipes_appended
+
 logger = logging.getLogger(__name__)
 
 
@@ -176,19 +178,27 @@ class DataImporter:
 
                 # Merge without duplicates (by name)
                 existing_names = {r['name'].lower() for r in existing_recipes}
+                previous_count = len(existing_recipes)
                 for recipe in new_recipes:
                     if recipe['name'].lower() not in existing_names:
                         existing_recipes.append(recipe)
+                appended = existing_recipes[previous_count:]
 
                 final_recipes = existing_recipes
                 logger.info(f"Merged {len(new_recipes)} recipes with existing data")
             else:
                 final_recipes = new_recipes
+                appended = None
                 logger.info(f"Importing {len(new_recipes)} recipes (replace mode)")
 
             with open(recipes_file, 'w', encoding='utf-8') as f:
                 json.dump(final_recipes, f, indent=2, ensure_ascii=False)
 
+            if appended is None:
+                invalidate_search_index(recipes_file)
+            else:
+                recipes_appended(appended, previous_count, recipes_file)
+
             return True
         except Exception as e:
             logger.error(f"Import failed: {e}")
@@ -9,6 +9,8 @@ import json
 from pathlib import Path
 import logging
 
+from meal.infra.Cooked_Repository import CookedHistory, get_cooked_history
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,6 +29,10 @@ class MealPlannerStats:
             logger.error(f"Failed to load cooked recipes: {e}")
             return []
 
+    def _cooked_history(self) -> CookedHistory:
+        """Date-indexed view of the cooked log (cached until the file changes)."""
+        return get_cooked_history(self.data_dir / "Pantry_recipe_cooked.json")
+
     def _load_recipes(self) -> List[Dict]:
         """Load all recipes."""
         try:
@@ -71,22 +77,17 @@ class MealPlannerStats:
         return dict(day_counter)
 
     def average_nutrition_per_week(self, weeks: int = 4) -> Dict[str, float]:
-        """Calculate average nutrition for recent weeks."""
-        cooked = self._load_cooked_recipes()
+        """Calculate average nutrition for recent weeks.
+
+        Counts entries cooked on or after the day `weeks` weeks ago (whole days, so that
+        day is included) and matches them by `recipe_name`, or `name` as the cooked log
+        writes it.
+        """
         recipes = {r['name']: r for r in self._load_recipes()}
 
-        # Filter last N weeks
-        cutoff_date = datetime.now() - timedelta(weeks=weeks)
-        recent_cooked = []
-
-        for entry in cooked:
-            date_str = entry.get('date_cooked', '')
-            try:
-                dt = datetime.strptime(date_str, "%d-%m-%Y")
-                if dt >= cutoff_date:
-                    recent_cooked.append(entry)
-            except Exception:
-                continue
+        # Last N weeks via date-indexed range query (no full log scan)
+        cutoff_date = (datetime.now() - timedelta(weeks=weeks)).date()
+        recent_cooked = self._cooked_history().range(cutoff_date)
 
         # Sum nutrition
         total_calories = 0
@@ -96,7 +97,7 @@ class MealPlannerStats:
         count = 0
 
         for entry in recent_cooked:
-            recipe_name = entry.get('recipe_name', '')
+            recipe_name = entry.get('recipe_name') or entry.get('name', '')
             recipe = recipes.get(recipe_name)
             if recipe:
                 servings = entry.get('servings_cooked', 1)
@@ -175,21 +176,12 @@ class MealPlannerStats:
         """
         Calculate meal diversity score (0-100).
         Higher score = more variety in meals.
+        Same window and recipe name lookup as average_nutrition_per_week.
         """
-        cooked = self._load_cooked_recipes()
-
-        # Filter recent weeks
-        cutoff_date = datetime.now() - timedelta(weeks=weeks)
-        recent_recipes = []
-
-        for entry in cooked:
-            date_str = entry.get('date_cooked', '')
-            try:
-                dt = datetime.strptime(date_str, "%d-%m-%Y")
-                if dt >= cutoff_date:
-                    recent_recipes.append(entry.get('recipe_name', ''))
-            except Exception:
-                continue
+        # Filter recent weeks via date-indexed range query
+        cutoff_date = (datetime.now() - timedelta(weeks=weeks)).date()
+        recent_recipes = [entry.get('recipe_name') or entry.get('name', '')
+                          for entry in self._cooked_history().range(cutoff_date)]
 
         if not recent_recipes:
             return 0.0
@@ -0,0 +1,42 @@
+"""Shared ingredient stemmer and tokenizer.
+
+One set of plural -> singular heuristics used everywhere ingredient names are matched
+(shopping list keys, Recipe pantry checks, the buy endpoint) and by the recipe search index,
+so "tomatoes" in a recipe, "Tomato" in the pantry and a search for "tomato" agree.
+"""
+from __future__ import annotations
+import re
+from typing import List
+
+__all__ = ['stem', 'normalize_name', 'tokenize']
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def stem(word: str) -> str:
+    """Simple plural -> singular heuristics (not perfect, acceptable for ingredient names)."""
+    if word.endswith('ies') and len(word) > 3:
+        return word[:-3] + 'y'  # candies -> candy
+    if word.endswith('oes') and len(word) > 3:
+        return word[:-3] + 'o'  # tomatoes -> tomato, potatoes -> potato
+    if word.endswith('ses') and len(word) > 3:
+        return word[:-2]  # classes -> classe (limitation acknowledged)
+    if word.endswith('es') and len(word) > 2 and word[-3] not in 'aeiou':
+        return word[:-2]  # boxes -> box, dishes -> dish
+    if word.endswith('s') and not word.endswith('ss') and len(word) > 1:
+        return word[:-1]
+    return word
+
+
+def normalize_name(name: str) -> str:
+    """Matching key for a whole ingredient name: trimmed, lower-cased, stemmed."""
+    if not isinstance(name, str):
+        return ""
+    return stem(name.strip().lower())
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded, stemmed word tokens of free text."""
+    if not isinstance(text, str):
+        return []
+    return [stem(t) for t in _TOKEN_RE.findall(text.casefold())]